@@ -1,8 +1,5 @@
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
-from sqlalchemy import pool
-
 from alembic import context
 
 # Import our application settings and models
@@ -13,10 +10,10 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
 
 from portfolio_tracker.config.settings import get_settings
-from portfolio_tracker.config.database import Base
+from portfolio_tracker.config.database import Base, create_sync_engine
 
 # Import all models to ensure they're registered with Base
-from portfolio_tracker.models.db import user, portfolio, holding, transaction, market_price  # noqa
+from portfolio_tracker.models.db import user, portfolio, holding, transaction, instrument, market_price, fx_rate, price_refresh_state, idempotency_key  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -73,11 +70,7 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    connectable = engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
-    )
+    connectable = create_sync_engine()
 
     with connectable.connect() as connection:
         context.configure(
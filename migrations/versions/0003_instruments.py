@@ -0,0 +1,78 @@
+"""instruments dictionary for market prices
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 18:05:12.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables whose symbols get an instrument ID up front
+SYMBOL_SOURCES = ["market_prices", "transactions", "holdings", "price_refresh_state"]
+FOREIGN_KEY = "fk_market_prices_instrument_id_instruments"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('instruments',
+    sa.Column('symbol', sa.String(length=20), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_instruments_id'), 'instruments', ['id'], unique=False)
+    op.create_index(op.f('ix_instruments_symbol'), 'instruments', ['symbol'], unique=True)
+
+    symbols = " UNION ".join(f"SELECT symbol FROM {table}" for table in SYMBOL_SOURCES)
+    op.execute(
+        "INSERT INTO instruments (symbol, created_at, updated_at) "
+        f"SELECT symbol, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP FROM ({symbols}) AS s "
+        "ORDER BY symbol"
+    )
+
+    op.add_column('market_prices', sa.Column('instrument_id', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE market_prices SET instrument_id = "
+        "(SELECT id FROM instruments WHERE instruments.symbol = market_prices.symbol)"
+    )
+
+    op.drop_index('ix_market_prices_symbol_date', table_name='market_prices')
+    op.drop_index(op.f('ix_market_prices_symbol'), table_name='market_prices')
+    with op.batch_alter_table('market_prices') as batch_op:
+        batch_op.alter_column('instrument_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key(
+            FOREIGN_KEY, 'instruments', ['instrument_id'], ['id'], ondelete='CASCADE'
+        )
+        batch_op.drop_column('symbol')
+    op.create_index('ix_market_prices_instrument_date', 'market_prices', ['instrument_id', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_market_prices_instrument_date', table_name='market_prices')
+    op.add_column('market_prices', sa.Column('symbol', sa.String(length=20), nullable=True))
+    op.execute(
+        "UPDATE market_prices SET symbol = "
+        "(SELECT symbol FROM instruments WHERE instruments.id = market_prices.instrument_id)"
+    )
+    with op.batch_alter_table('market_prices') as batch_op:
+        batch_op.alter_column('symbol', existing_type=sa.String(length=20), nullable=False)
+        batch_op.drop_constraint(FOREIGN_KEY, type_='foreignkey')
+        batch_op.drop_column('instrument_id')
+    op.create_index(op.f('ix_market_prices_symbol'), 'market_prices', ['symbol'], unique=False)
+    op.create_index('ix_market_prices_symbol_date', 'market_prices', ['symbol', 'date'], unique=True)
+
+    op.drop_index(op.f('ix_instruments_symbol'), table_name='instruments')
+    op.drop_index(op.f('ix_instruments_id'), table_name='instruments')
+    op.drop_table('instruments')
@@ -0,0 +1,28 @@
+"""index market_prices by updated_at
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 23:02:41.118034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_market_prices_updated_at', 'market_prices', ['updated_at', 'instrument_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_market_prices_updated_at', table_name='market_prices')
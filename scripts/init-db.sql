@@ -6,7 +6,8 @@
 
 -- Create extensions if needed in the future
 -- CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
--- CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+-- Trigram indexes for transaction notes and holding name search
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Log initialization
 DO $$
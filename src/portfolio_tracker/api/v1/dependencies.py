@@ -6,12 +6,14 @@ Reusable dependencies for dependency injection.
 
 from typing import AsyncGenerator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from portfolio_tracker.config.database import get_db
 from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.services.batch import BATCH_SESSION_KEY, BATCH_USER_KEY
+from portfolio_tracker.services.profiling import PROFILE_STATE_KEY
 
 settings = get_settings()
 
@@ -20,13 +22,18 @@ security = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Get current authenticated user from JWT token.
 
+    Sub-requests of a batch reuse the user already authenticated for the
+    batch call instead of validating the token again.
+
     Args:
+        request: Incoming request
         credentials: HTTP Bearer credentials (JWT token)
         db: Database session
 
@@ -38,6 +45,10 @@ async def get_current_user(
 
     TODO: Implement actual JWT validation and user lookup
     """
+    batch_user: Optional[dict] = getattr(request.state, BATCH_USER_KEY, None)
+    if batch_user is not None:
+        return batch_user
+
     # Placeholder - will be implemented with authentication system
     raise HTTPException(
         status_code=status.HTTP_501_NOT_IMPLEMENTED,
@@ -46,6 +57,7 @@ async def get_current_user(
 
 
 async def get_optional_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(
         HTTPBearer(auto_error=False)
     ),
@@ -55,6 +67,7 @@ async def get_optional_current_user(
     Get current user if authenticated, None otherwise.
 
     Args:
+        request: Incoming request
         credentials: Optional HTTP Bearer credentials
         db: Database session
 
@@ -65,7 +78,7 @@ async def get_optional_current_user(
         return None
 
     try:
-        return await get_current_user(credentials, db)
+        return await get_current_user(request, credentials, db)
     except HTTPException:
         return None
 
@@ -94,12 +107,45 @@ def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
     return current_user
 
 
-async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+async def authorize_profiling(
+    request: Request, current_user: dict = Depends(get_current_user)
+) -> None:
+    """
+    Allow the profile requested for this request only for admins.
+
+    Applied to every API router; without a profile flag it only reuses the
+    endpoint's own authentication.
+
+    Args:
+        request: Incoming request
+        current_user: Current authenticated user
+
+    Raises:
+        HTTPException: If a profile is requested by a non-admin
+    """
+    profile = getattr(request.state, PROFILE_STATE_KEY, None)
+    if profile is not None:
+        require_admin(current_user)
+        profile.authorized = True
+
+
+async def get_db_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Alias for get_db for cleaner dependency injection.
 
+    Inside a batch, yields the batch's shared session instead; the batch
+    endpoint owns its transaction.
+
+    Args:
+        request: Incoming request
+
     Yields:
         AsyncSession: Database session
     """
+    batch_session = getattr(request.state, BATCH_SESSION_KEY, None)
+    if batch_session is not None:
+        yield batch_session
+        return
+
     async for session in get_db():
         yield session
@@ -0,0 +1,96 @@
+"""
+Admin Endpoints
+
+Profiles collected by the request profiler on this worker, and
+maintenance operations.
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_db_session, require_admin
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.services.profiling import (
+    format_collapsed,
+    get_profile_store,
+    get_sampler,
+    merge_samples,
+    top_stacks,
+)
+from portfolio_tracker.utils.exceptions import NotFoundException
+from portfolio_tracker.utils.helpers import generate_response
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles")
+async def list_profiles() -> JSONResponse:
+    """List stored request profiles, newest first."""
+    return JSONResponse(content=generate_response(data=get_profile_store().list()))
+
+
+@router.get("/profiles/routes")
+async def get_route_profiles(
+    route: Optional[str] = Query(default=None, description="e.g. GET /{id}"),
+    top: int = Query(default=10, ge=1, le=100),
+    format: str = Query(default="json", pattern="^(json|collapsed)$"),
+    reset: bool = Query(default=False, description="Clear after reading"),
+) -> Response:
+    """
+    Hot stacks aggregated by route by the continuous sampler.
+
+    ``format=collapsed`` returns collapsed stacks for flame graph tools,
+    merged across routes unless ``route`` is given.
+    """
+    routes = get_sampler().take_routes(reset=reset)
+    if route is not None:
+        routes = {route: routes[route]} if route in routes else {}
+
+    if format == "collapsed":
+        return PlainTextResponse(format_collapsed(merge_samples(routes.values())))
+
+    ranked = sorted(
+        routes.items(), key=lambda item: sum(item[1].values()), reverse=True
+    )
+    data = [
+        {
+            "route": name,
+            "samples": sum(samples.values()),
+            "top_stacks": top_stacks(samples, top),
+        }
+        for name, samples in ranked
+    ]
+    return JSONResponse(
+        content=generate_response(
+            data=data, meta={"continuous": get_sampler().continuous}
+        )
+    )
+
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str) -> PlainTextResponse:
+    """Collapsed stacks of a stored request profile."""
+    collapsed = get_profile_store().get(profile_id)
+    if collapsed is None:
+        raise NotFoundException(
+            message=f"Profile {profile_id} not found", code="PROFILE_NOT_FOUND"
+        )
+    return PlainTextResponse(collapsed)
+
+
+@router.post("/portfolios/recompute-totals")
+async def recompute_portfolio_totals(
+    portfolio_id: Optional[List[int]] = Query(default=None),
+    db: AsyncSession = Depends(get_db_session),
+) -> JSONResponse:
+    """
+    Recompute cached portfolio totals from holdings.
+
+    Without ``portfolio_id`` every portfolio is recomputed.
+    """
+    updated = await PortfolioRepository(db).recompute_totals(portfolio_id)
+    await db.commit()
+    return JSONResponse(content=generate_response(data={"updated": updated}))
@@ -0,0 +1,299 @@
+"""
+Analytics Endpoints
+
+Portfolio metrics, with conditional GET support keyed on the portfolio
+version (and, for responses computed from closes, the price version).
+"""
+
+from datetime import date, timedelta
+from typing import Any, Collection, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.repositories.market_price import MarketPriceRepository
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.services.analytics import AnalyticsService
+from portfolio_tracker.services.benchmark import BenchmarkService
+from portfolio_tracker.services.net_worth import NetWorthService
+from portfolio_tracker.services.optimization import OptimizationService
+from portfolio_tracker.services.projection import ProjectionParams, ProjectionService
+from portfolio_tracker.services.rebalancing import RebalancingService
+from portfolio_tracker.utils.etag import (
+    build_weak_etag,
+    conditional_headers,
+    etag_matches,
+    not_modified_response,
+)
+from portfolio_tracker.utils.exceptions import PortfolioNotFoundException
+from portfolio_tracker.utils.helpers import generate_response
+from portfolio_tracker.utils.timeseries import negotiate_media_type, timeseries_response
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+async def get_priced_version(
+    db: AsyncSession, portfolio_id: int, user_id: int, symbols: Collection[str] = ()
+) -> Tuple[Any, ...]:
+    """
+    Portfolio version plus the latest price write of its symbols.
+
+    Raises:
+        PortfolioNotFoundException: If the portfolio is missing or not owned
+    """
+    version = await PortfolioRepository(db).get_version(portfolio_id, user_id)
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+    price_version = await MarketPriceRepository(db).get_price_version(
+        portfolio_id, symbols
+    )
+    return (*version, price_version)
+
+
+@router.get("/net-worth")
+async def get_net_worth(
+    currency: Optional[str] = Query(default=None, pattern="^[A-Z]{3}$"),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Get net worth, gain/loss and allocation across all of the user's portfolios.
+
+    Amounts are converted into ``currency`` at the latest exchange rate;
+    it defaults to the portfolios' currency when they share one.
+    """
+    net_worth = await NetWorthService(db).get_net_worth(current_user["id"], currency)
+
+    # Roll-ups are cached per data version, so their timestamp versions them
+    etag = build_weak_etag(
+        "net-worth", current_user["id"], net_worth.currency, net_worth.as_of
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    return JSONResponse(
+        content=generate_response(data=net_worth.model_dump(mode="json")),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/portfolios/{portfolio_id}/summary")
+async def get_portfolio_summary(
+    portfolio_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Get value, cost, gain/loss and allocation of a portfolio."""
+    repository = PortfolioRepository(db)
+    version = await repository.get_version(portfolio_id, current_user["id"])
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+
+    etag = build_weak_etag("summary", portfolio_id, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    portfolio = await repository.get_for_user(portfolio_id, current_user["id"])
+    if portfolio is None:
+        raise PortfolioNotFoundException(portfolio_id)
+    summary = await AnalyticsService(db).get_portfolio_summary(portfolio)
+    return JSONResponse(
+        content=generate_response(data=summary.model_dump(mode="json")),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/portfolios/{portfolio_id}/history")
+async def get_portfolio_value_history(
+    portfolio_id: int,
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    accept: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Get a portfolio's daily market value.
+
+    Defaults to the last 365 days. Returns JSON by default, or columnar
+    Arrow IPC / MessagePack when requested via ``Accept``.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+
+    version = await get_priced_version(db, portfolio_id, current_user["id"])
+    media_type = negotiate_media_type(accept)
+    etag = build_weak_etag("history", portfolio_id, start, end, media_type, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    dates, values = await AnalyticsService(db).get_value_history(
+        portfolio_id, start, end
+    )
+    return timeseries_response(
+        {"date": dates, "value": values.round(2)},
+        media_type,
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/portfolios/{portfolio_id}/benchmarks")
+async def compare_with_benchmarks(
+    portfolio_id: int,
+    symbol: List[str] = Query(description="Benchmark symbol; repeat for several"),
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Compare a portfolio's time-weighted returns with benchmark symbols.
+
+    Defaults to the last 365 days. Returns total and excess return,
+    tracking error, information ratio and beta per benchmark, and the
+    cumulative return series on the portfolio's trading dates.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=365)
+
+    benchmarks = [value.upper() for value in symbol]
+    version = await get_priced_version(
+        db, portfolio_id, current_user["id"], benchmarks
+    )
+    etag = build_weak_etag(
+        "benchmarks", portfolio_id, date.today(), start, end, *symbol, *version
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    comparison = await BenchmarkService(db).compare(portfolio_id, symbol, start, end)
+    return JSONResponse(
+        content=generate_response(data=comparison.model_dump(mode="json")),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/portfolios/{portfolio_id}/rebalance")
+async def get_rebalance_proposal(
+    portfolio_id: int,
+    tolerance: Optional[float] = Query(default=None, ge=0, le=1),
+    min_trade_value: Optional[float] = Query(default=None, ge=0),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Propose trades bringing a portfolio back to its risk profile's targets.
+
+    ``data`` is null when every asset type is within tolerance.
+    """
+    repository = PortfolioRepository(db)
+    version = await repository.get_version(portfolio_id, current_user["id"])
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+
+    etag = build_weak_etag(
+        "rebalance", portfolio_id, tolerance, min_trade_value, *version
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    portfolio = await repository.get_for_user(portfolio_id, current_user["id"])
+    if portfolio is None:
+        raise PortfolioNotFoundException(portfolio_id)
+    proposal = await RebalancingService(db, tolerance, min_trade_value).propose(
+        portfolio
+    )
+    return JSONResponse(
+        content=generate_response(
+            data=proposal.model_dump(mode="json") if proposal else None
+        ),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/portfolios/{portfolio_id}/projection")
+async def get_portfolio_projection(
+    portfolio_id: int,
+    horizon_years: int = Query(default=10, ge=1, le=settings.PROJECTION_MAX_YEARS),
+    paths: int = Query(default=10_000, ge=100, le=settings.PROJECTION_MAX_PATHS),
+    method: str = Query(default="bootstrap", pattern="^(bootstrap|normal)$"),
+    seed: int = Query(default=0, ge=0),
+    lookback_years: int = Query(
+        default=settings.PROJECTION_LOOKBACK_YEARS, ge=1, le=30
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Simulate the future value of a portfolio's current holdings.
+
+    Returns mean and percentile values at the end of each year. Results
+    are reproducible for a given ``seed``.
+    """
+    version = await get_priced_version(db, portfolio_id, current_user["id"])
+    params = ProjectionParams(horizon_years, paths, method, seed, lookback_years)
+    etag = build_weak_etag(
+        "projection", portfolio_id, date.today(), *vars(params).values(), *version
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    projection = await ProjectionService(db).project(portfolio_id, version, params)
+    return JSONResponse(
+        content=generate_response(data=projection.model_dump(mode="json")),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/portfolios/{portfolio_id}/frontier")
+async def get_efficient_frontier(
+    portfolio_id: int,
+    points: int = Query(default=50, ge=2, le=200),
+    risk_free_rate: Optional[float] = Query(default=None, ge=-0.1, le=1),
+    lookback_years: Optional[int] = Query(default=None, ge=1, le=30),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Get the long-only efficient frontier of a portfolio's symbols.
+
+    Includes the minimum-variance and maximum-Sharpe weights and where the
+    current holdings sit relative to them.
+    """
+    version = await PortfolioRepository(db).get_version(
+        portfolio_id, current_user["id"]
+    )
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+
+    etag = build_weak_etag(
+        "frontier",
+        portfolio_id,
+        date.today(),
+        points,
+        risk_free_rate,
+        lookback_years,
+        *version,
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    frontier = await OptimizationService(db).get_frontier(
+        portfolio_id, points, risk_free_rate, lookback_years
+    )
+    return JSONResponse(
+        content=generate_response(data=frontier.model_dump(mode="json")),
+        headers=conditional_headers(etag),
+    )
@@ -0,0 +1,73 @@
+"""
+Batch Endpoint
+
+Executes a list of API sub-requests in one call, sharing the caller's
+authentication and a single database session. Accepts an
+``Idempotency-Key`` header, so a retried batch is not applied twice.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.schemas.batch import BatchRequest
+from portfolio_tracker.services.batch import BatchExecutor, BatchSession
+from portfolio_tracker.services.idempotency import IdempotencyService
+from portfolio_tracker.utils.exceptions import ValidationException
+from portfolio_tracker.utils.helpers import generate_response
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+@router.post("")
+async def run_batch(
+    payload: BatchRequest,
+    request: Request,
+    idempotency_key: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Run sub-requests and return their responses in request order.
+
+    Consecutive reads run concurrently; writes run in order, each in its
+    own savepoint. The batch returns 200 even when sub-requests fail; check
+    each result's ``status``. A repeated ``Idempotency-Key`` replays the
+    first response instead of running the batch again.
+    """
+    limit = settings.BATCH_MAX_OPERATIONS
+    if len(payload.requests) > limit:
+        raise ValidationException(
+            message=f"A batch may contain at most {limit} requests",
+            field="requests",
+        )
+
+    async def execute() -> JSONResponse:
+        executor = BatchExecutor(
+            app=request.app,
+            session=BatchSession(db),
+            user=current_user,
+            parent_scope=request.scope,
+        )
+        results = await executor.run(payload.requests)
+        # Commit before the response is stored for replay
+        await db.commit()
+        return JSONResponse(
+            content=generate_response(
+                data=[result.model_dump(mode="json") for result in results]
+            )
+        )
+
+    return await IdempotencyService().run(
+        request,
+        idempotency_key,
+        current_user["id"],
+        payload.model_dump_json(),
+        execute,
+    )
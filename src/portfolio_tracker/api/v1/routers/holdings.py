@@ -0,0 +1,63 @@
+"""
+Holding Endpoints
+
+Read endpoints for the holdings of a portfolio, with conditional GET
+support keyed on the portfolio version and a ``fields=`` sparse fieldset.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.schemas.holding import HoldingResponse
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.utils.etag import (
+    build_weak_etag,
+    conditional_headers,
+    etag_matches,
+    not_modified_response,
+)
+from portfolio_tracker.utils.exceptions import PortfolioNotFoundException
+from portfolio_tracker.utils.helpers import generate_response
+from portfolio_tracker.utils.serialization import (
+    FIELDS_DESCRIPTION,
+    get_row_serializer,
+    parse_fields,
+)
+
+router = APIRouter()
+
+HOLDING_FIELDS = tuple(HoldingResponse.model_fields)
+
+
+@router.get("/{portfolio_id}/holdings")
+async def list_holdings(
+    portfolio_id: int,
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """List the holdings of one of the current user's portfolios."""
+    fieldset = parse_fields(fields, HOLDING_FIELDS)
+    version = await PortfolioRepository(db).get_version(
+        portfolio_id, current_user["id"]
+    )
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+
+    etag = build_weak_etag("holdings", portfolio_id, ",".join(fieldset), *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    rows = await HoldingRepository(db).select_by_portfolio(portfolio_id, fieldset)
+    serialize = get_row_serializer(Holding, fieldset)
+    return JSONResponse(
+        content=generate_response(data=[serialize(row) for row in rows]),
+        headers=conditional_headers(etag),
+    )
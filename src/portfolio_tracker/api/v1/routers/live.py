@@ -0,0 +1,112 @@
+"""
+Live Valuation Endpoints
+
+Server-Sent Events stream of portfolio value updates. The first event is
+a full ``snapshot``; later ``update`` events only carry the fields that
+changed. Idle streams receive a comment line every heartbeat interval so
+proxies keep them open.
+"""
+
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.services.batch import BATCH_SESSION_KEY
+from portfolio_tracker.services.live_valuation import (
+    Subscription,
+    ValuationHub,
+    get_valuation_hub,
+)
+from portfolio_tracker.utils.exceptions import (
+    PortfolioNotFoundException,
+    ValidationException,
+)
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+@router.get("/portfolios")
+async def stream_portfolio_values(
+    request: Request,
+    portfolio_id: Optional[List[int]] = Query(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> StreamingResponse:
+    """
+    Stream value updates for the current user's portfolios.
+
+    Without ``portfolio_id`` every portfolio of the user is followed.
+    """
+    if getattr(request.state, BATCH_SESSION_KEY, None) is not None:
+        raise ValidationException(message="Streaming endpoints cannot be batched")
+
+    owned = [
+        row.id
+        for row in await PortfolioRepository(db).select_for_user(
+            current_user["id"], ("id",)
+        )
+    ]
+    requested = portfolio_id or owned
+    for pid in requested:
+        if pid not in owned:
+            raise PortfolioNotFoundException(pid)
+    if len(requested) > settings.LIVE_MAX_PORTFOLIOS:
+        raise ValidationException(
+            message=f"At most {settings.LIVE_MAX_PORTFOLIOS} portfolios per stream",
+            field="portfolio_id",
+        )
+
+    hub = get_valuation_hub()
+    subscription = await hub.subscribe(db, requested)
+    # Release the connection; the stream itself never touches the database
+    await db.commit()
+
+    return StreamingResponse(
+        _event_stream(hub, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(
+    hub: ValuationHub, subscription: Subscription
+) -> AsyncIterator[str]:
+    """Yield SSE frames until the client disconnects."""
+    try:
+        yield _format_event(
+            "snapshot",
+            {
+                str(portfolio_id): hub.snapshot(portfolio_id)
+                for portfolio_id in sorted(subscription.portfolio_ids)
+            },
+        )
+        while True:
+            updates = await subscription.next_update(
+                throttle=settings.LIVE_THROTTLE_SECONDS,
+                timeout=settings.LIVE_HEARTBEAT_SECONDS,
+            )
+            if updates is None:
+                yield ": keep-alive\n\n"
+            elif updates:
+                yield _format_event(
+                    "update",
+                    {
+                        str(portfolio_id): delta
+                        for portfolio_id, delta in updates.items()
+                    },
+                )
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def _format_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one SSE frame."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
@@ -0,0 +1,37 @@
+"""
+Market Data Endpoints
+
+Historical market prices. Time-series responses are JSON by default and
+columnar Arrow IPC / MessagePack when requested via ``Accept``.
+"""
+
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.repositories.market_price import MarketPriceRepository
+from portfolio_tracker.utils.timeseries import negotiate_media_type, timeseries_response
+
+router = APIRouter()
+
+
+@router.get("/prices/{symbol}/history")
+async def get_price_history(
+    symbol: str,
+    start: Optional[date] = Query(default=None),
+    end: Optional[date] = Query(default=None),
+    accept: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Get daily closes for a symbol."""
+    dates, closes = await MarketPriceRepository(db).get_close_history(
+        symbol.upper(), start, end
+    )
+    return timeseries_response(
+        {"date": dates, "close": closes}, negotiate_media_type(accept)
+    )
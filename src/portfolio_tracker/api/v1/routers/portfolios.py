@@ -0,0 +1,88 @@
+"""
+Portfolio Endpoints
+
+Read endpoints for a user's portfolios. GETs emit weak ETags built from a
+cheap version query and answer ``If-None-Match`` with 304 before loading
+or serializing anything. The list accepts a ``fields=`` sparse fieldset.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.models.schemas.portfolio import PortfolioResponse
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.utils.etag import (
+    build_weak_etag,
+    conditional_headers,
+    etag_matches,
+    not_modified_response,
+)
+from portfolio_tracker.utils.exceptions import PortfolioNotFoundException
+from portfolio_tracker.utils.helpers import generate_response
+from portfolio_tracker.utils.serialization import (
+    FIELDS_DESCRIPTION,
+    get_row_serializer,
+    parse_fields,
+)
+
+router = APIRouter()
+
+PORTFOLIO_FIELDS = tuple(PortfolioResponse.model_fields)
+
+
+@router.get("")
+async def list_portfolios(
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """List the current user's portfolios."""
+    fieldset = parse_fields(fields, PORTFOLIO_FIELDS)
+    repository = PortfolioRepository(db)
+    version = await repository.get_list_version(current_user["id"])
+    etag = build_weak_etag(
+        "portfolios", current_user["id"], ",".join(fieldset), *version
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    rows = await repository.select_for_user(current_user["id"], fieldset)
+    serialize = get_row_serializer(Portfolio, fieldset)
+    return JSONResponse(
+        content=generate_response(data=[serialize(row) for row in rows]),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.get("/{portfolio_id}")
+async def get_portfolio(
+    portfolio_id: int,
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Get one of the current user's portfolios."""
+    repository = PortfolioRepository(db)
+    version = await repository.get_version(portfolio_id, current_user["id"])
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+
+    etag = build_weak_etag("portfolio", portfolio_id, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    portfolio = await repository.get_for_user(portfolio_id, current_user["id"])
+    if portfolio is None:
+        raise PortfolioNotFoundException(portfolio_id)
+    return JSONResponse(
+        content=generate_response(
+            data=PortfolioResponse.model_validate(portfolio).model_dump(mode="json")
+        ),
+        headers=conditional_headers(etag),
+    )
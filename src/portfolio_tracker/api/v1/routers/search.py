@@ -0,0 +1,90 @@
+"""
+Search Endpoints
+
+Substring search over the current user's transaction notes and holding
+names, backed by ``pg_trgm`` GIN indexes, and symbol autocomplete served
+from an in-memory prefix index. Search results accept a ``fields=``
+sparse fieldset.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.api.v1.routers.holdings import HOLDING_FIELDS
+from portfolio_tracker.api.v1.routers.transactions import TRANSACTION_FIELDS
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.transaction import Transaction
+from portfolio_tracker.models.schemas.search import SymbolSuggestion
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.repositories.transaction import TransactionRepository
+from portfolio_tracker.services.symbol_search import SymbolSearchService
+from portfolio_tracker.utils.helpers import generate_response
+from portfolio_tracker.utils.serialization import (
+    FIELDS_DESCRIPTION,
+    get_row_serializer,
+    parse_fields,
+)
+
+settings = get_settings()
+
+router = APIRouter()
+
+
+@router.get("/transactions")
+async def search_transactions(
+    q: str = Query(min_length=settings.SEARCH_MIN_QUERY_LENGTH, max_length=100),
+    limit: int = Query(default=50, ge=1, le=500),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Find the current user's transactions whose notes contain ``q``."""
+    fieldset = parse_fields(fields, TRANSACTION_FIELDS)
+    rows = await TransactionRepository(db).search_notes(
+        current_user["id"], q, fieldset, limit
+    )
+    serialize = get_row_serializer(Transaction, fieldset)
+    return JSONResponse(
+        content=generate_response(data=[serialize(row) for row in rows])
+    )
+
+
+@router.get("/holdings")
+async def search_holdings(
+    q: str = Query(min_length=settings.SEARCH_MIN_QUERY_LENGTH, max_length=100),
+    limit: int = Query(default=50, ge=1, le=500),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Find the current user's holdings whose name or symbol contains ``q``."""
+    fieldset = parse_fields(fields, HOLDING_FIELDS)
+    rows = await HoldingRepository(db).search(current_user["id"], q, fieldset, limit)
+    serialize = get_row_serializer(Holding, fieldset)
+    return JSONResponse(
+        content=generate_response(data=[serialize(row) for row in rows])
+    )
+
+
+@router.get("/symbols")
+async def autocomplete_symbols(
+    q: str = Query(min_length=1, max_length=50),
+    limit: int = Query(default=10, ge=1, le=50),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """Suggest symbols whose ticker or a word of whose name starts with ``q``."""
+    suggestions = await SymbolSearchService(db).complete(q, limit)
+    return JSONResponse(
+        content=generate_response(
+            data=[
+                SymbolSuggestion(symbol=symbol, name=name).model_dump()
+                for symbol, name in suggestions
+            ]
+        )
+    )
@@ -0,0 +1,125 @@
+"""
+Transaction Endpoints
+
+Paginated transaction listing for a portfolio. Supports a ``fields=``
+sparse fieldset and conditional GET keyed on the portfolio version.
+
+Recording a transaction accepts an ``Idempotency-Key`` header: retries
+with the same key replay the first response instead of recording the
+transaction again.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Query, Request, status
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+from portfolio_tracker.models.db.transaction import Transaction
+from portfolio_tracker.models.schemas.transaction import (
+    TransactionCreate,
+    TransactionResponse,
+)
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.repositories.transaction import TransactionRepository
+from portfolio_tracker.services.idempotency import IdempotencyService
+from portfolio_tracker.services.transactions import TransactionService
+from portfolio_tracker.utils.etag import (
+    build_weak_etag,
+    conditional_headers,
+    etag_matches,
+    not_modified_response,
+)
+from portfolio_tracker.utils.exceptions import PortfolioNotFoundException
+from portfolio_tracker.utils.helpers import (
+    generate_pagination_meta,
+    generate_response,
+    paginate_query,
+)
+from portfolio_tracker.utils.serialization import (
+    FIELDS_DESCRIPTION,
+    get_object_serializer,
+    get_row_serializer,
+    parse_fields,
+)
+
+router = APIRouter()
+
+TRANSACTION_FIELDS = tuple(TransactionResponse.model_fields)
+
+
+@router.get("/{portfolio_id}/transactions")
+async def list_transactions(
+    portfolio_id: int,
+    page: int = Query(default=1, ge=1),
+    page_size: int = Query(default=50, ge=1, le=500),
+    fields: Optional[str] = Query(default=None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """List a page of a portfolio's transactions, newest first."""
+    fieldset = parse_fields(fields, TRANSACTION_FIELDS)
+    offset, limit = paginate_query(page, page_size, max_page_size=500)
+
+    version = await PortfolioRepository(db).get_version(
+        portfolio_id, current_user["id"]
+    )
+    if version is None:
+        raise PortfolioNotFoundException(portfolio_id)
+
+    etag = build_weak_etag(
+        "transactions", portfolio_id, page, limit, ",".join(fieldset), *version
+    )
+    if etag_matches(if_none_match, etag):
+        return not_modified_response(etag)
+
+    repository = TransactionRepository(db)
+    total = await repository.count_by_portfolio(portfolio_id)
+    rows = await repository.select_by_portfolio(portfolio_id, fieldset, offset, limit)
+    serialize = get_row_serializer(Transaction, fieldset)
+    return JSONResponse(
+        content=generate_response(
+            data=[serialize(row) for row in rows],
+            meta={"pagination": generate_pagination_meta(page, limit, total)},
+        ),
+        headers=conditional_headers(etag),
+    )
+
+
+@router.post("/{portfolio_id}/transactions", status_code=status.HTTP_201_CREATED)
+async def create_transaction(
+    portfolio_id: int,
+    payload: TransactionCreate,
+    request: Request,
+    idempotency_key: Optional[str] = Header(default=None),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+) -> Response:
+    """
+    Record a transaction and apply it to the portfolio's holding.
+
+    Send an ``Idempotency-Key`` to make retries safe: a repeated key
+    replays the first response (with ``Idempotent-Replayed: true``), a
+    concurrent duplicate waits for it, and reusing a key for a different
+    request is rejected with 422.
+    """
+
+    async def create() -> JSONResponse:
+        transaction = await TransactionService(db).create(
+            portfolio_id, current_user["id"], payload
+        )
+        serialize = get_object_serializer(Transaction, TRANSACTION_FIELDS)
+        return JSONResponse(
+            content=generate_response(data=serialize(transaction)),
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    return await IdempotencyService().run(
+        request,
+        idempotency_key,
+        current_user["id"],
+        payload.model_dump_json(),
+        create,
+    )
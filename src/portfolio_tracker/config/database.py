@@ -2,17 +2,23 @@
 Database Configuration
 
 SQLAlchemy setup for PostgreSQL with async support.
+
+Engines are created lazily: importing this module only builds the
+declarative ``Base`` used by the ORM models. The async engine is created
+on first use (normally by the FastAPI lifespan handler) and the sync
+engine is only ever built for Alembic migrations.
 """
 
-from typing import AsyncGenerator
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Optional
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import declarative_base
 
 from portfolio_tracker.config.settings import get_settings
 
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
 settings = get_settings()
 
 # Convert postgresql:// to postgresql+asyncpg:// for async support
@@ -20,38 +26,86 @@ ASYNC_DATABASE_URL = settings.DATABASE_URL.replace(
     "postgresql://", "postgresql+asyncpg://"
 )
 
-# Create async engine
-async_engine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_POOL_MAX_OVERFLOW,
-    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
-)
+# Base class for ORM models
+Base = declarative_base()
 
-# Create async session factory
-AsyncSessionLocal = sessionmaker(
-    bind=async_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+_async_engine: Optional["AsyncEngine"] = None
+_session_factory: Optional["async_sessionmaker[AsyncSession]"] = None
 
-# Create sync engine (for Alembic migrations)
-sync_engine = create_engine(
-    settings.DATABASE_URL,
-    echo=settings.DATABASE_ECHO,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_POOL_MAX_OVERFLOW,
-    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
-)
 
-# Base class for ORM models
-Base = declarative_base()
+def get_async_engine() -> "AsyncEngine":
+    """
+    Get the application async engine, creating it on first use.
+
+    Returns:
+        AsyncEngine: Shared async engine
+    """
+    global _async_engine
 
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            echo=settings.DATABASE_ECHO,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_POOL_MAX_OVERFLOW,
+            pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        )
+    return _async_engine
+
+
+def get_session_factory() -> "async_sessionmaker[AsyncSession]":
+    """
+    Get the async session factory bound to the application engine.
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    Returns:
+        async_sessionmaker: Session factory
+    """
+    global _session_factory
+
+    if _session_factory is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+        _session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            expire_on_commit=False,
+            autoflush=False,
+        )
+    return _session_factory
+
+
+def create_sync_engine() -> "Engine":
+    """
+    Create a sync engine for Alembic migrations.
+
+    The engine uses ``DATABASE_URL_SYNC`` (psycopg2) and no connection
+    pool, since migrations open a single short-lived connection.
+
+    Returns:
+        Engine: Unpooled sync engine
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+
+    return create_engine(
+        settings.DATABASE_URL_SYNC,
+        echo=settings.DATABASE_ECHO,
+        poolclass=NullPool,
+    )
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve legacy module attributes lazily."""
+    if name == "async_engine":
+        return get_async_engine()
+    if name == "AsyncSessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+async def get_db() -> AsyncGenerator["AsyncSession", None]:
     """
     Dependency for getting async database sessions.
 
@@ -64,7 +118,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             result = await db.execute(select(User))
             return result.scalars().all()
     """
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
             await session.commit()
@@ -83,10 +137,15 @@ async def init_db() -> None:
     Should only be used in development/testing.
     In production, use Alembic migrations.
     """
-    async with async_engine.begin() as conn:
+    async with get_async_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
 async def close_db() -> None:
-    """Close database connections."""
-    await async_engine.dispose()
+    """Close database connections and drop the cached engine."""
+    global _async_engine, _session_factory
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _session_factory = None
@@ -2,32 +2,92 @@
 Logging Configuration
 
 Centralized logging setup for the application.
+
+Per-request fields (request ID, user ID, ...) live in a
+:class:`~contextvars.ContextVar`, so concurrent requests on the same event
+loop never see each other's context. Records are handed to a
+:class:`~logging.handlers.QueueHandler` and written by a
+:class:`~logging.handlers.QueueListener` thread, so log I/O never blocks
+the event loop. Output is one JSON object per line (``LOG_FORMAT=json``)
+or the classic text format (``LOG_FORMAT=text``).
 """
 
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
-from typing import Any, Dict
+import uuid
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, TextIO
+
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from portfolio_tracker.config.settings import get_settings
 
 settings = get_settings()
 
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+REQUEST_ID_HEADER = b"x-request-id"
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+_log_context: ContextVar[Mapping[str, Any]] = ContextVar("log_context", default=_EMPTY)
+
+# Attributes every LogRecord has; anything else came from context or ``extra``
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime"}
 
-def setup_logging() -> None:
+_exception_formatter = logging.Formatter()
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(
+    stream: Optional[TextIO] = None,
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+) -> None:
     """
     Configure application logging.
 
     Sets up formatters, handlers, and log levels based on environment.
+    Calling it again replaces the previous configuration.
+
+    Args:
+        stream: Output stream (defaults to stdout)
+        log_format: ``json`` or ``text`` (defaults to LOG_FORMAT)
+        use_queue: Write from a background thread (defaults to LOG_QUEUE_ENABLED)
     """
+    shutdown_logging()
+
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
+    log_format = (log_format or settings.LOG_FORMAT).lower()
+    use_queue = settings.LOG_QUEUE_ENABLED if use_queue is None else use_queue
 
-    # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
     )
 
+    if use_queue:
+        log_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        handler: logging.Handler = ContextQueueHandler(log_queue)
+        _start_listener(log_queue, output)
+    else:
+        handler = output
+    handler.addFilter(ContextFilter())
+
+    # Configure root logger
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(log_level)
+
     # Set specific log levels for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("sqlalchemy.engine").setLevel(
@@ -35,6 +95,28 @@ def setup_logging() -> None:
     )
 
 
+def shutdown_logging() -> None:
+    """Stop the queue listener, writing out every queued record."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def _start_listener(
+    log_queue: "queue.SimpleQueue[Any]", output: logging.Handler
+) -> None:
+    """Start the background writer thread."""
+    global _listener
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance.
@@ -48,10 +130,33 @@ def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
 
 
+def get_log_context() -> Mapping[str, Any]:
+    """Get the fields bound to the current context."""
+    return _log_context.get()
+
+
+def bind_log_context(**context: Any) -> Token:
+    """
+    Add fields to the current context.
+
+    Returns:
+        Token: Pass to :func:`reset_log_context` to restore the previous fields
+    """
+    return _log_context.set(MappingProxyType({**_log_context.get(), **context}))
+
+
+def reset_log_context(token: Token) -> None:
+    """Restore the fields in place before :func:`bind_log_context`."""
+    _log_context.reset(token)
+
+
 class LogContext:
     """
     Context manager for adding context to log messages.
 
+    Fields are bound to the current task only, so it is safe to use from
+    concurrent coroutines.
+
     Example:
         with LogContext(user_id=123, request_id="abc"):
             logger.info("Processing request")
@@ -61,20 +166,109 @@ class LogContext:
     def __init__(self, **context: Any) -> None:
         """Initialize log context."""
         self.context = context
-        self.old_factory = logging.getLogRecordFactory()
+        self._token: Optional[Token] = None
 
     def __enter__(self) -> "LogContext":
         """Enter context manager."""
-
-        def record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
-            record = self.old_factory(*args, **kwargs)
-            for key, value in self.context.items():
-                setattr(record, key, value)
-            return record
-
-        logging.setLogRecordFactory(record_factory)
+        self._token = bind_log_context(**self.context)
         return self
 
     def __exit__(self, *args: Any) -> None:
         """Exit context manager."""
-        logging.setLogRecordFactory(self.old_factory)
+        if self._token is not None:
+            reset_log_context(self._token)
+            self._token = None
+
+
+class ContextFilter(logging.Filter):
+    """Copy the current context fields onto each record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Add context fields; explicit ``extra`` values take precedence."""
+        for key, value in _log_context.get().items():
+            if key not in record.__dict__:
+                setattr(record, key, value)
+        return True
+
+
+class ContextQueueHandler(QueueHandler):
+    """Queue handler that keeps exception text apart from the message."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Make the record safe to format on another thread.
+
+        The message is rendered now (arguments may be mutable), and the
+        traceback is kept in ``exc_text`` so formatters can still place it
+        in a field of its own.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format a record."""
+        payload: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class LogContextMiddleware:
+    """
+    ASGI middleware binding request fields to the log context.
+
+    Every record logged while handling a request carries ``request_id``
+    (from the ``X-Request-ID`` header, or generated), ``method`` and
+    ``path``.
+    """
+
+    def __init__(
+        self, app: ASGIApp, id_factory: Optional[Callable[[], str]] = None
+    ) -> None:
+        """Wrap an ASGI application."""
+        self.app = app
+        self.id_factory = id_factory or (lambda: uuid.uuid4().hex)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:128]
+                break
+        token = bind_log_context(
+            request_id=request_id or self.id_factory(),
+            method=scope["method"],
+            path=scope["path"],
+        )
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            reset_log_context(token)
@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     APP_ENV: str = Field(default="development")
     DEBUG: bool = Field(default=False)
     LOG_LEVEL: str = Field(default="INFO")
+    LOG_FORMAT: str = Field(default="json")  # json | text
+    LOG_QUEUE_ENABLED: bool = Field(default=True)
     API_V1_PREFIX: str = Field(default="/api/v1")
 
     # Server
@@ -72,6 +74,92 @@ class Settings(BaseSettings):
     ALPHA_VANTAGE_BASE_URL: str = Field(default="https://www.alphavantage.co/query")
     YAHOOFINANCE_ENABLED: bool = Field(default=True)
 
+    # Price Refresh Worker
+    PRICE_REFRESH_INTERVAL_SECONDS: int = Field(default=300)
+    PRICE_REFRESH_POLL_SECONDS: int = Field(default=30)
+    PRICE_REFRESH_CONCURRENCY: int = Field(default=4)
+    PRICE_REFRESH_BATCH_SIZE: int = Field(default=100)
+    PRICE_REFRESH_JITTER_SECONDS: float = Field(default=1.0)
+    PRICE_REFRESH_BACKOFF_BASE_SECONDS: int = Field(default=60)
+    PRICE_REFRESH_BACKOFF_MAX_SECONDS: int = Field(default=3600)
+
+    # Holding Price Write-behind
+    HOLDING_PRICE_FLUSH_SECONDS: float = Field(default=5.0)
+    HOLDING_PRICE_MAX_PENDING: int = Field(default=5000)
+
+    # Price Watermarks
+    PRICE_WATERMARK_OVERLAP_SECONDS: float = Field(default=60.0)
+
+    # Columnar Price Store
+    PRICE_STORE_ENABLED: bool = Field(default=False)
+    PRICE_STORE_PATH: str = Field(default="data/price_store")
+    PRICE_STORE_REFRESH_SECONDS: int = Field(default=300)
+
+    # As-of Price Index
+    PRICE_INDEX_MAX_SYMBOLS: int = Field(default=5000)
+    PRICE_INDEX_TTL_SECONDS: float = Field(default=300.0)
+
+    # Search
+    SEARCH_MIN_QUERY_LENGTH: int = Field(default=3)
+    SYMBOL_INDEX_REFRESH_SECONDS: float = Field(default=300.0)
+
+    # Currency
+    FX_PIVOT_CURRENCY: str = Field(default="USD")
+
+    # Net Worth Roll-up
+    NET_WORTH_CACHE_SECONDS: float = Field(default=300.0)
+    NET_WORTH_CACHE_MAX_ENTRIES: int = Field(default=10_000)
+
+    # Batch Requests
+    BATCH_MAX_OPERATIONS: int = Field(default=50)
+    BATCH_READ_CONCURRENCY: int = Field(default=8)
+
+    # Idempotency Keys
+    IDEMPOTENCY_BACKEND: str = Field(default="redis")  # redis | database
+    IDEMPOTENCY_TTL_SECONDS: int = Field(default=86400)
+    IDEMPOTENCY_LOCK_SECONDS: float = Field(default=30.0)
+    IDEMPOTENCY_WAIT_SECONDS: float = Field(default=10.0)
+
+    # Cache Invalidation
+    INVALIDATION_ENABLED: bool = Field(default=True)
+    INVALIDATION_CHANNEL: str = Field(default="portfolio_tracker_invalidation")
+    INVALIDATION_RECONNECT_SECONDS: float = Field(default=5.0)
+
+    # Live Valuation Streaming
+    LIVE_POLL_SECONDS: float = Field(default=5.0)
+    LIVE_THROTTLE_SECONDS: float = Field(default=1.0)
+    LIVE_HEARTBEAT_SECONDS: float = Field(default=25.0)
+    LIVE_MAX_PORTFOLIOS: int = Field(default=20)
+
+    # Rebalancing
+    REBALANCE_TOLERANCE: float = Field(default=0.05)
+    REBALANCE_MIN_TRADE_VALUE: float = Field(default=50.0)
+    REBALANCE_CHUNK_SIZE: int = Field(default=1000)
+    REBALANCE_CONCURRENCY: int = Field(default=4)
+
+    # Monte Carlo Projection
+    PROJECTION_LOOKBACK_YEARS: int = Field(default=5)
+    PROJECTION_MAX_PATHS: int = Field(default=100_000)
+    PROJECTION_MAX_YEARS: int = Field(default=50)
+    PROJECTION_WORKERS: int = Field(default=0)
+    PROJECTION_POOL_MIN_PATHS: int = Field(default=20_000)
+    PROJECTION_CACHE_SECONDS: float = Field(default=3600.0)
+    PROJECTION_CACHE_MAX_ENTRIES: int = Field(default=256)
+
+    # Portfolio Optimization
+    OPTIMIZATION_LOOKBACK_YEARS: int = Field(default=3)
+    OPTIMIZATION_RISK_FREE_RATE: float = Field(default=0.04)
+    OPTIMIZATION_MAX_SYMBOLS: int = Field(default=500)
+    OPTIMIZATION_CACHE_SECONDS: float = Field(default=3600.0)
+
+    # Profiling
+    PROFILING_ENABLED: bool = Field(default=True)
+    PROFILING_SAMPLE_SECONDS: float = Field(default=0.005)
+    PROFILING_CONTINUOUS_ENABLED: bool = Field(default=False)
+    PROFILING_CONTINUOUS_SAMPLE_SECONDS: float = Field(default=0.05)
+    PROFILING_MAX_STORED: int = Field(default=50)
+    PROFILING_DIR: str = Field(default="")
+
     # Email
     SMTP_HOST: str = Field(default="smtp.gmail.com")
     SMTP_PORT: int = Field(default=587)
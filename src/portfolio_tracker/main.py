@@ -3,38 +3,225 @@ FastAPI Application Entry Point
 
 This module initializes the FastAPI application with all necessary
 configurations, middleware, and routers.
+
+Resource setup (database engine, background workers) happens in the
+lifespan handler rather than at import time, so importing this module
+stays cheap for cold-started workers. The API routers, which pull in
+SQLAlchemy, the ORM models, NumPy and every service, are likewise
+imported and mounted when the application is first called (lifespan
+startup, or the first request for servers that skip lifespan events).
 """
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from starlette.types import Receive, Scope, Send
 
+from portfolio_tracker.config.logging import LogContextMiddleware
 from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.services.profiling import ProfilingMiddleware
+from portfolio_tracker.utils.exceptions import PortfolioTrackerException
+from portfolio_tracker.utils.helpers import generate_error_response
 
 # Initialize settings
 settings = get_settings()
 
-# Create FastAPI app
-app = FastAPI(
-    title=settings.APP_NAME,
-    description=settings.APP_DESCRIPTION,
-    version="0.1.0",
-    docs_url=f"{settings.API_V1_PREFIX}/docs",
-    redoc_url=f"{settings.API_V1_PREFIX}/redoc",
-    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
-    allow_methods=settings.CORS_ALLOW_METHODS,
-    allow_headers=settings.CORS_ALLOW_HEADERS,
-)
-
-
-@app.get("/")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Application lifespan handler.
+
+    Configures logging, creates the async database engine, installs the
+    cache invalidation hooks and starts this worker's invalidation listener
+    on startup. On shutdown, stops the listener, the live valuation feed,
+    the profiler and the projection process pool, closes the idempotency
+    key store, disposes of the engine and flushes queued log records.
+    Imports are deferred so they are only paid once the server actually
+    starts.
+    """
+    from portfolio_tracker.config.database import close_db, get_async_engine
+    from portfolio_tracker.config.logging import setup_logging, shutdown_logging
+    from portfolio_tracker.services.idempotency import close_idempotency_store
+    from portfolio_tracker.services.invalidation import (
+        install_invalidation_hooks,
+        start_invalidation_listener,
+        stop_invalidation_listener,
+    )
+    from portfolio_tracker.services.live_valuation import close_valuation_hub
+    from portfolio_tracker.services.profiling import stop_sampler
+    from portfolio_tracker.services.projection import close_projection_pool
+
+    setup_logging()
+    get_async_engine()
+    install_invalidation_hooks()
+    start_invalidation_listener()
+    try:
+        yield
+    finally:
+        await stop_invalidation_listener()
+        await close_valuation_hub()
+        await close_idempotency_store()
+        await close_db()
+        stop_sampler()
+        close_projection_pool()
+        shutdown_logging()
+
+
+class PortfolioTrackerApp(FastAPI):
+    """FastAPI application that mounts the API routers when first called."""
+
+    routers_mounted = False
+
+    def mount_routers(self) -> None:
+        """Import and include the API routers, once."""
+        if not self.routers_mounted:
+            self.routers_mounted = True
+            include_api_routers(self)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle an ASGI call, mounting the routers first if needed."""
+        if not self.routers_mounted:
+            self.mount_routers()
+        await super().__call__(scope, receive, send)
+
+
+def create_app() -> PortfolioTrackerApp:
+    """
+    Create and configure the FastAPI application.
+
+    API routers are mounted on the first call; see
+    :class:`PortfolioTrackerApp`.
+
+    Returns:
+        PortfolioTrackerApp: Configured application instance
+    """
+    application = PortfolioTrackerApp(
+        title=settings.APP_NAME,
+        description=settings.APP_DESCRIPTION,
+        version="0.1.0",
+        docs_url=f"{settings.API_V1_PREFIX}/docs",
+        redoc_url=f"{settings.API_V1_PREFIX}/redoc",
+        openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+        lifespan=lifespan,
+    )
+
+    # Configure CORS
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=settings.CORS_ALLOW_CREDENTIALS,
+        allow_methods=settings.CORS_ALLOW_METHODS,
+        allow_headers=settings.CORS_ALLOW_HEADERS,
+    )
+    application.add_middleware(ProfilingMiddleware)
+    application.add_middleware(LogContextMiddleware)
+
+    application.add_api_route("/", root, methods=["GET"])
+    application.add_api_route("/health", health_check, methods=["GET"])
+
+    application.add_exception_handler(
+        PortfolioTrackerException, portfolio_tracker_exception_handler
+    )
+
+    return application
+
+
+def include_api_routers(application: FastAPI) -> None:
+    """
+    Include the versioned API routers.
+
+    Args:
+        application: Application to mount the routers on
+    """
+    from portfolio_tracker.api.v1.dependencies import authorize_profiling
+    from portfolio_tracker.api.v1.routers import (
+        admin,
+        analytics,
+        batch,
+        holdings,
+        live,
+        market,
+        portfolios,
+        search,
+        transactions,
+    )
+
+    # Lets admins profile any API request (see services/profiling.py)
+    api_dependencies = [Depends(authorize_profiling)]
+
+    application.include_router(
+        portfolios.router,
+        prefix=f"{settings.API_V1_PREFIX}/portfolios",
+        tags=["portfolios"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        holdings.router,
+        prefix=f"{settings.API_V1_PREFIX}/portfolios",
+        tags=["holdings"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        transactions.router,
+        prefix=f"{settings.API_V1_PREFIX}/portfolios",
+        tags=["transactions"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        analytics.router,
+        prefix=f"{settings.API_V1_PREFIX}/analytics",
+        tags=["analytics"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        market.router,
+        prefix=f"{settings.API_V1_PREFIX}/market",
+        tags=["market"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        search.router,
+        prefix=f"{settings.API_V1_PREFIX}/search",
+        tags=["search"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        live.router,
+        prefix=f"{settings.API_V1_PREFIX}/live",
+        tags=["live"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        batch.router,
+        prefix=f"{settings.API_V1_PREFIX}/batch",
+        tags=["batch"],
+        dependencies=api_dependencies,
+    )
+    application.include_router(
+        admin.router,
+        prefix=f"{settings.API_V1_PREFIX}/admin",
+        tags=["admin"],
+    )
+
+
+async def portfolio_tracker_exception_handler(
+    request: Request, exc: Exception
+) -> JSONResponse:
+    """Render application exceptions with the standard error format."""
+    if not isinstance(exc, PortfolioTrackerException):
+        raise exc
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=generate_error_response(
+            code=exc.code, message=exc.message, details=exc.details
+        ),
+    )
+
+
 async def root() -> JSONResponse:
     """Root endpoint - Health check."""
     return JSONResponse(
@@ -47,7 +234,6 @@ async def root() -> JSONResponse:
     )
 
 
-@app.get("/health")
 async def health_check() -> JSONResponse:
     """Health check endpoint."""
     return JSONResponse(
@@ -58,7 +244,5 @@ async def health_check() -> JSONResponse:
     )
 
 
-# TODO: Add routers when created
-# from portfolio_tracker.api.v1.routers import users, portfolios, holdings, transactions, analytics
-# app.include_router(users.router, prefix=f"{settings.API_V1_PREFIX}/users", tags=["users"])
-# app.include_router(portfolios.router, prefix=f"{settings.API_V1_PREFIX}/portfolios", tags=["portfolios"])
+# Create FastAPI app
+app = create_app()
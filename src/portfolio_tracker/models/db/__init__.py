@@ -9,7 +9,11 @@ from portfolio_tracker.models.db.user import User
 from portfolio_tracker.models.db.portfolio import Portfolio, RiskProfile
 from portfolio_tracker.models.db.holding import Holding
 from portfolio_tracker.models.db.transaction import Transaction, TransactionType
+from portfolio_tracker.models.db.instrument import Instrument
 from portfolio_tracker.models.db.market_price import MarketPrice
+from portfolio_tracker.models.db.fx_rate import FxRate
+from portfolio_tracker.models.db.price_refresh_state import PriceRefreshState
+from portfolio_tracker.models.db.idempotency_key import IdempotencyKey
 
 __all__ = [
     "BaseModel",
@@ -19,5 +23,9 @@ __all__ = [
     "Holding",
     "Transaction",
     "TransactionType",
+    "Instrument",
     "MarketPrice",
+    "FxRate",
+    "PriceRefreshState",
+    "IdempotencyKey",
 ]
@@ -11,6 +11,7 @@ from sqlalchemy import Column, DateTime, Integer
 from sqlalchemy.ext.declarative import declared_attr
 
 from portfolio_tracker.config.database import Base as SQLAlchemyBase
+from portfolio_tracker.utils.serialization import column_names
 
 
 class BaseModel(SQLAlchemyBase):
@@ -34,7 +35,7 @@ class BaseModel(SQLAlchemyBase):
         nullable=False,
     )
 
-    @declared_attr
+    @declared_attr.directive
     def __tablename__(cls) -> str:
         """
         Automatically generate table name from class name.
@@ -45,10 +46,9 @@ class BaseModel(SQLAlchemyBase):
 
     def dict(self) -> dict[str, Any]:
         """Convert model instance to dictionary."""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        model: Any = type(self)
+        names = column_names(model)
+        return {name: getattr(self, name) for name in names}
 
     def __repr__(self) -> str:
         """String representation of model."""
@@ -0,0 +1,50 @@
+"""
+FX Rate Model
+
+Database model for historical foreign exchange rates.
+"""
+
+from sqlalchemy import Column, Date, Index, Numeric, String
+
+from portfolio_tracker.models.db.base import BaseModel
+
+
+class FxRate(BaseModel):
+    """
+    FxRate model for storing daily exchange rates.
+
+    One row means ``1 base_currency = rate quote_currency`` on ``date``.
+    Inverse and cross rates are derived in memory by the conversion
+    service, so only one direction per pair needs to be stored.
+    """
+
+    __tablename__ = "fx_rates"
+
+    # Currency Pair (ISO 4217)
+    base_currency = Column(String(3), nullable=False)
+    quote_currency = Column(String(3), nullable=False)
+    date = Column(Date, nullable=False)
+
+    # Rate
+    rate = Column(Numeric(precision=20, scale=10), nullable=False)
+
+    # Metadata
+    source = Column(String(50), default="ecb", nullable=False)  # Data source
+
+    # Composite unique constraint: one rate per pair per date
+    __table_args__ = (
+        Index(
+            "ix_fx_rates_pair_date",
+            "base_currency",
+            "quote_currency",
+            "date",
+            unique=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<FxRate({self.base_currency}/{self.quote_currency}, "
+            f"date={self.date}, rate={self.rate})>"
+        )
@@ -4,7 +4,7 @@ Holding Model
 Database model for portfolio holdings (positions).
 """
 
-from sqlalchemy import Column, ForeignKey, Integer, Numeric, String
+from sqlalchemy import Column, ForeignKey, Index, Integer, Numeric, String
 from sqlalchemy.orm import relationship
 
 from portfolio_tracker.models.db.base import BaseModel
@@ -62,6 +62,16 @@ class Holding(BaseModel):
         lazy="select",
     )
 
+    # Trigram index for substring search over names (PostgreSQL pg_trgm)
+    __table_args__ = (
+        Index(
+            "ix_holdings_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<Holding(id={self.id}, symbol='{self.symbol}', quantity={self.quantity})>"
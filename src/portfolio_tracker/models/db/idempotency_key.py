@@ -0,0 +1,38 @@
+"""
+Idempotency Key Model
+
+Database model for the ``Idempotency-Key`` fallback store.
+"""
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from portfolio_tracker.models.db.base import BaseModel
+
+
+class IdempotencyKey(BaseModel):
+    """
+    IdempotencyKey model recording the outcome of a keyed write request.
+
+    Used when Redis is not configured or unavailable. A row without
+    ``status_code`` is a request still in flight; ``expires_at`` is when
+    its lock lapses, or when a completed response stops being replayed.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    # "<user id>:<client key>"
+    key = Column(String(300), unique=True, nullable=False, index=True)
+    request_hash = Column(String(64), nullable=False)
+
+    # Stored response (NULL while in flight)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<IdempotencyKey(key='{self.key}', status_code={self.status_code}, "
+            f"expires_at={self.expires_at})>"
+        )
@@ -0,0 +1,27 @@
+"""
+Instrument Model
+
+Database model for the dictionary of tradable symbols.
+"""
+
+from sqlalchemy import Column, String
+
+from portfolio_tracker.models.db.base import BaseModel
+
+
+class Instrument(BaseModel):
+    """
+    Instrument model mapping ticker symbols to compact integer IDs.
+
+    Large tables (``market_prices``) reference instruments by ID instead of
+    repeating the symbol string on every row. Symbols are translated back
+    only at the API edge. A symbol's ID never changes once assigned.
+    """
+
+    __tablename__ = "instruments"
+
+    symbol = Column(String(20), unique=True, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return f"<Instrument(id={self.id}, symbol='{self.symbol}')>"
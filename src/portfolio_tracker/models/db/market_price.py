@@ -5,8 +5,9 @@ Database model for historical market prices.
 Updated daily by Airflow workers.
 """
 
-from datetime import date as date_type
-from sqlalchemy import Column, Date, Index, Numeric, String
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import relationship
 
 from portfolio_tracker.models.db.base import BaseModel
 
@@ -21,8 +22,10 @@ class MarketPrice(BaseModel):
 
     __tablename__ = "market_prices"
 
-    # Asset Information
-    symbol = Column(String(20), nullable=False, index=True)
+    # Asset Information (symbol strings live in ``instruments``)
+    instrument_id = Column(
+        Integer, ForeignKey("instruments.id", ondelete="CASCADE"), nullable=False
+    )
     date = Column(Date, nullable=False, index=True)
 
     # OHLCV Data
@@ -38,11 +41,22 @@ class MarketPrice(BaseModel):
     # Metadata
     source = Column(String(50), default="yahoo", nullable=False)  # Data source
 
-    # Composite unique constraint: one price per symbol per date
+    # Relationships
+    instrument = relationship("Instrument")
+    symbol = association_proxy("instrument", "symbol")
+
+    # Composite unique constraint: one price per instrument per date
+    # updated_at index: watermark reads of recently written rows
     __table_args__ = (
-        Index("ix_market_prices_symbol_date", "symbol", "date", unique=True),
+        Index(
+            "ix_market_prices_instrument_date", "instrument_id", "date", unique=True
+        ),
+        Index("ix_market_prices_updated_at", "updated_at", "instrument_id"),
     )
 
     def __repr__(self) -> str:
         """String representation."""
-        return f"<MarketPrice(symbol='{self.symbol}', date={self.date}, close={self.close})>"
+        return (
+            f"<MarketPrice(instrument_id={self.instrument_id}, date={self.date}, "
+            f"close={self.close})>"
+        )
@@ -0,0 +1,39 @@
+"""
+Price Refresh State Model
+
+Database model for the price refresh scheduler watermark.
+"""
+
+from sqlalchemy import Column, Date, DateTime, Integer, String
+
+from portfolio_tracker.models.db.base import BaseModel
+
+
+class PriceRefreshState(BaseModel):
+    """
+    PriceRefreshState model tracking refresh progress per symbol.
+
+    Written by the in-process price refresh scheduler so that restarts
+    resume from the last successful refresh and failing symbols keep
+    their backoff instead of hammering the provider.
+    """
+
+    __tablename__ = "price_refresh_state"
+
+    symbol = Column(String(20), unique=True, nullable=False, index=True)
+
+    # Watermark
+    last_refreshed_at = Column(DateTime, nullable=True)
+    last_price_date = Column(Date, nullable=True)
+
+    # Backoff
+    failure_count = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True)
+    last_error = Column(String(255), nullable=True)
+
+    def __repr__(self) -> str:
+        """String representation."""
+        return (
+            f"<PriceRefreshState(symbol='{self.symbol}', "
+            f"last_refreshed_at={self.last_refreshed_at})>"
+        )
@@ -6,7 +6,17 @@ Transactions are immutable records of buy/sell operations.
 """
 
 from datetime import date as date_type
-from sqlalchemy import Column, Date, Enum, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 import enum
 
@@ -78,6 +88,16 @@ class Transaction(BaseModel):
     portfolio = relationship("Portfolio", back_populates="transactions")
     holding = relationship("Holding", back_populates="transactions")
 
+    # Trigram index for substring search over notes (PostgreSQL pg_trgm)
+    __table_args__ = (
+        Index(
+            "ix_transactions_notes_trgm",
+            "notes",
+            postgresql_using="gin",
+            postgresql_ops={"notes": "gin_trgm_ops"},
+        ),
+    )
+
     def __repr__(self) -> str:
         """String representation."""
         return (
@@ -0,0 +1,84 @@
+"""
+Analytics Schemas
+
+Pydantic schemas for analytics responses.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class AssetAllocation(BaseModel):
+    """Market value held in one asset type."""
+
+    asset_type: str
+    market_value: Decimal
+    weight: Decimal
+
+
+class PortfolioSummary(BaseModel):
+    """Aggregated value and performance of a portfolio."""
+
+    portfolio_id: int
+    currency: str
+    holdings_count: int
+    total_value: Decimal
+    total_cost: Decimal
+    total_gain_loss: Decimal
+    total_gain_loss_percent: Decimal
+    allocation: List[AssetAllocation]
+
+
+class CurrencyExposure(BaseModel):
+    """Holdings of the portfolios kept in one currency."""
+
+    currency: str
+    # In ``currency``
+    market_value: Decimal
+    total_cost: Decimal
+    # In the reporting currency
+    converted_value: Decimal
+    weight: Decimal
+
+
+class NetWorth(BaseModel):
+    """Aggregated value and performance of all of a user's portfolios."""
+
+    user_id: int
+    currency: str
+    as_of: datetime
+    portfolios_count: int
+    holdings_count: int
+    total_value: Decimal
+    total_cost: Decimal
+    total_gain_loss: Decimal
+    total_gain_loss_percent: Decimal
+    allocation: List[AssetAllocation]
+    currencies: List[CurrencyExposure]
+
+
+class BenchmarkStats(BaseModel):
+    """Portfolio performance relative to one benchmark."""
+
+    symbol: str
+    total_return: float
+    excess_return: float
+    tracking_error: float
+    information_ratio: Optional[float]
+    beta: Optional[float]
+    correlation: Optional[float]
+
+
+class BenchmarkComparison(BaseModel):
+    """Portfolio performance against benchmarks on a common date axis."""
+
+    portfolio_id: int
+    start: date
+    end: date
+    portfolio_return: float
+    benchmarks: List[BenchmarkStats]
+    # Cumulative returns: "date", "portfolio" and one column per benchmark
+    series: Dict[str, List]
@@ -0,0 +1,36 @@
+"""
+Batch Schemas
+
+Pydantic schemas for the batch request endpoint.
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchOperation(BaseModel):
+    """One sub-request of a batch."""
+
+    id: Optional[str] = Field(default=None, description="Client reference echoed back")
+    method: Literal["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., description="API path, e.g. /api/v1/portfolios/1")
+    query: Dict[str, Any] = Field(default_factory=dict)
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Any] = None
+
+
+class BatchRequest(BaseModel):
+    """Batch of sub-requests executed in order."""
+
+    requests: List[BatchOperation] = Field(..., min_length=1)
+
+
+class BatchOperationResult(BaseModel):
+    """Result of one sub-request."""
+
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = Field(default_factory=dict)
+    body: Optional[Any] = None
+    encoding: Optional[Literal["base64"]] = None
@@ -0,0 +1,26 @@
+"""
+FX Rate Schemas
+
+Pydantic schemas for exchange rate ingestion.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class FxRateCreate(BaseModel):
+    """Exchange rate row for bulk ingestion."""
+
+    base_currency: str = Field(min_length=3, max_length=3)
+    quote_currency: str = Field(min_length=3, max_length=3)
+    date: date
+    rate: Decimal = Field(gt=0)
+    source: str = Field(default="ecb", max_length=50)
+
+    @field_validator("base_currency", "quote_currency")
+    @classmethod
+    def normalize_currency(cls, v: str) -> str:
+        """Normalize ISO 4217 codes to upper case."""
+        return v.upper()
@@ -0,0 +1,32 @@
+"""
+Holding Schemas
+
+Pydantic schemas for holding responses.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class HoldingResponse(BaseModel):
+    """Holding as returned by the API."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    portfolio_id: int
+    symbol: str
+    name: Optional[str] = None
+    asset_type: str
+    quantity: Decimal
+    average_cost: Decimal
+    current_price: Optional[Decimal] = None
+    market_value: Optional[Decimal] = None
+    total_cost: Decimal
+    unrealized_gain_loss: Optional[Decimal] = None
+    unrealized_gain_loss_percent: Optional[Decimal] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,37 @@
+"""
+Optimization Schemas
+
+Pydantic schemas for mean-variance optimization results.
+"""
+
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class FrontierPoint(BaseModel):
+    """Annualized return and risk of one efficient portfolio."""
+
+    expected_return: float
+    volatility: float
+    sharpe_ratio: float
+
+
+class OptimizedPortfolio(FrontierPoint):
+    """Frontier point with its long-only weights."""
+
+    weights: Dict[str, float]
+
+
+class EfficientFrontier(BaseModel):
+    """Efficient frontier of a portfolio's symbols."""
+
+    portfolio_id: int
+    symbols: List[str]
+    excluded_symbols: List[str]  # Not enough price history
+    history_days: int
+    risk_free_rate: float
+    current: OptimizedPortfolio
+    min_variance: OptimizedPortfolio
+    max_sharpe: OptimizedPortfolio
+    frontier: List[FrontierPoint]  # By increasing volatility
@@ -0,0 +1,31 @@
+"""
+Portfolio Schemas
+
+Pydantic schemas for portfolio responses.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from portfolio_tracker.models.db.portfolio import RiskProfile
+
+
+class PortfolioResponse(BaseModel):
+    """Portfolio as returned by the API."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: int
+    name: str
+    description: Optional[str] = None
+    currency: str
+    risk_profile: RiskProfile
+    total_value: Decimal
+    total_cost: Decimal
+    total_gain_loss: Decimal
+    created_at: datetime
+    updated_at: datetime
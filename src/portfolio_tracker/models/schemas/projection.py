@@ -0,0 +1,33 @@
+"""
+Projection Schemas
+
+Pydantic schemas for Monte Carlo value projections.
+"""
+
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+
+class ProjectionPoint(BaseModel):
+    """Distribution of simulated values at the end of one year."""
+
+    year: int
+    mean: float
+    percentiles: Dict[str, float]  # "p5" ... "p95"
+
+
+class ProjectionResult(BaseModel):
+    """Simulated future values of a portfolio's current holdings."""
+
+    portfolio_id: int
+    method: str
+    paths: int
+    horizon_years: int
+    seed: int
+    initial_value: float
+    history_days: int
+    annual_return: float
+    annual_volatility: float
+    probability_of_loss: float
+    points: List[ProjectionPoint]
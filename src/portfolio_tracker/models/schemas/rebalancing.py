@@ -0,0 +1,31 @@
+"""
+Rebalancing Schemas
+
+Pydantic schemas for proposed rebalancing trades.
+"""
+
+from typing import Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+
+
+class ProposedTrade(BaseModel):
+    """One trade moving an asset type towards its target weight."""
+
+    asset_type: str
+    action: Literal["buy", "sell"]
+    symbol: Optional[str]  # None: no holding of this asset type to buy into
+    quantity: Optional[float]
+    value: float
+
+
+class RebalanceProposal(BaseModel):
+    """Trades bringing a portfolio back to its risk profile's allocation."""
+
+    portfolio_id: int
+    risk_profile: str
+    total_value: float
+    weights: Dict[str, float]
+    targets: Dict[str, float]
+    max_drift: float
+    trades: List[ProposedTrade]
@@ -0,0 +1,16 @@
+"""
+Search Schemas
+
+Pydantic schemas for search responses.
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SymbolSuggestion(BaseModel):
+    """Autocomplete suggestion for a symbol."""
+
+    symbol: str
+    name: Optional[str] = None
@@ -0,0 +1,60 @@
+"""
+Transaction Schemas
+
+Pydantic schemas for transaction requests and responses.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from portfolio_tracker.models.db.transaction import TransactionType
+
+
+class TransactionResponse(BaseModel):
+    """Transaction as returned by the API."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    portfolio_id: int
+    holding_id: int
+    transaction_type: TransactionType
+    transaction_date: date
+    symbol: str
+    quantity: Decimal
+    price: Decimal
+    commission: Decimal
+    fees: Decimal
+    total_amount: Decimal
+    notes: Optional[str] = None
+    currency: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class TransactionCreate(BaseModel):
+    """Transaction recorded through the API."""
+
+    transaction_type: TransactionType
+    transaction_date: date = Field(default_factory=date.today)
+    symbol: str = Field(..., min_length=1, max_length=20)
+    quantity: Decimal = Field(..., gt=0)
+    price: Decimal = Field(..., ge=0)
+    commission: Decimal = Field(default=Decimal("0"), ge=0)
+    fees: Decimal = Field(default=Decimal("0"), ge=0)
+    notes: Optional[str] = Field(default=None, max_length=1000)
+    currency: Optional[str] = Field(
+        default=None,
+        min_length=3,
+        max_length=3,
+        description="Defaults to the portfolio's",
+    )
+
+    @field_validator("symbol", "currency", mode="before")
+    @classmethod
+    def upper_case(cls, value: Any) -> Any:
+        """Normalize symbols and currency codes to upper case."""
+        return value.strip().upper() if isinstance(value, str) else value
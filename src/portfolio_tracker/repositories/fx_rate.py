@@ -0,0 +1,80 @@
+"""
+FX Rate Repository
+
+Data access for the ``fx_rates`` table.
+"""
+
+from datetime import date
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.fx_rate import FxRate
+
+# Rows per INSERT statement; keeps bind parameters well under asyncpg's limit
+UPSERT_CHUNK_SIZE = 5_000
+
+
+class FxRateRepository:
+    """Repository for exchange rates."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def bulk_upsert(self, rows: Sequence[Dict[str, Any]]) -> int:
+        """
+        Insert or update exchange rates in bulk.
+
+        Existing rows for the same pair and date are overwritten.
+
+        Args:
+            rows: Mappings with base_currency, quote_currency, date, rate, source
+
+        Returns:
+            int: Number of rows written
+        """
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            statement = insert(FxRate).values(
+                list(rows[start : start + UPSERT_CHUNK_SIZE])
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["base_currency", "quote_currency", "date"],
+                set_={
+                    "rate": statement.excluded.rate,
+                    "source": statement.excluded.source,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+            await self.session.execute(statement)
+        return len(rows)
+
+    async def get_rates(
+        self, currencies: Collection[str], end: Optional[date] = None
+    ) -> List[Tuple[str, str, date, Any]]:
+        """
+        Get every stored rate between the given currencies.
+
+        Args:
+            currencies: ISO 4217 codes; both sides of a pair must be included
+            end: Optional last date to load
+
+        Returns:
+            List of (base_currency, quote_currency, date, rate) ordered by date
+        """
+        query = select(
+            FxRate.base_currency, FxRate.quote_currency, FxRate.date, FxRate.rate
+        ).where(
+            FxRate.base_currency.in_(currencies),
+            FxRate.quote_currency.in_(currencies),
+        )
+        if end is not None:
+            query = query.where(FxRate.date <= end)
+        result = await self.session.execute(
+            query.order_by(FxRate.base_currency, FxRate.quote_currency, FxRate.date)
+        )
+        return [tuple(row) for row in result.all()]
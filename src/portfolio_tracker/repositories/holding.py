@@ -0,0 +1,187 @@
+"""
+Holding Repository
+
+Data access for the ``holdings`` table.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import (
+    DateTime,
+    Numeric,
+    Row,
+    String,
+    case,
+    column,
+    func,
+    or_,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.utils.helpers import contains_pattern
+from portfolio_tracker.utils.serialization import FieldSet, select_columns
+
+# Rows per price UPDATE (3 bind parameters each)
+PRICE_UPDATE_CHUNK_SIZE = 1000
+
+# Largest value of holdings.unrealized_gain_loss_percent (NUMERIC(5, 2))
+MAX_GAIN_LOSS_PERCENT = Decimal("999.99")
+
+
+class HoldingRepository:
+    """Repository for holdings."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def select_by_portfolio(
+        self, portfolio_id: int, fieldset: FieldSet
+    ) -> List[Row]:
+        """
+        Select only the ``fieldset`` columns of a portfolio's holdings.
+
+        Args:
+            portfolio_id: Portfolio ID
+            fieldset: Column names to load
+
+        Returns:
+            List[Row]: Rows ordered by symbol
+        """
+        result = await self.session.execute(
+            select(*select_columns(Holding, fieldset))
+            .where(Holding.portfolio_id == portfolio_id)
+            .order_by(Holding.symbol)
+        )
+        return list(result.all())
+
+    async def select_by_portfolios(
+        self, portfolio_ids: Sequence[int], fieldset: FieldSet
+    ) -> List[Row]:
+        """
+        Select the ``fieldset`` columns of the holdings of several portfolios.
+
+        Args:
+            portfolio_ids: Portfolio IDs
+            fieldset: Column names to load
+
+        Returns:
+            List[Row]: Rows ordered by portfolio ID and symbol
+        """
+        result = await self.session.execute(
+            select(*select_columns(Holding, fieldset))
+            .where(Holding.portfolio_id.in_(portfolio_ids))
+            .order_by(Holding.portfolio_id, Holding.symbol)
+        )
+        return list(result.all())
+
+    async def search(
+        self, user_id: int, term: str, fieldset: FieldSet, limit: int
+    ) -> List[Row]:
+        """
+        Select a user's holdings whose name or symbol contains ``term``.
+
+        Case-insensitive substring match, served by the ``pg_trgm`` GIN
+        index on ``name`` in PostgreSQL.
+
+        Args:
+            user_id: Owner user ID
+            term: Text to search for
+            fieldset: Column names to load
+            limit: Maximum rows to return
+
+        Returns:
+            List[Row]: Rows of the ``fieldset`` columns ordered by symbol
+        """
+        pattern = contains_pattern(term)
+        result = await self.session.execute(
+            select(*select_columns(Holding, fieldset))
+            .join(Portfolio, Portfolio.id == Holding.portfolio_id)
+            .where(
+                Portfolio.user_id == user_id,
+                or_(
+                    Holding.name.ilike(pattern, escape="\\"),
+                    Holding.symbol.ilike(pattern, escape="\\"),
+                ),
+            )
+            .order_by(Holding.symbol, Holding.portfolio_id)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def get_symbol_names(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Get every held symbol with one of its names.
+
+        Returns:
+            List of (symbol, name or None)
+        """
+        result = await self.session.execute(
+            select(Holding.symbol, func.max(Holding.name)).group_by(Holding.symbol)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def apply_prices(
+        self, prices: Sequence[Tuple[str, Decimal, datetime]]
+    ) -> Set[int]:
+        """
+        Revalue every holding of the given symbols.
+
+        One ``UPDATE holdings ... FROM (VALUES ...)`` per chunk sets
+        ``current_price``, ``market_value``, ``unrealized_gain_loss`` and
+        ``unrealized_gain_loss_percent`` (0 without cost basis, capped at
+        what the column holds); holdings already at the price are not
+        written. The VALUES list is a CTE, which Postgres inlines and
+        SQLite also accepts.
+
+        Args:
+            prices: (symbol, price, priced at) rows, one per symbol
+
+        Returns:
+            Set[int]: IDs of the portfolios whose holdings changed
+        """
+        holdings = Holding.__table__
+        affected: Set[int] = set()
+        for start in range(0, len(prices), PRICE_UPDATE_CHUNK_SIZE):
+            latest = (
+                values(
+                    column("symbol", String(20)),
+                    column("price", Numeric(precision=15, scale=2)),
+                    column("priced_at", DateTime),
+                    name="prices",
+                )
+                .data(list(prices[start : start + PRICE_UPDATE_CHUNK_SIZE]))
+                .cte("prices")
+            )
+            market_value = holdings.c.quantity * latest.c.price
+            gain_loss = market_value - holdings.c.total_cost
+            gain_loss_percent = gain_loss * 100 / holdings.c.total_cost
+            result = await self.session.execute(
+                update(holdings)
+                .where(holdings.c.symbol == latest.c.symbol)
+                .where(holdings.c.current_price.is_distinct_from(latest.c.price))
+                .values(
+                    current_price=latest.c.price,
+                    market_value=market_value,
+                    unrealized_gain_loss=gain_loss,
+                    unrealized_gain_loss_percent=case(
+                        (holdings.c.total_cost == 0, 0),
+                        (
+                            gain_loss_percent > MAX_GAIN_LOSS_PERCENT,
+                            MAX_GAIN_LOSS_PERCENT,
+                        ),
+                        else_=gain_loss_percent,
+                    ),
+                    updated_at=latest.c.priced_at,
+                )
+                .returning(holdings.c.portfolio_id)
+            )
+            affected.update(result.scalars())
+        return affected
@@ -0,0 +1,135 @@
+"""
+Idempotency Key Repository
+
+Data access for the ``idempotency_keys`` table.
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Tuple, cast
+
+from sqlalchemy import CursorResult, delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.idempotency_key import IdempotencyKey
+
+
+class IdempotencyKeyRepository:
+    """Repository for idempotency keys."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def get_state(
+        self, key: str
+    ) -> Optional[Tuple[str, Optional[int], Optional[str]]]:
+        """Get a key's request hash, status code and response body, or None."""
+        result = await self.session.execute(
+            select(
+                IdempotencyKey.request_hash,
+                IdempotencyKey.status_code,
+                IdempotencyKey.response_body,
+            ).where(IdempotencyKey.key == key)
+        )
+        return result.tuples().one_or_none()
+
+    async def claim(
+        self, key: str, request_hash: str, locked_until: datetime, now: datetime
+    ) -> bool:
+        """
+        Claim a key for a new request.
+
+        Inserts an in-flight record, or takes over one whose lock or
+        replay window has lapsed.
+
+        Args:
+            key: Scoped idempotency key
+            request_hash: Fingerprint of the request
+            locked_until: When the in-flight lock lapses
+            now: Current time
+
+        Returns:
+            bool: True if the caller now owns the key
+        """
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        result = await self.session.execute(
+            insert(IdempotencyKey)
+            .values(key=key, request_hash=request_hash, expires_at=locked_until)
+            .on_conflict_do_nothing(index_elements=["key"])
+            .returning(IdempotencyKey.id)
+        )
+        if result.scalar_one_or_none() is not None:
+            return True
+
+        result = await self.session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+            .values(
+                request_hash=request_hash,
+                status_code=None,
+                response_body=None,
+                expires_at=locked_until,
+                updated_at=now,
+            )
+            .returning(IdempotencyKey.id)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def complete(
+        self,
+        key: str,
+        request_hash: str,
+        status_code: int,
+        response_body: str,
+        expires_at: datetime,
+    ) -> None:
+        """Store the response of a claimed key until ``expires_at``."""
+        await self.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_hash == request_hash,
+                IdempotencyKey.status_code.is_(None),
+            )
+            .values(
+                status_code=status_code,
+                response_body=response_body,
+                expires_at=expires_at,
+            )
+        )
+
+    async def release(self, key: str, request_hash: str) -> None:
+        """Drop an in-flight claim so the request can be retried."""
+        await self.session.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_hash == request_hash,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+
+    async def extend(self, key: str, request_hash: str, expires_at: datetime) -> None:
+        """Keep an in-flight claim until ``expires_at``."""
+        await self.session.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.request_hash == request_hash,
+                IdempotencyKey.status_code.is_(None),
+            )
+            .values(expires_at=expires_at)
+        )
+
+    async def purge_expired(self, now: datetime) -> int:
+        """
+        Delete records whose lock or replay window has lapsed.
+
+        Returns:
+            int: Number of records deleted
+        """
+        result = await self.session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now)
+        )
+        return cast(CursorResult[Any], result).rowcount
@@ -0,0 +1,83 @@
+"""
+Instrument Repository
+
+Data access for the ``instruments`` table.
+"""
+
+from typing import Collection, Dict
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.instrument import Instrument
+
+
+class InstrumentRepository:
+    """Repository for instruments."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def get_ids(self, symbols: Collection[str]) -> Dict[str, int]:
+        """
+        Get the IDs of existing instruments.
+
+        Args:
+            symbols: Ticker symbols
+
+        Returns:
+            Dict of symbol -> instrument ID; unknown symbols are omitted
+        """
+        if not symbols:
+            return {}
+        result = await self.session.execute(
+            select(Instrument.symbol, Instrument.id).where(
+                Instrument.symbol.in_(list(symbols))
+            )
+        )
+        return {symbol: instrument_id for symbol, instrument_id in result.all()}
+
+    async def get_symbols(self, instrument_ids: Collection[int]) -> Dict[int, str]:
+        """
+        Get the symbols of instruments.
+
+        Args:
+            instrument_ids: Instrument IDs
+
+        Returns:
+            Dict of instrument ID -> symbol; unknown IDs are omitted
+        """
+        if not instrument_ids:
+            return {}
+        result = await self.session.execute(
+            select(Instrument.id, Instrument.symbol).where(
+                Instrument.id.in_(list(instrument_ids))
+            )
+        )
+        return {instrument_id: symbol for instrument_id, symbol in result.all()}
+
+    async def insert_missing(self, symbols: Collection[str]) -> Dict[str, int]:
+        """
+        Insert instruments that do not exist yet.
+
+        Symbols inserted concurrently by another transaction are skipped.
+
+        Args:
+            symbols: Ticker symbols
+
+        Returns:
+            Dict of symbol -> ID of the instruments inserted by this call
+        """
+        if not symbols:
+            return {}
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        result = await self.session.execute(
+            insert(Instrument)
+            .values([{"symbol": symbol} for symbol in symbols])
+            .on_conflict_do_nothing(index_elements=["symbol"])
+            .returning(Instrument.symbol, Instrument.id)
+        )
+        return {symbol: instrument_id for symbol, instrument_id in result.all()}
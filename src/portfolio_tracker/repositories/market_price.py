@@ -0,0 +1,164 @@
+"""
+Market Price Repository
+
+Data access for the ``market_prices`` table. Close histories are returned
+as NumPy column arrays and served from the columnar price store when it
+is enabled. Rows are keyed by instrument ID; symbols are translated at
+the edges through the process-wide symbol map.
+"""
+
+from datetime import date, datetime
+from typing import Collection, Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.instrument import Instrument
+from portfolio_tracker.models.db.market_price import MarketPrice
+from portfolio_tracker.models.db.transaction import Transaction
+from portfolio_tracker.services.instruments import InstrumentService
+from portfolio_tracker.services.price_store import get_price_store
+
+CloseHistory = Tuple[np.ndarray, np.ndarray]
+
+
+class MarketPriceRepository:
+    """Repository for market prices."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def get_close_history(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> CloseHistory:
+        """
+        Get a symbol's daily closes.
+
+        Args:
+            symbol: Ticker symbol
+            start: Optional first date (inclusive)
+            end: Optional last date (inclusive)
+
+        Returns:
+            Tuple of (``datetime64[D]`` dates, ``float64`` closes), ascending
+        """
+        histories = await self.get_close_histories([symbol], start, end)
+        return histories.get(symbol, _empty_history())
+
+    async def get_close_histories(
+        self,
+        symbols: Collection[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, CloseHistory]:
+        """
+        Get daily closes for many symbols.
+
+        Symbols found in the price store are sliced from memory-mapped
+        arrays; the rest are read with a single query.
+
+        Args:
+            symbols: Ticker symbols
+            start: Optional first date (inclusive)
+            end: Optional last date (inclusive)
+
+        Returns:
+            Dict of symbol -> (dates, closes); symbols without prices are omitted
+        """
+        histories: Dict[str, CloseHistory] = {}
+        missing = list(symbols)
+
+        store = get_price_store()
+        if store is not None:
+            missing = []
+            for symbol in symbols:
+                series = store.get_series(symbol, start, end)
+                if series is None:
+                    missing.append(symbol)
+                else:
+                    histories[symbol] = (series.dates, series.closes)
+
+        if not missing:
+            return histories
+
+        ids = await InstrumentService(self.session).get_ids(missing)
+        if not ids:
+            return histories
+        symbols_by_id = {instrument_id: symbol for symbol, instrument_id in ids.items()}
+
+        query = select(
+            MarketPrice.instrument_id, MarketPrice.date, MarketPrice.close
+        ).where(MarketPrice.instrument_id.in_(list(symbols_by_id)))
+        if start is not None:
+            query = query.where(MarketPrice.date >= start)
+        if end is not None:
+            query = query.where(MarketPrice.date <= end)
+        result = await self.session.execute(
+            query.order_by(MarketPrice.instrument_id, MarketPrice.date)
+        )
+        rows = result.all()
+        if not rows:
+            return histories
+
+        row_ids, dates, closes = zip(*rows)
+        id_array = np.asarray(row_ids, dtype=np.int64)
+        date_array = np.asarray(dates, dtype="datetime64[D]")
+        close_array = np.asarray(closes, dtype=np.float64)
+
+        # Rows are ordered by instrument, so each one is a contiguous block
+        boundaries = np.flatnonzero(id_array[1:] != id_array[:-1]) + 1
+        starts = np.concatenate(([0], boundaries))
+        ends = np.concatenate((boundaries, [len(rows)]))
+        for lo, hi in zip(starts, ends):
+            symbol = symbols_by_id[int(id_array[lo])]
+            histories[symbol] = (date_array[lo:hi], close_array[lo:hi])
+        return histories
+
+    async def get_price_version(
+        self, portfolio_id: int, symbols: Collection[str] = ()
+    ) -> Optional[datetime]:
+        """
+        Get the latest price write for a portfolio's symbols.
+
+        Complements :meth:`PortfolioRepository.get_version` for responses
+        computed from closes: a new or corrected close of any symbol the
+        portfolio holds or traded, or of ``symbols``, changes the value.
+
+        Args:
+            portfolio_id: Portfolio ID
+            symbols: Extra symbols the response depends on (e.g. benchmarks)
+
+        Returns:
+            Optional[datetime]: Latest ``updated_at``, or None without prices
+        """
+        portfolio_symbols = (
+            select(Holding.symbol)
+            .where(Holding.portfolio_id == portfolio_id)
+            .union(
+                select(Transaction.symbol).where(
+                    Transaction.portfolio_id == portfolio_id
+                )
+            )
+        )
+        latest: Optional[datetime] = await self.session.scalar(
+            select(func.max(MarketPrice.updated_at))
+            .join(Instrument, Instrument.id == MarketPrice.instrument_id)
+            .where(
+                or_(
+                    Instrument.symbol.in_(portfolio_symbols),
+                    Instrument.symbol.in_(list(symbols)),
+                )
+            )
+        )
+        return latest
+
+
+def _empty_history() -> CloseHistory:
+    """Empty (dates, closes) pair."""
+    return np.empty(0, dtype="datetime64[D]"), np.empty(0, dtype=np.float64)
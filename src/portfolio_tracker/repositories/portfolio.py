@@ -0,0 +1,202 @@
+"""
+Portfolio Repository
+
+Data access for the ``portfolios`` table.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple, cast
+
+from sqlalchemy import CursorResult, Row, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.models.db.transaction import Transaction
+from portfolio_tracker.utils.serialization import FieldSet, select_columns
+
+
+class PortfolioRepository:
+    """Repository for portfolios."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def get_for_user(
+        self, portfolio_id: int, user_id: int
+    ) -> Optional[Portfolio]:
+        """
+        Get a portfolio owned by a user.
+
+        Args:
+            portfolio_id: Portfolio ID
+            user_id: Owner user ID
+
+        Returns:
+            Optional[Portfolio]: Portfolio, or None if missing or not owned
+        """
+        result = await self.session.execute(
+            select(Portfolio).where(
+                Portfolio.id == portfolio_id, Portfolio.user_id == user_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def select_for_user(self, user_id: int, fieldset: FieldSet) -> List[Row]:
+        """
+        Select only the ``fieldset`` columns of a user's portfolios.
+
+        Args:
+            user_id: Owner user ID
+            fieldset: Column names to load
+
+        Returns:
+            List[Row]: Rows ordered by portfolio ID
+        """
+        result = await self.session.execute(
+            select(*select_columns(Portfolio, fieldset))
+            .where(Portfolio.user_id == user_id)
+            .order_by(Portfolio.id)
+        )
+        return list(result.all())
+
+    async def get_version(
+        self, portfolio_id: int, user_id: int
+    ) -> Optional[Tuple[Any, ...]]:
+        """
+        Get version components of a portfolio and its holdings/transactions.
+
+        One indexed query returning the portfolio's ``updated_at``, the
+        latest holding ``updated_at``, the holding count (to catch deletes)
+        and the last transaction ID. Any write that changes what the
+        portfolio, holding or analytics endpoints return changes this tuple.
+
+        Args:
+            portfolio_id: Portfolio ID
+            user_id: Owner user ID
+
+        Returns:
+            Optional[Tuple]: Version components, or None if not found/owned
+        """
+        result = await self.session.execute(
+            select(
+                Portfolio.updated_at,
+                select(func.max(Holding.updated_at))
+                .where(Holding.portfolio_id == Portfolio.id)
+                .scalar_subquery(),
+                select(func.count(Holding.id))
+                .where(Holding.portfolio_id == Portfolio.id)
+                .scalar_subquery(),
+                select(func.max(Transaction.id))
+                .where(Transaction.portfolio_id == Portfolio.id)
+                .scalar_subquery(),
+            ).where(Portfolio.id == portfolio_id, Portfolio.user_id == user_id)
+        )
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
+    async def get_list_version(self, user_id: int) -> Tuple[Any, ...]:
+        """
+        Get version components of a user's portfolio list.
+
+        Args:
+            user_id: Owner user ID
+
+        Returns:
+            Tuple: (latest updated_at, portfolio count)
+        """
+        result = await self.session.execute(
+            select(func.max(Portfolio.updated_at), func.count(Portfolio.id)).where(
+                Portfolio.user_id == user_id
+            )
+        )
+        return tuple(result.one())
+
+    async def get_user_version(self, user_id: int) -> Tuple[Any, ...]:
+        """
+        Get version components of all of a user's portfolios and holdings.
+
+        The user-wide counterpart of :meth:`get_version`: the list version
+        followed by the latest holding ``updated_at``, the holding count and
+        the last transaction ID across the user's portfolios, in one query.
+
+        Args:
+            user_id: Owner user ID
+
+        Returns:
+            Tuple: Version components
+        """
+        owner = aliased(Portfolio)
+        owned = select(owner.id).where(owner.user_id == user_id)
+        result = await self.session.execute(
+            select(
+                func.max(Portfolio.updated_at),
+                func.count(Portfolio.id),
+                select(func.max(Holding.updated_at))
+                .where(Holding.portfolio_id.in_(owned))
+                .scalar_subquery(),
+                select(func.count(Holding.id))
+                .where(Holding.portfolio_id.in_(owned))
+                .scalar_subquery(),
+                select(func.max(Transaction.id))
+                .where(Transaction.portfolio_id.in_(owned))
+                .scalar_subquery(),
+            ).where(Portfolio.user_id == user_id)
+        )
+        return tuple(result.one())
+
+    async def recompute_totals(
+        self, portfolio_ids: Optional[Sequence[int]] = None
+    ) -> int:
+        """
+        Recompute the cached totals of portfolios from their holdings.
+
+        A single ``UPDATE portfolios ... FROM (SELECT ... GROUP BY)``:
+        ``total_value`` is the sum of holding market values (unpriced
+        holdings count as 0), ``total_cost`` the sum of holding costs.
+        Portfolios without holdings are reset to 0 and rows whose totals
+        did not change are not written.
+
+        Args:
+            portfolio_ids: Portfolios to recompute, or None for all
+
+        Returns:
+            int: Number of portfolios whose totals changed
+        """
+        if portfolio_ids is not None and not portfolio_ids:
+            return 0
+
+        target = aliased(Portfolio)
+        query = (
+            select(
+                target.id.label("portfolio_id"),
+                func.coalesce(func.sum(Holding.market_value), 0).label("total_value"),
+                func.coalesce(func.sum(Holding.total_cost), 0).label("total_cost"),
+            )
+            .outerjoin(Holding, Holding.portfolio_id == target.id)
+            .group_by(target.id)
+        )
+        if portfolio_ids is not None:
+            query = query.where(target.id.in_(list(portfolio_ids)))
+        totals = query.subquery("totals")
+        gain_loss = totals.c.total_value - totals.c.total_cost
+
+        result = await self.session.execute(
+            update(Portfolio)
+            .where(Portfolio.id == totals.c.portfolio_id)
+            .where(
+                or_(
+                    Portfolio.total_value.is_distinct_from(totals.c.total_value),
+                    Portfolio.total_cost.is_distinct_from(totals.c.total_cost),
+                    Portfolio.total_gain_loss.is_distinct_from(gain_loss),
+                )
+            )
+            .values(
+                total_value=totals.c.total_value,
+                total_cost=totals.c.total_cost,
+                total_gain_loss=gain_loss,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return cast(CursorResult[Any], result).rowcount
@@ -0,0 +1,94 @@
+"""
+Transaction Repository
+
+Data access for the ``transactions`` table.
+"""
+
+from typing import List
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.models.db.transaction import Transaction
+from portfolio_tracker.utils.helpers import contains_pattern
+from portfolio_tracker.utils.serialization import FieldSet, select_columns
+
+
+class TransactionRepository:
+    """Repository for transactions."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize repository with a database session."""
+        self.session = session
+
+    async def count_by_portfolio(self, portfolio_id: int) -> int:
+        """
+        Count a portfolio's transactions.
+
+        Args:
+            portfolio_id: Portfolio ID
+
+        Returns:
+            int: Number of transactions
+        """
+        result = await self.session.execute(
+            select(func.count(Transaction.id)).where(
+                Transaction.portfolio_id == portfolio_id
+            )
+        )
+        return int(result.scalar_one())
+
+    async def select_by_portfolio(
+        self, portfolio_id: int, fieldset: FieldSet, offset: int, limit: int
+    ) -> List[Row]:
+        """
+        Select a page of a portfolio's transactions, newest first.
+
+        Args:
+            portfolio_id: Portfolio ID
+            fieldset: Column names to load
+            offset: Rows to skip
+            limit: Maximum rows to return
+
+        Returns:
+            List[Row]: Rows of the ``fieldset`` columns
+        """
+        result = await self.session.execute(
+            select(*select_columns(Transaction, fieldset))
+            .where(Transaction.portfolio_id == portfolio_id)
+            .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        return list(result.all())
+
+    async def search_notes(
+        self, user_id: int, term: str, fieldset: FieldSet, limit: int
+    ) -> List[Row]:
+        """
+        Select a user's transactions whose notes contain ``term``.
+
+        Case-insensitive substring match, served by the ``pg_trgm`` GIN
+        index on ``notes`` in PostgreSQL.
+
+        Args:
+            user_id: Owner user ID
+            term: Text to search for
+            fieldset: Column names to load
+            limit: Maximum rows to return
+
+        Returns:
+            List[Row]: Rows of the ``fieldset`` columns, newest first
+        """
+        result = await self.session.execute(
+            select(*select_columns(Transaction, fieldset))
+            .join(Portfolio, Portfolio.id == Transaction.portfolio_id)
+            .where(
+                Portfolio.user_id == user_id,
+                Transaction.notes.ilike(contains_pattern(term), escape="\\"),
+            )
+            .order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+            .limit(limit)
+        )
+        return list(result.all())
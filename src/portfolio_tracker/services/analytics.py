@@ -0,0 +1,266 @@
+"""
+Analytics Service
+
+Portfolio performance and allocation metrics.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple, cast
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.models.db.transaction import Transaction, TransactionType
+from portfolio_tracker.models.schemas.analytics import AssetAllocation, PortfolioSummary
+from portfolio_tracker.repositories.market_price import CloseHistory
+from portfolio_tracker.services.price_index import PriceIndexService
+
+CENT = Decimal("0.01")
+BASIS_POINT = Decimal("0.0001")
+
+# Effect of each transaction type on the position quantity
+QUANTITY_SIGN = {
+    TransactionType.BUY: 1.0,
+    TransactionType.TRANSFER_IN: 1.0,
+    TransactionType.SPLIT: 1.0,
+    TransactionType.SELL: -1.0,
+    TransactionType.TRANSFER_OUT: -1.0,
+    TransactionType.DIVIDEND: 0.0,
+}
+
+
+class AnalyticsService:
+    """Service for portfolio analytics."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def get_portfolio_summary(self, portfolio: Portfolio) -> PortfolioSummary:
+        """
+        Summarize a portfolio's value, cost and allocation.
+
+        Aggregates holdings by asset type in the database, so only one row
+        per asset type is transferred.
+
+        Args:
+            portfolio: Portfolio to summarize
+
+        Returns:
+            PortfolioSummary: Aggregated metrics
+        """
+        result = await self.session.execute(
+            select(
+                Holding.asset_type,
+                func.count(Holding.id),
+                func.coalesce(func.sum(Holding.market_value), 0),
+                func.coalesce(func.sum(Holding.total_cost), 0),
+            )
+            .where(Holding.portfolio_id == portfolio.id)
+            .group_by(Holding.asset_type)
+            .order_by(Holding.asset_type)
+        )
+        groups = [
+            (asset_type, count, Decimal(value), Decimal(cost))
+            for asset_type, count, value, cost in result.all()
+        ]
+
+        total_value = sum((value for _, _, value, _ in groups), Decimal("0"))
+        total_cost = sum((cost for _, _, _, cost in groups), Decimal("0"))
+        gain_loss = total_value - total_cost
+
+        return PortfolioSummary(
+            portfolio_id=cast(int, portfolio.id),
+            currency=cast(str, portfolio.currency),
+            holdings_count=sum(count for _, count, _, _ in groups),
+            total_value=total_value.quantize(CENT),
+            total_cost=total_cost.quantize(CENT),
+            total_gain_loss=gain_loss.quantize(CENT),
+            total_gain_loss_percent=(
+                (gain_loss / total_cost * 100).quantize(CENT)
+                if total_cost
+                else Decimal("0.00")
+            ),
+            allocation=[
+                AssetAllocation(
+                    asset_type=asset_type,
+                    market_value=value.quantize(CENT),
+                    weight=(
+                        (value / total_value).quantize(BASIS_POINT)
+                        if total_value
+                        else Decimal("0")
+                    ),
+                )
+                for asset_type, _, value, _ in groups
+            ],
+        )
+
+    async def get_value_history(
+        self, portfolio_id: int, start: date, end: date
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a portfolio's daily market value between two dates.
+
+        Positions are rebuilt from transactions as cumulative quantities
+        per symbol (current holdings are used when there are no
+        transactions). Prices are the last close on or before each date
+        from the as-of price index. Both lookups are binary searches over
+        whole date arrays, so no per-date queries are issued.
+
+        Args:
+            portfolio_id: Portfolio ID
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Tuple of (``datetime64[D]`` trading dates, ``float64`` values)
+        """
+        axis, quantities, prices = await self._load_position_matrix(
+            portfolio_id, start, end
+        )
+        return axis, (quantities * prices).sum(axis=1)
+
+    async def get_return_history(
+        self, portfolio_id: int, start: date, end: date
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a portfolio's daily time-weighted returns between two dates.
+
+        Each day's return is that of the positions held at the previous
+        close, so buys, sells and transfers do not count as performance.
+        Symbols without a price on the previous date are left out of that
+        day's return.
+
+        Args:
+            portfolio_id: Portfolio ID
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            Tuple of (``datetime64[D]`` trading dates, ``float64`` returns);
+            the first date's return is 0
+        """
+        axis, quantities, prices = await self._load_position_matrix(
+            portfolio_id, start, end
+        )
+        held = quantities[:-1] * (prices[:-1] > 0)
+        before = (held * prices[:-1]).sum(axis=1)
+        after = (held * prices[1:]).sum(axis=1)
+
+        returns = np.zeros(axis.shape, dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns[1:] = np.where(before > 0, after / before - 1.0, 0.0)
+        return axis, returns
+
+    async def _load_position_matrix(
+        self, portfolio_id: int, start: date, end: date
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get daily quantities and prices of every priced symbol.
+
+        Returns:
+            Tuple of (trading dates, ``(dates, symbols)`` quantities,
+            ``(dates, symbols)`` forward-filled prices, 0 before the first)
+        """
+        positions = await self._load_positions(portfolio_id)
+        price_index = PriceIndexService(self.session)
+        histories = await price_index.histories(list(positions), end=end)
+
+        lo, hi = np.datetime64(start, "D"), np.datetime64(end, "D")
+        in_range = [
+            dates[(dates >= lo) & (dates <= hi)] for dates, _ in histories.values()
+        ]
+        axis = (
+            np.unique(np.concatenate(in_range))
+            if in_range
+            else np.empty(0, dtype="datetime64[D]")
+        )
+
+        symbols = [symbol for symbol in positions if symbol in histories]
+        quantities = np.zeros((len(axis), len(symbols)), dtype=np.float64)
+        for column, symbol in enumerate(symbols):
+            quantities[:, column] = _as_of(*positions[symbol], axis)
+        prices = np.nan_to_num(price_index.index.closes_as_of(symbols, axis))
+        return axis, quantities, prices
+
+    async def _load_positions(
+        self, portfolio_id: int
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Get cumulative quantity step series per symbol."""
+        result = await self.session.execute(
+            select(
+                Transaction.symbol,
+                Transaction.transaction_date,
+                Transaction.transaction_type,
+                Transaction.quantity,
+            )
+            .where(Transaction.portfolio_id == portfolio_id)
+            .order_by(Transaction.symbol, Transaction.transaction_date)
+        )
+        rows = result.all()
+
+        if not rows:
+            holdings = await self.session.execute(
+                select(Holding.symbol, Holding.quantity).where(
+                    Holding.portfolio_id == portfolio_id
+                )
+            )
+            epoch = np.array(["1970-01-01"], dtype="datetime64[D]")
+            return {
+                symbol: (epoch, np.array([float(quantity)]))
+                for symbol, quantity in holdings.all()
+            }
+
+        grouped: Dict[str, List[Tuple[date, float]]] = defaultdict(list)
+        for symbol, on_date, transaction_type, quantity in rows:
+            grouped[symbol].append(
+                (on_date, QUANTITY_SIGN[transaction_type] * float(quantity))
+            )
+
+        return {
+            symbol: (
+                np.array([d for d, _ in changes], dtype="datetime64[D]"),
+                np.cumsum([q for _, q in changes]),
+            )
+            for symbol, changes in grouped.items()
+        }
+
+
+def _as_of(dates: np.ndarray, values: np.ndarray, axis: np.ndarray) -> np.ndarray:
+    """Last value on or before each axis date; 0 before the first date."""
+    positions = np.searchsorted(dates, axis, side="right") - 1
+    return np.where(positions >= 0, values[np.maximum(positions, 0)], 0.0)
+
+
+def align_closes(
+    histories: Dict[str, CloseHistory], symbols: Sequence[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forward-fill closes of several symbols onto a common date axis.
+
+    The axis is the union of their trading dates, starting from the first
+    date on which every symbol has a price.
+
+    Args:
+        histories: Symbol -> (dates, closes), each with at least one price
+        symbols: Symbols to align, in column order
+
+    Returns:
+        Tuple of (``datetime64[D]`` axis, ``(dates, symbols)`` closes)
+    """
+    if not symbols:
+        return np.empty(0, dtype="datetime64[D]"), np.empty((0, 0))
+    first = max(histories[symbol][0][0] for symbol in symbols)
+    axis = np.unique(np.concatenate([histories[symbol][0] for symbol in symbols]))
+    axis = axis[axis >= first]
+
+    closes = np.empty((len(axis), len(symbols)))
+    for column, symbol in enumerate(symbols):
+        dates, prices = histories[symbol]
+        closes[:, column] = prices[np.searchsorted(dates, axis, side="right") - 1]
+    return axis, closes
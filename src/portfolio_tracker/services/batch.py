@@ -0,0 +1,331 @@
+"""
+Batch Execution
+
+Runs the sub-requests of a ``/api/v1/batch`` call in-process through the
+application's own ASGI stack, so routing, validation and error handling
+are exactly those of the individual endpoints, without the per-request
+HTTP, authentication and connection checkout overhead.
+
+All sub-requests share one :class:`BatchSession`. Runs of consecutive
+reads (GET/HEAD) execute concurrently; every awaited session call is
+serialized on the single connection and identical SELECTs are answered
+from a batch-local result cache. Writes run one at a time in their own savepoint
+and clear that cache.
+"""
+
+import asyncio
+import base64
+import functools
+import inspect
+import json
+from typing import Any, Dict, List, Literal, Optional, Tuple
+from urllib.parse import urlencode
+
+from sqlalchemy import Select
+from sqlalchemy.engine import FrozenResult, Result
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from starlette.types import ASGIApp, Message, Scope
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.schemas.batch import BatchOperation, BatchOperationResult
+from portfolio_tracker.utils.helpers import generate_error_response
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Scope state keys read by the API dependencies
+BATCH_SESSION_KEY = "batch_session"
+BATCH_USER_KEY = "batch_user"
+
+
+class BatchSession:
+    """
+    Session shared by the sub-requests of one batch.
+
+    Wraps an :class:`AsyncSession`, which does not allow concurrent
+    operations: every awaited method (``execute``, ``get``, ``refresh``,
+    ``run_sync``, ...) holds a lock, and ``stream`` is buffered under it
+    instead of keeping a cursor open. SELECT results are cached until the
+    next write, and ``commit`` only flushes because the batch endpoint owns
+    the transaction. Other attributes are delegated to the wrapped session;
+    ``awaitable_attrs`` loads bypass the lock, so endpoints load relations
+    with explicit statements.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Wrap ``session`` for the duration of a batch."""
+        self._session = session
+        self._lock = asyncio.Lock()
+        self._results: Dict[Tuple[str, str], FrozenResult] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped session, locking coroutines."""
+        attribute = getattr(self._session, name)
+        if not inspect.iscoroutinefunction(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def locked(*args: Any, **kwargs: Any) -> Any:
+            async with self._lock:
+                return await attribute(*args, **kwargs)
+
+        return locked
+
+    async def execute(
+        self, statement: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Result:
+        """Execute a statement, reusing cached SELECT results."""
+        key = self._cache_key(statement, params) if not kwargs else None
+        async with self._lock:
+            if key is not None and key in self._results:
+                return self._results[key]()
+            result = await self._session.execute(statement, params, **kwargs)
+            if key is None:
+                return result
+            frozen = result.freeze()
+            self._results[key] = frozen
+            return frozen()
+
+    async def scalar(
+        self, statement: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Execute a statement and return the first column of the first row."""
+        return (await self.execute(statement, params, **kwargs)).scalar()
+
+    async def scalars(
+        self, statement: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Execute a statement and return scalar results."""
+        return (await self.execute(statement, params, **kwargs)).scalars()
+
+    async def stream(
+        self, statement: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> AsyncResult:
+        """Execute a statement and return its rows, fully fetched, as a stream."""
+        result = await self.execute(statement, params, **kwargs)
+        return AsyncResult(result.freeze()())
+
+    async def stream_scalars(
+        self, statement: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        """Execute a statement and return scalar results as a stream."""
+        return (await self.stream(statement, params, **kwargs)).scalars()
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        """Get an instance by primary key."""
+        async with self._lock:
+            return await self._session.get(*args, **kwargs)
+
+    async def flush(self, *args: Any, **kwargs: Any) -> None:
+        """Flush pending changes."""
+        async with self._lock:
+            await self._session.flush(*args, **kwargs)
+
+    async def commit(self) -> None:
+        """Flush only; the batch endpoint commits once at the end."""
+        await self.flush()
+
+    def invalidate(self) -> None:
+        """Drop cached SELECT results."""
+        self._results.clear()
+
+    def _cache_key(
+        self, statement: Any, params: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[str, str]]:
+        """Key a SELECT by its compiled SQL and bound parameters."""
+        if not isinstance(statement, Select):
+            return None
+        compiled = statement.compile(dialect=self._session.bind.dialect)
+        bound = {**compiled.params, **(params or {})}
+        return compiled.string, repr(sorted(bound.items()))
+
+
+class BatchExecutor:
+    """Executes batch operations against the ASGI application."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        session: BatchSession,
+        user: Dict[str, Any],
+        parent_scope: Scope,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize executor.
+
+        Args:
+            app: ASGI application to dispatch to
+            session: Shared batch session
+            user: Authenticated user of the batch request
+            parent_scope: Scope of the batch request
+            concurrency: Maximum concurrent reads (defaults to settings)
+        """
+        self.app = app
+        self.session = session
+        self.user = user
+        self.parent_scope = parent_scope
+        self.concurrency = concurrency or settings.BATCH_READ_CONCURRENCY
+        self._batch_path = f"{settings.API_V1_PREFIX}/batch"
+
+    async def run(self, operations: List[BatchOperation]) -> List[BatchOperationResult]:
+        """
+        Run operations, preserving their order in the results.
+
+        Consecutive reads form a group that runs concurrently; each write
+        waits for everything before it and runs alone.
+
+        Args:
+            operations: Sub-requests in client order
+
+        Returns:
+            List[BatchOperationResult]: One result per operation
+        """
+        results: List[Optional[BatchOperationResult]] = [None] * len(operations)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        reads: List[int] = []
+
+        async def run_read(index: int) -> None:
+            async with semaphore:
+                results[index] = await self._dispatch(operations[index])
+
+        async def flush_reads() -> None:
+            await asyncio.gather(*(run_read(index) for index in reads))
+            reads.clear()
+
+        for index, operation in enumerate(operations):
+            if operation.method in READ_METHODS:
+                reads.append(index)
+                continue
+            await flush_reads()
+            results[index] = await self._run_write(operation)
+        await flush_reads()
+
+        return [result for result in results if result is not None]
+
+    async def _run_write(self, operation: BatchOperation) -> BatchOperationResult:
+        """Run a write in a savepoint, rolled back if it fails."""
+        self.session.invalidate()
+        savepoint = await self.session.begin_nested()
+        result = await self._dispatch(operation)
+        if result.status >= 400:
+            await savepoint.rollback()
+        else:
+            await savepoint.commit()
+        self.session.invalidate()
+        return result
+
+    async def _dispatch(self, operation: BatchOperation) -> BatchOperationResult:
+        """Send one operation through the ASGI app and capture the response."""
+        error = self._check_path(operation.path)
+        if error is not None:
+            return BatchOperationResult(
+                id=operation.id,
+                status=400,
+                body=generate_error_response(code="INVALID_BATCH_PATH", message=error),
+            )
+
+        body = b"" if operation.body is None else json.dumps(operation.body).encode()
+        scope = self._build_scope(operation, body)
+        request_sent = False
+        start: Dict[str, Any] = {}
+        chunks: List[bytes] = []
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if request_sent:
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        except Exception:
+            # The error middleware has already sent a 500 if it could
+            logger.exception(
+                "Batch operation failed: %s %s", operation.method, operation.path
+            )
+            if not start:
+                start = {"status": 500, "headers": []}
+
+        return self._build_result(operation, start, b"".join(chunks))
+
+    def _check_path(self, path: str) -> Optional[str]:
+        """Validate a sub-request path; returns an error message or None."""
+        if not path.startswith(f"{settings.API_V1_PREFIX}/"):
+            return f"Path must start with {settings.API_V1_PREFIX}/"
+        if path.rstrip("/") == self._batch_path:
+            return "Batch requests cannot be nested"
+        return None
+
+    def _build_scope(self, operation: BatchOperation, body: bytes) -> Scope:
+        """Build the ASGI scope of a sub-request."""
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in self.parent_scope.get("headers", [])
+            if key.lower() == b"authorization"
+        }
+        headers.update({key.lower(): value for key, value in operation.headers.items()})
+        if body:
+            headers.setdefault("content-type", "application/json")
+            headers["content-length"] = str(len(body))
+
+        state = dict(self.parent_scope.get("state") or {})
+        state[BATCH_SESSION_KEY] = self.session
+        state[BATCH_USER_KEY] = self.user
+
+        return {
+            "type": "http",
+            "asgi": self.parent_scope.get("asgi", {"version": "3.0"}),
+            "http_version": self.parent_scope.get("http_version", "1.1"),
+            "method": operation.method,
+            "scheme": self.parent_scope.get("scheme", "http"),
+            "server": self.parent_scope.get("server"),
+            "client": self.parent_scope.get("client"),
+            "root_path": self.parent_scope.get("root_path", ""),
+            "path": operation.path,
+            "raw_path": operation.path.encode(),
+            "query_string": urlencode(operation.query, doseq=True).encode(),
+            "headers": [
+                (key.encode("latin-1"), value.encode("latin-1"))
+                for key, value in headers.items()
+            ],
+            "state": state,
+        }
+
+    @staticmethod
+    def _build_result(
+        operation: BatchOperation, start: Dict[str, Any], payload: bytes
+    ) -> BatchOperationResult:
+        """Decode a captured response into a batch result."""
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in start.get("headers", [])
+            if key.lower() != b"content-length"
+        }
+        content_type = headers.get("content-type", "")
+
+        body: Any = None
+        encoding: Optional[Literal["base64"]] = None
+        if payload and content_type.startswith("application/json"):
+            body = json.loads(payload)
+        elif payload:
+            body = base64.b64encode(payload).decode("ascii")
+            encoding = "base64"
+
+        return BatchOperationResult(
+            id=operation.id,
+            status=start["status"],
+            headers=headers,
+            body=body,
+            encoding=encoding,
+        )
@@ -0,0 +1,138 @@
+"""
+Benchmark Service
+
+Portfolio performance compared with benchmark symbols.
+
+The portfolio's daily time-weighted returns define the date axis. Each
+benchmark's closes are joined onto that axis with one batched lookup in
+the as-of price index (the last close on or before each date), so
+differing trading calendars need no per-date queries.
+"""
+
+import math
+from datetime import date
+from typing import List, Sequence
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.schemas.analytics import (
+    BenchmarkComparison,
+    BenchmarkStats,
+)
+from portfolio_tracker.services.analytics import AnalyticsService
+from portfolio_tracker.services.price_index import PriceIndexService
+from portfolio_tracker.utils.exceptions import (
+    BusinessLogicException,
+    ValidationException,
+)
+
+TRADING_DAYS = 252
+MAX_BENCHMARKS = 10
+
+
+def benchmark_stats(
+    symbol: str, portfolio: np.ndarray, benchmark: np.ndarray
+) -> BenchmarkStats:
+    """Relative performance from aligned daily returns."""
+    active = portfolio - benchmark
+    tracking_error = float(active.std(ddof=1) * math.sqrt(TRADING_DAYS))
+    variance = float(benchmark.var(ddof=1))
+    spread = float(portfolio.std(ddof=1)) * math.sqrt(variance)
+    covariance = float(np.cov(portfolio, benchmark)[0, 1])
+    total = float(np.prod(1 + benchmark) - 1)
+    return BenchmarkStats(
+        symbol=symbol,
+        total_return=round(total, 6),
+        excess_return=round(float(np.prod(1 + portfolio) - 1) - total, 6),
+        tracking_error=round(tracking_error, 6),
+        information_ratio=(
+            round(float(active.mean()) * TRADING_DAYS / tracking_error, 4)
+            if tracking_error > 0
+            else None
+        ),
+        beta=round(covariance / variance, 4) if variance > 0 else None,
+        correlation=round(covariance / spread, 4) if spread > 0 else None,
+    )
+
+
+class BenchmarkService:
+    """Service comparing portfolios with benchmarks."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def compare(
+        self, portfolio_id: int, symbols: Sequence[str], start: date, end: date
+    ) -> BenchmarkComparison:
+        """
+        Compare a portfolio's returns with benchmarks between two dates.
+
+        The window starts on the first portfolio date on which every
+        benchmark has a close.
+
+        Args:
+            portfolio_id: Portfolio ID
+            symbols: Benchmark symbols
+            start: First date (inclusive)
+            end: Last date (inclusive)
+
+        Returns:
+            BenchmarkComparison: Per-benchmark statistics and cumulative
+            return series
+
+        Raises:
+            ValidationException: If a benchmark is unknown or too many are given
+            BusinessLogicException: If the portfolio has no priced history
+        """
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not symbols or len(symbols) > MAX_BENCHMARKS:
+            raise ValidationException(
+                f"Between 1 and {MAX_BENCHMARKS} benchmarks are supported",
+                field="symbol",
+            )
+
+        axis, returns = await AnalyticsService(self.session).get_return_history(
+            portfolio_id, start, end
+        )
+        index = await PriceIndexService(self.session).ensure(symbols)
+        unknown = [symbol for symbol in symbols if index.history(symbol) is None]
+        if unknown:
+            raise ValidationException(
+                f"No prices for benchmark {', '.join(unknown)}",
+                field="symbol",
+                details={"field": "symbol", "symbols": unknown},
+            )
+
+        closes = index.closes_as_of(symbols, axis)
+        first = int(np.argmax(~np.isnan(closes).any(axis=1))) if len(axis) else 0
+        axis, returns, closes = axis[first:], returns[first:], closes[first:]
+        if len(axis) < 2 or np.isnan(closes).any():
+            raise BusinessLogicException(
+                f"Not enough overlapping history to compare portfolio {portfolio_id}",
+                code="INSUFFICIENT_PRICE_HISTORY",
+            )
+
+        # The first date is the base of the comparison
+        returns = returns[1:]
+        benchmark_returns = closes[1:] / closes[:-1] - 1.0
+        cumulative = np.cumprod(1 + np.column_stack([returns, benchmark_returns]), 0)
+        cumulative = np.vstack([np.ones(cumulative.shape[1]), cumulative]) - 1.0
+
+        series: dict = {"date": axis.astype(date).tolist()}
+        for column, name in enumerate(["portfolio", *symbols]):
+            series[name] = np.round(cumulative[:, column], 6).tolist()
+
+        stats: List[BenchmarkStats] = [
+            benchmark_stats(symbol, returns, benchmark_returns[:, column])
+            for column, symbol in enumerate(symbols)
+        ]
+        return BenchmarkComparison(
+            portfolio_id=portfolio_id,
+            start=axis[0].astype(date),
+            end=axis[-1].astype(date),
+            portfolio_return=round(float(cumulative[-1, 0]), 6),
+            benchmarks=stats,
+            series=series,
+        )
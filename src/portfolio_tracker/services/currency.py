@@ -0,0 +1,326 @@
+"""
+Currency Conversion Service
+
+Vectorized currency conversion backed by an in-memory as-of index of
+exchange rates. Rates are loaded once per request/job, and whole arrays
+of amounts are converted per source currency with a single binary search
+over the rate dates instead of one rate lookup per row.
+"""
+
+import csv
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.models.db.transaction import Transaction, TransactionType
+from portfolio_tracker.models.schemas.fx_rate import FxRateCreate
+from portfolio_tracker.repositories.fx_rate import FxRateRepository
+from portfolio_tracker.utils.exceptions import (
+    ExchangeRateUnavailableException,
+    PortfolioNotFoundException,
+)
+
+settings = get_settings()
+
+# Sign applied to a transaction's total_amount when computing invested capital
+CAPITAL_FLOW_SIGN = {
+    TransactionType.BUY: 1.0,
+    TransactionType.TRANSFER_IN: 1.0,
+    TransactionType.SELL: -1.0,
+    TransactionType.TRANSFER_OUT: -1.0,
+}
+
+# Accepted CSV headers per rate field, compared case-insensitively
+RATE_COLUMNS = {
+    "base_currency": ("base_currency", "base"),
+    "quote_currency": ("quote_currency", "quote"),
+    "date": ("date",),
+    "rate": ("rate",),
+}
+
+
+def read_rates_csv(path: Path, source: str) -> Tuple[List[FxRateCreate], int]:
+    """
+    Read exchange rates from a CSV file.
+
+    Columns are matched by name (see ``RATE_COLUMNS``); other columns are
+    ignored.
+
+    Args:
+        path: CSV file with a header row
+        source: Value stored in ``fx_rates.source``
+
+    Returns:
+        Tuple of (valid rates, number of rejected rows)
+
+    Raises:
+        ValueError: If a required column is missing
+    """
+    rates: List[FxRateCreate] = []
+    rejected = 0
+    with path.open(newline="") as handle:
+        reader = csv.DictReader(handle)
+        header = {name.strip().lower(): name for name in reader.fieldnames or ()}
+        columns: Dict[str, str] = {}
+        for field, aliases in RATE_COLUMNS.items():
+            found = next((header[a] for a in aliases if a in header), None)
+            if found is None:
+                raise ValueError(f"{path}: missing column {field!r}")
+            columns[field] = found
+
+        for record in reader:
+            values = {field: record[column] for field, column in columns.items()}
+            try:
+                rates.append(FxRateCreate.model_validate({**values, "source": source}))
+            except ValidationError:
+                rejected += 1
+    return rates, rejected
+
+
+class FxRateIndex:
+    """
+    In-memory as-of index of exchange rates.
+
+    Each stored pair keeps a sorted ``datetime64[D]`` array of dates and a
+    parallel ``float64`` array of rates. Lookups return the last rate on or
+    before each requested date. Inverse pairs are derived as ``1 / rate``
+    and missing crosses are triangulated through the pivot currency.
+    """
+
+    def __init__(self, pivot_currency: str = "USD") -> None:
+        """Initialize an empty index."""
+        self.pivot_currency = pivot_currency
+        self._series: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Tuple[str, str, date, Any]], pivot_currency: str = "USD"
+    ) -> "FxRateIndex":
+        """
+        Build an index from (base, quote, date, rate) rows.
+
+        Args:
+            rows: Rate rows in any order
+            pivot_currency: Currency used to triangulate cross rates
+
+        Returns:
+            FxRateIndex: Populated index
+        """
+        grouped: Dict[Tuple[str, str], List[Tuple[date, float]]] = defaultdict(list)
+        for base, quote, on_date, rate in rows:
+            grouped[(base, quote)].append((on_date, float(rate)))
+
+        index = cls(pivot_currency)
+        for (base, quote), points in grouped.items():
+            dates, rates = zip(*points)
+            index.add_series(base, quote, dates, rates)
+        return index
+
+    def add_series(
+        self, base: str, quote: str, dates: Sequence[Any], rates: Sequence[float]
+    ) -> None:
+        """
+        Add or replace the rate series for a currency pair.
+
+        Args:
+            base: Base currency
+            quote: Quote currency
+            dates: Rate dates (any order)
+            rates: Rates, ``1 base = rate quote``
+        """
+        date_array = np.asarray(dates, dtype="datetime64[D]")
+        rate_array = np.asarray(rates, dtype=np.float64)
+        order = np.argsort(date_array, kind="stable")
+        self._series[(base, quote)] = (date_array[order], rate_array[order])
+
+    def has_pair(self, base: str, quote: str) -> bool:
+        """Check whether a pair can be resolved (directly, inverted or via pivot)."""
+        try:
+            self._resolve(base, quote)
+        except ExchangeRateUnavailableException:
+            return False
+        return True
+
+    def rates(self, base: str, quote: str, dates: Any) -> np.ndarray:
+        """
+        Get as-of rates for many dates at once.
+
+        Args:
+            base: Currency converted from
+            quote: Currency converted to
+            dates: Array-like of dates
+
+        Returns:
+            np.ndarray: ``float64`` rates aligned with ``dates``
+
+        Raises:
+            ExchangeRateUnavailableException: If the pair is unknown or a date
+                precedes the first stored rate
+        """
+        date_array = np.asarray(dates, dtype="datetime64[D]")
+        if base == quote:
+            return np.ones(date_array.shape, dtype=np.float64)
+
+        result = np.ones(date_array.shape, dtype=np.float64)
+        for leg_base, leg_quote, inverted in self._resolve(base, quote):
+            leg = self._lookup(leg_base, leg_quote, date_array)
+            result *= 1.0 / leg if inverted else leg
+        return result
+
+    def convert(
+        self, amounts: Any, currencies: Any, dates: Any, target_currency: str
+    ) -> np.ndarray:
+        """
+        Convert amounts in mixed currencies into one target currency.
+
+        Args:
+            amounts: Array-like of amounts
+            currencies: Array-like of source currency codes, aligned with amounts
+            dates: Array-like of dates at which each amount is converted
+            target_currency: Currency to convert into
+
+        Returns:
+            np.ndarray: Converted ``float64`` amounts
+        """
+        amount_array = np.asarray(amounts, dtype=np.float64)
+        currency_array = np.asarray(currencies)
+        date_array = np.asarray(dates, dtype="datetime64[D]")
+
+        converted = np.empty_like(amount_array)
+        for currency in np.unique(currency_array):
+            mask = currency_array == currency
+            converted[mask] = amount_array[mask] * self.rates(
+                str(currency), target_currency, date_array[mask]
+            )
+        return converted
+
+    def _resolve(self, base: str, quote: str) -> List[Tuple[str, str, bool]]:
+        """Resolve a pair into stored legs as (base, quote, inverted) tuples."""
+        direct = self._leg(base, quote)
+        if direct is not None:
+            return [direct]
+
+        pivot = self.pivot_currency
+        if pivot not in (base, quote):
+            first = self._leg(base, pivot)
+            second = self._leg(pivot, quote)
+            if first is not None and second is not None:
+                return [first, second]
+
+        raise ExchangeRateUnavailableException(base, quote)
+
+    def _leg(self, base: str, quote: str) -> Optional[Tuple[str, str, bool]]:
+        """Find a stored series for a pair in either direction."""
+        if (base, quote) in self._series:
+            return (base, quote, False)
+        if (quote, base) in self._series:
+            return (quote, base, True)
+        return None
+
+    def _lookup(self, base: str, quote: str, dates: np.ndarray) -> np.ndarray:
+        """As-of lookup of a stored series via binary search."""
+        series_dates, series_rates = self._series[(base, quote)]
+        positions = np.searchsorted(series_dates, dates, side="right") - 1
+        if dates.size and positions.min() < 0:
+            earliest = dates[positions < 0].min()
+            raise ExchangeRateUnavailableException(base, quote, earliest)
+        return series_rates[positions]
+
+
+class CurrencyConversionService:
+    """Service for exchange rate ingestion and multi-currency valuation."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+        self.repository = FxRateRepository(session)
+
+    async def ingest_rates(self, rates: Iterable[FxRateCreate]) -> int:
+        """
+        Bulk insert or update exchange rates.
+
+        Args:
+            rates: Validated rate rows
+
+        Returns:
+            int: Number of rows written
+        """
+        rows = [rate.model_dump() for rate in rates]
+        return await self.repository.bulk_upsert(rows)
+
+    async def load_index(
+        self, currencies: Iterable[str], end: Optional[date] = None
+    ) -> FxRateIndex:
+        """
+        Load an as-of rate index for the given currencies.
+
+        The pivot currency is always included so cross rates can be
+        triangulated.
+
+        Args:
+            currencies: Currencies that will be converted between
+            end: Optional last date needed
+
+        Returns:
+            FxRateIndex: Populated index
+        """
+        pivot = settings.FX_PIVOT_CURRENCY
+        rows = await self.repository.get_rates({*currencies, pivot}, end)
+        return FxRateIndex.from_rows(rows, pivot)
+
+    async def get_invested_capital(self, portfolio_id: int) -> Decimal:
+        """
+        Get a portfolio's net invested capital in its own currency.
+
+        Buys and transfers in add to capital, sells and transfers out
+        subtract from it. Every transaction is converted at the rate of its
+        own date, in one vectorized step per source currency.
+
+        Args:
+            portfolio_id: Portfolio ID
+
+        Returns:
+            Decimal: Net invested capital rounded to cents
+
+        Raises:
+            PortfolioNotFoundException: If the portfolio does not exist
+        """
+        target = await self.session.scalar(
+            select(Portfolio.currency).where(Portfolio.id == portfolio_id)
+        )
+        if target is None:
+            raise PortfolioNotFoundException(portfolio_id)
+
+        result = await self.session.execute(
+            select(
+                Transaction.transaction_type,
+                Transaction.total_amount,
+                Transaction.currency,
+                Transaction.transaction_date,
+            ).where(
+                Transaction.portfolio_id == portfolio_id,
+                Transaction.transaction_type.in_(list(CAPITAL_FLOW_SIGN)),
+            )
+        )
+        rows = result.all()
+        if not rows:
+            return Decimal("0.00")
+
+        types, amounts, currencies, dates = zip(*rows)
+        signed = np.fromiter(
+            (CAPITAL_FLOW_SIGN[t] * float(a) for t, a in zip(types, amounts)),
+            dtype=np.float64,
+            count=len(rows),
+        )
+        index = await self.load_index(set(currencies) | {target}, max(dates))
+        converted = index.convert(signed, currencies, dates, target)
+        return Decimal(str(round(float(converted.sum()), 2)))
@@ -0,0 +1,161 @@
+"""
+Holding Price Write-behind Buffer
+
+Coalesces ``Holding.current_price`` / ``market_value`` updates in memory
+and writes them in batches, so price ticks do not turn into one row-level
+UPDATE per holding per tick.
+
+Every holding of a symbol is revalued at the same price, so pending
+updates are keyed by symbol and a later tick replaces an earlier one. A
+flush writes everything pending with one ``UPDATE holdings ... FROM
+(VALUES ...)`` per chunk (see :meth:`HoldingRepository.apply_prices`),
+recomputes the totals of the portfolios it touched and publishes their
+invalidations in the same transaction.
+
+Staleness is bounded: the oldest pending update is flushed at most
+``HOLDING_PRICE_FLUSH_SECONDS`` after it was buffered, or immediately
+once ``HOLDING_PRICE_MAX_PENDING`` symbols are waiting. :meth:`close`
+flushes whatever is left on shutdown.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.services.invalidation import publish_invalidations
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+class HoldingPriceBuffer:
+    """Per-symbol buffer of holding prices flushed in batches."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        flush_seconds: Optional[float] = None,
+        max_pending: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize buffer; unset options fall back to settings."""
+        if session_factory is None:
+            from portfolio_tracker.config.database import get_session_factory
+
+            session_factory = get_session_factory()
+
+        self.session_factory = session_factory
+        self.flush_seconds = flush_seconds or settings.HOLDING_PRICE_FLUSH_SECONDS
+        self.max_pending = max_pending or settings.HOLDING_PRICE_MAX_PENDING
+        self._clock = clock
+        self._pending: Dict[str, Tuple[Decimal, datetime]] = {}
+        self._oldest: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        """Number of symbols waiting to be written."""
+        return len(self._pending)
+
+    def add(self, prices: Mapping[str, Decimal], priced_at: datetime) -> None:
+        """
+        Buffer new prices; later prices for a symbol replace earlier ones.
+
+        Args:
+            prices: Price by symbol
+            priced_at: Time the prices were obtained (stored as ``updated_at``)
+        """
+        if not prices:
+            return
+        for symbol, price in prices.items():
+            self._pending[symbol] = (price, priced_at)
+        if self._oldest is None:
+            self._oldest = self._clock()
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    def due_in(self) -> float:
+        """Seconds until the oldest pending update must be written."""
+        if self._oldest is None:
+            return self.flush_seconds
+        return max(0.0, self._oldest + self.flush_seconds - self._clock())
+
+    async def flush(self) -> int:
+        """
+        Write every pending price in one transaction.
+
+        Prices are put back if the write fails, unless a newer price for
+        the symbol arrived meanwhile.
+
+        Returns:
+            int: Number of symbols written
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            oldest, self._oldest = self._oldest, None
+            try:
+                async with self.session_factory() as session:
+                    affected = await HoldingRepository(session).apply_prices(
+                        [(symbol, *row) for symbol, row in batch.items()]
+                    )
+                    await PortfolioRepository(session).recompute_totals(
+                        sorted(affected)
+                    )
+                    await publish_invalidations(session, "holding", affected)
+                    await session.commit()
+            except BaseException:
+                for symbol, row in batch.items():
+                    self._pending.setdefault(symbol, row)
+                self._oldest = oldest
+                raise
+            logger.debug(
+                "Flushed %d holding prices (%d portfolios)", len(batch), len(affected)
+            )
+            return len(batch)
+
+    async def run(self) -> None:
+        """Flush when the oldest update is due or the buffer is full, until closed."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.due_in())
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closed:
+                break
+            if self._pending and (
+                self.due_in() == 0 or len(self._pending) >= self.max_pending
+            ):
+                try:
+                    await self.flush()
+                except Exception:
+                    logger.exception("Holding price flush failed")
+                    # Retry after a full interval instead of spinning
+                    self._oldest = self._clock()
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def close(self) -> None:
+        """Stop the flush task and write whatever is still pending."""
+        self._closed = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
@@ -0,0 +1,447 @@
+"""
+Idempotency Service
+
+``Idempotency-Key`` support for write endpoints, so clients can retry
+with short timeouts without recording a write twice.
+
+The first request with a key claims it and runs; its response (status
+and JSON body) is stored for ``IDEMPOTENCY_TTL_SECONDS`` together with a
+SHA-256 fingerprint of the request. Later requests with the key:
+
+- replay the stored response, with ``Idempotent-Replayed: true``;
+- wait while the first one is still running (up to
+  ``IDEMPOTENCY_WAIT_SECONDS``, then 409) instead of executing again;
+- get a 422 if the fingerprint differs, i.e. the key was reused for
+  another request.
+
+Keys are scoped per user. Requests that raise or return a 5xx release
+the key so a retry runs again. An in-flight claim whose worker died
+lapses after ``IDEMPOTENCY_LOCK_SECONDS``. If the write succeeded but its
+response cannot be stored, the claim is kept for the full TTL instead:
+duplicates then get a 409 rather than running the write again.
+
+Keys are kept in Redis (``SET NX PX`` claim, ``SET EX`` result). If Redis
+is unreachable, or ``IDEMPOTENCY_BACKEND=database``, the
+``idempotency_keys`` table is used instead. A retry that straddles a
+Redis outage can miss the claim made in the other store.
+
+Sub-requests of a batch ignore the header: the batch itself is the unit
+that can carry a key.
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, Protocol
+
+from fastapi import Request
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.repositories.idempotency_key import IdempotencyKeyRepository
+from portfolio_tracker.services.batch import BATCH_SESSION_KEY
+from portfolio_tracker.utils.exceptions import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+    ValidationException,
+)
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+PURGE_INTERVAL_SECONDS = 600.0
+
+# Compare-and-set scripts: only the in-flight claim of the same request
+# (hash ``h`` and no status ``s`` yet) may be completed, released or kept.
+# KEYS[1] key; ARGV[1] request hash; ARGV[2] value; ARGV[3] TTL seconds
+REDIS_COMPLETE = """
+local raw = redis.call('GET', KEYS[1])
+if not raw then
+    return redis.call('SET', KEYS[1], ARGV[2], 'NX', 'EX', ARGV[3]) and 1 or 0
+end
+local data = cjson.decode(raw)
+if data['h'] == ARGV[1] and data['s'] == nil then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+# KEYS[1] key; ARGV[1] request hash
+REDIS_RELEASE = """
+local raw = redis.call('GET', KEYS[1])
+if raw then
+    local data = cjson.decode(raw)
+    if data['h'] == ARGV[1] and data['s'] == nil then
+        return redis.call('DEL', KEYS[1])
+    end
+end
+return 0
+"""
+# KEYS[1] key; ARGV[1] request hash; ARGV[2] TTL seconds
+REDIS_RETAIN = """
+local raw = redis.call('GET', KEYS[1])
+if raw then
+    local data = cjson.decode(raw)
+    if data['h'] == ARGV[1] and data['s'] == nil then
+        return redis.call('EXPIRE', KEYS[1], ARGV[2])
+    end
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class IdempotencyRecord:
+    """State of a claimed key: in flight, or completed with a response."""
+
+    request_hash: str
+    status_code: Optional[int] = None
+    body: Optional[str] = None
+
+    @property
+    def completed(self) -> bool:
+        """Whether the response is stored."""
+        return self.status_code is not None
+
+
+class IdempotencyStore(Protocol):
+    """Interface implemented by idempotency key stores."""
+
+    async def claim(self, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+        """Claim a key; None if the caller now owns it, else its current record."""
+        ...
+
+    async def complete(
+        self, key: str, request_hash: str, status_code: int, body: str
+    ) -> None:
+        """Store the response of a claimed key."""
+        ...
+
+    async def release(self, key: str, request_hash: str) -> None:
+        """Drop an in-flight claim so the request can be retried."""
+        ...
+
+    async def retain(self, key: str, request_hash: str) -> None:
+        """Keep an in-flight claim for the TTL when its response was lost."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release store resources."""
+        ...
+
+
+class DatabaseIdempotencyStore:
+    """Store backed by the ``idempotency_keys`` table."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        ttl_seconds: Optional[int] = None,
+        lock_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize store; unset options fall back to settings."""
+        self._session_factory = session_factory
+        self.ttl = timedelta(seconds=ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS)
+        self.lock = timedelta(seconds=lock_seconds or settings.IDEMPOTENCY_LOCK_SECONDS)
+        self._next_purge = 0.0
+
+    @property
+    def session_factory(self) -> Callable[[], AsyncSession]:
+        """Session factory, defaulting to the application's."""
+        if self._session_factory is None:
+            from portfolio_tracker.config.database import get_session_factory
+
+            self._session_factory = get_session_factory()
+        return self._session_factory
+
+    async def claim(self, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+        """Claim a key in its own committed transaction."""
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            repository = IdempotencyKeyRepository(session)
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + PURGE_INTERVAL_SECONDS
+                await repository.purge_expired(now)
+            claimed = await repository.claim(key, request_hash, now + self.lock, now)
+            state = None if claimed else await repository.get_state(key)
+            await session.commit()
+        if claimed:
+            return None
+        if state is None:
+            # Purged between the insert and the read: try again
+            return await self.claim(key, request_hash)
+        return IdempotencyRecord(*state)
+
+    async def complete(
+        self, key: str, request_hash: str, status_code: int, body: str
+    ) -> None:
+        """Store the response until the TTL lapses."""
+        async with self.session_factory() as session:
+            await IdempotencyKeyRepository(session).complete(
+                key, request_hash, status_code, body, datetime.utcnow() + self.ttl
+            )
+            await session.commit()
+
+    async def release(self, key: str, request_hash: str) -> None:
+        """Delete the in-flight claim."""
+        async with self.session_factory() as session:
+            await IdempotencyKeyRepository(session).release(key, request_hash)
+            await session.commit()
+
+    async def retain(self, key: str, request_hash: str) -> None:
+        """Extend the in-flight claim until the TTL lapses."""
+        async with self.session_factory() as session:
+            await IdempotencyKeyRepository(session).extend(
+                key, request_hash, datetime.utcnow() + self.ttl
+            )
+            await session.commit()
+
+    async def aclose(self) -> None:
+        """Nothing to release; sessions are per call."""
+
+
+class RedisIdempotencyStore:
+    """Store backed by Redis, falling back to another store when unreachable."""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        ttl_seconds: Optional[int] = None,
+        lock_seconds: Optional[float] = None,
+        fallback: Optional[IdempotencyStore] = None,
+        prefix: str = "idempotency:",
+    ) -> None:
+        """Initialize store; unset options fall back to settings."""
+        self.url = url or settings.REDIS_URL
+        self.ttl_seconds = ttl_seconds or settings.IDEMPOTENCY_TTL_SECONDS
+        self.lock_ms = int(1000 * (lock_seconds or settings.IDEMPOTENCY_LOCK_SECONDS))
+        self.fallback = fallback
+        self.prefix = prefix
+        self._client: Any = None
+
+    @property
+    def client(self) -> Any:
+        """Redis client, created on first use."""
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url, socket_timeout=1.0)
+        return self._client
+
+    async def claim(self, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+        """Claim with ``SET NX PX``; read the record if someone else holds it."""
+        record: Optional[IdempotencyRecord] = await self._call(
+            "claim", key, request_hash, redis_call=self._claim(key, request_hash)
+        )
+        return record
+
+    async def complete(
+        self, key: str, request_hash: str, status_code: int, body: str
+    ) -> None:
+        """
+        Replace this request's claim with the response, expiring after the TTL.
+
+        A claim taken over by a retry after the lock lapsed is left alone.
+        """
+        value = json.dumps({"h": request_hash, "s": status_code, "b": body})
+        await self._call(
+            "complete",
+            key,
+            request_hash,
+            status_code,
+            body,
+            redis_call=self.client.eval(
+                REDIS_COMPLETE,
+                1,
+                self.prefix + key,
+                request_hash,
+                value,
+                self.ttl_seconds,
+            ),
+        )
+
+    async def release(self, key: str, request_hash: str) -> None:
+        """Delete the in-flight claim."""
+        await self._call(
+            "release",
+            key,
+            request_hash,
+            redis_call=self.client.eval(
+                REDIS_RELEASE, 1, self.prefix + key, request_hash
+            ),
+        )
+
+    async def retain(self, key: str, request_hash: str) -> None:
+        """Extend the in-flight claim to the TTL."""
+        await self._call(
+            "retain",
+            key,
+            request_hash,
+            redis_call=self.client.eval(
+                REDIS_RETAIN, 1, self.prefix + key, request_hash, self.ttl_seconds
+            ),
+        )
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self.fallback is not None:
+            await self.fallback.aclose()
+
+    async def _claim(self, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+        name = self.prefix + key
+        while True:
+            claim = json.dumps({"h": request_hash})
+            if await self.client.set(name, claim, nx=True, px=self.lock_ms):
+                return None
+            raw = await self.client.get(name)
+            if raw is not None:
+                data = json.loads(raw)
+                return IdempotencyRecord(data["h"], data.get("s"), data.get("b"))
+            # Expired between SET and GET: claim again
+
+    async def _call(self, method: str, *args: Any, redis_call: Awaitable[Any]) -> Any:
+        """Await a Redis operation, retrying it on the fallback store on failure."""
+        from redis.exceptions import ConnectionError, TimeoutError
+
+        try:
+            return await redis_call
+        except (ConnectionError, TimeoutError, OSError):
+            if self.fallback is None:
+                raise
+            logger.warning("Redis unavailable, using fallback idempotency store")
+            return await getattr(self.fallback, method)(*args)
+
+
+class IdempotencyService:
+    """Runs write handlers at most once per idempotency key."""
+
+    def __init__(
+        self,
+        store: Optional[IdempotencyStore] = None,
+        wait_seconds: Optional[float] = None,
+        poll_seconds: float = 0.05,
+    ) -> None:
+        """Initialize service; unset options fall back to settings."""
+        self.store = store or get_idempotency_store()
+        self.wait_seconds = (
+            settings.IDEMPOTENCY_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        )
+        self.poll_seconds = poll_seconds
+
+    async def run(
+        self,
+        request: Request,
+        key: Optional[str],
+        user_id: int,
+        payload: str,
+        handler: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """
+        Run ``handler`` unless the key already has a response.
+
+        Args:
+            request: Current request (method and path are fingerprinted)
+            key: ``Idempotency-Key`` header value, or None to just run
+            user_id: Current user ID (keys are scoped per user)
+            payload: Canonical request body (e.g. ``model_dump_json()``)
+            handler: Endpoint body returning a JSON response
+
+        Returns:
+            Response: Handler response, or the stored one replayed
+        """
+        if key is None or getattr(request.state, BATCH_SESSION_KEY, None) is not None:
+            return await handler()
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            raise ValidationException(
+                message=f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters",
+                field=IDEMPOTENCY_HEADER,
+            )
+
+        scoped_key = f"{user_id}:{key}"
+        fingerprint = f"{request.method} {request.url.path} {payload}"
+        request_hash = hashlib.sha256(fingerprint.encode()).hexdigest()
+        record = await self._claim(scoped_key, request_hash)
+        if record is not None:
+            return Response(
+                content=record.body,
+                status_code=record.status_code or 200,
+                media_type="application/json",
+                headers={REPLAYED_HEADER: "true"},
+            )
+
+        try:
+            response = await handler()
+        except BaseException:
+            await self.store.release(scoped_key, request_hash)
+            raise
+        if response.status_code >= 500:
+            await self.store.release(scoped_key, request_hash)
+            return response
+        try:
+            await self.store.complete(
+                scoped_key,
+                request_hash,
+                response.status_code,
+                bytes(response.body).decode(),
+            )
+        except Exception:
+            logger.exception("Could not store idempotent response for %s", scoped_key)
+            # The write happened: a lapsed lock would let a retry repeat it
+            try:
+                await self.store.retain(scoped_key, request_hash)
+            except Exception:
+                logger.exception("Could not retain idempotency key %s", scoped_key)
+        return response
+
+    async def _claim(self, key: str, request_hash: str) -> Optional[IdempotencyRecord]:
+        """Claim a key, waiting while another request holds it."""
+        deadline = time.monotonic() + self.wait_seconds
+        delay = self.poll_seconds
+        while True:
+            record = await self.store.claim(key, request_hash)
+            if record is None:
+                return None
+            if record.request_hash != request_hash:
+                raise IdempotencyKeyReusedException()
+            if record.completed:
+                return record
+            if time.monotonic() + delay > deadline:
+                raise IdempotencyKeyInProgressException()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+
+_store: Optional[IdempotencyStore] = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the process-wide idempotency store."""
+    global _store
+
+    if _store is None:
+        database = DatabaseIdempotencyStore()
+        if settings.IDEMPOTENCY_BACKEND == "redis":
+            _store = RedisIdempotencyStore(fallback=database)
+        else:
+            _store = database
+    return _store
+
+
+async def close_idempotency_store() -> None:
+    """Close the process-wide store."""
+    global _store
+
+    if _store is not None:
+        await _store.aclose()
+        _store = None
@@ -0,0 +1,143 @@
+"""
+Instrument Service
+
+Translation between ticker symbols and the integer instrument IDs that
+``market_prices`` stores.
+
+Assigned IDs never change, so every worker keeps a process-wide
+:class:`SymbolMap` that only grows: once a symbol has been seen, both
+directions are answered from memory and the database is only asked about
+symbols or IDs this process has not met yet, in one query per call.
+Symbol strings are interned, so the millions of rows mapped back to
+symbols (price store refreshes, close histories) share one string each.
+
+IDs are only remembered when read back from the database, never straight
+from the insert that created them, so a rolled back insert does not leave
+an ID behind that does not exist.
+"""
+
+import sys
+from typing import Collection, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.repositories.instrument import InstrumentRepository
+
+
+class SymbolMap:
+    """Interned bidirectional map of symbol <-> instrument ID."""
+
+    def __init__(self) -> None:
+        """Initialize an empty map."""
+        self._ids: Dict[str, int] = {}
+        self._symbols: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        """Number of known instruments."""
+        return len(self._ids)
+
+    def id_of(self, symbol: str) -> Optional[int]:
+        """Instrument ID of a symbol, or None if unknown."""
+        return self._ids.get(symbol)
+
+    def symbol_of(self, instrument_id: int) -> Optional[str]:
+        """Symbol of an instrument ID, or None if unknown."""
+        return self._symbols.get(instrument_id)
+
+    def add(self, pairs: Iterable[Tuple[str, int]]) -> None:
+        """Remember (symbol, ID) pairs read from the database."""
+        for symbol, instrument_id in pairs:
+            symbol = sys.intern(symbol)
+            self._ids[symbol] = instrument_id
+            self._symbols[instrument_id] = symbol
+
+    def clear(self) -> None:
+        """Forget everything."""
+        self._ids.clear()
+        self._symbols.clear()
+
+
+class InstrumentService:
+    """Service resolving symbols and instrument IDs through the symbol map."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+        self.repository = InstrumentRepository(session)
+        self.symbol_map = get_symbol_map()
+
+    async def get_ids(
+        self, symbols: Collection[str], create: bool = False
+    ) -> Dict[str, int]:
+        """
+        Get the instrument IDs of symbols.
+
+        Args:
+            symbols: Ticker symbols
+            create: Insert instruments for unknown symbols
+
+        Returns:
+            Dict of symbol -> instrument ID; unknown symbols are omitted
+            unless ``create`` is set
+        """
+        ids: Dict[str, int] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            instrument_id = self.symbol_map.id_of(symbol)
+            if instrument_id is None:
+                missing.append(symbol)
+            else:
+                ids[symbol] = instrument_id
+        if not missing:
+            return ids
+
+        found = await self.repository.get_ids(missing)
+        self.symbol_map.add(found.items())
+        ids.update(found)
+        if create and len(found) < len(missing):
+            unknown = [symbol for symbol in missing if symbol not in found]
+            inserted = await self.repository.insert_missing(unknown)
+            ids.update(inserted)
+            # Lost insert races: the rows exist, committed by someone else
+            raced = [symbol for symbol in unknown if symbol not in inserted]
+            if raced:
+                found = await self.repository.get_ids(raced)
+                self.symbol_map.add(found.items())
+                ids.update(found)
+        return ids
+
+    async def get_symbols(self, instrument_ids: Collection[int]) -> Dict[int, str]:
+        """
+        Get the symbols of instrument IDs.
+
+        Args:
+            instrument_ids: Instrument IDs
+
+        Returns:
+            Dict of instrument ID -> symbol; unknown IDs are omitted
+        """
+        symbols: Dict[int, str] = {}
+        missing = []
+        for instrument_id in dict.fromkeys(instrument_ids):
+            symbol = self.symbol_map.symbol_of(instrument_id)
+            if symbol is None:
+                missing.append(instrument_id)
+            else:
+                symbols[instrument_id] = symbol
+        if missing:
+            found = await self.repository.get_symbols(missing)
+            self.symbol_map.add((symbol, key) for key, symbol in found.items())
+            symbols.update((key, sys.intern(symbol)) for key, symbol in found.items())
+        return symbols
+
+
+_symbol_map: Optional[SymbolMap] = None
+
+
+def get_symbol_map() -> SymbolMap:
+    """Get the process-wide symbol map."""
+    global _symbol_map
+
+    if _symbol_map is None:
+        _symbol_map = SymbolMap()
+    return _symbol_map
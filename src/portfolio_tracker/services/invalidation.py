@@ -0,0 +1,323 @@
+"""
+Cache Invalidation Bus
+
+Cross-worker cache invalidation over Postgres ``LISTEN``/``NOTIFY``.
+
+Writers publish compact JSON payloads inside the writing transaction, so
+listeners only hear about committed changes::
+
+    {"entity": "holding", "id": 42, "version": 918273}
+
+``id`` is the cache key the entity affects: the portfolio ID for
+``transaction`` and ``holding``, the symbol for ``market_price`` (ORM
+price rows only carry an instrument ID; the flush hook resolves it).
+``version`` is the writing transaction's ``txid_current()``.
+
+ORM writes to those models are published automatically by session hooks
+(see :func:`install_invalidation_hooks`); Core bulk statements call
+:func:`publish_invalidations` themselves. Each worker runs one
+:class:`InvalidationListener` on a dedicated asyncpg connection that
+dispatches payloads to the handlers registered on the process-wide
+:class:`InvalidationBus`. After a reconnect, handlers registered with
+``on_reset`` are told to drop everything, since notifications sent while
+disconnected are lost.
+
+On databases without ``NOTIFY`` (SQLite in tests and tools) committed
+invalidations are dispatched to the local bus directly.
+"""
+
+import asyncio
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.instrument import Instrument
+from portfolio_tracker.models.db.market_price import MarketPrice
+from portfolio_tracker.models.db.transaction import Transaction
+from portfolio_tracker.services.instruments import get_symbol_map
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+# Model -> (entity name, attribute holding the cache key); market_price
+# rows are collected by instrument ID and published by symbol
+TRACKED_MODELS: Dict[type, Tuple[str, str]] = {
+    Transaction: ("transaction", "portfolio_id"),
+    Holding: ("holding", "portfolio_id"),
+    MarketPrice: ("market_price", "instrument_id"),
+}
+INTEGER_KEYED = frozenset({"transaction", "holding"})
+
+_LOCAL_PENDING = "local_invalidations"
+
+NOTIFY_SQL = text(
+    "SELECT pg_notify(:channel, json_build_object("
+    "'entity', entity, 'id', key, 'version', txid_current())::text) "
+    "FROM unnest(CAST(:entities AS text[]), CAST(:keys AS text[])) AS t(entity, key)"
+)
+
+
+@dataclass(frozen=True)
+class Invalidation:
+    """One invalidation event."""
+
+    entity: str
+    id: Any
+    version: Optional[int] = None
+
+
+Handler = Callable[[Invalidation], None]
+
+
+class InvalidationBus:
+    """In-process registry of invalidation handlers."""
+
+    def __init__(self) -> None:
+        """Initialize an empty bus."""
+        self._handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self._reset_handlers: List[Callable[[], None]] = []
+
+    def subscribe(self, entity: str, handler: Handler) -> None:
+        """Call ``handler`` for every invalidation of ``entity``."""
+        self._handlers[entity].append(handler)
+
+    def unsubscribe(self, entity: str, handler: Handler) -> None:
+        """Remove a handler registered with :meth:`subscribe`."""
+        if handler in self._handlers.get(entity, ()):
+            self._handlers[entity].remove(handler)
+
+    def on_reset(self, handler: Callable[[], None]) -> None:
+        """Call ``handler`` when invalidations may have been missed."""
+        self._reset_handlers.append(handler)
+
+    def remove_reset(self, handler: Callable[[], None]) -> None:
+        """Remove a handler registered with :meth:`on_reset`."""
+        if handler in self._reset_handlers:
+            self._reset_handlers.remove(handler)
+
+    def dispatch(self, invalidation: Invalidation) -> None:
+        """Deliver an invalidation to the entity's handlers."""
+        for handler in list(self._handlers.get(invalidation.entity, ())):
+            try:
+                handler(invalidation)
+            except Exception:
+                logger.exception("Invalidation handler failed for %s", invalidation)
+
+    def reset(self) -> None:
+        """Tell every reset handler to drop its cached state."""
+        for handler in list(self._reset_handlers):
+            try:
+                handler()
+            except Exception:
+                logger.exception("Invalidation reset handler failed")
+
+
+class InvalidationListener:
+    """Single ``LISTEN`` connection feeding the local bus."""
+
+    def __init__(
+        self,
+        bus: InvalidationBus,
+        dsn: Optional[str] = None,
+        channel: Optional[str] = None,
+        reconnect_seconds: Optional[float] = None,
+    ) -> None:
+        """Initialize listener; unset options fall back to settings."""
+        self.bus = bus
+        self.dsn = dsn or settings.DATABASE_URL
+        self.channel = channel or settings.INVALIDATION_CHANNEL
+        self.reconnect_seconds = (
+            reconnect_seconds or settings.INVALIDATION_RECONNECT_SECONDS
+        )
+
+    async def run(self) -> None:
+        """Listen until cancelled, reconnecting after connection loss."""
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                # Anything published while we were not listening is lost
+                self.bus.reset()
+                logger.info("Listening for invalidations on %s", self.channel)
+                await closed.wait()
+                logger.warning("Invalidation listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Invalidation listener failed")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.reconnect_seconds)
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        """asyncpg notification callback."""
+        try:
+            invalidation = parse_payload(payload)
+        except (ValueError, KeyError):
+            logger.warning("Ignoring malformed invalidation payload: %r", payload)
+            return
+        self.bus.dispatch(invalidation)
+
+
+def parse_payload(payload: str) -> Invalidation:
+    """
+    Parse a ``NOTIFY`` payload.
+
+    Args:
+        payload: JSON payload
+
+    Returns:
+        Invalidation: Parsed event, with integer IDs for portfolio-keyed entities
+    """
+    data = json.loads(payload)
+    entity = data["entity"]
+    key = int(data["id"]) if entity in INTEGER_KEYED else data["id"]
+    return Invalidation(entity=entity, id=key, version=data.get("version"))
+
+
+async def publish_invalidations(
+    session: AsyncSession, entity: str, keys: Iterable[Any]
+) -> None:
+    """
+    Publish invalidations from a Core write, inside its transaction.
+
+    Args:
+        session: Session of the writing transaction
+        entity: Entity name
+        keys: Affected cache keys
+    """
+    pending = {(entity, str(key)) for key in keys}
+    if pending:
+        await session.run_sync(_publish, pending)
+
+
+def install_invalidation_hooks() -> None:
+    """Publish ORM writes to tracked models automatically (idempotent)."""
+    if not event.contains(Session, "after_flush", _after_flush):
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_soft_rollback", _after_rollback)
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    """Collect tracked objects written by a flush and publish them."""
+    pending: Set[Tuple[str, str]] = set()
+    instrument_ids: Set[int] = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked is None:
+            continue
+        entity, attribute = tracked
+        if entity == "market_price":
+            instrument_ids.add(getattr(obj, attribute))
+        else:
+            pending.add((entity, str(getattr(obj, attribute))))
+    if instrument_ids:
+        pending.update(
+            ("market_price", symbol) for symbol in _symbols_of(session, instrument_ids)
+        )
+    if pending:
+        _publish(session, pending)
+
+
+def _symbols_of(session: Session, instrument_ids: Set[int]) -> List[str]:
+    """Symbols of instrument IDs, reading unknown ones in the flushing session."""
+    symbol_map = get_symbol_map()
+    missing = [
+        instrument_id
+        for instrument_id in instrument_ids
+        if symbol_map.symbol_of(instrument_id) is None
+    ]
+    if missing:
+        result = session.execute(
+            select(Instrument.symbol, Instrument.id).where(Instrument.id.in_(missing))
+        )
+        symbol_map.add(result.tuples())
+    symbols = (symbol_map.symbol_of(instrument_id) for instrument_id in instrument_ids)
+    return [symbol for symbol in symbols if symbol is not None]
+
+
+def _publish(session: Session, pending: Set[Tuple[str, str]]) -> None:
+    """NOTIFY on Postgres; otherwise keep for local dispatch on commit."""
+    if session.get_bind().dialect.name == "postgresql":
+        entities, keys = zip(*sorted(pending))
+        session.execute(
+            NOTIFY_SQL,
+            {
+                "channel": settings.INVALIDATION_CHANNEL,
+                "entities": list(entities),
+                "keys": list(keys),
+            },
+        )
+    else:
+        session.info.setdefault(_LOCAL_PENDING, set()).update(pending)
+
+
+def _after_commit(session: Session) -> None:
+    """Dispatch invalidations kept for databases without NOTIFY."""
+    pending = session.info.pop(_LOCAL_PENDING, None)
+    if not pending:
+        return
+    bus = get_invalidation_bus()
+    for entity, key in sorted(pending):
+        bus.dispatch(
+            Invalidation(entity=entity, id=int(key) if entity in INTEGER_KEYED else key)
+        )
+
+
+def _after_rollback(session: Session, previous_transaction: Any) -> None:
+    """Drop invalidations of a rolled back transaction."""
+    session.info.pop(_LOCAL_PENDING, None)
+
+
+_bus: Optional[InvalidationBus] = None
+_listener_task: Optional[asyncio.Task] = None
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get the process-wide invalidation bus."""
+    global _bus
+
+    if _bus is None:
+        _bus = InvalidationBus()
+    return _bus
+
+
+def start_invalidation_listener() -> None:
+    """Start this worker's listener task if enabled and not running."""
+    global _listener_task
+
+    if not settings.INVALIDATION_ENABLED:
+        return
+    if _listener_task is None or _listener_task.done():
+        listener = InvalidationListener(get_invalidation_bus())
+        _listener_task = asyncio.get_running_loop().create_task(listener.run())
+
+
+async def stop_invalidation_listener() -> None:
+    """Cancel this worker's listener task."""
+    global _listener_task
+
+    if _listener_task is None:
+        return
+    _listener_task.cancel()
+    try:
+        await _listener_task
+    except asyncio.CancelledError:
+        pass
+    _listener_task = None
@@ -0,0 +1,511 @@
+"""
+Live Valuation Hub
+
+Process-wide fan-out of portfolio value updates to streaming clients.
+
+One feed task per worker polls ``market_prices`` for the instruments with
+rows newer than its watermark (one grouped row per instrument, however
+many prices were written), so the database sees one query per poll
+interval however many clients are connected. The poll re-reads
+``PRICE_WATERMARK_OVERLAP_SECONDS`` behind the watermark so rows that
+commit late with an older stamp are still seen; an instrument counts as
+changed only when its latest stamp or row count in that window moved.
+Symbols with new rows are revalued at their last close on or before today
+from the as-of price index. Each changed symbol is applied once to every
+tracked portfolio holding it; each affected portfolio is revalued once
+and diffed against what was last published, and that same delta is
+handed to every subscriber of the portfolio.
+
+Holding and transaction invalidations from the invalidation bus make the
+feed reload the affected portfolios' positions; price invalidations for
+tracked symbols wake it before the next poll.
+
+Subscriptions are plain objects with an event and a pending-delta buffer,
+not tasks or queues. Deltas arriving faster than the per-connection
+throttle are merged, so an idle or slow connection costs a few hundred
+bytes and never builds a backlog.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.market_price import MarketPrice
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.services.instruments import InstrumentService
+from portfolio_tracker.services.invalidation import (
+    Invalidation,
+    InvalidationBus,
+    get_invalidation_bus,
+)
+from portfolio_tracker.services.price_index import PriceIndexService
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+POSITION_FIELDS = ("portfolio_id", "symbol", "quantity", "total_cost", "current_price")
+
+
+@dataclass(slots=True)
+class Position:
+    """Quantity, cost and last price of one holding."""
+
+    quantity: float
+    total_cost: float
+    price: Optional[float]
+
+
+class PortfolioValuation:
+    """Valuation state of one tracked portfolio."""
+
+    __slots__ = ("portfolio_id", "positions", "published")
+
+    def __init__(self, portfolio_id: int, positions: Dict[str, Position]) -> None:
+        """Initialize from the portfolio's positions."""
+        self.portfolio_id = portfolio_id
+        self.positions = positions
+        self.published = self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current values of the portfolio and its holdings."""
+        holdings: Dict[str, Any] = {}
+        total_value = 0.0
+        total_cost = 0.0
+        for symbol, position in self.positions.items():
+            market_value = (
+                None if position.price is None else position.quantity * position.price
+            )
+            holdings[symbol] = {
+                "price": position.price,
+                "market_value": None
+                if market_value is None
+                else round(market_value, 2),
+            }
+            total_value += market_value or 0.0
+            total_cost += position.total_cost
+
+        return {
+            "total_value": round(total_value, 2),
+            "total_cost": round(total_cost, 2),
+            "total_gain_loss": round(total_value - total_cost, 2),
+            "holdings": holdings,
+        }
+
+    def publish(self) -> Optional[Dict[str, Any]]:
+        """Revalue and return the fields that changed since the last publish."""
+        current = self.snapshot()
+        delta = diff_values(self.published, current)
+        self.published = current
+        return delta
+
+
+class Subscription:
+    """One streaming connection's view of the hub."""
+
+    __slots__ = ("portfolio_ids", "pending", "event", "last_sent")
+
+    def __init__(self, portfolio_ids: Iterable[int]) -> None:
+        """Subscribe to ``portfolio_ids``."""
+        self.portfolio_ids = frozenset(portfolio_ids)
+        self.pending: Dict[int, Dict[str, Any]] = {}
+        self.event = asyncio.Event()
+        self.last_sent = 0.0
+
+    def push(self, portfolio_id: int, delta: Dict[str, Any]) -> None:
+        """Merge a delta into the pending buffer and wake the connection."""
+        current = self.pending.get(portfolio_id)
+        self.pending[portfolio_id] = (
+            delta if current is None else merge_deltas(current, delta)
+        )
+        self.event.set()
+
+    async def next_update(
+        self, throttle: float, timeout: float
+    ) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Wait for the next batch of deltas.
+
+        Args:
+            throttle: Minimum seconds between two sends
+            timeout: Seconds to wait before returning None (heartbeat)
+
+        Returns:
+            Pending deltas by portfolio ID, or None on timeout
+        """
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+        loop = asyncio.get_running_loop()
+        wait = self.last_sent + throttle - loop.time()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        self.event.clear()
+        updates, self.pending = self.pending, {}
+        self.last_sent = loop.time()
+        return updates
+
+
+class ValuationHub:
+    """Tracks subscribed portfolios and fans out value deltas."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        """Initialize hub; unset options fall back to settings."""
+        self._session_factory = session_factory
+        self.poll_interval = poll_interval or settings.LIVE_POLL_SECONDS
+        self.watermark: Optional[datetime] = None
+        self.overlap = timedelta(seconds=settings.PRICE_WATERMARK_OVERLAP_SECONDS)
+        self._window: Dict[int, Tuple[datetime, int]] = {}
+        self._portfolios: Dict[int, PortfolioValuation] = {}
+        self._by_symbol: Dict[str, Set[int]] = {}
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._stale: Set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._feed: Optional[asyncio.Task] = None
+
+    def attach(self, bus: InvalidationBus) -> None:
+        """Follow holding, transaction and price invalidations from ``bus``."""
+        bus.subscribe("holding", self._on_portfolio_change)
+        bus.subscribe("transaction", self._on_portfolio_change)
+        bus.subscribe("market_price", self._on_price_change)
+        bus.on_reset(self._on_reset)
+
+    def detach(self, bus: InvalidationBus) -> None:
+        """Stop following ``bus``."""
+        bus.unsubscribe("holding", self._on_portfolio_change)
+        bus.unsubscribe("transaction", self._on_portfolio_change)
+        bus.unsubscribe("market_price", self._on_price_change)
+        bus.remove_reset(self._on_reset)
+
+    async def subscribe(
+        self, session: AsyncSession, portfolio_ids: Iterable[int]
+    ) -> Subscription:
+        """
+        Subscribe to portfolios, loading any that are not tracked yet.
+
+        Args:
+            session: Database session used to load untracked portfolios
+            portfolio_ids: Portfolios to follow (ownership already checked)
+
+        Returns:
+            Subscription: Handle to wait on and later unsubscribe
+        """
+        subscription = Subscription(portfolio_ids)
+        missing = [
+            pid for pid in subscription.portfolio_ids if pid not in self._portfolios
+        ]
+        if missing:
+            await self._load(session, missing)
+
+        for portfolio_id in subscription.portfolio_ids:
+            self._subscribers.setdefault(portfolio_id, set()).add(subscription)
+        self._ensure_feed()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Drop a subscription and stop tracking portfolios nobody follows."""
+        for portfolio_id in subscription.portfolio_ids:
+            subscribers = self._subscribers.get(portfolio_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[portfolio_id]
+                self._untrack(portfolio_id)
+
+        if not self._subscribers and self._feed is not None:
+            self._feed.cancel()
+            self._feed = None
+
+    def snapshot(self, portfolio_id: int) -> Dict[str, Any]:
+        """Last published values of a tracked portfolio."""
+        return self._portfolios[portfolio_id].published
+
+    def apply_prices(self, prices: Dict[str, float]) -> int:
+        """
+        Apply new prices and push deltas to subscribers.
+
+        Args:
+            prices: Latest price by symbol
+
+        Returns:
+            int: Number of portfolios whose values changed
+        """
+        touched: Set[int] = set()
+        for symbol, price in prices.items():
+            for portfolio_id in self._by_symbol.get(symbol, ()):
+                position = self._portfolios[portfolio_id].positions[symbol]
+                if position.price != price:
+                    position.price = price
+                    touched.add(portfolio_id)
+
+        changed = 0
+        for portfolio_id in touched:
+            delta = self._portfolios[portfolio_id].publish()
+            if not delta:
+                continue
+            changed += 1
+            for subscription in self._subscribers.get(portfolio_id, ()):
+                subscription.push(portfolio_id, delta)
+        return changed
+
+    async def poll_once(self, session: AsyncSession) -> int:
+        """
+        Reload invalidated portfolios, then apply prices newer than the watermark.
+
+        Args:
+            session: Database session
+
+        Returns:
+            int: Number of portfolios whose values changed
+        """
+        changed = 0
+        if self._stale:
+            stale, self._stale = self._stale, set()
+            changed += await self._reload(session, stale)
+
+        first_poll = self.watermark is None
+        if self.watermark is None:
+            self.watermark = await session.scalar(
+                select(func.max(MarketPrice.updated_at))
+            )
+            if self.watermark is None:
+                return changed
+
+        result = await session.execute(
+            select(
+                MarketPrice.instrument_id,
+                func.max(MarketPrice.updated_at),
+                func.count(),
+            )
+            .where(MarketPrice.updated_at > self.watermark - self.overlap)
+            .group_by(MarketPrice.instrument_id)
+        )
+        window = {
+            instrument_id: (updated_at, rows)
+            for instrument_id, updated_at, rows in result.all()
+        }
+        instrument_ids = {
+            instrument_id
+            for instrument_id, seen in window.items()
+            if self._window.get(instrument_id) != seen
+        }
+        self._window = window
+        self.watermark = max(
+            [self.watermark, *(updated_at for updated_at, _ in window.values())]
+        )
+        if first_poll:
+            return changed
+
+        symbols = await InstrumentService(session).get_symbols(instrument_ids)
+        updated = {symbol for symbol in symbols.values() if symbol in self._by_symbol}
+        if not updated:
+            return changed
+
+        # Backfilled older rows must not replace the latest close
+        price_index = PriceIndexService(session)
+        for symbol in updated:
+            price_index.index.invalidate(symbol)
+        changed += self.apply_prices(await price_index.latest(sorted(updated)))
+        return changed
+
+    async def run(self) -> None:
+        """Poll until cancelled; invalidations wake the loop early."""
+        session_factory = self._session_factory
+        if session_factory is None:
+            from portfolio_tracker.config.database import get_session_factory
+
+            session_factory = get_session_factory()
+
+        while True:
+            try:
+                async with session_factory() as session:
+                    await self.poll_once(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live valuation poll failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def stop(self) -> None:
+        """Cancel the feed task."""
+        if self._feed is None:
+            return
+        self._feed.cancel()
+        try:
+            await self._feed
+        except asyncio.CancelledError:
+            pass
+        self._feed = None
+
+    def _ensure_feed(self) -> None:
+        """Start the feed task on first subscription."""
+        if self._feed is None or self._feed.done():
+            self._feed = asyncio.get_running_loop().create_task(self.run())
+
+    async def _load(self, session: AsyncSession, portfolio_ids: List[int]) -> None:
+        """Load positions of several portfolios with one query."""
+        positions = await self._read_positions(session, portfolio_ids)
+        for portfolio_id, portfolio_positions in positions.items():
+            # Another connection may have loaded it while we were querying
+            if portfolio_id in self._portfolios:
+                continue
+            self._portfolios[portfolio_id] = PortfolioValuation(
+                portfolio_id, portfolio_positions
+            )
+            self._index(portfolio_id, portfolio_positions)
+
+    async def _reload(self, session: AsyncSession, portfolio_ids: Set[int]) -> int:
+        """Re-read positions of tracked portfolios and push the deltas."""
+        tracked = [pid for pid in portfolio_ids if pid in self._portfolios]
+        if not tracked:
+            return 0
+
+        changed = 0
+        positions = await self._read_positions(session, tracked)
+        for portfolio_id, portfolio_positions in positions.items():
+            valuation = self._portfolios.get(portfolio_id)
+            if valuation is None:
+                continue
+            self._unindex(portfolio_id, valuation.positions)
+            valuation.positions = portfolio_positions
+            self._index(portfolio_id, portfolio_positions)
+
+            delta = valuation.publish()
+            if delta:
+                changed += 1
+                for subscription in self._subscribers.get(portfolio_id, ()):
+                    subscription.push(portfolio_id, delta)
+        return changed
+
+    @staticmethod
+    async def _read_positions(
+        session: AsyncSession, portfolio_ids: List[int]
+    ) -> Dict[int, Dict[str, Position]]:
+        """
+        Query positions of several portfolios.
+
+        Holdings the price workers have not priced yet fall back to their
+        last known close.
+        """
+        rows = await HoldingRepository(session).select_by_portfolios(
+            portfolio_ids, POSITION_FIELDS
+        )
+        unpriced = sorted({row[1] for row in rows if row[4] is None})
+        latest = await PriceIndexService(session).latest(unpriced) if unpriced else {}
+
+        positions: Dict[int, Dict[str, Position]] = {pid: {} for pid in portfolio_ids}
+        for portfolio_id, symbol, quantity, total_cost, price in rows:
+            positions[portfolio_id][symbol] = Position(
+                quantity=float(quantity),
+                total_cost=float(total_cost or 0),
+                price=latest.get(symbol) if price is None else float(price),
+            )
+        return positions
+
+    def _index(self, portfolio_id: int, positions: Dict[str, Position]) -> None:
+        """Add a portfolio's symbols to the symbol index."""
+        for symbol in positions:
+            self._by_symbol.setdefault(symbol, set()).add(portfolio_id)
+
+    def _unindex(self, portfolio_id: int, positions: Dict[str, Position]) -> None:
+        """Remove a portfolio's symbols from the symbol index."""
+        for symbol in positions:
+            holders = self._by_symbol.get(symbol)
+            if holders is not None:
+                holders.discard(portfolio_id)
+                if not holders:
+                    del self._by_symbol[symbol]
+
+    def _on_portfolio_change(self, invalidation: Invalidation) -> None:
+        """Mark a tracked portfolio for reload."""
+        if invalidation.id in self._portfolios:
+            self._stale.add(invalidation.id)
+            self._wakeup.set()
+
+    def _on_price_change(self, invalidation: Invalidation) -> None:
+        """Poll early when a tracked symbol got a new price."""
+        if invalidation.id in self._by_symbol:
+            self._wakeup.set()
+
+    def _on_reset(self) -> None:
+        """Reload everything after missed invalidations."""
+        self._stale.update(self._portfolios)
+        self._wakeup.set()
+
+    def _untrack(self, portfolio_id: int) -> None:
+        """Forget a portfolio's valuation state."""
+        valuation = self._portfolios.pop(portfolio_id, None)
+        if valuation is not None:
+            self._unindex(portfolio_id, valuation.positions)
+        self._stale.discard(portfolio_id)
+
+
+def diff_values(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the keys of ``new`` that differ from ``old``, recursing into dicts.
+
+    Keys that disappeared are reported as None.
+    """
+    delta: Dict[str, Any] = {}
+    for key, value in new.items():
+        previous = old.get(key)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            nested = diff_values(previous, value)
+            if nested:
+                delta[key] = nested
+        elif value != previous or key not in old:
+            delta[key] = value
+    for key in old.keys() - new.keys():
+        delta[key] = None
+    return delta
+
+
+def merge_deltas(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two consecutive deltas; later values win."""
+    merged = dict(first)
+    for key, value in second.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_deltas(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+_hub: Optional[ValuationHub] = None
+
+
+def get_valuation_hub() -> ValuationHub:
+    """Get the process-wide valuation hub."""
+    global _hub
+
+    if _hub is None:
+        _hub = ValuationHub()
+        _hub.attach(get_invalidation_bus())
+    return _hub
+
+
+async def close_valuation_hub() -> None:
+    """Stop the process-wide hub's feed, if it was ever started."""
+    global _hub
+
+    if _hub is not None:
+        _hub.detach(get_invalidation_bus())
+        await _hub.stop()
+        _hub = None
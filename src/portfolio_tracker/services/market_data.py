@@ -0,0 +1,110 @@
+"""
+Market Data Providers
+
+Clients for external market data APIs.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Protocol
+
+import httpx
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.utils.exceptions import MarketDataUnavailableException
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """Latest daily quote for a symbol."""
+
+    symbol: str
+    date: date
+    close: Decimal
+    open: Optional[Decimal] = None
+    high: Optional[Decimal] = None
+    low: Optional[Decimal] = None
+    volume: Optional[Decimal] = None
+
+
+class PriceProvider(Protocol):
+    """Interface implemented by market data providers."""
+
+    source: str
+
+    async def fetch_quote(self, symbol: str) -> PriceQuote:
+        """Fetch the latest quote for a symbol."""
+        ...
+
+    async def aclose(self) -> None:
+        """Release provider resources."""
+        ...
+
+
+class AlphaVantageProvider:
+    """Alpha Vantage ``GLOBAL_QUOTE`` client."""
+
+    source = "alpha_vantage"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: float = 10.0,
+    ) -> None:
+        """Initialize provider with an HTTP client."""
+        self.api_key = api_key or settings.ALPHA_VANTAGE_API_KEY
+        self.client = httpx.AsyncClient(
+            base_url=base_url or settings.ALPHA_VANTAGE_BASE_URL, timeout=timeout
+        )
+
+    async def fetch_quote(self, symbol: str) -> PriceQuote:
+        """
+        Fetch the latest quote for a symbol.
+
+        Args:
+            symbol: Ticker symbol
+
+        Returns:
+            PriceQuote: Latest daily quote
+
+        Raises:
+            MarketDataUnavailableException: On HTTP errors, throttling or
+                an empty quote
+        """
+        try:
+            response = await self.client.get(
+                "",
+                params={
+                    "function": "GLOBAL_QUOTE",
+                    "symbol": symbol,
+                    "apikey": self.api_key,
+                },
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            raise MarketDataUnavailableException(symbol, {"error": str(e)}) from e
+
+        payload = response.json()
+        quote = payload.get("Global Quote")
+        if not quote:
+            # Throttling and invalid symbols come back as 200 with a note
+            reason = payload.get("Note") or payload.get("Information") or "empty quote"
+            raise MarketDataUnavailableException(symbol, {"error": reason})
+
+        return PriceQuote(
+            symbol=symbol,
+            date=date.fromisoformat(quote["07. latest trading day"]),
+            close=Decimal(quote["05. price"]),
+            open=Decimal(quote["02. open"]),
+            high=Decimal(quote["03. high"]),
+            low=Decimal(quote["04. low"]),
+            volume=Decimal(quote["06. volume"]),
+        )
+
+    async def aclose(self) -> None:
+        """Close the HTTP client."""
+        await self.client.aclose()
@@ -0,0 +1,211 @@
+"""
+Net Worth Service
+
+Roll-up of all of a user's portfolios: net worth, cost, gain/loss and
+allocation in one reporting currency.
+
+Holdings are aggregated in the database with one query joining
+``portfolios`` and ``holdings`` grouped by portfolio currency and asset
+type, so only a handful of rows are transferred however many portfolios
+and holdings the user has. Each currency group is converted once at the
+latest exchange rate.
+
+Results are cached per user under the version of the user's portfolios,
+holdings and transactions (see :meth:`PortfolioRepository.get_user_version`),
+so any write to one of them misses the cache, including one that commits
+while a roll-up is being computed. Superseded entries age out with
+``NET_WORTH_CACHE_SECONDS`` or ``NET_WORTH_CACHE_MAX_ENTRIES``.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.portfolio import Portfolio
+from portfolio_tracker.models.schemas.analytics import (
+    AssetAllocation,
+    CurrencyExposure,
+    NetWorth,
+)
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.services.analytics import BASIS_POINT, CENT
+from portfolio_tracker.services.currency import CurrencyConversionService
+from portfolio_tracker.utils.cache import LocalCache
+
+settings = get_settings()
+
+
+class NetWorthService:
+    """Service for user-level portfolio roll-ups."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def get_net_worth(
+        self, user_id: int, currency: Optional[str] = None
+    ) -> NetWorth:
+        """
+        Roll up every portfolio of a user.
+
+        Args:
+            user_id: Owner user ID
+            currency: Reporting currency; defaults to the portfolios'
+                currency when they share one, else the FX pivot currency
+
+        Returns:
+            NetWorth: Aggregated metrics
+
+        Raises:
+            ExchangeRateUnavailableException: If a portfolio currency cannot
+                be converted into the reporting currency
+        """
+        repository = PortfolioRepository(self.session)
+        version = await repository.get_user_version(user_id)
+        cache = get_net_worth_cache()
+        key = (currency, date.today(), *version)
+        cached = cache.get(user_id, key)
+        if cached is not None:
+            return cached
+
+        portfolio_ids = [
+            row.id for row in await repository.select_for_user(user_id, ("id",))
+        ]
+        result = await self.session.execute(
+            select(
+                Portfolio.currency,
+                Holding.asset_type,
+                func.count(Holding.id),
+                func.coalesce(func.sum(Holding.market_value), 0),
+                func.coalesce(func.sum(Holding.total_cost), 0),
+            )
+            .join(Holding, Holding.portfolio_id == Portfolio.id)
+            .where(Portfolio.user_id == user_id)
+            .group_by(Portfolio.currency, Holding.asset_type)
+        )
+        groups = [
+            (group_currency, asset_type, count, Decimal(value), Decimal(cost))
+            for group_currency, asset_type, count, value, cost in result.all()
+        ]
+
+        currencies = sorted({group[0] for group in groups})
+        if currency is None:
+            currency = (
+                currencies[0] if len(currencies) == 1 else settings.FX_PIVOT_CURRENCY
+            )
+        rates = await self._latest_rates(currencies, currency)
+
+        net_worth = summarize(user_id, currency, len(portfolio_ids), groups, rates)
+        cache.set(user_id, key, net_worth)
+        return net_worth
+
+    async def _latest_rates(
+        self, currencies: List[str], target: str
+    ) -> Dict[str, Decimal]:
+        """Latest rate from each currency into ``target``."""
+        rates = {source: Decimal("1") for source in currencies if source == target}
+        foreign = [source for source in currencies if source != target]
+        if foreign:
+            today = date.today()
+            index = await CurrencyConversionService(self.session).load_index(
+                [*foreign, target], today
+            )
+            for source in foreign:
+                rates[source] = Decimal(str(index.rates(source, target, [today])[0]))
+        return rates
+
+
+def summarize(
+    user_id: int,
+    currency: str,
+    portfolios_count: int,
+    groups: List[Tuple[str, str, int, Decimal, Decimal]],
+    rates: Dict[str, Decimal],
+) -> NetWorth:
+    """
+    Build the roll-up from (currency, asset_type, count, value, cost) groups.
+
+    Args:
+        user_id: Owner user ID
+        currency: Reporting currency
+        portfolios_count: Number of portfolios rolled up
+        groups: Aggregated holdings in their portfolio's currency
+        rates: Rate from each group currency into ``currency``
+
+    Returns:
+        NetWorth: Aggregated metrics
+    """
+    by_asset_type: Dict[str, Decimal] = defaultdict(Decimal)
+    by_currency: Dict[str, List[Decimal]] = defaultdict(lambda: [Decimal("0")] * 3)
+    total_cost = Decimal("0")
+    for group_currency, asset_type, _, value, cost in groups:
+        rate = rates[group_currency]
+        by_asset_type[asset_type] += value * rate
+        exposure = by_currency[group_currency]
+        exposure[0] += value
+        exposure[1] += cost
+        exposure[2] += value * rate
+        total_cost += cost * rate
+
+    total_value = sum(by_asset_type.values(), Decimal("0"))
+    gain_loss = total_value - total_cost
+
+    def weight(value: Decimal) -> Decimal:
+        return (
+            (value / total_value).quantize(BASIS_POINT) if total_value else Decimal("0")
+        )
+
+    return NetWorth(
+        user_id=user_id,
+        currency=currency,
+        as_of=datetime.utcnow(),
+        portfolios_count=portfolios_count,
+        holdings_count=sum(group[2] for group in groups),
+        total_value=total_value.quantize(CENT),
+        total_cost=total_cost.quantize(CENT),
+        total_gain_loss=gain_loss.quantize(CENT),
+        total_gain_loss_percent=(
+            (gain_loss / total_cost * 100).quantize(CENT)
+            if total_cost
+            else Decimal("0.00")
+        ),
+        allocation=[
+            AssetAllocation(
+                asset_type=asset_type,
+                market_value=value.quantize(CENT),
+                weight=weight(value),
+            )
+            for asset_type, value in sorted(by_asset_type.items())
+        ],
+        currencies=[
+            CurrencyExposure(
+                currency=group_currency,
+                market_value=value.quantize(CENT),
+                total_cost=cost.quantize(CENT),
+                converted_value=converted.quantize(CENT),
+                weight=weight(converted),
+            )
+            for group_currency, (value, cost, converted) in sorted(by_currency.items())
+        ],
+    )
+
+
+_cache: Optional[LocalCache[NetWorth]] = None
+
+
+def get_net_worth_cache() -> LocalCache[NetWorth]:
+    """Get the process-wide roll-up cache, keyed by user and data version."""
+    global _cache
+
+    if _cache is None:
+        _cache = LocalCache(
+            settings.NET_WORTH_CACHE_SECONDS,
+            max_entries=settings.NET_WORTH_CACHE_MAX_ENTRIES,
+        )
+    return _cache
@@ -0,0 +1,310 @@
+"""
+Optimization Service
+
+Mean-variance optimization over the symbols of a portfolio.
+
+Annualized expected returns and the covariance matrix are estimated from
+daily returns of aligned closes and cached per symbol set, so every
+portfolio holding the same symbols reuses them for the rest of the day.
+
+Frontier portfolios are long-only and fully invested. Each point minimizes
+``w'Σw - λ·μ'w`` for one risk aversion ``λ``; all points are solved
+together by accelerated projected gradient descent on a ``(points,
+symbols)`` weight matrix, so one iteration is one matrix product and one
+batched simplex projection. ``λ = 0`` is the minimum-variance portfolio.
+The maximum-Sharpe portfolio is the best frontier point after a second
+batched pass on a finer grid around it.
+"""
+
+import asyncio
+from datetime import date, timedelta
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.schemas.optimization import (
+    EfficientFrontier,
+    FrontierPoint,
+    OptimizedPortfolio,
+)
+from portfolio_tracker.repositories.market_price import (
+    CloseHistory,
+    MarketPriceRepository,
+)
+from portfolio_tracker.services.analytics import align_closes
+from portfolio_tracker.utils.cache import LocalCache
+from portfolio_tracker.utils.exceptions import BusinessLogicException
+
+settings = get_settings()
+
+TRADING_DAYS = 252
+MIN_HISTORY_DAYS = 20
+# Symbols with less history than this share of the longest are excluded,
+# so one recent listing does not cut the window for all others
+MIN_COVERAGE = 0.8
+MAX_ITERATIONS = 5_000
+TOLERANCE = 1e-9
+
+# (symbols, annualized mean returns, annualized covariance, history days,
+# latest closes)
+Estimates = Tuple[Tuple[str, ...], np.ndarray, np.ndarray, int, np.ndarray]
+
+
+def project_simplex(points: np.ndarray) -> np.ndarray:
+    """Euclidean projection of each row onto the probability simplex."""
+    k, n = points.shape
+    ordered = -np.sort(-points, axis=1)
+    excess = np.cumsum(ordered, axis=1) - 1.0
+    ranks = np.arange(1, n + 1)
+    support = ordered - excess / ranks > 0
+    last = n - 1 - np.argmax(support[:, ::-1], axis=1)
+    theta = excess[np.arange(k), last] / (last + 1)
+    projected: np.ndarray = np.maximum(points - theta[:, None], 0.0)
+    return projected
+
+
+def solve_frontier(
+    mu: np.ndarray, cov: np.ndarray, risk_aversion: np.ndarray
+) -> np.ndarray:
+    """
+    Solve long-only mean-variance portfolios for many risk aversions at once.
+
+    Args:
+        mu: ``(n,)`` expected returns
+        cov: ``(n, n)`` covariance matrix
+        risk_aversion: ``(k,)`` values of ``λ``
+
+    Returns:
+        np.ndarray: ``(k, n)`` weights, one row per ``λ``
+    """
+    k, n = len(risk_aversion), len(mu)
+    lipschitz = 2.0 * max(float(np.linalg.eigvalsh(cov)[-1]), 1e-12)
+    step = 1.0 / lipschitz
+    linear = risk_aversion[:, None] * mu
+
+    weights = np.full((k, n), 1.0 / n)
+    momentum, t = weights, 1.0
+    for _ in range(MAX_ITERATIONS):
+        gradient = 2.0 * momentum @ cov - linear
+        updated = project_simplex(momentum - step * gradient)
+        t_next = (1.0 + np.sqrt(1.0 + 4.0 * t * t)) / 2.0
+        momentum = updated + ((t - 1.0) / t_next) * (updated - weights)
+        converged = np.max(np.abs(updated - weights)) < TOLERANCE
+        weights, t = updated, t_next
+        if converged:
+            break
+    return weights
+
+
+def portfolio_stats(
+    weights: np.ndarray, mu: np.ndarray, cov: np.ndarray, risk_free_rate: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns, volatilities and Sharpe ratios of ``(k, n)`` weight rows."""
+    returns = weights @ mu
+    volatility = np.sqrt(np.maximum(np.einsum("ij,jk,ik->i", weights, cov, weights), 0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(volatility > 0, (returns - risk_free_rate) / volatility, 0.0)
+    return returns, volatility, sharpe
+
+
+def efficient_frontier(
+    mu: np.ndarray, cov: np.ndarray, points: int, risk_free_rate: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Trace the long-only efficient frontier.
+
+    Returns:
+        Tuple of (frontier weights by increasing volatility, minimum-variance
+        weights, maximum-Sharpe weights)
+    """
+    # λ from 0 (minimum variance) up to where the best asset dominates
+    spread = max(float(mu.max() - mu.min()), 1e-6)
+    scale = 2.0 * float(np.linalg.eigvalsh(cov)[-1]) / spread
+    grid = np.concatenate(([0.0], np.geomspace(1e-3 * scale, 1e2 * scale, points - 1)))
+    weights = solve_frontier(mu, cov, grid)
+    _, _, sharpe = portfolio_stats(weights, mu, cov, risk_free_rate)
+
+    best = int(np.argmax(sharpe))
+    fine = np.linspace(grid[max(best - 1, 0)], grid[min(best + 1, points - 1)], 21)
+    refined = solve_frontier(mu, cov, fine)
+    _, _, refined_sharpe = portfolio_stats(refined, mu, cov, risk_free_rate)
+    max_sharpe = (
+        refined[int(np.argmax(refined_sharpe))]
+        if refined_sharpe.max() > sharpe[best]
+        else weights[best]
+    )
+
+    # Large λ values converge on the same corner portfolio
+    returns, volatility, _ = portfolio_stats(weights, mu, cov, risk_free_rate)
+    _, distinct = np.unique(
+        np.round(np.c_[returns, volatility], 6), axis=0, return_index=True
+    )
+    frontier = weights[np.sort(distinct)]
+    frontier = frontier[np.argsort(portfolio_stats(frontier, mu, cov, 0.0)[1])]
+    return frontier, weights[0], max_sharpe
+
+
+def estimate(histories: Dict[str, CloseHistory], symbols: Sequence[str]) -> Estimates:
+    """
+    Estimate annualized mean returns and covariance of some symbols.
+
+    Symbols with too little history are left out.
+    """
+    lengths = {symbol: len(histories.get(symbol, ((), ()))[0]) for symbol in symbols}
+    longest = max(lengths.values(), default=0)
+    kept = tuple(
+        symbol
+        for symbol in symbols
+        if lengths[symbol] > MIN_HISTORY_DAYS
+        and lengths[symbol] >= MIN_COVERAGE * longest
+    )
+    if not kept:
+        return kept, np.empty(0), np.empty((0, 0)), 0, np.empty(0)
+
+    _, closes = align_closes(histories, kept)
+    returns = closes[1:] / closes[:-1] - 1.0
+    mu = returns.mean(axis=0) * TRADING_DAYS
+    cov = np.atleast_2d(np.cov(returns, rowvar=False)) * TRADING_DAYS
+    return kept, mu, cov, len(returns), closes[-1]
+
+
+class OptimizationService:
+    """Service for mean-variance optimization."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def get_frontier(
+        self,
+        portfolio_id: int,
+        points: int = 50,
+        risk_free_rate: Optional[float] = None,
+        lookback_years: Optional[int] = None,
+    ) -> EfficientFrontier:
+        """
+        Compute the efficient frontier of a portfolio's symbols.
+
+        Args:
+            portfolio_id: Portfolio ID
+            points: Risk aversion values traced (duplicates are dropped)
+            risk_free_rate: Annual rate for Sharpe ratios
+            lookback_years: Years of closes used for the estimates
+
+        Returns:
+            EfficientFrontier: Frontier with current, minimum-variance and
+            maximum-Sharpe portfolios
+
+        Raises:
+            BusinessLogicException: If fewer than two symbols have prices
+        """
+        if risk_free_rate is None:
+            risk_free_rate = settings.OPTIMIZATION_RISK_FREE_RATE
+        lookback_years = lookback_years or settings.OPTIMIZATION_LOOKBACK_YEARS
+
+        quantities = await self._load_quantities(portfolio_id)
+        symbols = tuple(sorted(quantities))
+        if len(symbols) > settings.OPTIMIZATION_MAX_SYMBOLS:
+            raise BusinessLogicException(
+                f"Portfolio {portfolio_id} holds more than "
+                f"{settings.OPTIMIZATION_MAX_SYMBOLS} symbols",
+                code="TOO_MANY_SYMBOLS",
+            )
+        kept, mu, cov, history_days, last_closes = await self._get_estimates(
+            symbols, lookback_years
+        )
+        if len(kept) < 2:
+            raise BusinessLogicException(
+                f"Not enough price history to optimize portfolio {portfolio_id}",
+                code="INSUFFICIENT_PRICE_HISTORY",
+                details={"symbols_with_history": list(kept)},
+            )
+
+        values = np.array([quantities[symbol] for symbol in kept]) * last_closes
+        current = values / values.sum()
+
+        frontier, min_variance, max_sharpe = await asyncio.to_thread(
+            efficient_frontier, mu, cov, points, risk_free_rate
+        )
+        portfolios = np.vstack([current, min_variance, max_sharpe])
+        returns, volatility, sharpe = portfolio_stats(
+            portfolios, mu, cov, risk_free_rate
+        )
+        summary = [
+            OptimizedPortfolio(
+                expected_return=round(float(returns[row]), 4),
+                volatility=round(float(volatility[row]), 4),
+                sharpe_ratio=round(float(sharpe[row]), 4),
+                weights={
+                    symbol: round(float(weight), 4)
+                    for symbol, weight in zip(kept, portfolios[row])
+                    if weight >= 1e-4
+                },
+            )
+            for row in range(3)
+        ]
+        returns, volatility, sharpe = portfolio_stats(frontier, mu, cov, risk_free_rate)
+        return EfficientFrontier(
+            portfolio_id=portfolio_id,
+            symbols=list(kept),
+            excluded_symbols=[s for s in symbols if s not in kept],
+            history_days=history_days,
+            risk_free_rate=risk_free_rate,
+            current=summary[0],
+            min_variance=summary[1],
+            max_sharpe=summary[2],
+            frontier=[
+                FrontierPoint(
+                    expected_return=round(float(r), 4),
+                    volatility=round(float(v), 4),
+                    sharpe_ratio=round(float(s), 4),
+                )
+                for r, v, s in zip(returns, volatility, sharpe)
+            ],
+        )
+
+    async def _load_quantities(self, portfolio_id: int) -> Dict[str, float]:
+        """Quantity held per symbol."""
+        result = await self.session.execute(
+            select(Holding.symbol, Holding.quantity).where(
+                Holding.portfolio_id == portfolio_id, Holding.quantity > 0
+            )
+        )
+        quantities: Dict[str, float] = {}
+        for symbol, quantity in result.all():
+            quantities[symbol] = quantities.get(symbol, 0.0) + float(quantity)
+        return quantities
+
+    async def _get_estimates(
+        self, symbols: Tuple[str, ...], lookback_years: int
+    ) -> Estimates:
+        """Cached return and covariance estimates of a symbol set."""
+        cache = get_covariance_cache()
+        key = (lookback_years, date.today())
+        cached = cache.get(symbols, key)
+        if cached is not None:
+            return cached
+
+        start = date.today() - timedelta(days=round(365.25 * lookback_years))
+        histories = await MarketPriceRepository(self.session).get_close_histories(
+            symbols, start=start
+        )
+        estimates = await asyncio.to_thread(estimate, histories, symbols)
+        cache.set(symbols, key, estimates)
+        return estimates
+
+
+_cache: Optional[LocalCache[Estimates]] = None
+
+
+def get_covariance_cache() -> LocalCache[Estimates]:
+    """Get the process-wide cache of return and covariance estimates."""
+    global _cache
+
+    if _cache is None:
+        _cache = LocalCache(settings.OPTIMIZATION_CACHE_SECONDS, max_entries=256)
+    return _cache
@@ -0,0 +1,499 @@
+"""
+Historical Price Backfill
+
+Loads vendor price dumps (CSV or Parquet) into ``market_prices``.
+
+Files are split into chunks (byte ranges aligned to line breaks for CSV,
+row groups for Parquet). Chunks are parsed, validated and normalized to
+``MarketPrice`` columns in a process pool, since parsing rather than the
+database is the bottleneck, and a single writer in the parent process
+upserts the results. After a chunk is committed its key is recorded in a
+JSON checkpoint, so an interrupted run resumes with the remaining chunks.
+Upserts are idempotent, so a chunk committed just before a crash and
+replayed afterwards is harmless.
+
+CSV files must hold one row per line (no quoted line breaks).
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from multiprocessing import get_context
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.models.db.market_price import MarketPrice
+from portfolio_tracker.services.instruments import InstrumentService
+from portfolio_tracker.services.invalidation import publish_invalidations
+
+logger = get_logger(__name__)
+
+PRICE_COLUMNS = (
+    "symbol",
+    "date",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "adjusted_close",
+)
+
+# Vendor header (lower-cased, spaces and dashes as underscores) -> column
+COLUMN_ALIASES: Dict[str, str] = {
+    "symbol": "symbol",
+    "ticker": "symbol",
+    "date": "date",
+    "timestamp": "date",
+    "trade_date": "date",
+    "open": "open",
+    "high": "high",
+    "low": "low",
+    "close": "close",
+    "last": "close",
+    "volume": "volume",
+    "vol": "volume",
+    "adjusted_close": "adjusted_close",
+    "adj_close": "adjusted_close",
+    "adjclose": "adjusted_close",
+}
+
+CENT = Decimal("0.01")
+MAX_ERRORS_REPORTED = 5
+
+PriceRow = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Part of a file parsed by one worker task."""
+
+    path: str
+    kind: str  # csv | parquet
+    start: int  # byte offset, or row group index
+    end: int
+    header: Tuple[str, ...] = ()
+    symbol: Optional[str] = None  # for files without a symbol column
+
+    @property
+    def key(self) -> str:
+        """Checkpoint key, unique within its file."""
+        return f"{self.start}-{self.end}"
+
+
+@dataclass
+class ChunkResult:
+    """Normalized rows of a chunk."""
+
+    chunk: Chunk
+    rows: List[PriceRow]
+    rejected: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BackfillSummary:
+    """Counters of one backfill run."""
+
+    chunks: int = 0
+    skipped_chunks: int = 0
+    rows: int = 0
+    rejected: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        """Counters as a plain dictionary."""
+        return {
+            "chunks": self.chunks,
+            "skipped_chunks": self.skipped_chunks,
+            "rows": self.rows,
+            "rejected": self.rejected,
+        }
+
+
+# ============================================================================
+# Planning
+# ============================================================================
+
+
+def plan_chunks(
+    path: Path, chunk_bytes: int, symbol: Optional[str] = None
+) -> List[Chunk]:
+    """
+    Split a file into chunks.
+
+    Args:
+        path: CSV or Parquet file
+        chunk_bytes: Approximate CSV chunk size
+        symbol: Symbol for every row, if the file has no symbol column
+
+    Returns:
+        List[Chunk]: Chunks in file order
+    """
+    if path.suffix.lower() in (".parquet", ".pq"):
+        import pyarrow.parquet as pq
+
+        row_groups = pq.ParquetFile(path).num_row_groups
+        return [
+            Chunk(str(path), "parquet", index, index + 1, symbol=symbol)
+            for index in range(row_groups)
+        ]
+
+    with open(path, "rb") as handle:
+        header_line = handle.readline()
+        header = tuple(next(csv.reader([header_line.decode("utf-8-sig")]), ()))
+        size = os.fstat(handle.fileno()).st_size
+        chunks = []
+        start = handle.tell()
+        while start < size:
+            handle.seek(min(start + chunk_bytes, size))
+            handle.readline()  # extend to the end of the current line
+            end = min(handle.tell(), size)
+            chunks.append(Chunk(str(path), "csv", start, end, header, symbol))
+            start = end
+    return chunks
+
+
+# ============================================================================
+# Parsing (runs in worker processes)
+# ============================================================================
+
+
+def parse_chunk(chunk: Chunk) -> ChunkResult:
+    """
+    Parse, validate and normalize one chunk.
+
+    Args:
+        chunk: Chunk to parse
+
+    Returns:
+        ChunkResult: Rows as tuples in ``PRICE_COLUMNS`` order
+    """
+    result = ChunkResult(chunk=chunk, rows=[])
+    for line_number, record in _read_records(chunk):
+        try:
+            result.rows.append(normalize_record(record, chunk.symbol))
+        except (ValueError, InvalidOperation) as exc:
+            result.rejected += 1
+            if len(result.errors) < MAX_ERRORS_REPORTED:
+                result.errors.append(f"{chunk.path}@{line_number}: {exc}")
+    return result
+
+
+def _read_records(chunk: Chunk) -> Iterable[Tuple[Any, Mapping[str, Any]]]:
+    """Yield ``(position, record)`` with columns renamed to model names."""
+    if chunk.kind == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.ParquetFile(chunk.path).read_row_group(chunk.start)
+        names = [normalize_header(name) for name in table.column_names]
+        columns = [table.column(index).to_pylist() for index in range(len(names))]
+        for offset, values in enumerate(zip(*columns)):
+            yield f"row group {chunk.start} row {offset}", dict(zip(names, values))
+        return
+
+    names = [normalize_header(name) for name in chunk.header]
+    with open(chunk.path, "rb") as handle:
+        handle.seek(chunk.start)
+        data = handle.read(chunk.end - chunk.start).decode("utf-8")
+    for offset, row in enumerate(csv.reader(io.StringIO(data))):
+        if row:
+            yield f"byte {chunk.start} row {offset}", dict(zip(names, row))
+
+
+def normalize_header(name: str) -> str:
+    """Map a vendor column name to a ``MarketPrice`` column (or itself)."""
+    key = name.strip().lower().replace(" ", "_").replace("-", "_")
+    return COLUMN_ALIASES.get(key, key)
+
+
+def normalize_record(
+    record: Mapping[str, Any], default_symbol: Optional[str] = None
+) -> PriceRow:
+    """
+    Validate one record and convert it to ``MarketPrice`` column values.
+
+    Raises:
+        ValueError: If a required value is missing or out of range
+    """
+    symbol = str(record.get("symbol") or default_symbol or "").strip().upper()
+    if not symbol or len(symbol) > 20:
+        raise ValueError(f"invalid symbol {symbol!r}")
+
+    price_date = _parse_date(record.get("date"))
+    open_, high, low, close, adjusted_close = (
+        _parse_price(record.get(name))
+        for name in ("open", "high", "low", "close", "adjusted_close")
+    )
+    if close is None or close <= 0:
+        raise ValueError("close must be positive")
+    if high is not None and low is not None and high < low:
+        raise ValueError("high is below low")
+
+    volume = _parse_decimal(record.get("volume"))
+    if volume is not None:
+        if volume < 0:
+            raise ValueError("negative volume")
+        volume = volume.to_integral_value(ROUND_HALF_UP)
+
+    return (symbol, price_date, open_, high, low, close, volume, adjusted_close)
+
+
+def _parse_date(value: Any) -> date:
+    """Parse ISO, ``YYYY/MM/DD`` and ``YYYYMMDD`` dates and timestamps."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value or "").strip()
+    if len(text) == 8 and text.isdigit():
+        text = f"{text[:4]}-{text[4:6]}-{text[6:]}"
+    try:
+        return date.fromisoformat(text[:10].replace("/", "-"))
+    except ValueError:
+        raise ValueError(f"invalid date {value!r}") from None
+
+
+def _parse_decimal(value: Any) -> Optional[Decimal]:
+    """Parse a number, treating blanks and NaN as missing."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text or text.lower() in ("nan", "null", "na", "-"):
+        return None
+    number = Decimal(text)
+    if not number.is_finite():
+        return None
+    return number
+
+
+def _parse_price(value: Any) -> Optional[Decimal]:
+    """Parse a price rounded to the column's two decimals."""
+    number = _parse_decimal(value)
+    if number is None:
+        return None
+    if number < 0:
+        raise ValueError(f"negative price {value!r}")
+    return number.quantize(CENT, ROUND_HALF_UP)
+
+
+# ============================================================================
+# Checkpoints
+# ============================================================================
+
+
+class Checkpoint:
+    """Committed chunk keys per file, persisted as JSON."""
+
+    def __init__(self, path: Optional[Path]) -> None:
+        """Load the checkpoint at ``path`` (None disables persistence)."""
+        self.path = path
+        self._files: Dict[str, Dict[str, Any]] = {}
+        if path is not None and path.exists():
+            self._files = json.loads(path.read_text())["files"]
+
+    def completed(self, file_path: Path) -> Set[str]:
+        """Chunk keys already committed for an unchanged file."""
+        entry = self._files.get(str(file_path))
+        if entry is None or entry["fingerprint"] != _fingerprint(file_path):
+            return set()
+        return set(entry["chunks"])
+
+    def mark(self, chunk: Chunk) -> None:
+        """Record a committed chunk and persist."""
+        file_path = Path(chunk.path)
+        fingerprint = _fingerprint(file_path)
+        entry = self._files.get(chunk.path)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            entry = self._files[chunk.path] = {"fingerprint": fingerprint, "chunks": []}
+        entry["chunks"].append(chunk.key)
+        self._save()
+
+    def _save(self) -> None:
+        """Write atomically so a crash never leaves a truncated file."""
+        if self.path is None:
+            return
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(json.dumps({"files": self._files}))
+        os.replace(temporary, self.path)
+
+
+def _fingerprint(path: Path) -> List[int]:
+    """Size and modification time identifying a file's contents."""
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+# ============================================================================
+# Writing
+# ============================================================================
+
+
+class PriceWriter:
+    """Upserts normalized rows into ``market_prices``."""
+
+    def __init__(self, source: str, batch_rows: int = 2000) -> None:
+        """
+        Initialize writer.
+
+        Args:
+            source: Value stored in ``market_prices.source``
+            batch_rows: Rows per INSERT statement
+        """
+        self.source = source
+        self.batch_rows = batch_rows
+
+    async def write(self, session: AsyncSession, rows: Sequence[PriceRow]) -> int:
+        """
+        Upsert rows in the session's transaction.
+
+        Later rows win when a chunk repeats a ``(symbol, date)``.
+
+        Returns:
+            int: Distinct rows written
+        """
+        unique = {(row[0], row[1]): row for row in rows}
+        if not unique:
+            return 0
+
+        symbols = {symbol for symbol, _ in unique}
+        instrument_ids = await InstrumentService(session).get_ids(symbols, create=True)
+
+        dialect = session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert(MarketPrice)
+        # One compiled statement, executed with batched multi-row VALUES
+        upsert = statement.on_conflict_do_update(
+            index_elements=["instrument_id", "date"],
+            set_={
+                name: statement.excluded[name]
+                for name in (*PRICE_COLUMNS[2:], "source", "updated_at")
+            },
+        )
+        values = [
+            {
+                "instrument_id": instrument_ids[row[0]],
+                **dict(zip(PRICE_COLUMNS[1:], row[1:])),
+                "source": self.source,
+            }
+            for row in unique.values()
+        ]
+        for start in range(0, len(values), self.batch_rows):
+            await session.execute(upsert, values[start : start + self.batch_rows])
+        await publish_invalidations(session, "market_price", symbols)
+        return len(unique)
+
+
+async def backfill(
+    paths: Sequence[Path],
+    session_factory: async_sessionmaker[AsyncSession],
+    writer: PriceWriter,
+    checkpoint: Checkpoint,
+    chunk_bytes: int = 8 * 1024 * 1024,
+    workers: Optional[int] = None,
+    symbol_from_filename: bool = False,
+    on_progress: Optional[Callable[[ChunkResult], None]] = None,
+) -> BackfillSummary:
+    """
+    Backfill price files.
+
+    Args:
+        paths: CSV or Parquet files
+        session_factory: Session factory of the target database
+        writer: Bulk writer
+        checkpoint: Committed chunks to skip and record
+        chunk_bytes: Approximate CSV chunk size
+        workers: Parser processes (0 parses in this process)
+        symbol_from_filename: Use the file stem as symbol (``AAPL.csv``)
+        on_progress: Called after each chunk is committed
+
+    Returns:
+        BackfillSummary: Counters of the run
+    """
+    summary = BackfillSummary()
+    pending: List[Chunk] = []
+    for path in paths:
+        symbol = path.stem.upper() if symbol_from_filename else None
+        done = checkpoint.completed(path)
+        for chunk in plan_chunks(path, chunk_bytes, symbol):
+            if chunk.key in done:
+                summary.skipped_chunks += 1
+            else:
+                pending.append(chunk)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    executor: Optional[Executor] = None
+    if workers > 0 and pending:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=get_context("spawn")
+        )
+    try:
+        async for result in _parse_all(pending, executor, 2 * workers):
+            async with session_factory() as session:
+                summary.rows += await writer.write(session, result.rows)
+                await session.commit()
+            checkpoint.mark(result.chunk)
+            summary.chunks += 1
+            summary.rejected += result.rejected
+            for error in result.errors:
+                logger.warning("Rejected row %s", error)
+            if on_progress is not None:
+                on_progress(result)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return summary
+
+
+async def _parse_all(
+    chunks: Sequence[Chunk], executor: Optional[Executor], limit: int
+) -> AsyncIterator[ChunkResult]:
+    """
+    Yield parsed chunks as they complete.
+
+    At most ``limit`` chunks are in flight, which bounds memory while
+    keeping every worker busy during writes.
+    """
+    if executor is None:
+        for chunk in chunks:
+            yield parse_chunk(chunk)
+        return
+
+    loop = asyncio.get_running_loop()
+    remaining = iter(chunks)
+    in_flight: Set["asyncio.Future[ChunkResult]"] = set()
+    for chunk in remaining:
+        in_flight.add(loop.run_in_executor(executor, parse_chunk, chunk))
+        if len(in_flight) >= limit:
+            break
+    while in_flight:
+        done, in_flight = await asyncio.wait(
+            in_flight, return_when=asyncio.FIRST_COMPLETED
+        )
+        for future in done:
+            queued = next(remaining, None)
+            if queued is not None:
+                in_flight.add(loop.run_in_executor(executor, parse_chunk, queued))
+            yield future.result()
@@ -0,0 +1,235 @@
+"""
+As-of Price Index
+
+In-process index answering "last known close on or before date D" for
+many symbols and dates at once.
+
+Each symbol's full close history is kept as a sorted ``datetime64[D]``
+array and an aligned ``float64`` close array. Symbols are loaded from
+``market_prices`` (or the columnar price store) on first use, all missing
+ones in one query, and are dropped again when the invalidation bus
+reports new prices for them, after ``PRICE_INDEX_TTL_SECONDS``, or when
+the least recently used symbols exceed ``PRICE_INDEX_MAX_SYMBOLS``.
+
+Lookups are binary searches. :func:`asof_merge` resolves a whole
+``(dates, symbols)`` grid with one ``searchsorted`` over the concatenated
+histories, keyed by symbol offset and day number, so weekends, holidays
+and stale symbols cost nothing extra.
+"""
+
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.repositories.market_price import (
+    CloseHistory,
+    MarketPriceRepository,
+)
+from portfolio_tracker.services.invalidation import Invalidation, get_invalidation_bus
+
+settings = get_settings()
+
+# Key offset between series; day numbers stay far below it
+_STRIDE = np.int64(1) << 32
+
+
+def asof_merge(axis: np.ndarray, series: Sequence[CloseHistory]) -> np.ndarray:
+    """
+    Join several (dates, values) series onto a date axis.
+
+    Args:
+        axis: ``datetime64[D]`` dates, in any order
+        series: Sorted (dates, values) pairs
+
+    Returns:
+        np.ndarray: ``(len(axis), len(series))`` last value on or before
+        each date; NaN before a series' first date
+    """
+    if not series:
+        return np.empty((len(axis), 0))
+    offsets = np.arange(len(series), dtype=np.int64) * _STRIDE
+    keys = np.concatenate(
+        [offset + dates.astype(np.int64) for offset, (dates, _) in zip(offsets, series)]
+    )
+    values = np.concatenate([values for _, values in series]).astype(np.float64)
+    if not len(keys):
+        return np.full((len(axis), len(series)), np.nan)
+    block_starts = np.cumsum([0] + [len(dates) for dates, _ in series[:-1]])
+
+    queries = offsets[None, :] + axis.astype("datetime64[D]").astype(np.int64)[:, None]
+    positions = np.searchsorted(keys, queries, side="right") - 1
+    return np.where(
+        positions >= block_starts[None, :], values[np.maximum(positions, 0)], np.nan
+    )
+
+
+class AsOfPriceIndex:
+    """LRU map of symbol -> sorted (dates, closes) with as-of lookups."""
+
+    def __init__(
+        self,
+        max_symbols: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize index.
+
+        Args:
+            max_symbols: Symbols kept before evicting least recently used
+            ttl_seconds: Lifetime of a loaded history
+            clock: Time source (monotonic seconds)
+        """
+        self.max_symbols = max_symbols
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._series: "OrderedDict[str, Tuple[float, CloseHistory]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of indexed symbols."""
+        return len(self._series)
+
+    def missing(self, symbols: Sequence[str]) -> List[str]:
+        """Symbols that are not indexed or have expired."""
+        now = self._clock()
+        return [
+            symbol
+            for symbol in dict.fromkeys(symbols)
+            if symbol not in self._series or self._series[symbol][0] <= now
+        ]
+
+    def put(self, symbol: str, history: CloseHistory) -> None:
+        """Index a symbol's full history (an empty one marks it unpriced)."""
+        self._series[symbol] = (self._clock() + self.ttl_seconds, history)
+        self._series.move_to_end(symbol)
+        while len(self._series) > self.max_symbols:
+            self._series.popitem(last=False)
+
+    def history(self, symbol: str) -> Optional[CloseHistory]:
+        """Indexed (dates, closes) of a symbol, or None if unpriced."""
+        entry = self._series.get(symbol)
+        if entry is None or not len(entry[1][0]):
+            return None
+        self._series.move_to_end(symbol)
+        return entry[1]
+
+    def closes_as_of(self, symbols: Sequence[str], dates: np.ndarray) -> np.ndarray:
+        """
+        Last close on or before each date.
+
+        Returns:
+            np.ndarray: ``(len(dates), len(symbols))`` closes; NaN before
+            a symbol's first close or for unpriced symbols
+        """
+        empty = (np.empty(0, dtype="datetime64[D]"), np.empty(0))
+        return asof_merge(dates, [self.history(symbol) or empty for symbol in symbols])
+
+    def latest(
+        self, symbols: Sequence[str], on: Optional[date] = None
+    ) -> Dict[str, float]:
+        """Last close on or before ``on`` (default today) of priced symbols."""
+        day = np.array([on or date.today()], dtype="datetime64[D]")
+        closes = self.closes_as_of(symbols, day)[0]
+        return {
+            symbol: float(close)
+            for symbol, close in zip(symbols, closes)
+            if not np.isnan(close)
+        }
+
+    def invalidate(self, symbol: str) -> None:
+        """Drop a symbol; it is reloaded on next use."""
+        self._series.pop(symbol, None)
+
+    def clear(self) -> None:
+        """Drop everything."""
+        self._series.clear()
+
+
+class PriceIndexService:
+    """Service loading symbols into the process-wide as-of index."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+        self.index = get_price_index()
+
+    async def ensure(self, symbols: Sequence[str]) -> AsOfPriceIndex:
+        """Load every missing or expired symbol with one query."""
+        missing = self.index.missing(symbols)
+        if missing:
+            histories = await MarketPriceRepository(self.session).get_close_histories(
+                missing
+            )
+            empty = (np.empty(0, dtype="datetime64[D]"), np.empty(0))
+            for symbol in missing:
+                self.index.put(symbol, histories.get(symbol, empty))
+        return self.index
+
+    async def histories(
+        self,
+        symbols: Sequence[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[str, CloseHistory]:
+        """
+        Get indexed close histories sliced to a date range.
+
+        Returns:
+            Dict of symbol -> (dates, closes); symbols without prices in
+            the range are omitted
+        """
+        index = await self.ensure(symbols)
+        lo = np.datetime64(start, "D") if start else None
+        hi = np.datetime64(end, "D") if end else None
+        histories: Dict[str, CloseHistory] = {}
+        for symbol in symbols:
+            history = index.history(symbol)
+            if history is None:
+                continue
+            dates, closes = history
+            first = np.searchsorted(dates, lo, side="left") if lo is not None else 0
+            last = np.searchsorted(dates, hi, side="right") if hi is not None else None
+            if len(dates[first:last]):
+                histories[symbol] = (dates[first:last], closes[first:last])
+        return histories
+
+    async def closes_as_of(
+        self, symbols: Sequence[str], dates: np.ndarray
+    ) -> np.ndarray:
+        """Batched as-of closes; see :meth:`AsOfPriceIndex.closes_as_of`."""
+        index = await self.ensure(symbols)
+        return index.closes_as_of(symbols, dates)
+
+    async def latest(
+        self, symbols: Sequence[str], on: Optional[date] = None
+    ) -> Dict[str, float]:
+        """Last close on or before ``on`` (default today) per priced symbol."""
+        index = await self.ensure(symbols)
+        return index.latest(symbols, on)
+
+
+_index: Optional[AsOfPriceIndex] = None
+
+
+def get_price_index() -> AsOfPriceIndex:
+    """Get the process-wide index, evicting symbols on price invalidations."""
+    global _index
+
+    if _index is None:
+        _index = AsOfPriceIndex(
+            settings.PRICE_INDEX_MAX_SYMBOLS, settings.PRICE_INDEX_TTL_SECONDS
+        )
+        index = _index
+
+        def evict(invalidation: Invalidation) -> None:
+            index.invalidate(invalidation.id)
+
+        bus = get_invalidation_bus()
+        bus.subscribe("market_price", evict)
+        bus.on_reset(index.clear)
+    return _index
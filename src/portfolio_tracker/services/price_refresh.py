@@ -0,0 +1,369 @@
+"""
+Price Refresh Scheduler
+
+In-process asyncio scheduler that keeps ``market_prices`` and
+``Holding.current_price`` fresh. Each cycle picks the symbols that are
+due (stale and not backing off), ordered by how much is held in them,
+fetches quotes with bounded concurrency and jitter, and persists the
+results together with a per-symbol watermark in ``price_refresh_state``.
+
+Holdings are revalued in the same transaction, or handed to a
+:class:`HoldingPriceBuffer` that coalesces and writes them behind.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.market_price import MarketPrice
+from portfolio_tracker.models.db.price_refresh_state import PriceRefreshState
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.services.holding_prices import HoldingPriceBuffer
+from portfolio_tracker.services.instruments import InstrumentService
+from portfolio_tracker.services.invalidation import publish_invalidations
+from portfolio_tracker.services.market_data import PriceProvider, PriceQuote
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+@dataclass
+class RefreshSummary:
+    """Outcome of one refresh cycle."""
+
+    selected: int = 0
+    refreshed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+class PriceRefreshScheduler:
+    """
+    Priority-ordered price refresh loop.
+
+    Symbols are ranked by total held market value, then by the number of
+    portfolios holding them, so the prices users actually see are
+    refreshed first and provider quota is not spent on unheld symbols.
+    """
+
+    def __init__(
+        self,
+        provider: PriceProvider,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        refresh_interval: Optional[int] = None,
+        poll_interval: Optional[int] = None,
+        jitter: Optional[float] = None,
+        backoff_base: Optional[int] = None,
+        backoff_max: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        holding_prices: Optional[HoldingPriceBuffer] = None,
+    ) -> None:
+        """
+        Initialize scheduler; unset options fall back to settings.
+
+        Without ``holding_prices`` holdings are revalued synchronously.
+        """
+        if session_factory is None:
+            from portfolio_tracker.config.database import get_session_factory
+
+            session_factory = get_session_factory()
+
+        self.provider = provider
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.PRICE_REFRESH_CONCURRENCY
+        self.batch_size = batch_size or settings.PRICE_REFRESH_BATCH_SIZE
+        self.refresh_interval = timedelta(
+            seconds=refresh_interval or settings.PRICE_REFRESH_INTERVAL_SECONDS
+        )
+        self.poll_interval = poll_interval or settings.PRICE_REFRESH_POLL_SECONDS
+        self.jitter = (
+            settings.PRICE_REFRESH_JITTER_SECONDS if jitter is None else jitter
+        )
+        self.backoff_base = backoff_base or settings.PRICE_REFRESH_BACKOFF_BASE_SECONDS
+        self.backoff_max = backoff_max or settings.PRICE_REFRESH_BACKOFF_MAX_SECONDS
+        self.rng = rng or random.Random()
+        self.holding_prices = holding_prices
+
+    async def run_forever(self, stop_event: Optional[asyncio.Event] = None) -> None:
+        """
+        Run refresh cycles until ``stop_event`` is set.
+
+        A cycle that filled its whole batch is followed immediately by the
+        next one; otherwise the loop waits for the poll interval.
+        """
+        stop_event = stop_event or asyncio.Event()
+        while not stop_event.is_set():
+            try:
+                summary = await self.run_once()
+            except Exception:
+                logger.exception("Price refresh cycle failed")
+                summary = RefreshSummary()
+
+            delay = self.rng.uniform(0, self.jitter)
+            if summary.selected < self.batch_size:
+                delay += self.poll_interval
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_once(self) -> RefreshSummary:
+        """
+        Run a single refresh cycle.
+
+        Returns:
+            RefreshSummary: Symbols selected, refreshed and failed
+        """
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            due = await self.select_due_symbols(session, now)
+
+        summary = RefreshSummary(selected=len(due))
+        if not due:
+            return summary
+
+        quotes, errors = await self.fetch_quotes([symbol for symbol, _ in due])
+        failure_counts = dict(due)
+
+        async with self.session_factory() as session:
+            await self._store_quotes(session, quotes, now)
+            await self._store_failures(session, errors, failure_counts, now)
+            await session.commit()
+
+        summary.refreshed = sorted(quotes)
+        summary.failed = errors
+        logger.info(
+            "Price refresh cycle: %d selected, %d refreshed, %d failed",
+            summary.selected,
+            len(quotes),
+            len(errors),
+        )
+        return summary
+
+    async def select_due_symbols(
+        self, session: AsyncSession, now: datetime
+    ) -> List[Tuple[str, int]]:
+        """
+        Select held symbols that are due for a refresh, highest priority first.
+
+        Args:
+            session: Database session
+            now: Current UTC time
+
+        Returns:
+            List of (symbol, consecutive failure count)
+        """
+        held = (
+            select(
+                Holding.symbol.label("symbol"),
+                func.count(func.distinct(Holding.portfolio_id)).label(
+                    "portfolio_count"
+                ),
+                func.coalesce(func.sum(Holding.market_value), 0).label("held_value"),
+            )
+            .where(Holding.quantity > 0)
+            .group_by(Holding.symbol)
+            .subquery()
+        )
+        query = (
+            select(held.c.symbol, func.coalesce(PriceRefreshState.failure_count, 0))
+            .outerjoin(PriceRefreshState, PriceRefreshState.symbol == held.c.symbol)
+            .where(
+                or_(
+                    PriceRefreshState.next_attempt_at.is_(None),
+                    PriceRefreshState.next_attempt_at <= now,
+                ),
+                or_(
+                    PriceRefreshState.last_refreshed_at.is_(None),
+                    PriceRefreshState.last_refreshed_at <= now - self.refresh_interval,
+                ),
+            )
+            .order_by(
+                held.c.held_value.desc(),
+                held.c.portfolio_count.desc(),
+                held.c.symbol,
+            )
+            .limit(self.batch_size)
+        )
+        result = await session.execute(query)
+        return [(symbol, failures) for symbol, failures in result.all()]
+
+    async def fetch_quotes(
+        self, symbols: List[str]
+    ) -> Tuple[Dict[str, PriceQuote], Dict[str, str]]:
+        """
+        Fetch quotes concurrently, bounded by the concurrency limit.
+
+        Each request is delayed by a random jitter so workers started
+        together do not burst against the provider.
+
+        Args:
+            symbols: Symbols to fetch, in priority order
+
+        Returns:
+            Tuple of (quotes by symbol, error message by symbol)
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(symbol: str) -> PriceQuote:
+            async with semaphore:
+                if self.jitter:
+                    await asyncio.sleep(self.rng.uniform(0, self.jitter))
+                return await self.provider.fetch_quote(symbol)
+
+        results = await asyncio.gather(
+            *(fetch(symbol) for symbol in symbols), return_exceptions=True
+        )
+
+        quotes: Dict[str, PriceQuote] = {}
+        errors: Dict[str, str] = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, BaseException):
+                errors[symbol] = str(result) or result.__class__.__name__
+            else:
+                quotes[symbol] = result
+        return quotes, errors
+
+    def backoff_delay(self, failure_count: int) -> timedelta:
+        """
+        Get the retry delay after ``failure_count`` consecutive failures.
+
+        Args:
+            failure_count: Consecutive failures including the latest one
+
+        Returns:
+            timedelta: Exponential delay capped at the configured maximum
+        """
+        seconds = min(
+            self.backoff_base * 2 ** max(failure_count - 1, 0), self.backoff_max
+        )
+        return timedelta(seconds=seconds)
+
+    async def _store_quotes(
+        self, session: AsyncSession, quotes: Dict[str, PriceQuote], now: datetime
+    ) -> None:
+        """Upsert prices, revalue or buffer holdings and totals, advance watermarks."""
+        if not quotes:
+            return
+
+        instrument_ids = await InstrumentService(session).get_ids(
+            [quote.symbol for quote in quotes.values()], create=True
+        )
+        prices = insert(MarketPrice).values(
+            [
+                {
+                    "instrument_id": instrument_ids[quote.symbol],
+                    "date": quote.date,
+                    "open": quote.open,
+                    "high": quote.high,
+                    "low": quote.low,
+                    "close": quote.close,
+                    "volume": quote.volume,
+                    "source": self.provider.source,
+                }
+                for quote in quotes.values()
+            ]
+        )
+        await session.execute(
+            prices.on_conflict_do_update(
+                index_elements=["instrument_id", "date"],
+                set_={
+                    "open": prices.excluded.open,
+                    "high": prices.excluded.high,
+                    "low": prices.excluded.low,
+                    "close": prices.excluded.close,
+                    "volume": prices.excluded.volume,
+                    "source": prices.excluded.source,
+                    "updated_at": prices.excluded.updated_at,
+                },
+            )
+        )
+
+        await publish_invalidations(session, "market_price", quotes)
+        if self.holding_prices is not None:
+            self.holding_prices.add(
+                {quote.symbol: quote.close for quote in quotes.values()}, now
+            )
+        else:
+            affected = await HoldingRepository(session).apply_prices(
+                [(quote.symbol, quote.close, now) for quote in quotes.values()]
+            )
+            await PortfolioRepository(session).recompute_totals(sorted(affected))
+            await publish_invalidations(session, "holding", affected)
+
+        state = insert(PriceRefreshState).values(
+            [
+                {
+                    "symbol": quote.symbol,
+                    "last_refreshed_at": now,
+                    "last_price_date": quote.date,
+                    "failure_count": 0,
+                    "next_attempt_at": None,
+                    "last_error": None,
+                }
+                for quote in quotes.values()
+            ]
+        )
+        await session.execute(
+            state.on_conflict_do_update(
+                index_elements=["symbol"],
+                set_={
+                    "last_refreshed_at": state.excluded.last_refreshed_at,
+                    "last_price_date": state.excluded.last_price_date,
+                    "failure_count": 0,
+                    "next_attempt_at": None,
+                    "last_error": None,
+                    "updated_at": state.excluded.updated_at,
+                },
+            )
+        )
+
+    async def _store_failures(
+        self,
+        session: AsyncSession,
+        errors: Dict[str, str],
+        failure_counts: Dict[str, int],
+        now: datetime,
+    ) -> None:
+        """Record failures and schedule the next attempt with backoff."""
+        if not errors:
+            return
+
+        rows = []
+        for symbol, error in errors.items():
+            failures = failure_counts.get(symbol, 0) + 1
+            rows.append(
+                {
+                    "symbol": symbol,
+                    "failure_count": failures,
+                    "next_attempt_at": now + self.backoff_delay(failures),
+                    "last_error": error[:255],
+                }
+            )
+            logger.warning(
+                "Price refresh failed for %s (%d): %s", symbol, failures, error
+            )
+
+        state = insert(PriceRefreshState).values(rows)
+        await session.execute(
+            state.on_conflict_do_update(
+                index_elements=["symbol"],
+                set_={
+                    "failure_count": state.excluded.failure_count,
+                    "next_attempt_at": state.excluded.next_attempt_at,
+                    "last_error": state.excluded.last_error,
+                    "updated_at": state.excluded.updated_at,
+                },
+            )
+        )
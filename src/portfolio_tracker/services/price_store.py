@@ -0,0 +1,319 @@
+"""
+Columnar Price Store
+
+Optional local snapshot of ``market_prices`` closes as per-symbol NumPy
+arrays in ``.npy`` files. Readers open them with ``mmap_mode="r"``, so
+every analytics worker on the host shares the same page-cache pages and
+gets zero-copy slices instead of re-querying Postgres and re-parsing
+Decimals.
+
+Layout under ``PRICE_STORE_PATH``::
+
+    manifest.json        symbol -> files, generation, row count, date range
+    s42.g7.dates.npy     datetime64[D], sorted ascending
+    s42.g7.close.npy     float64, aligned with dates
+
+A single refresher process keeps the store current. Each refresh re-reads
+``PRICE_WATERMARK_OVERLAP_SECONDS`` behind its watermark, so rows stamped
+before a slower writer committed are not skipped; re-read rows that match
+the stored close are dropped. Every rewrite of a symbol goes to files of a
+new generation, which the manifest points at once it is swapped in with
+``os.replace``; the previous generation is deleted only after that. A
+reader therefore always maps a dates and a closes file of the same
+generation, and readers that already mapped the previous one keep a valid
+view of it.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.instrument import Instrument
+from portfolio_tracker.models.db.market_price import MarketPrice
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+STREAM_PARTITION_SIZE = 50_000
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """Read-only view of a symbol's close history."""
+
+    symbol: str
+    dates: np.ndarray
+    closes: np.ndarray
+
+    def __len__(self) -> int:
+        """Number of observations."""
+        return int(self.dates.shape[0])
+
+
+class ColumnarPriceStore:
+    """Memory-mapped, per-symbol close price store."""
+
+    def __init__(self, root: Path, overlap_seconds: Optional[float] = None) -> None:
+        """Initialize a store rooted at ``root``."""
+        self.root = Path(root)
+        self.overlap = timedelta(
+            seconds=(
+                settings.PRICE_WATERMARK_OVERLAP_SECONDS
+                if overlap_seconds is None
+                else overlap_seconds
+            )
+        )
+        self._manifest: Dict[str, Any] = {"watermark": None, "symbols": {}}
+        self._manifest_mtime: Optional[int] = None
+        self._mapped: Dict[str, Tuple[int, np.ndarray, np.ndarray]] = {}
+        self._obsolete: List[str] = []
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols present in the store."""
+        self._reload_manifest()
+        return sorted(self._manifest["symbols"])
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Latest ``market_prices.updated_at`` included in the snapshot."""
+        self._reload_manifest()
+        value = self._manifest["watermark"]
+        return datetime.fromisoformat(value) if value else None
+
+    def get_series(
+        self,
+        symbol: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Optional[PriceSeries]:
+        """
+        Get a symbol's closes between ``start`` and ``end`` (inclusive).
+
+        The returned arrays are slices of the memory-mapped files; no data
+        is copied.
+
+        Args:
+            symbol: Ticker symbol
+            start: Optional first date
+            end: Optional last date
+
+        Returns:
+            Optional[PriceSeries]: Series, or None if the symbol is not stored
+        """
+        mapped = self._map(symbol)
+        if mapped is None:
+            return None
+
+        dates, closes = mapped
+        lo = (
+            0
+            if start is None
+            else int(np.searchsorted(dates, np.datetime64(start, "D")))
+        )
+        hi = (
+            len(dates)
+            if end is None
+            else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        )
+        return PriceSeries(symbol, dates[lo:hi], closes[lo:hi])
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """
+        Incrementally refresh the store from ``market_prices``.
+
+        Only rows updated after the stored watermark (less the overlap
+        window) are read, so the first call takes a full snapshot and later
+        calls pick up new days and corrected closes.
+
+        Args:
+            session: Database session
+
+        Returns:
+            int: Number of price rows that changed the store
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._reload_manifest()
+        watermark = self.watermark
+
+        query = (
+            select(
+                Instrument.symbol,
+                MarketPrice.date,
+                MarketPrice.close,
+                MarketPrice.updated_at,
+            )
+            .join(Instrument, Instrument.id == MarketPrice.instrument_id)
+            .order_by(MarketPrice.instrument_id, MarketPrice.date)
+        )
+        if watermark is not None:
+            query = query.where(MarketPrice.updated_at > watermark - self.overlap)
+
+        applied = 0
+        latest = watermark
+        pending_symbol: Optional[str] = None
+        pending: List[Tuple[date, float]] = []
+
+        result = await session.stream(
+            query.execution_options(yield_per=STREAM_PARTITION_SIZE)
+        )
+        async for rows in result.partitions():
+            for symbol, on_date, close, updated_at in rows:
+                if symbol != pending_symbol:
+                    if pending_symbol is not None:
+                        applied += self._merge(pending_symbol, pending)
+                    pending_symbol, pending = symbol, []
+                pending.append((on_date, float(close)))
+                if latest is None or updated_at > latest:
+                    latest = updated_at
+        if pending_symbol is not None:
+            applied += self._merge(pending_symbol, pending)
+
+        if applied or latest != watermark:
+            self._manifest["watermark"] = latest.isoformat() if latest else None
+            self._write_manifest()
+        # Readers only find superseded generations through the old manifest
+        for name in self._obsolete:
+            (self.root / name).unlink(missing_ok=True)
+        self._obsolete.clear()
+        if applied:
+            logger.info("Price store refreshed with %d rows", applied)
+        return applied
+
+    def _merge(self, symbol: str, rows: List[Tuple[date, float]]) -> int:
+        """
+        Merge rows into a symbol's arrays; new values win on equal dates.
+
+        Rows whose date is already stored with the same close (re-read from
+        the overlap window) are dropped, and nothing is written if no row
+        is left.
+
+        Returns:
+            int: Number of rows that were added or changed
+        """
+        new_dates = np.array([row[0] for row in rows], dtype="datetime64[D]")
+        new_closes = np.array([row[1] for row in rows], dtype=np.float64)
+
+        mapped = self._map(symbol)
+        if mapped is not None:
+            old_dates, old_closes = mapped
+            at = np.minimum(np.searchsorted(old_dates, new_dates), len(old_dates) - 1)
+            changed = (old_dates[at] != new_dates) | (old_closes[at] != new_closes)
+            new_dates, new_closes = new_dates[changed], new_closes[changed]
+        applied = int(new_dates.shape[0])
+        if not applied:
+            return 0
+
+        if mapped is not None:
+            keep = ~np.isin(old_dates, new_dates)
+            new_dates = np.concatenate([old_dates[keep], new_dates])
+            new_closes = np.concatenate([old_closes[keep], new_closes])
+            order = np.argsort(new_dates, kind="stable")
+            new_dates, new_closes = new_dates[order], new_closes[order]
+
+        symbols = self._manifest["symbols"]
+        previous = symbols.get(symbol)
+        entry = dict(previous or {"stem": f"s{len(symbols)}", "generation": 0})
+        entry["generation"] += 1
+        entry["rows"] = int(new_dates.shape[0])
+        entry["first"] = str(new_dates[0])
+        entry["last"] = str(new_dates[-1])
+        stem = f"{entry['stem']}.g{entry['generation']}"
+        entry["files"] = [f"{stem}.dates.npy", f"{stem}.close.npy"]
+
+        self._atomic_save(entry["files"][0], new_dates)
+        self._atomic_save(entry["files"][1], new_closes)
+        if previous is not None:
+            self._obsolete.extend(_file_names(previous))
+        symbols[symbol] = entry
+        self._mapped.pop(symbol, None)
+        return applied
+
+    def _map(self, symbol: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Memory-map a symbol's arrays, reusing current mappings."""
+        self._reload_manifest()
+        entry = self._manifest["symbols"].get(symbol)
+        if entry is None:
+            return None
+
+        cached = self._mapped.get(symbol)
+        if cached is not None and cached[0] == entry["generation"]:
+            return cached[1], cached[2]
+
+        dates_name, closes_name = _file_names(entry)
+        try:
+            dates = np.load(self.root / dates_name, mmap_mode="r")
+            closes = np.load(self.root / closes_name, mmap_mode="r")
+        except FileNotFoundError:
+            # Superseded and deleted after this manifest was read
+            self._manifest_mtime = None
+            self._reload_manifest()
+            if self._manifest["symbols"].get(symbol) == entry:
+                raise
+            return self._map(symbol)
+        self._mapped[symbol] = (entry["generation"], dates, closes)
+        return dates, closes
+
+    def _reload_manifest(self) -> None:
+        """Reload the manifest if another process replaced it."""
+        path = self.root / MANIFEST_NAME
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime != self._manifest_mtime:
+            self._manifest = json.loads(path.read_text())
+            self._manifest_mtime = mtime
+
+    def _write_manifest(self) -> None:
+        """Atomically write the manifest."""
+        path = self.root / MANIFEST_NAME
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._manifest))
+        os.replace(tmp, path)
+        self._manifest_mtime = path.stat().st_mtime_ns
+
+    def _atomic_save(self, name: str, array: np.ndarray) -> None:
+        """Write an ``.npy`` file under a temporary name and swap it in."""
+        path = self.root / name
+        tmp = self.root / f".{name}.tmp"
+        with open(tmp, "wb") as handle:
+            np.save(handle, np.ascontiguousarray(array))
+        os.replace(tmp, path)
+
+
+def _file_names(entry: Dict[str, Any]) -> Tuple[str, str]:
+    """Dates and closes file names of a manifest entry."""
+    if "files" in entry:
+        return entry["files"][0], entry["files"][1]
+    # Stores written before files were generation-suffixed
+    return f"{entry['stem']}.dates.npy", f"{entry['stem']}.close.npy"
+
+
+_price_store: Optional[ColumnarPriceStore] = None
+
+
+def get_price_store() -> Optional[ColumnarPriceStore]:
+    """
+    Get the process-wide price store.
+
+    Returns:
+        Optional[ColumnarPriceStore]: Store, or None when disabled
+    """
+    global _price_store
+
+    if not settings.PRICE_STORE_ENABLED:
+        return None
+    if _price_store is None:
+        _price_store = ColumnarPriceStore(Path(settings.PRICE_STORE_PATH))
+    return _price_store
@@ -0,0 +1,429 @@
+"""
+Request Profiling
+
+Sampling profiler for the event loop, with two modes:
+
+* On demand: an admin sends ``X-Profile: store`` (or ``?profile=store``)
+  and the stacks sampled while that request runs are kept as a
+  collapsed-stack profile, retrievable by the ``X-Profile-ID`` returned
+  with the response. ``X-Profile: collapsed`` returns the profile itself
+  instead of the response body.
+* Continuous (``PROFILING_CONTINUOUS_ENABLED``): every request is sampled
+  every ``PROFILING_CONTINUOUS_SAMPLE_SECONDS`` and hot stacks are
+  aggregated by route.
+
+One daemon thread samples the event loop thread's stack, every
+``PROFILING_SAMPLE_SECONDS`` while a profiled request is running. Each
+request registers the frame of :class:`ProfilingMiddleware` handling it,
+so a sample is attributed to the request whose frame is on the stack,
+and concurrent requests never pollute each other's profiles. Only the
+frames between the middleware and the leaf are recorded. Synchronous
+endpoints run in the thread pool and are not sampled.
+
+Collapsed stacks (``frame;frame;frame count`` per line) load directly
+into flamegraph.pl, speedscope or inferno.
+"""
+
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from portfolio_tracker.config.logging import get_logger
+from portfolio_tracker.config.settings import get_settings
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = "profile"
+PROFILE_STATE_KEY = "profile"
+PROFILE_MODES = frozenset({"store", "collapsed"})
+
+Stack = Tuple[CodeType, ...]
+
+
+@dataclass
+class RequestProfile:
+    """Samples collected for one profiled request."""
+
+    id: str
+    method: str
+    path: str
+    mode: str
+    authorized: bool = False
+    route: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    duration_ms: float = 0.0
+    samples: "Counter[Stack]" = field(default_factory=Counter)
+
+    def summary(self) -> Dict[str, Any]:
+        """Metadata without the samples."""
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "created_at": self.created_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": sum(self.samples.values()),
+        }
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text."""
+        return format_collapsed(self.samples)
+
+
+@dataclass
+class _ActiveRequest:
+    """A request currently being handled."""
+
+    scope: Scope
+    profile: Optional[RequestProfile]
+
+
+class StackSampler:
+    """Background thread sampling one thread's stack."""
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval: float,
+        continuous_interval: Optional[float] = None,
+        max_stacks_per_route: int = 500,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize sampler.
+
+        Args:
+            thread_id: Thread to sample (the event loop thread)
+            interval: Seconds between samples of profiled requests
+            continuous_interval: Seconds between samples aggregated by
+                route, or None to only sample profiled requests
+            max_stacks_per_route: Distinct stacks kept per route
+            clock: Time source (monotonic seconds)
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.continuous_interval = continuous_interval
+        self.max_stacks_per_route = max_stacks_per_route
+        self.active: Dict[FrameType, _ActiveRequest] = {}
+        self.routes: Dict[str, "Counter[Stack]"] = {}
+        self._clock = clock
+        self._last_route_sample = float("-inf")
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def continuous(self) -> bool:
+        """Whether every request is sampled."""
+        return self.continuous_interval is not None
+
+    def start(self) -> None:
+        """Start the sampling thread if not running."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="request-profiler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def sample(self) -> bool:
+        """
+        Take one sample.
+
+        Returns:
+            bool: True if the sample was attributed to a request
+        """
+        now = self._clock()
+        by_route = (
+            self.continuous_interval is not None
+            and now - self._last_route_sample >= self.continuous_interval
+        )
+        frame = sys._current_frames().get(self.thread_id)
+        stack: List[CodeType] = []
+        request = None
+        while frame is not None:
+            request = self.active.get(frame)
+            if request is not None:
+                break
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if request is None:
+            return False
+
+        key: Stack = tuple(reversed(stack))
+        if request.profile is not None:
+            request.profile.samples[key] += 1
+        if by_route:
+            self._last_route_sample = now
+            stacks = self.routes.setdefault(route_label(request.scope), Counter())
+            if key in stacks or len(stacks) < self.max_stacks_per_route:
+                stacks[key] += 1
+        return True
+
+    def take_routes(self, reset: bool = False) -> Dict[str, "Counter[Stack]"]:
+        """Copy of the per-route aggregates, optionally clearing them."""
+        routes = {route: Counter(stacks) for route, stacks in self.routes.items()}
+        if reset:
+            self.routes = {}
+        return routes
+
+    def _run(self) -> None:
+        """Sampling loop; runs at the coarser interval unless a profile is active."""
+        while not self._stop.wait(self._next_interval()):
+            if self.active:
+                try:
+                    self.sample()
+                except Exception:
+                    logger.debug("Profiler sample failed", exc_info=True)
+
+    def _next_interval(self) -> float:
+        """Seconds to wait before the next sample."""
+        if self.continuous_interval is None or any(
+            request.profile is not None for request in list(self.active.values())
+        ):
+            return self.interval
+        return max(self.interval, self.continuous_interval)
+
+
+class ProfileStore:
+    """Most recent profiles of this worker, optionally mirrored to disk."""
+
+    def __init__(self, max_profiles: int, directory: Optional[Path] = None) -> None:
+        """Initialize store."""
+        self.max_profiles = max_profiles
+        self.directory = directory
+        self._profiles: "OrderedDict[str, RequestProfile]" = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        """Keep a finished profile."""
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_profiles:
+            self._profiles.popitem(last=False)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{profile.id}.collapsed").write_text(profile.collapsed())
+
+    def get(self, profile_id: str) -> Optional[str]:
+        """Collapsed stacks of a profile, or None."""
+        profile = self._profiles.get(profile_id)
+        if profile is not None:
+            return profile.collapsed()
+        if self.directory is not None and profile_id.isalnum():
+            path = self.directory / f"{profile_id}.collapsed"
+            if path.is_file():
+                return path.read_text()
+        return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries, newest first."""
+        return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware registering requests with the sampler.
+
+    Flagged requests get a :class:`RequestProfile` in ``request.state``;
+    :func:`~portfolio_tracker.api.v1.dependencies.authorize_profiling`
+    marks it authorized once the caller is known to be an admin.
+    Unauthorized profiles are discarded.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap an ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        mode = requested_mode(scope)
+        sampler = get_sampler()
+        if mode is None and not sampler.continuous:
+            await self.app(scope, receive, send)
+            return
+
+        profile = None
+        if mode is not None:
+            profile = RequestProfile(
+                id=uuid.uuid4().hex,
+                method=scope["method"],
+                path=scope["path"],
+                mode=mode,
+            )
+            scope.setdefault("state", {})[PROFILE_STATE_KEY] = profile
+
+        frame = sys._getframe()
+        sampler.active[frame] = _ActiveRequest(scope, profile)
+        sampler.start()
+        started = time.perf_counter()
+        send_profile = send if profile is None else self._wrap_send(profile, send)
+        try:
+            await self.app(scope, receive, send_profile)
+        finally:
+            del sampler.active[frame]
+
+        if profile is None or not profile.authorized:
+            return
+        profile.duration_ms = (time.perf_counter() - started) * 1000
+        profile.route = route_label(scope)
+        get_profile_store().add(profile)
+        if profile.mode == "collapsed":
+            body = profile.collapsed().encode()
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/plain; charset=utf-8"),
+                        (b"content-length", str(len(body)).encode()),
+                        (b"x-profile-id", profile.id.encode()),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _wrap_send(profile: RequestProfile, send: Any) -> Any:
+        """Tag the response with the profile ID, or swallow it when inlined."""
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if not profile.authorized:
+                await send(message)
+            elif profile.mode == "store":
+                if message["type"] == "http.response.start":
+                    message = {
+                        **message,
+                        "headers": [
+                            *message.get("headers", []),
+                            (b"x-profile-id", profile.id.encode()),
+                        ],
+                    }
+                await send(message)
+
+        return send_wrapper
+
+
+def requested_mode(scope: Scope) -> Optional[str]:
+    """Profile mode requested by the header or query flag, if any."""
+    value: Optional[str] = None
+    for name, header in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            value = header.decode("latin-1")
+            break
+    if value is None and PROFILE_QUERY.encode() in scope.get("query_string", b""):
+        values = parse_qs(scope["query_string"].decode("latin-1")).get(PROFILE_QUERY)
+        value = values[0] if values else None
+    if value is None:
+        return None
+    value = value.strip().lower()
+    if value in PROFILE_MODES:
+        return value
+    return "store" if value in ("1", "true") else None
+
+
+def route_label(scope: Scope) -> str:
+    """``METHOD /route/{template}`` of a request, or its raw path if unrouted."""
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+def frame_label(code: CodeType) -> str:
+    """Readable name of a code object for collapsed stacks."""
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def format_collapsed(samples: "Counter[Stack]") -> str:
+    """Format samples as ``frame;frame;frame count`` lines."""
+    lines = [
+        f"{';'.join(frame_label(code) for code in stack) or '<request>'} {count}"
+        for stack, count in samples.most_common()
+    ]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def top_stacks(samples: "Counter[Stack]", limit: int) -> List[Dict[str, Any]]:
+    """Most frequent stacks with their share of the samples."""
+    total = sum(samples.values()) or 1
+    return [
+        {
+            "stack": [frame_label(code) for code in stack],
+            "samples": count,
+            "share": round(count / total, 4),
+        }
+        for stack, count in samples.most_common(limit)
+    ]
+
+
+def merge_samples(counters: Iterable["Counter[Stack]"]) -> "Counter[Stack]":
+    """Sum several sample counters."""
+    merged: "Counter[Stack]" = Counter()
+    for counter in counters:
+        merged.update(counter)
+    return merged
+
+
+_sampler: Optional[StackSampler] = None
+_store: Optional[ProfileStore] = None
+
+
+def get_sampler() -> StackSampler:
+    """
+    Get the process-wide sampler.
+
+    The first call must come from the event loop thread, which is the
+    thread it samples.
+    """
+    global _sampler
+
+    if _sampler is None:
+        _sampler = StackSampler(
+            thread_id=threading.get_ident(),
+            interval=settings.PROFILING_SAMPLE_SECONDS,
+            continuous_interval=(
+                settings.PROFILING_CONTINUOUS_SAMPLE_SECONDS
+                if settings.PROFILING_CONTINUOUS_ENABLED
+                else None
+            ),
+        )
+    return _sampler
+
+
+def get_profile_store() -> ProfileStore:
+    """Get this process's profile store."""
+    global _store
+
+    if _store is None:
+        _store = ProfileStore(
+            max_profiles=settings.PROFILING_MAX_STORED,
+            directory=Path(settings.PROFILING_DIR) if settings.PROFILING_DIR else None,
+        )
+    return _store
+
+
+def stop_sampler() -> None:
+    """Stop the sampling thread."""
+    if _sampler is not None:
+        _sampler.stop()
@@ -0,0 +1,311 @@
+"""
+Projection Service
+
+Monte Carlo projections of a portfolio's future value.
+
+The current holdings are valued at their latest close and held at
+constant weights. Their historical daily log returns (weighted at today's
+weights) drive the simulation:
+
+- ``bootstrap`` resamples historical days with replacement, so fat tails
+  and cross-asset correlation on each day are kept as observed
+- ``normal`` draws from a normal fitted to the same series, which is the
+  multivariate normal of the holdings' returns projected onto the weights
+
+Paths are simulated as whole ``(paths, days)`` arrays one year at a time.
+Normal daily log returns add up to a normal yearly one, so that method
+draws one value per path and year. Paths are split into fixed-size shards
+seeded from one :class:`numpy.random.SeedSequence`, which makes results
+for a seed identical whether shards run inline or in a process pool.
+"""
+
+import asyncio
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.schemas.projection import (
+    ProjectionPoint,
+    ProjectionResult,
+)
+from portfolio_tracker.repositories.market_price import (
+    CloseHistory,
+    MarketPriceRepository,
+)
+from portfolio_tracker.services.analytics import align_closes
+from portfolio_tracker.services.invalidation import get_invalidation_bus
+from portfolio_tracker.utils.cache import LocalCache, bind_invalidations
+from portfolio_tracker.utils.exceptions import BusinessLogicException
+
+settings = get_settings()
+
+TRADING_DAYS = 252
+PERCENTILES = (5, 25, 50, 75, 95)
+METHODS = ("bootstrap", "normal")
+MIN_HISTORY_DAYS = 20
+
+# Fixed shard size: a seed gives the same paths for any number of workers
+PATHS_PER_SHARD = 2_500
+
+
+@dataclass(frozen=True)
+class ProjectionParams:
+    """Simulation parameters; hashable, as part of the cache key."""
+
+    horizon_years: int = 10
+    paths: int = 10_000
+    method: str = "bootstrap"
+    seed: int = 0
+    lookback_years: int = 5
+
+
+def weighted_log_returns(
+    histories: Dict[str, CloseHistory], quantities: Dict[str, float]
+) -> Tuple[float, np.ndarray]:
+    """
+    Value the holdings and build their historical daily log returns.
+
+    Closes are aligned with :func:`align_closes`.
+
+    Args:
+        histories: Symbol -> (dates, closes)
+        quantities: Symbol -> quantity held
+
+    Returns:
+        Tuple of (current value, daily log returns at today's weights)
+    """
+    symbols = [s for s in quantities if s in histories and len(histories[s][0])]
+    if not symbols:
+        return 0.0, np.empty(0)
+
+    axis, closes = align_closes(histories, symbols)
+    values = closes[-1] * np.array([quantities[s] for s in symbols])
+    total = float(values.sum())
+    if total <= 0 or len(axis) < 2:
+        return total, np.empty(0)
+    weights = values / total
+    return total, np.log((closes[1:] / closes[:-1]) @ weights)
+
+
+def simulate_shard(
+    returns: np.ndarray,
+    method: str,
+    years: int,
+    paths: int,
+    seed: np.random.SeedSequence,
+) -> np.ndarray:
+    """
+    Simulate cumulative log growth of some paths.
+
+    Module-level so it can run in a process pool.
+
+    Returns:
+        np.ndarray: ``(paths, years)`` log growth at the end of each year
+    """
+    rng = np.random.default_rng(seed)
+    if method == "normal":
+        draws = rng.normal(
+            returns.mean() * TRADING_DAYS,
+            returns.std(ddof=1) * math.sqrt(TRADING_DAYS),
+            size=(paths, years),
+        )
+        return np.cumsum(draws, axis=1)
+
+    growth = np.empty((paths, years))
+    total = np.zeros(paths)
+    for year in range(years):
+        days = rng.integers(0, len(returns), size=(paths, TRADING_DAYS))
+        total += returns[days].sum(axis=1)
+        growth[:, year] = total
+    return growth
+
+
+def shard_sizes(paths: int) -> List[int]:
+    """Split a path count into fixed-size shards."""
+    full, rest = divmod(paths, PATHS_PER_SHARD)
+    return [PATHS_PER_SHARD] * full + ([rest] if rest else [])
+
+
+def summarize(
+    portfolio_id: int,
+    params: ProjectionParams,
+    initial_value: float,
+    returns: np.ndarray,
+    growth: np.ndarray,
+) -> ProjectionResult:
+    """Reduce simulated log growth to yearly value percentiles."""
+    values = initial_value * np.exp(growth)
+    quantiles = np.percentile(values, PERCENTILES, axis=0)
+    means = values.mean(axis=0)
+    return ProjectionResult(
+        portfolio_id=portfolio_id,
+        method=params.method,
+        paths=params.paths,
+        horizon_years=params.horizon_years,
+        seed=params.seed,
+        initial_value=round(initial_value, 2),
+        history_days=len(returns),
+        annual_return=round(float(np.expm1(returns.mean() * TRADING_DAYS)), 4),
+        annual_volatility=round(
+            float(returns.std(ddof=1) * math.sqrt(TRADING_DAYS)), 4
+        ),
+        probability_of_loss=round(float((growth[:, -1] < 0).mean()), 4),
+        points=[
+            ProjectionPoint(
+                year=year + 1,
+                mean=round(float(means[year]), 2),
+                percentiles={
+                    f"p{p}": round(float(q), 2)
+                    for p, q in zip(PERCENTILES, quantiles[:, year])
+                },
+            )
+            for year in range(params.horizon_years)
+        ],
+    )
+
+
+class ProjectionService:
+    """Service for Monte Carlo value projections."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def project(
+        self,
+        portfolio_id: int,
+        version: Sequence[object],
+        params: ProjectionParams,
+    ) -> ProjectionResult:
+        """
+        Project a portfolio's value, served from cache when possible.
+
+        Args:
+            portfolio_id: Portfolio ID
+            version: Portfolio version components (part of the cache key)
+            params: Simulation parameters
+
+        Returns:
+            ProjectionResult: Yearly value distribution
+
+        Raises:
+            BusinessLogicException: If the holdings lack price history
+        """
+        # The lookback window moves daily, so the date is part of the key
+        cache = get_projection_cache()
+        key = (tuple(version), params, date.today())
+        cached = cache.get(portfolio_id, key)
+        if cached is not None:
+            return cached
+
+        initial_value, returns = await self._load_returns(
+            portfolio_id, params.lookback_years
+        )
+        if len(returns) < MIN_HISTORY_DAYS:
+            raise BusinessLogicException(
+                f"Not enough price history to project portfolio {portfolio_id}",
+                code="INSUFFICIENT_PRICE_HISTORY",
+                details={"history_days": len(returns), "required": MIN_HISTORY_DAYS},
+            )
+
+        growth = await run_simulation(returns, params)
+        result = summarize(portfolio_id, params, initial_value, returns, growth)
+        cache.set(portfolio_id, key, result)
+        return result
+
+    async def _load_returns(
+        self, portfolio_id: int, lookback_years: int
+    ) -> Tuple[float, np.ndarray]:
+        """Current value and weighted daily log returns of the holdings."""
+        result = await self.session.execute(
+            select(Holding.symbol, Holding.quantity).where(
+                Holding.portfolio_id == portfolio_id, Holding.quantity > 0
+            )
+        )
+        quantities: Dict[str, float] = {}
+        for symbol, quantity in result.all():
+            quantities[symbol] = quantities.get(symbol, 0.0) + float(quantity)
+        if not quantities:
+            return 0.0, np.empty(0)
+
+        start = date.today() - timedelta(days=round(365.25 * lookback_years))
+        histories = await MarketPriceRepository(self.session).get_close_histories(
+            list(quantities), start=start
+        )
+        return weighted_log_returns(histories, quantities)
+
+
+async def run_simulation(returns: np.ndarray, params: ProjectionParams) -> np.ndarray:
+    """
+    Simulate all paths of a projection off the event loop.
+
+    Large requests fan out over the process pool when one is configured;
+    otherwise every shard runs in one worker thread.
+
+    Returns:
+        np.ndarray: ``(paths, years)`` cumulative log growth
+    """
+    sizes = shard_sizes(params.paths)
+    seeds = np.random.SeedSequence(params.seed).spawn(len(sizes))
+    jobs = [
+        (returns, params.method, params.horizon_years, size, seed)
+        for size, seed in zip(sizes, seeds)
+    ]
+
+    pool = get_projection_pool()
+    if pool is None or params.paths < settings.PROJECTION_POOL_MIN_PATHS:
+        return await asyncio.to_thread(
+            lambda: np.concatenate([simulate_shard(*job) for job in jobs])
+        )
+
+    loop = asyncio.get_running_loop()
+    shards = await asyncio.gather(
+        *(loop.run_in_executor(pool, simulate_shard, *job) for job in jobs)
+    )
+    return np.concatenate(shards)
+
+
+_cache: Optional[LocalCache[ProjectionResult]] = None
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_projection_cache() -> LocalCache[ProjectionResult]:
+    """Get the process-wide projection cache, evicted on portfolio writes."""
+    global _cache
+
+    if _cache is None:
+        _cache = LocalCache(
+            settings.PROJECTION_CACHE_SECONDS,
+            max_entries=settings.PROJECTION_CACHE_MAX_ENTRIES,
+        )
+        bind_invalidations(_cache, get_invalidation_bus(), "holding", "transaction")
+    return _cache
+
+
+def get_projection_pool() -> Optional[ProcessPoolExecutor]:
+    """Get the process pool for large projections, if enabled."""
+    global _pool
+
+    if _pool is None and settings.PROJECTION_WORKERS > 0:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PROJECTION_WORKERS, mp_context=get_context("spawn")
+        )
+    return _pool
+
+
+def close_projection_pool() -> None:
+    """Shut down the process pool, if it was ever started."""
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
@@ -0,0 +1,313 @@
+"""
+Rebalancing Service
+
+Proposes trades bringing portfolios back to the target allocation of
+their ``risk_profile``.
+
+Targets are weights per ``asset_type``; asset types without a target are
+held outside the model and neither traded nor counted. A portfolio is
+rebalanced once any asset type drifts more than the tolerance from its
+target. Each drifting asset type then trades its whole gap, using as few
+trades as possible: sells start with the largest holding of the type and
+only spill into the next one when it is exhausted, and buys go into the
+largest holding. Asset types with a target but no holding get a buy
+without a symbol, for an advisor to pick the instrument. Trades below the
+minimum value are dropped and their amount stays in cash.
+
+The computation is vectorized over all holdings of all portfolios in a
+chunk. :func:`propose_all` runs it across every portfolio in keyset
+chunks, loading and computing several chunks in parallel.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.portfolio import Portfolio, RiskProfile
+from portfolio_tracker.models.schemas.rebalancing import (
+    ProposedTrade,
+    RebalanceProposal,
+)
+
+settings = get_settings()
+
+TARGET_ALLOCATIONS: Dict[RiskProfile, Dict[str, float]] = {
+    RiskProfile.CONSERVATIVE: {"bond": 0.60, "etf": 0.25, "stock": 0.15},
+    RiskProfile.MODERATE: {"bond": 0.35, "etf": 0.30, "stock": 0.30, "crypto": 0.05},
+    RiskProfile.AGGRESSIVE: {"bond": 0.10, "etf": 0.25, "stock": 0.55, "crypto": 0.10},
+}
+
+# Matrix form: profile row x asset type column
+PROFILES: Tuple[RiskProfile, ...] = tuple(TARGET_ALLOCATIONS)
+ASSET_TYPES: Tuple[str, ...] = tuple(
+    sorted({name for targets in TARGET_ALLOCATIONS.values() for name in targets})
+)
+TARGET_MATRIX = np.array(
+    [
+        [TARGET_ALLOCATIONS[profile].get(name, 0.0) for name in ASSET_TYPES]
+        for profile in PROFILES
+    ]
+)
+
+
+@dataclass(frozen=True)
+class HoldingRow:
+    """Tradable position as loaded for rebalancing."""
+
+    portfolio_id: int
+    symbol: str
+    asset_type: str
+    quantity: float
+    price: float
+
+
+def compute_proposals(
+    portfolios: Sequence[Tuple[int, RiskProfile]],
+    holdings: Sequence[HoldingRow],
+    tolerance: float,
+    min_trade_value: float,
+) -> List[RebalanceProposal]:
+    """
+    Propose trades for a set of portfolios.
+
+    Args:
+        portfolios: ``(portfolio_id, risk_profile)`` pairs
+        holdings: Priced holdings of those portfolios
+        tolerance: Largest drift (absolute weight) left untouched
+        min_trade_value: Smallest trade proposed
+
+    Returns:
+        List[RebalanceProposal]: One proposal per non-empty portfolio that
+        needs trades, in ``portfolios`` order
+    """
+    if not portfolios:
+        return []
+    asset_index = {name: column for column, name in enumerate(ASSET_TYPES)}
+    portfolio_index = {pid: row for row, (pid, _) in enumerate(portfolios)}
+    rows = [
+        holding
+        for holding in holdings
+        if holding.asset_type in asset_index
+        and holding.portfolio_id in portfolio_index
+        and holding.price > 0
+        and holding.quantity > 0
+    ]
+
+    n, k = len(portfolios), len(ASSET_TYPES)
+    owner = np.fromiter((portfolio_index[h.portfolio_id] for h in rows), np.intp)
+    kind = np.fromiter((asset_index[h.asset_type] for h in rows), np.intp)
+    price = np.fromiter((h.price for h in rows), np.float64)
+    value = np.fromiter((h.quantity for h in rows), np.float64) * price
+
+    current = np.zeros((n, k))
+    np.add.at(current, (owner, kind), value)
+    totals = current.sum(axis=1)
+    profile_rows = np.array([PROFILES.index(profile) for _, profile in portfolios])
+    target_weights = TARGET_MATRIX[profile_rows]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weights = np.where(totals[:, None] > 0, current / totals[:, None], 0.0)
+    drift = np.abs(weights - target_weights).max(axis=1)
+
+    rebalance = (totals > 0) & (drift > tolerance)
+    gaps = (target_weights * totals[:, None] - current) * rebalance[:, None]
+    gaps[np.abs(gaps) < min_trade_value] = 0.0
+
+    # Largest holding first within each (portfolio, asset type) group
+    order = np.lexsort((-value, kind, owner))
+    owner, kind, price, value = owner[order], kind[order], price[order], value[order]
+    group = owner * k + kind
+    first = np.ones(len(group), dtype=bool)
+    first[1:] = group[1:] != group[:-1]
+    starts = np.maximum.accumulate(np.where(first, np.arange(len(group)), 0))
+    running = np.cumsum(value)
+    before = running - value - (running[starts] - value[starts])
+
+    gap = gaps.ravel()[group]
+    sell = -np.clip(-gap - before, 0.0, value)
+    trade = np.where(gap < 0, sell, np.where(first, gap, 0.0))
+    trade[np.abs(trade) < min_trade_value] = 0.0
+
+    held = np.zeros((n, k), dtype=bool)
+    held[owner, kind] = True
+
+    trades: Dict[int, List[ProposedTrade]] = {}
+    for index in np.flatnonzero(trade):
+        holding = rows[order[index]]
+        trades.setdefault(int(owner[index]), []).append(
+            ProposedTrade(
+                asset_type=holding.asset_type,
+                action="buy" if trade[index] > 0 else "sell",
+                symbol=holding.symbol,
+                quantity=round(abs(float(trade[index])) / float(price[index]), 8),
+                value=round(abs(float(trade[index])), 2),
+            )
+        )
+    for row, column in zip(*np.nonzero((gaps > 0) & ~held)):
+        trades.setdefault(int(row), []).append(
+            ProposedTrade(
+                asset_type=ASSET_TYPES[column],
+                action="buy",
+                symbol=None,
+                quantity=None,
+                value=round(float(gaps[row, column]), 2),
+            )
+        )
+
+    return [
+        RebalanceProposal(
+            portfolio_id=portfolio_id,
+            risk_profile=profile.value,
+            total_value=round(float(totals[row]), 2),
+            weights=_by_asset_type(weights[row]),
+            targets=_by_asset_type(target_weights[row]),
+            max_drift=round(float(drift[row]), 4),
+            trades=sorted(trades[row], key=lambda t: (t.action != "sell", -t.value)),
+        )
+        for row, (portfolio_id, profile) in enumerate(portfolios)
+        if row in trades
+    ]
+
+
+def _by_asset_type(row: np.ndarray) -> Dict[str, float]:
+    """Non-zero weights keyed by asset type."""
+    return {
+        name: round(float(weight), 4)
+        for name, weight in zip(ASSET_TYPES, row)
+        if weight
+    }
+
+
+class RebalancingService:
+    """Service loading portfolios and proposing rebalancing trades."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        tolerance: Optional[float] = None,
+        min_trade_value: Optional[float] = None,
+    ) -> None:
+        """Initialize service; unset options fall back to settings."""
+        self.session = session
+        self.tolerance = (
+            settings.REBALANCE_TOLERANCE if tolerance is None else tolerance
+        )
+        self.min_trade_value = (
+            settings.REBALANCE_MIN_TRADE_VALUE
+            if min_trade_value is None
+            else min_trade_value
+        )
+
+    async def propose(self, portfolio: Portfolio) -> Optional[RebalanceProposal]:
+        """
+        Propose trades for one portfolio.
+
+        Returns:
+            Optional[RebalanceProposal]: None if it is within tolerance
+        """
+        portfolio_id = cast(int, portfolio.id)
+        portfolios = [(portfolio_id, cast(RiskProfile, portfolio.risk_profile))]
+        holdings = await self.load_holdings([portfolio_id])
+        proposals = compute_proposals(
+            portfolios, holdings, self.tolerance, self.min_trade_value
+        )
+        return proposals[0] if proposals else None
+
+    async def load_chunk(
+        self, after_id: int, limit: int
+    ) -> Tuple[List[Tuple[int, RiskProfile]], List[HoldingRow]]:
+        """Load the next ``limit`` portfolios after ``after_id`` and their holdings."""
+        result = await self.session.execute(
+            select(Portfolio.id, Portfolio.risk_profile)
+            .where(Portfolio.id > after_id)
+            .order_by(Portfolio.id)
+            .limit(limit)
+        )
+        portfolios = [(pid, profile) for pid, profile in result.all()]
+        if not portfolios:
+            return [], []
+        holdings = await self.load_holdings([pid for pid, _ in portfolios])
+        return portfolios, holdings
+
+    async def load_holdings(self, portfolio_ids: Sequence[int]) -> List[HoldingRow]:
+        """Load the priced holdings of some portfolios."""
+        result = await self.session.execute(
+            select(
+                Holding.portfolio_id,
+                Holding.symbol,
+                Holding.asset_type,
+                Holding.quantity,
+                Holding.current_price,
+            ).where(
+                Holding.portfolio_id.in_(list(portfolio_ids)),
+                Holding.current_price.is_not(None),
+            )
+        )
+        return [
+            HoldingRow(pid, symbol, asset_type, float(quantity), float(price))
+            for pid, symbol, asset_type, quantity, price in result.all()
+        ]
+
+
+async def propose_all(
+    session_factory: Callable[[], AsyncSession],
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    min_trade_value: Optional[float] = None,
+) -> AsyncIterator[List[RebalanceProposal]]:
+    """
+    Propose trades for every portfolio.
+
+    Portfolio IDs are split into keyset chunks. Up to ``concurrency``
+    chunks are loaded (each with its own session) and computed (in worker
+    threads) at a time; proposals are yielded per chunk as they finish, so
+    chunk order is not preserved.
+
+    Args:
+        session_factory: Factory of sessions for loading chunks
+        chunk_size: Portfolios per chunk
+        concurrency: Chunks processed in parallel
+        tolerance: Largest drift left untouched
+        min_trade_value: Smallest trade proposed
+
+    Yields:
+        List[RebalanceProposal]: Proposals of one chunk
+    """
+    chunk_size = chunk_size or settings.REBALANCE_CHUNK_SIZE
+    concurrency = concurrency or settings.REBALANCE_CONCURRENCY
+
+    # Chunk boundaries come from one narrow index scan
+    async with session_factory() as session:
+        ids = (await session.scalars(select(Portfolio.id).order_by(Portfolio.id))).all()
+    boundaries = [
+        ids[start - 1] if start else 0 for start in range(0, len(ids), chunk_size)
+    ]
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_chunk(after_id: int) -> List[RebalanceProposal]:
+        async with semaphore:
+            async with session_factory() as session:
+                service = RebalancingService(session, tolerance, min_trade_value)
+                portfolios, holdings = await service.load_chunk(after_id, chunk_size)
+            return await asyncio.to_thread(
+                compute_proposals,
+                portfolios,
+                holdings,
+                service.tolerance,
+                service.min_trade_value,
+            )
+
+    tasks = [asyncio.ensure_future(run_chunk(after_id)) for after_id in boundaries]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
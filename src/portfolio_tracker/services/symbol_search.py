@@ -0,0 +1,199 @@
+"""
+Symbol Search Service
+
+In-memory prefix index for symbol autocomplete.
+
+Known symbols (held in any portfolio or tracked by the price refresh
+worker) and the words of their names are kept in two sorted arrays. A
+prefix lookup is one ``bisect`` into each array followed by a scan of the
+matching run, so keystroke-by-keystroke completion never touches the
+database. The index is rebuilt with one query per source after
+``SYMBOL_INDEX_REFRESH_SECONDS``, or sooner when the invalidation bus
+reports prices for a symbol it does not know yet.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db.price_refresh_state import PriceRefreshState
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.services.invalidation import Invalidation, get_invalidation_bus
+
+settings = get_settings()
+
+
+class SymbolIndex:
+    """Immutable prefix index over symbols and the words of their names."""
+
+    def __init__(self, entries: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Build index.
+
+        Args:
+            entries: (symbol, name or None) pairs; the first name seen for
+                a symbol is kept
+        """
+        self.names: Dict[str, Optional[str]] = {}
+        for symbol, name in entries:
+            symbol = symbol.upper()
+            if not self.names.get(symbol):
+                self.names[symbol] = name or None
+
+        self._symbols: List[str] = sorted(self.names)
+        self._words: List[Tuple[str, str]] = sorted(
+            {
+                (word, symbol)
+                for symbol, name in self.names.items()
+                if name
+                for word in name.lower().split()
+            }
+        )
+
+    def __len__(self) -> int:
+        """Number of indexed symbols."""
+        return len(self._symbols)
+
+    def __contains__(self, symbol: object) -> bool:
+        """Whether a symbol is indexed."""
+        return symbol in self.names
+
+    def complete(self, prefix: str, limit: int) -> List[Tuple[str, Optional[str]]]:
+        """
+        Complete a prefix.
+
+        Symbols starting with the prefix come first, then symbols with a
+        name word starting with it.
+
+        Args:
+            prefix: Typed text (case-insensitive)
+            limit: Maximum suggestions
+
+        Returns:
+            List of (symbol, name or None)
+        """
+        prefix = prefix.strip()
+        if not prefix or limit <= 0:
+            return []
+
+        matches: Dict[str, None] = {}
+        upper = prefix.upper()
+        position = bisect_left(self._symbols, upper)
+        while (
+            len(matches) < limit
+            and position < len(self._symbols)
+            and self._symbols[position].startswith(upper)
+        ):
+            matches[self._symbols[position]] = None
+            position += 1
+
+        lower = prefix.lower()
+        position = bisect_left(self._words, (lower, ""))
+        while (
+            len(matches) < limit
+            and position < len(self._words)
+            and self._words[position][0].startswith(lower)
+        ):
+            matches.setdefault(self._words[position][1], None)
+            position += 1
+
+        return [(symbol, self.names[symbol]) for symbol in matches]
+
+
+class SymbolSearchService:
+    """Service answering symbol autocomplete from the process-wide index."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def complete(
+        self, prefix: str, limit: int = 10
+    ) -> List[Tuple[str, Optional[str]]]:
+        """
+        Complete a symbol or name prefix.
+
+        Args:
+            prefix: Typed text
+            limit: Maximum suggestions
+
+        Returns:
+            List of (symbol, name or None)
+        """
+        index = await self.get_index()
+        return index.complete(prefix, limit)
+
+    async def get_index(self) -> SymbolIndex:
+        """Get the process-wide index, rebuilding it if missing or stale."""
+        cache = get_symbol_index_cache()
+        index = cache.get()
+        if index is None:
+            held = await HoldingRepository(self.session).get_symbol_names()
+            result = await self.session.execute(select(PriceRefreshState.symbol))
+            tracked = [(symbol, None) for symbol in result.scalars()]
+            index = cache.set(SymbolIndex([*held, *tracked]))
+        return index
+
+
+class SymbolIndexCache:
+    """Holder of the current index, expiring it after a refresh interval."""
+
+    def __init__(
+        self, refresh_seconds: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            refresh_seconds: Index lifetime
+            clock: Time source (monotonic seconds)
+        """
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._index: Optional[SymbolIndex] = None
+        self._expires_at = 0.0
+
+    def get(self) -> Optional[SymbolIndex]:
+        """Current index, or None if it must be rebuilt."""
+        if self._index is not None and self._expires_at <= self._clock():
+            self._index = None
+        return self._index
+
+    def set(self, index: SymbolIndex) -> SymbolIndex:
+        """Store a freshly built index."""
+        self._index = index
+        self._expires_at = self._clock() + self.refresh_seconds
+        return index
+
+    def learn(self, symbol: str) -> None:
+        """Expire the index if ``symbol`` is not in it."""
+        if self._index is not None and symbol not in self._index:
+            self._index = None
+
+    def clear(self) -> None:
+        """Drop the index."""
+        self._index = None
+
+
+_cache: Optional[SymbolIndexCache] = None
+
+
+def get_symbol_index_cache() -> SymbolIndexCache:
+    """Get the process-wide index holder, expired by prices for new symbols."""
+    global _cache
+
+    if _cache is None:
+        _cache = SymbolIndexCache(settings.SYMBOL_INDEX_REFRESH_SECONDS)
+        cache = _cache
+
+        def learn(invalidation: Invalidation) -> None:
+            cache.learn(invalidation.id)
+
+        bus = get_invalidation_bus()
+        bus.subscribe("market_price", learn)
+        bus.on_reset(cache.clear)
+    return _cache
@@ -0,0 +1,164 @@
+"""
+Transaction Service
+
+Records transactions and applies them to the portfolio's holding of the
+symbol in the same database transaction.
+
+Buys and transfers in add to the position and its cost; sells and
+transfers out remove quantity at the average cost, leaving
+``average_cost`` unchanged. Splits add quantity without cost. Dividends
+are recorded without touching the position. The holding is revalued at
+its current price and the portfolio totals are recomputed.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional, Protocol, cast
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from portfolio_tracker.models.db.holding import Holding
+from portfolio_tracker.models.db.transaction import Transaction, TransactionType
+from portfolio_tracker.models.schemas.transaction import TransactionCreate
+from portfolio_tracker.repositories.holding import MAX_GAIN_LOSS_PERCENT
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+from portfolio_tracker.utils.exceptions import (
+    InvalidTransactionException,
+    PortfolioNotFoundException,
+)
+
+CENT = Decimal("0.01")
+
+ADDING = frozenset({TransactionType.BUY, TransactionType.TRANSFER_IN})
+REMOVING = frozenset({TransactionType.SELL, TransactionType.TRANSFER_OUT})
+
+
+def _money(value: Decimal) -> Decimal:
+    """Round to cents."""
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class _Position(Protocol):
+    """Holding columns this service updates, typed as loaded values."""
+
+    quantity: Decimal
+    average_cost: Decimal
+    total_cost: Decimal
+    current_price: Optional[Decimal]
+    market_value: Optional[Decimal]
+    unrealized_gain_loss: Optional[Decimal]
+    unrealized_gain_loss_percent: Optional[Decimal]
+
+
+class TransactionService:
+    """Service recording transactions against holdings."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        """Initialize service with a database session."""
+        self.session = session
+
+    async def create(
+        self, portfolio_id: int, user_id: int, payload: TransactionCreate
+    ) -> Transaction:
+        """
+        Record a transaction and update the holding and portfolio totals.
+
+        Args:
+            portfolio_id: Portfolio ID
+            user_id: Owner user ID
+            payload: Transaction to record
+
+        Returns:
+            Transaction: Committed transaction
+
+        Raises:
+            PortfolioNotFoundException: Portfolio missing or not owned
+            InvalidTransactionException: Removing more than is held
+        """
+        portfolios = PortfolioRepository(self.session)
+        portfolio = await portfolios.get_for_user(portfolio_id, user_id)
+        if portfolio is None:
+            raise PortfolioNotFoundException(portfolio_id)
+
+        kind = payload.transaction_type
+        result = await self.session.execute(
+            select(Holding).where(
+                Holding.portfolio_id == portfolio_id, Holding.symbol == payload.symbol
+            )
+        )
+        holding = result.scalar_one_or_none()
+        held = (
+            cast(_Position, holding).quantity if holding is not None else Decimal("0")
+        )
+        if kind in REMOVING and payload.quantity > held:
+            raise InvalidTransactionException(
+                f"Cannot remove {payload.quantity} {payload.symbol}, {held} held",
+                details={"symbol": payload.symbol, "held": str(held)},
+            )
+        if holding is None:
+            holding = Holding(
+                portfolio_id=portfolio_id,
+                symbol=payload.symbol,
+                quantity=Decimal("0"),
+                average_cost=Decimal("0"),
+                total_cost=Decimal("0"),
+            )
+            self.session.add(holding)
+            await self.session.flush()
+        position = cast(_Position, holding)
+
+        gross = payload.quantity * payload.price
+        costs = payload.commission + payload.fees
+        if kind in ADDING:
+            total_amount = gross + costs
+            position.quantity = held + payload.quantity
+            position.total_cost = _money(position.total_cost + total_amount)
+        elif kind in REMOVING:
+            total_amount = gross - costs
+            cost_basis = position.average_cost * payload.quantity
+            position.quantity = held - payload.quantity
+            position.total_cost = _money(
+                max(position.total_cost - cost_basis, Decimal("0"))
+            )
+        elif kind is TransactionType.SPLIT:
+            total_amount = Decimal("0")
+            position.quantity = held + payload.quantity
+        else:
+            total_amount = gross - costs
+
+        quantity = position.quantity
+        position.average_cost = (
+            _money(position.total_cost / quantity) if quantity else Decimal("0")
+        )
+        if position.current_price is not None:
+            position.market_value = _money(quantity * position.current_price)
+            position.unrealized_gain_loss = position.market_value - position.total_cost
+            total_cost = position.total_cost
+            position.unrealized_gain_loss_percent = (
+                min(
+                    _money(position.unrealized_gain_loss / total_cost * 100),
+                    MAX_GAIN_LOSS_PERCENT,
+                )
+                if total_cost > 0
+                else Decimal("0")
+            )
+
+        transaction = Transaction(
+            portfolio_id=portfolio_id,
+            holding_id=holding.id,
+            transaction_type=kind,
+            transaction_date=payload.transaction_date,
+            symbol=payload.symbol,
+            quantity=payload.quantity,
+            price=payload.price,
+            commission=payload.commission,
+            fees=payload.fees,
+            total_amount=_money(total_amount),
+            notes=payload.notes,
+            currency=payload.currency or portfolio.currency,
+        )
+        self.session.add(transaction)
+        await self.session.flush()
+        await portfolios.recompute_totals([portfolio_id])
+        await self.session.commit()
+        return transaction
@@ -0,0 +1,133 @@
+"""
+Local Cache
+
+Small in-process TTL cache whose entries are grouped by invalidation key,
+so an invalidation for e.g. portfolio 42 evicts every entry derived from
+it at once.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Set, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class LocalCache(Generic[V]):
+    """
+    LRU cache with a TTL and key-group eviction.
+
+    Entries are stored under ``(group, key)``: ``group`` is the
+    invalidation key (a portfolio ID, a symbol, ...) and ``key`` identifies
+    the cached value within it (request parameters, a version, ...).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            ttl_seconds: Entry lifetime
+            max_entries: Entries kept before evicting least recently used
+            clock: Time source (monotonic seconds)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[Hashable, Hashable], Tuple[float, V]]" = (
+            OrderedDict()
+        )
+        self._groups: Dict[Hashable, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        """Number of stored entries, including expired ones not yet purged."""
+        return len(self._entries)
+
+    def get(self, group: Hashable, key: Hashable = None) -> Optional[V]:
+        """Get a live entry, or None."""
+        entry = self._entries.get((group, key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            self._discard(group, key)
+            return None
+        self._entries.move_to_end((group, key))
+        return value
+
+    def set(self, group: Hashable, key: Hashable, value: V) -> None:
+        """Store an entry."""
+        self._entries[(group, key)] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end((group, key))
+        self._groups.setdefault(group, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            (old_group, old_key), _ = self._entries.popitem(last=False)
+            self._forget(old_group, old_key)
+
+    def invalidate(self, group: Hashable) -> int:
+        """
+        Evict every entry of a group.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        keys = self._groups.pop(group, set())
+        for key in keys:
+            self._entries.pop((group, key), None)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Evict everything."""
+        self._entries.clear()
+        self._groups.clear()
+
+    def _discard(self, group: Hashable, key: Hashable) -> None:
+        """Remove one entry."""
+        self._entries.pop((group, key), None)
+        self._forget(group, key)
+
+    def _forget(self, group: Hashable, key: Hashable) -> None:
+        """Remove a key from its group index."""
+        keys = self._groups.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+
+def bind_invalidations(
+    cache: LocalCache[Any], bus: Any, *entities: str
+) -> Callable[[], None]:
+    """
+    Evict cache groups when the bus reports changes to ``entities``.
+
+    The invalidation ``id`` is used as the group; a bus reset clears the
+    whole cache.
+
+    Args:
+        cache: Cache to evict from
+        bus: :class:`~portfolio_tracker.services.invalidation.InvalidationBus`
+        *entities: Entity names to follow
+
+    Returns:
+        Callable that detaches the cache from the bus
+    """
+
+    def evict(invalidation: Any) -> None:
+        cache.invalidate(invalidation.id)
+
+    for entity in entities:
+        bus.subscribe(entity, evict)
+    bus.on_reset(cache.clear)
+
+    def unbind() -> None:
+        for entity in entities:
+            bus.unsubscribe(entity, evict)
+        bus.remove_reset(cache.clear)
+
+    return unbind
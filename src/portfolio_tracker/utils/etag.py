@@ -0,0 +1,79 @@
+"""
+ETag Utilities
+
+Helpers for weak ETags and conditional GET handling.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+
+def build_weak_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from version components.
+
+    Args:
+        *parts: Values identifying the resource version (ids, timestamps, counts)
+
+    Returns:
+        str: Weak ETag, e.g. ``W/"3f2a..."``
+    """
+    digest = hashlib.blake2b(
+        "|".join(map(str, parts)).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an ``If-None-Match`` header against an ETag.
+
+    Uses weak comparison as required for ``If-None-Match``.
+
+    Args:
+        if_none_match: Raw header value
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: True if the client copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified_response(etag: str) -> Response:
+    """
+    Build an empty ``304 Not Modified`` response.
+
+    Args:
+        etag: Current ETag of the resource
+
+    Returns:
+        Response: 304 response carrying the ETag
+    """
+    return Response(status_code=304, headers=conditional_headers(etag))
+
+
+def conditional_headers(etag: str) -> Dict[str, str]:
+    """
+    Get caching headers for a conditionally served resource.
+
+    Clients may cache the payload but must revalidate it on every use.
+
+    Args:
+        etag: Current ETag of the resource
+
+    Returns:
+        Dict[str, str]: Response headers
+    """
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
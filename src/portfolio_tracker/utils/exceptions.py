@@ -181,6 +181,22 @@ class DuplicateResourceException(PortfolioTrackerException):
         super().__init__(message, "DUPLICATE_RESOURCE", 409, details)
 
 
+class IdempotencyKeyReusedException(PortfolioTrackerException):
+    """Raised when an idempotency key is reused for a different request."""
+
+    def __init__(self, details: Optional[Dict[str, Any]] = None) -> None:
+        message = "Idempotency-Key was already used for a different request"
+        super().__init__(message, "IDEMPOTENCY_KEY_REUSED", 422, details)
+
+
+class IdempotencyKeyInProgressException(PortfolioTrackerException):
+    """Raised when a request with the same idempotency key is still running."""
+
+    def __init__(self, details: Optional[Dict[str, Any]] = None) -> None:
+        message = "A request with this Idempotency-Key is still being processed"
+        super().__init__(message, "IDEMPOTENCY_KEY_IN_PROGRESS", 409, details)
+
+
 # ============================================================================
 # Business Logic Exceptions
 # ============================================================================
@@ -241,3 +257,19 @@ class MarketDataUnavailableException(ExternalServiceException):
     def __init__(self, symbol: str, details: Optional[Dict[str, Any]] = None) -> None:
         message = f"Market data unavailable for symbol: {symbol}"
         super().__init__(message, "MARKET_DATA_UNAVAILABLE", details)
+
+
+class ExchangeRateUnavailableException(ExternalServiceException):
+    """Raised when no exchange rate is known for a currency pair and date."""
+
+    def __init__(
+        self,
+        base_currency: str,
+        quote_currency: str,
+        on_date: Any = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        message = f"Exchange rate unavailable for {base_currency}/{quote_currency}"
+        if on_date is not None:
+            message += f" on {on_date}"
+        super().__init__(message, "EXCHANGE_RATE_UNAVAILABLE", details)
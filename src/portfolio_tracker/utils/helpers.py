@@ -6,7 +6,6 @@ Reusable helper functions for common operations.
 
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
-from uuid import UUID
 
 
 def generate_response(
@@ -83,6 +82,9 @@ def to_dict(obj: Any, exclude: Optional[list[str]] = None) -> Dict[str, Any]:
     """
     Convert SQLAlchemy model to dictionary.
 
+    Uses the cached serializer for the model's column set, so values come
+    back JSON-ready (ISO dates, Decimal strings, enum values).
+
     Args:
         obj: SQLAlchemy model instance
         exclude: List of fields to exclude
@@ -90,22 +92,18 @@ def to_dict(obj: Any, exclude: Optional[list[str]] = None) -> Dict[str, Any]:
     Returns:
         Dict: Model as dictionary
     """
-    if exclude is None:
-        exclude = []
+    # Deferred: serialization imports SQLAlchemy, which main.py avoids at import
+    from portfolio_tracker.utils.serialization import (
+        column_names,
+        get_object_serializer,
+    )
 
-    result = {}
-    for column in obj.__table__.columns:
-        if column.name not in exclude:
-            value = getattr(obj, column.name)
-            # Convert UUID to string
-            if isinstance(value, UUID):
-                value = str(value)
-            # Convert datetime to ISO format
-            elif isinstance(value, datetime):
-                value = value.isoformat()
-            result[column.name] = value
+    model: Any = type(obj)
+    fieldset = column_names(model)
+    if exclude:
+        fieldset = tuple(name for name in fieldset if name not in exclude)
 
-    return result
+    return get_object_serializer(model, fieldset)(obj)
 
 
 def paginate_query(
@@ -162,3 +160,20 @@ def generate_pagination_meta(
         "has_next": page < total_pages,
         "has_previous": page > 1,
     }
+
+
+def contains_pattern(term: str) -> str:
+    """
+    Build a ``LIKE``/``ILIKE`` pattern matching ``term`` anywhere.
+
+    ``%``, ``_`` and the escape character are escaped, so the pattern is
+    used with ``escape="\\"``.
+
+    Args:
+        term: Literal text to search for
+
+    Returns:
+        str: ``%term%`` pattern
+    """
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
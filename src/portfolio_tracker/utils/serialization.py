@@ -0,0 +1,142 @@
+"""
+Row Serialization
+
+Sparse fieldsets and precompiled row serializers for ORM models.
+
+A fieldset is the tuple of column names a client asked for with
+``fields=``, in the endpoint's response order. Repositories select only
+those columns, and :func:`get_row_serializer` returns a function that
+turns each result row into a JSON-ready dict. The per-column conversion
+is chosen once from the column type when the serializer is compiled and
+cached per ``(model, fieldset)``, instead of being re-discovered with
+``isinstance`` checks for every value of every row.
+"""
+
+from functools import lru_cache
+from operator import attrgetter, methodcaller
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, Date, DateTime, Enum, Numeric, Uuid
+
+from portfolio_tracker.utils.exceptions import ValidationException
+
+FieldSet = Tuple[str, ...]
+RowSerializer = Callable[[Sequence[Any]], Dict[str, Any]]
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (default: all)"
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> FieldSet:
+    """
+    Parse a ``fields=`` query parameter into a fieldset.
+
+    Args:
+        fields: Comma-separated field names, or None for every allowed field
+        allowed: Fields the endpoint exposes, in response order
+
+    Returns:
+        FieldSet: Requested fields in ``allowed`` order
+
+    Raises:
+        ValidationException: If a requested field is not exposed
+    """
+    if fields is None or not fields.strip():
+        return tuple(allowed)
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise ValidationException(
+            message=f"Unknown fields: {', '.join(unknown)}",
+            details={"field": "fields", "unknown": unknown, "allowed": list(allowed)},
+        )
+    return tuple(name for name in allowed if name in requested)
+
+
+def select_columns(model: Any, fieldset: FieldSet) -> Tuple[Column, ...]:
+    """
+    Get the table columns for a fieldset, for use in ``select()``.
+
+    Args:
+        model: ORM model class
+        fieldset: Column names
+
+    Returns:
+        Tuple of table columns
+    """
+    return tuple(model.__table__.c[name] for name in fieldset)
+
+
+@lru_cache(maxsize=256)
+def get_row_serializer(model: Any, fieldset: FieldSet) -> RowSerializer:
+    """
+    Get the compiled serializer for rows of ``fieldset`` columns.
+
+    Args:
+        model: ORM model class
+        fieldset: Column names, in row order
+
+    Returns:
+        RowSerializer: Function mapping a result row to a JSON-ready dict
+    """
+    columns = select_columns(model, fieldset)
+    converters = [_converter_for(column) for column in columns]
+
+    if not any(converters):
+        return lambda row: dict(zip(fieldset, row))
+
+    plan = tuple(zip(fieldset, converters))
+
+    def serialize(row: Sequence[Any]) -> Dict[str, Any]:
+        return {
+            name: value if convert is None or value is None else convert(value)
+            for (name, convert), value in zip(plan, row)
+        }
+
+    return serialize
+
+
+@lru_cache(maxsize=256)
+def get_object_serializer(
+    model: Any, fieldset: FieldSet
+) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Get the compiled serializer for ORM instances of ``model``.
+
+    Args:
+        model: ORM model class
+        fieldset: Column names to include
+
+    Returns:
+        Function mapping a model instance to a JSON-ready dict
+    """
+    serialize_row = get_row_serializer(model, fieldset)
+    if not fieldset:
+        return lambda obj: {}
+    if len(fieldset) == 1:
+        name = fieldset[0]
+        return lambda obj: serialize_row((getattr(obj, name),))
+
+    getter = attrgetter(*fieldset)
+    return lambda obj: serialize_row(getter(obj))
+
+
+@lru_cache(maxsize=None)
+def column_names(model: Any) -> FieldSet:
+    """Get a model's column names in table order."""
+    return tuple(column.name for column in model.__table__.columns)
+
+
+def _converter_for(column: Column) -> Optional[Callable[[Any], Any]]:
+    """Pick the JSON conversion for a column type; None means as-is."""
+    column_type = column.type
+    if isinstance(column_type, Enum):
+        return attrgetter("value") if column_type.enum_class is not None else None
+    if isinstance(column_type, (DateTime, Date)):
+        return methodcaller("isoformat")
+    if isinstance(column_type, Numeric) and column_type.asdecimal:
+        # Exact string form, as Pydantic emits Decimals in JSON mode
+        return str
+    if isinstance(column_type, Uuid):
+        return str
+    return None
@@ -0,0 +1,158 @@
+"""
+Time-Series Encoding
+
+Content negotiation and encoding for time-series responses.
+
+Series are passed around as NumPy column arrays (a ``datetime64[D]``
+``date`` column plus numeric value columns) and encoded straight from
+those arrays:
+
+- ``application/json`` (default): standard envelope with one object per point
+- ``application/vnd.apache.arrow.stream``: Arrow IPC stream (needs ``pyarrow``)
+- ``application/msgpack``: column block with dates as days since 1970-01-01
+  (needs ``msgpack``)
+
+Binary formats whose library is not installed are simply not offered
+during negotiation, so clients fall back to JSON.
+"""
+
+import importlib.util
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from portfolio_tracker.utils.helpers import generate_response
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Media type -> module required to encode it
+_BINARY_FORMATS = {
+    ARROW_MEDIA_TYPE: "pyarrow",
+    MSGPACK_MEDIA_TYPE: "msgpack",
+    "application/x-msgpack": "msgpack",
+}
+
+
+def available_media_types() -> List[str]:
+    """Get the time-series media types this installation can produce."""
+    return [JSON_MEDIA_TYPE] + [
+        media_type
+        for media_type, module in _BINARY_FORMATS.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an ``Accept`` header.
+
+    Args:
+        accept: Raw ``Accept`` header value
+
+    Returns:
+        str: Highest-quality supported media type, JSON by default
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    supported = available_media_types()
+    candidates: List[Tuple[float, int, str]] = []
+    for position, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in supported and quality > 0:
+            candidates.append((-quality, position, media_type))
+
+    if not candidates:
+        return JSON_MEDIA_TYPE
+    return min(candidates)[2]
+
+
+def timeseries_response(
+    columns: Mapping[str, np.ndarray],
+    media_type: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Encode time-series columns into a response.
+
+    Args:
+        columns: Column name -> array; must include a ``date`` column
+        media_type: Negotiated media type
+        headers: Extra response headers
+
+    Returns:
+        Response: Encoded response
+    """
+    headers = {**(headers or {}), "Vary": "Accept"}
+    if media_type == ARROW_MEDIA_TYPE:
+        body = _encode_arrow(columns)
+    elif media_type in _BINARY_FORMATS:
+        body = _encode_msgpack(columns)
+    else:
+        return JSONResponse(
+            content=generate_response(data=_to_records(columns)), headers=headers
+        )
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def _to_records(columns: Mapping[str, np.ndarray]) -> List[Dict[str, object]]:
+    """Convert columns to JSON-ready records."""
+    lists = {
+        name: (
+            np.datetime_as_string(values, unit="D").tolist()
+            if np.issubdtype(values.dtype, np.datetime64)
+            else values.tolist()
+        )
+        for name, values in columns.items()
+    }
+    names = list(lists)
+    return [dict(zip(names, row)) for row in zip(*lists.values())]
+
+
+def _encode_arrow(columns: Mapping[str, np.ndarray]) -> bytes:
+    """Encode columns as an Arrow IPC stream."""
+    import pyarrow as pa
+
+    table = pa.table(
+        {
+            name: pa.array(
+                values.astype("datetime64[D]")
+                if np.issubdtype(values.dtype, np.datetime64)
+                else values
+            )
+            for name, values in columns.items()
+        }
+    )
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    data: bytes = sink.getvalue().to_pybytes()
+    return data
+
+
+def _encode_msgpack(columns: Mapping[str, np.ndarray]) -> bytes:
+    """Encode columns as a MessagePack column block."""
+    import msgpack
+
+    block = {
+        name: (
+            values.astype("datetime64[D]").astype(np.int64).tolist()
+            if np.issubdtype(values.dtype, np.datetime64)
+            else values.tolist()
+        )
+        for name, values in columns.items()
+    }
+    data: bytes = msgpack.packb({"columns": list(columns), **block})
+    return data
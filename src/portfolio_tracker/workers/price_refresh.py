@@ -0,0 +1,52 @@
+"""
+Price Refresh Worker
+
+Standalone entry point running the price refresh scheduler outside the
+API process:
+
+    poetry run portfolio-tracker-price-worker
+"""
+
+import asyncio
+import signal
+import sys
+
+from portfolio_tracker.config.database import close_db
+from portfolio_tracker.config.logging import get_logger, setup_logging
+from portfolio_tracker.services.holding_prices import HoldingPriceBuffer
+from portfolio_tracker.services.market_data import AlphaVantageProvider
+from portfolio_tracker.services.price_refresh import PriceRefreshScheduler
+
+logger = get_logger(__name__)
+
+
+async def run_worker() -> None:
+    """Run the scheduler until SIGINT/SIGTERM, then flush buffered holding prices."""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    provider = AlphaVantageProvider()
+    holding_prices = HoldingPriceBuffer()
+    holding_prices.start()
+    scheduler = PriceRefreshScheduler(provider, holding_prices=holding_prices)
+    logger.info("Price refresh worker started")
+    try:
+        await scheduler.run_forever(stop_event)
+    finally:
+        await holding_prices.close()
+        await provider.aclose()
+        await close_db()
+        logger.info("Price refresh worker stopped")
+
+
+def main() -> int:
+    """Main function for the price refresh worker."""
+    setup_logging()
+    asyncio.run(run_worker())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Price Store Worker
+
+Keeps the local columnar price store in sync with ``market_prices``:
+
+    poetry run portfolio-tracker-price-store           # refresh once
+    poetry run portfolio-tracker-price-store --loop    # refresh periodically
+
+Run a single instance per host; analytics workers on the same host read
+the store through memory-mapped files.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+from portfolio_tracker.config.database import close_db, get_session_factory
+from portfolio_tracker.config.logging import get_logger, setup_logging
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.services.price_store import ColumnarPriceStore
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+async def refresh_store(store: ColumnarPriceStore, loop_forever: bool) -> None:
+    """Refresh the store once, or until SIGINT/SIGTERM when looping."""
+    stop_event = asyncio.Event()
+    if loop_forever:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_event.set)
+
+    try:
+        while True:
+            async with get_session_factory()() as session:
+                applied = await store.refresh(session)
+            logger.info("Price store refresh applied %d rows", applied)
+            if not loop_forever:
+                break
+            try:
+                await asyncio.wait_for(
+                    stop_event.wait(), timeout=settings.PRICE_STORE_REFRESH_SECONDS
+                )
+                break
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        await close_db()
+
+
+def main() -> int:
+    """Main function for the price store worker."""
+    parser = argparse.ArgumentParser(description="Columnar price store refresher")
+    parser.add_argument(
+        "--path", type=Path, default=Path(settings.PRICE_STORE_PATH), help="Store path"
+    )
+    parser.add_argument("--loop", action="store_true", help="Refresh periodically")
+
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(refresh_store(ColumnarPriceStore(args.path), args.loop))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
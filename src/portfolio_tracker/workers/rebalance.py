@@ -0,0 +1,86 @@
+"""
+Rebalancing Batch Job
+
+Proposes rebalancing trades for every portfolio and writes them as JSON
+lines, one proposal per portfolio that needs trades:
+
+    poetry run portfolio-tracker-rebalance --output proposals.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional, TextIO
+
+from portfolio_tracker.config.database import close_db, get_session_factory
+from portfolio_tracker.config.logging import get_logger, setup_logging
+from portfolio_tracker.services.rebalancing import propose_all
+
+logger = get_logger(__name__)
+
+
+async def run_job(
+    output: TextIO,
+    chunk_size: Optional[int],
+    concurrency: Optional[int],
+    tolerance: Optional[float],
+    min_trade_value: Optional[float],
+) -> int:
+    """Write every proposal to ``output``; returns the number written."""
+    written = 0
+    started = time.perf_counter()
+    try:
+        async for proposals in propose_all(
+            get_session_factory(),
+            chunk_size=chunk_size,
+            concurrency=concurrency,
+            tolerance=tolerance,
+            min_trade_value=min_trade_value,
+        ):
+            for proposal in proposals:
+                output.write(json.dumps(proposal.model_dump(mode="json")) + "\n")
+            written += len(proposals)
+    finally:
+        await close_db()
+    logger.info(
+        "Rebalancing proposed trades for %d portfolios in %.1fs",
+        written,
+        time.perf_counter() - started,
+    )
+    return written
+
+
+def main() -> int:
+    """Main function for the rebalancing batch job."""
+    parser = argparse.ArgumentParser(description="Rebalancing batch job")
+    parser.add_argument("--output", type=Path, help="JSON lines file (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, help="Portfolios per chunk")
+    parser.add_argument("--concurrency", type=int, help="Chunks in parallel")
+    parser.add_argument("--tolerance", type=float, help="Largest drift left untouched")
+    parser.add_argument("--min-trade-value", type=float, help="Smallest trade")
+
+    args = parser.parse_args()
+
+    setup_logging()
+    output = open(args.output, "w") if args.output else sys.stdout
+    try:
+        asyncio.run(
+            run_job(
+                output,
+                args.chunk_size,
+                args.concurrency,
+                args.tolerance,
+                args.min_trade_value,
+            )
+        )
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,10 @@ Configuración pytest (fixtures compartidas).
 """
 
 import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from portfolio_tracker.config.database import Base
 
 
 @pytest.fixture
@@ -15,3 +19,69 @@ def ejemplo_fixture():
 def config_mock():
     """Fixture con configuración de ejemplo."""
     return {"setting1": "value1", "setting2": "value2"}
+
+
+@pytest.fixture(autouse=True)
+def indice_precios_vacio():
+    """Índice as-of de precios vacío en cada test (es global al proceso)."""
+    from portfolio_tracker.services.price_index import get_price_index
+
+    get_price_index().clear()
+
+
+@pytest.fixture(autouse=True)
+def mapa_simbolos_vacio():
+    """Mapa símbolo <-> ID de instrumento vacío en cada test (es global al proceso)."""
+    from portfolio_tracker.services.instruments import get_symbol_map
+
+    get_symbol_map().clear()
+
+
+@pytest_asyncio.fixture
+async def db_session():
+    """Sesión async sobre SQLite en memoria con todas las tablas creadas."""
+    import portfolio_tracker.models.db  # noqa: F401  (registra los modelos)
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def instrument():
+    """Devuelve el ``Instrument`` de un símbolo, creando uno por símbolo y test."""
+    from portfolio_tracker.models.db import Instrument
+
+    instruments = {}
+
+    def get(symbol: str) -> Instrument:
+        if symbol not in instruments:
+            instruments[symbol] = Instrument(symbol=symbol)
+        return instruments[symbol]
+
+    return get
+
+
+@pytest_asyncio.fixture
+async def api_client(db_session):
+    """Cliente HTTP async contra la app con BD SQLite y usuario id=1."""
+    import httpx
+    from fastapi import Request
+
+    from portfolio_tracker.api.v1.dependencies import get_current_user, get_db_session
+    from portfolio_tracker.main import app
+    from portfolio_tracker.services.batch import BATCH_SESSION_KEY
+
+    async def override_db(request: Request):
+        # Las sub-peticiones de /batch usan la sesión compartida del lote
+        yield getattr(request.state, BATCH_SESSION_KEY, None) or db_session
+
+    app.dependency_overrides[get_db_session] = override_db
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "is_admin": False}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
@@ -1,8 +1,25 @@
 """
 Factories para crear objetos de prueba.
+
+Incluye generadores de datos sintéticos a escala (instrumentos, usuarios,
+portfolios, holdings, transacciones y precios históricos) usados por los tests y por
+la suite de benchmarks. Los generadores producen diccionarios de filas
+listos para ``insert()`` masivo y son deterministas dada una semilla.
 """
 
-from typing import Any, Dict
+import random
+import string
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Sequence
+
+ASSET_TYPES = ("stock", "stock", "stock", "etf", "etf", "crypto", "bond")
+CURRENCIES = ("USD", "USD", "USD", "EUR", "GBP")
+RISK_PROFILES = ("CONSERVATIVE", "MODERATE", "AGGRESSIVE")
+TRADE_TYPES = ("BUY", "BUY", "BUY", "SELL", "DIVIDEND")
+
+CENT = Decimal("0.01")
 
 
 def create_test_config(**overrides: Any) -> Dict[str, Any]:
@@ -18,3 +35,268 @@ def create_test_config(**overrides: Any) -> Dict[str, Any]:
     default = {"setting1": "default_value1", "setting2": "default_value2"}
     default.update(overrides)
     return default
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """Tamaños de un conjunto de datos sintético."""
+
+    users: int
+    portfolios_per_user: int
+    holdings_per_portfolio: int
+    transactions: int
+    symbols: int
+    price_years: int
+
+
+SCALES: Dict[str, SyntheticScale] = {
+    "tiny": SyntheticScale(
+        users=20,
+        portfolios_per_user=2,
+        holdings_per_portfolio=5,
+        transactions=2_000,
+        symbols=50,
+        price_years=1,
+    ),
+    "small": SyntheticScale(
+        users=200,
+        portfolios_per_user=2,
+        holdings_per_portfolio=10,
+        transactions=50_000,
+        symbols=500,
+        price_years=2,
+    ),
+    "large": SyntheticScale(
+        users=20_000,
+        portfolios_per_user=3,
+        holdings_per_portfolio=15,
+        transactions=1_000_000,
+        symbols=5_000,
+        price_years=10,
+    ),
+}
+
+
+def _money(value: float) -> Decimal:
+    """Redondear un float a céntimos."""
+    return Decimal(str(value)).quantize(CENT)
+
+
+def build_symbols(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """
+    Crear un universo de símbolos únicos.
+
+    Args:
+        count: Número de símbolos
+        rng: Generador aleatorio
+
+    Returns:
+        Lista de diccionarios con ``id`` (del instrumento), ``symbol``,
+        ``name`` y ``asset_type``
+    """
+    seen: set[str] = set()
+    symbols = []
+    while len(symbols) < count:
+        symbol = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(3, 5)))
+        if symbol in seen:
+            continue
+        seen.add(symbol)
+        symbols.append(
+            {
+                "id": len(symbols) + 1,
+                "symbol": symbol,
+                "name": f"{symbol} Holdings Inc.",
+                "asset_type": rng.choice(ASSET_TYPES),
+            }
+        )
+    return symbols
+
+
+def build_instruments(symbols: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Crear filas de instrumentos para un universo de símbolos.
+
+    Args:
+        symbols: Universo de símbolos
+
+    Returns:
+        Lista de filas para la tabla ``instruments``
+    """
+    return [{"id": asset["id"], "symbol": asset["symbol"]} for asset in symbols]
+
+
+def build_users(count: int) -> List[Dict[str, Any]]:
+    """
+    Crear filas de usuarios.
+
+    Args:
+        count: Número de usuarios
+
+    Returns:
+        Lista de filas para la tabla ``users``
+    """
+    return [
+        {
+            "id": user_id,
+            "email": f"user{user_id}@example.com",
+            "password_hash": "x" * 60,
+            "name": f"User {user_id}",
+        }
+        for user_id in range(1, count + 1)
+    ]
+
+
+def build_portfolios(
+    users: Sequence[Dict[str, Any]], per_user: int, rng: random.Random
+) -> List[Dict[str, Any]]:
+    """
+    Crear filas de portfolios para cada usuario.
+
+    Args:
+        users: Filas de usuarios
+        per_user: Portfolios por usuario
+        rng: Generador aleatorio
+
+    Returns:
+        Lista de filas para la tabla ``portfolios``
+    """
+    portfolios = []
+    for user in users:
+        for index in range(per_user):
+            portfolios.append(
+                {
+                    "id": len(portfolios) + 1,
+                    "user_id": user["id"],
+                    "name": f"Portfolio {index + 1}",
+                    "currency": rng.choice(CURRENCIES),
+                    "risk_profile": rng.choice(RISK_PROFILES),
+                }
+            )
+    return portfolios
+
+
+def build_holdings(
+    portfolios: Sequence[Dict[str, Any]],
+    symbols: Sequence[Dict[str, str]],
+    per_portfolio: int,
+    rng: random.Random,
+) -> List[Dict[str, Any]]:
+    """
+    Crear filas de holdings con símbolos distintos por portfolio.
+
+    Args:
+        portfolios: Filas de portfolios
+        symbols: Universo de símbolos
+        per_portfolio: Holdings por portfolio
+        rng: Generador aleatorio
+
+    Returns:
+        Lista de filas para la tabla ``holdings``
+    """
+    holdings = []
+    per_portfolio = min(per_portfolio, len(symbols))
+    for portfolio in portfolios:
+        for asset in rng.sample(symbols, per_portfolio):
+            quantity = _money(rng.uniform(1, 500))
+            average_cost = _money(rng.uniform(5, 500))
+            current_price = _money(float(average_cost) * rng.uniform(0.5, 2.0))
+            holdings.append(
+                {
+                    "id": len(holdings) + 1,
+                    "portfolio_id": portfolio["id"],
+                    "symbol": asset["symbol"],
+                    "name": asset["name"],
+                    "asset_type": asset["asset_type"],
+                    "quantity": quantity,
+                    "average_cost": average_cost,
+                    "current_price": current_price,
+                    "market_value": _money(quantity * current_price),
+                    "total_cost": _money(quantity * average_cost),
+                }
+            )
+    return holdings
+
+
+def iter_transactions(
+    holdings: Sequence[Dict[str, Any]],
+    count: int,
+    start: date,
+    days: int,
+    rng: random.Random,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generar filas de transacciones repartidas entre los holdings.
+
+    Args:
+        holdings: Filas de holdings
+        count: Número total de transacciones
+        start: Fecha de la primera transacción posible
+        days: Rango de días para las fechas
+        rng: Generador aleatorio
+
+    Yields:
+        Filas para la tabla ``transactions``
+    """
+    for transaction_id in range(1, count + 1):
+        holding = holdings[rng.randrange(len(holdings))]
+        quantity = _money(rng.uniform(1, 100))
+        price = _money(float(holding["average_cost"]) * rng.uniform(0.7, 1.3))
+        commission = _money(rng.uniform(0, 10))
+        yield {
+            "id": transaction_id,
+            "portfolio_id": holding["portfolio_id"],
+            "holding_id": holding["id"],
+            "transaction_type": rng.choice(TRADE_TYPES),
+            "transaction_date": start + timedelta(days=rng.randrange(days)),
+            "symbol": holding["symbol"],
+            "quantity": quantity,
+            "price": price,
+            "commission": commission,
+            "fees": Decimal("0.00"),
+            "total_amount": _money(quantity * price + commission),
+            "notes": None,
+            "currency": "USD",
+        }
+
+
+def iter_market_prices(
+    symbols: Sequence[Dict[str, Any]],
+    start: date,
+    years: int,
+    rng: random.Random,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generar precios diarios (días laborables) con un paseo aleatorio.
+
+    Args:
+        symbols: Universo de símbolos
+        start: Fecha inicial
+        years: Años de histórico por símbolo
+        rng: Generador aleatorio
+
+    Yields:
+        Filas para la tabla ``market_prices``
+    """
+    trading_days = [
+        start + timedelta(days=offset)
+        for offset in range(years * 365)
+        if (start + timedelta(days=offset)).weekday() < 5
+    ]
+    for asset in symbols:
+        close = rng.uniform(5, 500)
+        for day in trading_days:
+            open_ = close
+            close = max(0.01, close * (1 + rng.gauss(0.0003, 0.02)))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, 0.005)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, 0.005)))
+            yield {
+                "instrument_id": asset["id"],
+                "date": day,
+                "open": _money(open_),
+                "high": _money(high),
+                "low": _money(low),
+                "close": _money(close),
+                "adjusted_close": _money(close),
+                "volume": Decimal(rng.randrange(10_000, 5_000_000)),
+                "source": "synthetic",
+            }
@@ -0,0 +1,135 @@
+"""
+Unit tests for the batch request endpoint.
+"""
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+
+from portfolio_tracker.config.settings import get_settings
+from portfolio_tracker.models.db import Holding, Portfolio, User
+from portfolio_tracker.services.batch import BatchSession
+
+
+@pytest.fixture
+async def portfolio(db_session):
+    """Portfolio with one holding owned by user 1."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    db_session.add(
+        Holding(
+            id=100,
+            portfolio_id=10,
+            symbol="AAA",
+            quantity=Decimal("2"),
+            average_cost=Decimal("5"),
+            total_cost=Decimal("10"),
+        )
+    )
+    await db_session.commit()
+    return 10
+
+
+class TestBatchSession:
+    """Tests for the shared batch session."""
+
+    async def test_identical_selects_hit_the_database_once(self, db_session, portfolio):
+        """Test that repeated SELECTs are served from the batch cache."""
+        statements = []
+        event.listen(
+            db_session.bind.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        session = BatchSession(db_session)
+        query = select(Portfolio.name).where(Portfolio.id == 10)
+
+        assert (await session.execute(query)).scalar_one() == "Main"
+        assert await session.scalar(query) == "Main"
+        assert len(statements) == 1
+
+        session.invalidate()
+        assert await session.scalar(query) == "Main"
+        assert len(statements) == 2
+
+    async def test_every_awaited_call_is_serialized(self, db_session, portfolio):
+        """Test that delegated session calls wait for the batch lock."""
+        session = BatchSession(db_session)
+        holding = await session.get(Holding, 100)
+
+        async with session._lock:
+            calls = [
+                asyncio.create_task(session.refresh(holding)),
+                asyncio.create_task(session.stream(select(Holding.symbol))),
+            ]
+            await asyncio.sleep(0.01)
+            assert not any(call.done() for call in calls)
+
+        _, stream = await asyncio.gather(*calls)
+        assert [row async for row in stream] == [("AAA",)]
+
+
+class TestBatchEndpoint:
+    """Tests for POST /api/v1/batch."""
+
+    async def test_results_follow_request_order(self, api_client, portfolio):
+        """Test that sub-requests run and results keep their order and ids."""
+        response = await api_client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {"id": "list", "path": "/api/v1/portfolios"},
+                    {"id": "one", "path": "/api/v1/portfolios/10"},
+                    {
+                        "id": "holdings",
+                        "path": "/api/v1/portfolios/10/holdings",
+                        "query": {"fields": "symbol"},
+                    },
+                    {"id": "missing", "path": "/api/v1/portfolios/99"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        results = response.json()["data"]
+        assert [r["id"] for r in results] == ["list", "one", "holdings", "missing"]
+        assert [r["status"] for r in results] == [200, 200, 200, 404]
+        assert results[1]["body"]["data"]["name"] == "Main"
+        assert results[2]["body"]["data"] == [{"symbol": "AAA"}]
+        assert "etag" in results[1]["headers"]
+
+    async def test_conditional_sub_request(self, api_client, portfolio):
+        """Test that sub-request headers such as If-None-Match are honoured."""
+        etag = (await api_client.get("/api/v1/portfolios/10")).headers["ETag"]
+        response = await api_client.post(
+            "/api/v1/batch",
+            json={
+                "requests": [
+                    {
+                        "path": "/api/v1/portfolios/10",
+                        "headers": {"If-None-Match": etag},
+                    }
+                ]
+            },
+        )
+        result = response.json()["data"][0]
+        assert result["status"] == 304
+        assert result["body"] is None
+
+    async def test_rejects_foreign_and_nested_paths(self, api_client, portfolio):
+        """Test that only API paths outside /batch are dispatched."""
+        response = await api_client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": "/health"}, {"path": "/api/v1/batch"}]},
+        )
+        assert [r["status"] for r in response.json()["data"]] == [400, 400]
+
+    async def test_operation_limit(self, api_client, portfolio):
+        """Test that oversized batches are rejected."""
+        limit = get_settings().BATCH_MAX_OPERATIONS
+        response = await api_client.post(
+            "/api/v1/batch",
+            json={"requests": [{"path": "/api/v1/portfolios"}] * (limit + 1)},
+        )
+        assert response.status_code == 422
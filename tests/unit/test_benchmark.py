@@ -0,0 +1,174 @@
+"""
+Unit tests for benchmark comparison.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from portfolio_tracker.models.db import (
+    Holding,
+    MarketPrice,
+    Portfolio,
+    Transaction,
+    User,
+)
+from portfolio_tracker.models.db.transaction import TransactionType
+from portfolio_tracker.services.analytics import AnalyticsService
+from portfolio_tracker.services.price_index import asof_merge
+
+START = date.today() - timedelta(days=9)
+
+
+def _dates(*values):
+    """``datetime64[D]`` array."""
+    return np.array(values, dtype="datetime64[D]")
+
+
+@pytest.fixture
+async def tracked_portfolio(db_session, instrument):
+    """
+    Portfolio 10 buying AAA on day 0 and again on day 2.
+
+    AAA trades daily and gains 1% a day; BBB trades every other day and is
+    flat; CCC only starts trading on day 3.
+    """
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Growth"))
+    holding = Holding(
+        portfolio_id=10,
+        symbol="AAA",
+        asset_type="stock",
+        quantity=Decimal("20"),
+        average_cost=Decimal("100"),
+        total_cost=Decimal("2000"),
+    )
+    db_session.add(holding)
+    await db_session.flush()
+    for offset in (0, 2):
+        db_session.add(
+            Transaction(
+                portfolio_id=10,
+                holding_id=holding.id,
+                transaction_type=TransactionType.BUY,
+                transaction_date=START + timedelta(days=offset),
+                symbol="AAA",
+                quantity=Decimal("10"),
+                price=Decimal("100"),
+                total_amount=Decimal("1000"),
+            )
+        )
+    for offset in range(10):
+        day = START + timedelta(days=offset)
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=day,
+                close=Decimal(f"{100 * 1.01**offset:.2f}"),
+            )
+        )
+        if offset % 2 == 0:
+            db_session.add(
+                MarketPrice(instrument=instrument("BBB"), date=day, close=Decimal("50"))
+            )
+        if offset >= 3:
+            db_session.add(
+                MarketPrice(instrument=instrument("CCC"), date=day, close=Decimal("10"))
+            )
+    await db_session.commit()
+
+
+class TestAsOfMerge:
+    """Tests for the as-of join."""
+
+    def test_forward_fills_each_series(self):
+        """Test last-value-on-or-before lookups across calendars."""
+        axis = _dates("2024-01-01", "2024-01-02", "2024-01-03", "2024-01-06")
+        merged = asof_merge(
+            axis,
+            [
+                (_dates("2024-01-02", "2024-01-05"), np.array([1.0, 2.0])),
+                (_dates("2023-12-29", "2024-01-03"), np.array([7.0, 8.0])),
+            ],
+        )
+        np.testing.assert_array_equal(
+            merged, [[np.nan, 7.0], [1.0, 7.0], [1.0, 8.0], [2.0, 8.0]]
+        )
+
+    def test_no_series(self):
+        """Test an empty benchmark list."""
+        assert asof_merge(_dates("2024-01-01"), []).shape == (1, 0)
+
+
+class TestBenchmarkComparison:
+    """Tests for return histories and the comparison endpoint."""
+
+    async def test_returns_exclude_purchases(self, db_session, tracked_portfolio):
+        """Test that buying more does not count as performance."""
+        axis, returns = await AnalyticsService(db_session).get_return_history(
+            10, START, START + timedelta(days=9)
+        )
+        assert len(axis) == 10
+        assert returns[0] == 0
+        np.testing.assert_allclose(returns[1:], 0.01, atol=1e-4)
+
+    async def test_compare_with_benchmarks(self, api_client, tracked_portfolio):
+        """Test aligned statistics for several benchmarks."""
+        response = await api_client.get(
+            "/api/v1/analytics/portfolios/10/benchmarks",
+            params=[("symbol", "AAA"), ("symbol", "bbb"), ("symbol", "CCC")],
+        )
+        assert response.status_code == 200
+        data = response.json()["data"]
+
+        # CCC only has prices from day 3 on
+        assert data["start"] == (START + timedelta(days=3)).isoformat()
+        assert len(data["series"]["date"]) == 7
+        assert data["series"]["portfolio"][0] == 0
+        assert data["series"]["BBB"] == [0.0] * 7
+
+        same, flat, _ = data["benchmarks"]
+        assert same["symbol"] == "AAA"
+        assert same["excess_return"] == pytest.approx(0, abs=1e-4)
+        assert same["tracking_error"] == pytest.approx(0, abs=1e-3)
+        assert flat["total_return"] == 0
+        assert flat["beta"] is None
+        assert data["portfolio_return"] == pytest.approx(1.01**6 - 1, abs=1e-3)
+
+    async def test_new_benchmark_close_changes_etag(
+        self, api_client, db_session, tracked_portfolio, instrument
+    ):
+        """Test that a close of a benchmark the portfolio does not hold revalidates."""
+        url = "/api/v1/analytics/portfolios/10/benchmarks"
+        params = [("symbol", "AAA"), ("symbol", "ccc")]
+        first = await api_client.get(url, params=params)
+        etag = first.headers["ETag"]
+        cached = await api_client.get(
+            url, params=params, headers={"If-None-Match": etag}
+        )
+        assert cached.status_code == 304
+
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("CCC"),
+                date=START + timedelta(days=2),
+                close=Decimal("10"),
+            )
+        )
+        await db_session.commit()
+
+        response = await api_client.get(
+            url, params=params, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    async def test_unknown_benchmark_is_rejected(self, api_client, tracked_portfolio):
+        """Test the error for a benchmark without prices."""
+        response = await api_client.get(
+            "/api/v1/analytics/portfolios/10/benchmarks", params={"symbol": "NOPE"}
+        )
+        assert response.status_code == 422
+        assert response.json()["errors"][0]["details"]["symbols"] == ["NOPE"]
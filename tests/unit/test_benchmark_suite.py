@@ -0,0 +1,39 @@
+"""
+Unit tests for the benchmark suite baseline handling.
+"""
+
+import json
+
+from tools.benchmark.suite import check_against_baseline
+
+
+def results(valuation_ms: float, scale: str = "small") -> dict:
+    """Suite results with one read benchmark and one ingestion metric."""
+    return {
+        "meta": {"scale": scale},
+        "ingestion": {"ingest_market_prices": {"rows_per_second": 1000.0}},
+        "benchmarks": {"valuation": {"min_ms": valuation_ms, "median_ms": 1.0}},
+    }
+
+
+class TestBaseline:
+    """Tests for recording and comparing against the baseline."""
+
+    def test_first_run_records_baseline(self, tmp_path):
+        """Test that a missing baseline is recorded instead of skipped."""
+        path = tmp_path / "baseline.json"
+        assert check_against_baseline(results(10.0), path, tolerance=0.2) == 0
+        assert json.loads(path.read_text()) == results(10.0)
+
+        assert check_against_baseline(results(11.0), path, tolerance=0.2) == 0
+        assert check_against_baseline(results(13.0), path, tolerance=0.2) == 1
+        assert json.loads(path.read_text()) == results(10.0)
+
+    def test_update_and_other_scale(self, tmp_path):
+        """Test explicit updates and that other scales are not compared."""
+        path = tmp_path / "baseline.json"
+        check_against_baseline(results(10.0), path, tolerance=0.2)
+
+        assert check_against_baseline(results(50.0, "large"), path, 0.2) == 0
+        assert check_against_baseline(results(20.0), path, 0.2, update=True) == 0
+        assert json.loads(path.read_text()) == results(20.0)
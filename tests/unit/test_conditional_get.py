@@ -0,0 +1,98 @@
+"""
+Unit tests for ETag / conditional GET support.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from portfolio_tracker.models.db import Holding, Portfolio, User
+from portfolio_tracker.utils.etag import build_weak_etag, etag_matches
+
+
+@pytest.fixture
+async def portfolio(db_session):
+    """Portfolio with one holding owned by user 1."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    db_session.add(
+        Holding(
+            id=100,
+            portfolio_id=10,
+            symbol="AAA",
+            quantity=Decimal("2"),
+            average_cost=Decimal("5"),
+            total_cost=Decimal("10"),
+            market_value=Decimal("12"),
+        )
+    )
+    await db_session.commit()
+    return 10
+
+
+class TestEtagHelpers:
+    """Tests for ETag helpers."""
+
+    def test_etag_is_weak_and_stable(self):
+        """Test that equal versions give equal weak ETags."""
+        etag = build_weak_etag("portfolio", 1, "2024-01-01")
+        assert etag.startswith('W/"')
+        assert etag == build_weak_etag("portfolio", 1, "2024-01-01")
+        assert etag != build_weak_etag("portfolio", 1, "2024-01-02")
+
+    def test_if_none_match_weak_comparison(self):
+        """Test list, wildcard and strong/weak matching."""
+        etag = 'W/"abc"'
+        assert etag_matches('"xyz", W/"abc"', etag)
+        assert etag_matches('"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('W/"xyz"', etag)
+
+
+class TestConditionalGet:
+    """Tests for 304 handling on read endpoints."""
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/v1/portfolios",
+            "/api/v1/portfolios/10",
+            "/api/v1/portfolios/10/holdings",
+            "/api/v1/analytics/portfolios/10/summary",
+        ],
+    )
+    async def test_revalidation_returns_304(self, api_client, portfolio, path):
+        """Test that a matching If-None-Match yields an empty 304."""
+        first = await api_client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        second = await api_client.get(path, headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+
+    async def test_holding_change_invalidates_etag(
+        self, api_client, db_session, portfolio
+    ):
+        """Test that updating a holding changes the portfolio ETag."""
+        path = "/api/v1/analytics/portfolios/10/summary"
+        etag = (await api_client.get(path)).headers["ETag"]
+
+        await db_session.execute(
+            update(Holding).where(Holding.id == 100).values(market_value=Decimal("20"))
+        )
+        await db_session.commit()
+
+        response = await api_client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()["data"]["total_value"] == "20.00"
+
+    async def test_unknown_portfolio_is_404(self, api_client, portfolio):
+        """Test that portfolios of other users are not found."""
+        response = await api_client.get("/api/v1/portfolios/999")
+        assert response.status_code == 404
+        assert response.json()["errors"][0]["code"] == "PORTFOLIO_NOT_FOUND"
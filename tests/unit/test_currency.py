@@ -0,0 +1,182 @@
+"""
+Unit tests for currency conversion.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from portfolio_tracker.models.db import FxRate, Holding, Portfolio, Transaction, User
+from portfolio_tracker.models.db.transaction import TransactionType
+from portfolio_tracker.models.schemas.fx_rate import FxRateCreate
+from portfolio_tracker.services.currency import (
+    CurrencyConversionService,
+    FxRateIndex,
+    read_rates_csv,
+)
+from portfolio_tracker.utils.exceptions import ExchangeRateUnavailableException
+
+
+@pytest.fixture
+def index():
+    """Index with EUR/USD and USD/GBP series."""
+    return FxRateIndex.from_rows(
+        [
+            ("EUR", "USD", date(2024, 1, 2), 1.10),
+            ("EUR", "USD", date(2024, 1, 5), 1.20),
+            ("USD", "GBP", date(2024, 1, 2), 0.80),
+        ],
+        pivot_currency="USD",
+    )
+
+
+class TestFxRateIndex:
+    """Tests for the as-of exchange rate index."""
+
+    def test_as_of_lookup_uses_last_known_rate(self, index):
+        """Test that dates between quotes use the previous rate."""
+        rates = index.rates(
+            "EUR", "USD", [date(2024, 1, 2), date(2024, 1, 4), date(2024, 1, 7)]
+        )
+        np.testing.assert_allclose(rates, [1.10, 1.10, 1.20])
+
+    def test_inverse_and_cross_rates(self, index):
+        """Test inverse pairs and triangulation through the pivot."""
+        np.testing.assert_allclose(
+            index.rates("USD", "EUR", [date(2024, 1, 5)]), [1 / 1.20]
+        )
+        np.testing.assert_allclose(
+            index.rates("EUR", "GBP", [date(2024, 1, 5)]), [1.20 * 0.80]
+        )
+
+    def test_convert_mixed_currencies(self, index):
+        """Test converting an array of amounts in several currencies."""
+        converted = index.convert(
+            [100.0, 50.0, 10.0],
+            ["EUR", "USD", "GBP"],
+            [date(2024, 1, 3), date(2024, 1, 3), date(2024, 1, 3)],
+            "USD",
+        )
+        np.testing.assert_allclose(converted, [110.0, 50.0, 12.5])
+
+    def test_missing_rate_raises(self, index):
+        """Test that dates before the first quote and unknown pairs raise."""
+        with pytest.raises(ExchangeRateUnavailableException):
+            index.rates("EUR", "USD", [date(2023, 12, 31)])
+        with pytest.raises(ExchangeRateUnavailableException):
+            index.rates("JPY", "EUR", [date(2024, 1, 3)])
+
+
+class TestRateIngestion:
+    """Tests for loading exchange rates into fx_rates."""
+
+    def test_read_csv_rejects_invalid_rows(self, tmp_path):
+        """Test column matching and row validation."""
+        path = tmp_path / "rates.csv"
+        path.write_text(
+            "Date,Base,Quote,Rate,Note\n"
+            "2024-01-02,eur,usd,1.10,x\n"
+            "2024-01-03,EUR,USD,-1,negative\n"
+            "not-a-date,EUR,USD,1.2,\n"
+        )
+        rates, rejected = read_rates_csv(path, source="test")
+        assert rejected == 2
+        assert [(r.base_currency, r.quote_currency, r.rate) for r in rates] == [
+            ("EUR", "USD", Decimal("1.10"))
+        ]
+        assert rates[0].source == "test"
+
+        (tmp_path / "bad.csv").write_text("date,base,rate\n")
+        with pytest.raises(ValueError):
+            read_rates_csv(tmp_path / "bad.csv", source="test")
+
+    async def test_ingest_overwrites_existing_pair_and_date(self, db_session):
+        """Test that re-ingesting a pair and date updates it in place."""
+        service = CurrencyConversionService(db_session)
+        day = date(2024, 1, 2)
+        await service.ingest_rates(
+            [
+                FxRateCreate(
+                    base_currency="EUR", quote_currency="USD", date=day, rate=1.1
+                ),
+                FxRateCreate(
+                    base_currency="USD", quote_currency="GBP", date=day, rate=0.8
+                ),
+            ]
+        )
+        await db_session.commit()
+        written = await service.ingest_rates(
+            [
+                FxRateCreate(
+                    base_currency="EUR",
+                    quote_currency="USD",
+                    date=day,
+                    rate=1.2,
+                    source="fix",
+                )
+            ]
+        )
+        await db_session.commit()
+
+        assert written == 1
+        rows = (
+            await db_session.execute(
+                select(FxRate.base_currency, FxRate.rate, FxRate.source).order_by(
+                    FxRate.base_currency
+                )
+            )
+        ).all()
+        assert rows == [("EUR", Decimal("1.2"), "fix"), ("USD", Decimal("0.8"), "ecb")]
+
+
+class TestInvestedCapital:
+    """Tests for invested capital across transaction currencies."""
+
+    async def test_converts_each_flow_at_its_date(self, db_session):
+        """Test signed flows converted into the portfolio currency."""
+        db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+        db_session.add(Portfolio(id=10, user_id=1, name="Main", currency="EUR"))
+        holding = Holding(
+            portfolio_id=10,
+            symbol="AAA",
+            quantity=Decimal("1"),
+            average_cost=Decimal("1"),
+            total_cost=Decimal("1"),
+        )
+        db_session.add(holding)
+        await db_session.flush()
+        for kind, day, amount, currency in (
+            (TransactionType.BUY, date(2024, 1, 3), "110", "USD"),
+            (TransactionType.SELL, date(2024, 1, 4), "20", "EUR"),
+            (TransactionType.TRANSFER_IN, date(2024, 1, 5), "120", "USD"),
+            (TransactionType.DIVIDEND, date(2024, 1, 5), "999", "EUR"),
+        ):
+            db_session.add(
+                Transaction(
+                    portfolio_id=10,
+                    holding_id=holding.id,
+                    transaction_type=kind,
+                    transaction_date=day,
+                    symbol="AAA",
+                    quantity=Decimal("1"),
+                    price=Decimal(amount),
+                    total_amount=Decimal(amount),
+                    currency=currency,
+                )
+            )
+        await CurrencyConversionService(db_session).ingest_rates(
+            [
+                FxRateCreate(
+                    base_currency="EUR", quote_currency="USD", date=day, rate=rate
+                )
+                for day, rate in ((date(2024, 1, 2), 1.10), (date(2024, 1, 5), 1.20))
+            ]
+        )
+        await db_session.commit()
+
+        # 110 USD / 1.10 - 20 EUR + 120 USD / 1.20
+        service = CurrencyConversionService(db_session)
+        assert await service.get_invested_capital(10) == Decimal("180.00")
@@ -0,0 +1,31 @@
+"""
+Unit tests for database configuration.
+"""
+
+from sqlalchemy.pool import NullPool
+
+from portfolio_tracker.config import database
+
+
+class TestLazyEngines:
+    """Tests for lazy engine construction."""
+
+    def test_import_does_not_create_engine(self):
+        """Test that importing the module does not build an engine."""
+        assert "async_engine" not in vars(database)
+        assert "sync_engine" not in vars(database)
+
+    async def test_engine_created_on_first_use_and_disposed(self):
+        """Test that the engine is created lazily and reset on close."""
+        await database.close_db()
+        engine = database.get_async_engine()
+        assert database.get_async_engine() is engine
+        assert database.async_engine is engine
+        await database.close_db()
+        assert database._async_engine is None
+
+    def test_sync_engine_is_unpooled(self):
+        """Test that the Alembic engine uses the sync URL without a pool."""
+        engine = database.create_sync_engine()
+        assert isinstance(engine.pool, NullPool)
+        assert engine.url.drivername == "postgresql"
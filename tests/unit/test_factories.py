@@ -0,0 +1,53 @@
+"""
+Unit tests for synthetic data factories.
+"""
+
+import random
+from datetime import date
+
+from tests.fixtures.factories import (
+    build_holdings,
+    build_portfolios,
+    build_symbols,
+    build_users,
+    iter_market_prices,
+    iter_transactions,
+)
+
+
+class TestSyntheticFactories:
+    """Tests for synthetic dataset generators."""
+
+    def _dataset(self, seed):
+        rng = random.Random(seed)
+        symbols = build_symbols(10, rng)
+        users = build_users(3)
+        portfolios = build_portfolios(users, 2, rng)
+        holdings = build_holdings(portfolios, symbols, 4, rng)
+        transactions = list(iter_transactions(holdings, 50, date(2020, 1, 1), 30, rng))
+        return symbols, portfolios, holdings, transactions
+
+    def test_generators_are_deterministic(self):
+        """Test that the same seed produces the same rows."""
+        assert self._dataset(7) == self._dataset(7)
+
+    def test_foreign_keys_are_consistent(self):
+        """Test that generated rows reference existing parents."""
+        symbols, portfolios, holdings, transactions = self._dataset(1)
+        portfolio_ids = {p["id"] for p in portfolios}
+        holdings_by_id = {h["id"]: h for h in holdings}
+
+        assert len({s["symbol"] for s in symbols}) == 10
+        assert all(h["portfolio_id"] in portfolio_ids for h in holdings)
+        for row in transactions:
+            holding = holdings_by_id[row["holding_id"]]
+            assert row["portfolio_id"] == holding["portfolio_id"]
+            assert row["symbol"] == holding["symbol"]
+
+    def test_market_prices_skip_weekends(self):
+        """Test that prices are only generated for business days."""
+        symbols = build_symbols(2, random.Random(0))
+        rows = list(iter_market_prices(symbols, date(2024, 1, 1), 1, random.Random(0)))
+        assert rows
+        assert all(row["date"].weekday() < 5 for row in rows)
+        assert all(row["low"] <= row["close"] <= row["high"] for row in rows)
@@ -0,0 +1,153 @@
+"""
+Unit tests for the holding price write-behind buffer.
+"""
+
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from portfolio_tracker.models.db import Holding, Portfolio, User
+from portfolio_tracker.services.holding_prices import HoldingPriceBuffer
+
+NOW = datetime(2024, 1, 5, 16, 0)
+
+
+@pytest.fixture
+async def holdings(db_session):
+    """AAA held in two portfolios, BBB in one."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="One"))
+    db_session.add(Portfolio(id=11, user_id=1, name="Two"))
+    for portfolio_id, symbol, quantity in (
+        (10, "AAA", 2),
+        (11, "AAA", 3),
+        (11, "BBB", 1),
+    ):
+        db_session.add(
+            Holding(
+                portfolio_id=portfolio_id,
+                symbol=symbol,
+                quantity=Decimal(quantity),
+                average_cost=Decimal("10"),
+                total_cost=Decimal(10 * quantity),
+            )
+        )
+    await db_session.commit()
+    return async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+
+async def market_values(session_factory):
+    """Market value by (portfolio, symbol) and total value by portfolio."""
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(Holding.portfolio_id, Holding.symbol, Holding.market_value)
+        )
+        totals = await session.execute(select(Portfolio.id, Portfolio.total_value))
+        return (
+            {(pid, symbol): value for pid, symbol, value in rows.all()},
+            dict(totals.all()),
+        )
+
+
+async def gain_loss_percents(session_factory):
+    """Unrealized gain/loss percent by (portfolio, symbol)."""
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(
+                Holding.portfolio_id,
+                Holding.symbol,
+                Holding.unrealized_gain_loss_percent,
+            )
+        )
+        return {(pid, symbol): percent for pid, symbol, percent in rows.all()}
+
+
+class TestHoldingPriceBuffer:
+    """Tests for coalescing, flushing and bounded staleness."""
+
+    async def test_flush_writes_latest_price_once(self, holdings):
+        """Test that repeated ticks coalesce into one write per symbol."""
+        buffer = HoldingPriceBuffer(holdings, flush_seconds=60, max_pending=100)
+        buffer.add({"AAA": Decimal("11")}, NOW)
+        buffer.add({"AAA": Decimal("12"), "BBB": Decimal("5")}, NOW)
+        assert len(buffer) == 2
+
+        assert await buffer.flush() == 2
+        assert len(buffer) == 0
+        values, totals = await market_values(holdings)
+        assert values == {
+            (10, "AAA"): Decimal("24"),
+            (11, "AAA"): Decimal("36"),
+            (11, "BBB"): Decimal("5"),
+        }
+        assert totals == {10: Decimal("24"), 11: Decimal("41")}
+        assert await gain_loss_percents(holdings) == {
+            (10, "AAA"): Decimal("20.00"),
+            (11, "AAA"): Decimal("20.00"),
+            (11, "BBB"): Decimal("-50.00"),
+        }
+        assert await buffer.flush() == 0
+
+    async def test_gain_loss_percent_without_cost_or_out_of_range(
+        self, holdings, db_session
+    ):
+        """Test that zero cost gives 0% and large gains are capped."""
+        db_session.add(
+            Holding(
+                portfolio_id=10,
+                symbol="FREE",
+                quantity=Decimal("1"),
+                average_cost=Decimal("0"),
+                total_cost=Decimal("0"),
+            )
+        )
+        await db_session.commit()
+
+        buffer = HoldingPriceBuffer(holdings, flush_seconds=60)
+        buffer.add({"FREE": Decimal("3"), "BBB": Decimal("500")}, NOW)
+        await buffer.flush()
+        percents = await gain_loss_percents(holdings)
+        assert percents[(10, "FREE")] == Decimal("0.00")
+        assert percents[(11, "BBB")] == Decimal("999.99")
+
+    async def test_failed_flush_keeps_newer_prices(self, holdings):
+        """Test that a failed batch is put back without overwriting newer ticks."""
+
+        def broken_factory():
+            buffer.add({"AAA": Decimal("13")}, NOW)
+            raise ConnectionError("database unavailable")
+
+        buffer = HoldingPriceBuffer(broken_factory, flush_seconds=60)
+        buffer.add({"AAA": Decimal("12"), "BBB": Decimal("5")}, NOW)
+        with pytest.raises(ConnectionError):
+            await buffer.flush()
+
+        buffer.session_factory = holdings
+        assert await buffer.flush() == 2
+        values, _ = await market_values(holdings)
+        assert values[(10, "AAA")] == Decimal("26")
+
+    async def test_run_flushes_when_due_and_on_close(self, holdings):
+        """Test the staleness bound, the size trigger and the final flush."""
+        buffer = HoldingPriceBuffer(holdings, flush_seconds=0.05, max_pending=2)
+        buffer.start()
+        buffer.add({"AAA": Decimal("12")}, NOW)
+        await asyncio.sleep(0.2)
+        assert len(buffer) == 0
+        values, _ = await market_values(holdings)
+        assert values[(10, "AAA")] == Decimal("24")
+
+        buffer.flush_seconds = 60
+        buffer.add({"AAA": Decimal("14"), "BBB": Decimal("6")}, NOW)
+        await asyncio.sleep(0.05)
+        assert len(buffer) == 0
+
+        buffer.add({"BBB": Decimal("7")}, NOW)
+        await buffer.close()
+        assert len(buffer) == 0
+        values, _ = await market_values(holdings)
+        assert values[(11, "BBB")] == Decimal("7")
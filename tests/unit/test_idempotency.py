@@ -0,0 +1,250 @@
+"""
+Unit tests for Idempotency-Key handling and transaction recording.
+"""
+
+import asyncio
+import hashlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from starlette.requests import Request
+
+from portfolio_tracker.models.db import (
+    Holding,
+    IdempotencyKey,
+    Portfolio,
+    Transaction,
+    User,
+)
+from portfolio_tracker.services import idempotency
+from portfolio_tracker.services.idempotency import (
+    DatabaseIdempotencyStore,
+    IdempotencyService,
+    RedisIdempotencyStore,
+)
+from portfolio_tracker.utils.exceptions import IdempotencyKeyInProgressException
+
+URL = "/api/v1/portfolios/10/transactions"
+BUY = {"transaction_type": "buy", "symbol": "aaa", "quantity": "2", "price": "10"}
+
+
+@pytest.fixture
+async def store(db_session, monkeypatch):
+    """Database store on the test engine, installed as the process store."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    await db_session.commit()
+    store = DatabaseIdempotencyStore(
+        async_sessionmaker(db_session.bind, expire_on_commit=False),
+        ttl_seconds=60,
+        lock_seconds=5,
+    )
+    monkeypatch.setattr(idempotency, "_store", store)
+    return store
+
+
+def make_request(path: str = URL) -> Request:
+    """Bare POST request for calling the service directly."""
+    return Request({"type": "http", "method": "POST", "path": path, "headers": []})
+
+
+def request_hash(payload: str) -> str:
+    """Request hash the service computes for a POST to URL."""
+    return hashlib.sha256(f"POST {URL} {payload}".encode()).hexdigest()
+
+
+async def transaction_count(db_session) -> int:
+    """Number of recorded transactions."""
+    return await db_session.scalar(select(func.count()).select_from(Transaction))
+
+
+class TestDatabaseIdempotencyStore:
+    """Tests for claiming, completing and releasing keys in the database."""
+
+    async def test_claim_complete_and_release(self, store):
+        """Test the in-flight and completed states of a key."""
+        assert await store.claim("1:a", "h1") is None
+        record = await store.claim("1:a", "h1")
+        assert record.request_hash == "h1" and not record.completed
+
+        await store.complete("1:a", "h1", 201, '{"ok": true}')
+        record = await store.claim("1:a", "h1")
+        assert (record.status_code, record.body) == (201, '{"ok": true}')
+
+        assert await store.claim("1:b", "h2") is None
+        await store.release("1:b", "h2")
+        assert await store.claim("1:b", "h2") is None
+
+    async def test_lapsed_key_is_taken_over(self, store, db_session):
+        """Test that a claim whose lock has lapsed can be claimed again."""
+        assert await store.claim("1:a", "h1") is None
+        await db_session.execute(
+            update(IdempotencyKey).values(
+                expires_at=datetime.utcnow() - timedelta(seconds=1)
+            )
+        )
+        await db_session.commit()
+        assert await store.claim("1:a", "h2") is None
+
+    async def test_redis_outage_falls_back(self, store):
+        """Test that an unreachable Redis uses the fallback store."""
+        redis_store = RedisIdempotencyStore(url="redis://127.0.0.1:1/0", fallback=store)
+        try:
+            assert await redis_store.claim("1:a", "h1") is None
+            assert (await store.claim("1:a", "h1")).request_hash == "h1"
+        finally:
+            await redis_store.aclose()
+
+
+class TestIdempotencyService:
+    """Tests for running handlers at most once per key."""
+
+    async def test_concurrent_duplicate_waits_for_first(self, store):
+        """Test that a duplicate in flight waits and replays instead of running."""
+        calls = []
+
+        async def handler():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return JSONResponse({"data": len(calls)}, status_code=201)
+
+        service = IdempotencyService(store, wait_seconds=5, poll_seconds=0.01)
+        first, second = await asyncio.gather(
+            service.run(make_request(), "k", 1, "{}", handler),
+            service.run(make_request(), "k", 1, "{}", handler),
+        )
+        assert calls == [1]
+        assert first.status_code == second.status_code == 201
+        assert first.body == second.body
+        assert "idempotent-replayed" in {*first.headers, *second.headers}
+
+    async def test_wait_is_bounded(self, store):
+        """Test that a duplicate gives up with 409 while the first still runs."""
+        assert await store.claim("1:k", request_hash("{}")) is None
+        service = IdempotencyService(store, wait_seconds=0.05, poll_seconds=0.01)
+
+        async def handler():
+            raise AssertionError("duplicate must not run")
+
+        with pytest.raises(IdempotencyKeyInProgressException):
+            await service.run(make_request(), "k", 1, "{}", handler)
+
+    async def test_failed_request_can_be_retried(self, store):
+        """Test that a handler error releases the key."""
+        service = IdempotencyService(store)
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def succeeding():
+            return JSONResponse({"data": "ok"}, status_code=201)
+
+        with pytest.raises(RuntimeError):
+            await service.run(make_request(), "k", 1, "{}", failing)
+        response = await service.run(make_request(), "k", 1, "{}", succeeding)
+        assert response.status_code == 201
+        assert "idempotent-replayed" not in response.headers
+
+    async def test_lost_response_keeps_key(self, store, monkeypatch):
+        """Test that a write whose response cannot be stored is not rerun."""
+        store.lock = timedelta(seconds=0.05)
+
+        async def broken_complete(*args):
+            raise ConnectionError("store unavailable")
+
+        monkeypatch.setattr(store, "complete", broken_complete)
+        service = IdempotencyService(store, wait_seconds=0)
+
+        async def handler():
+            return JSONResponse({"data": "ok"}, status_code=201)
+
+        response = await service.run(make_request(), "k", 1, "{}", handler)
+        assert response.status_code == 201
+
+        await asyncio.sleep(0.1)
+        with pytest.raises(IdempotencyKeyInProgressException):
+            await service.run(make_request(), "k", 1, "{}", handler)
+
+
+class TestCreateTransactionEndpoint:
+    """Tests for POST /api/v1/portfolios/{id}/transactions."""
+
+    async def test_records_transaction_and_updates_holding(
+        self, api_client, store, db_session
+    ):
+        """Test that buys and sells update quantity and cost basis."""
+        response = await api_client.post(URL, json=BUY)
+        assert response.status_code == 201
+        data = response.json()["data"]
+        assert (data["symbol"], data["total_amount"]) == ("AAA", "20.00")
+
+        sell = {**BUY, "transaction_type": "sell", "quantity": "1", "price": "15"}
+        assert (await api_client.post(URL, json=sell)).status_code == 201
+        holding = await db_session.scalar(select(Holding))
+        await db_session.refresh(holding)
+        assert holding.quantity == Decimal("1")
+        assert holding.average_cost == Decimal("10")
+
+        too_many = {**sell, "quantity": "5"}
+        response = await api_client.post(URL, json=too_many)
+        assert response.status_code == 400
+        assert response.json()["errors"][0]["code"] == "INVALID_TRANSACTION"
+
+    async def test_gain_loss_percent_follows_revaluation(
+        self, api_client, store, db_session
+    ):
+        """Test that the holding's gain percent is recomputed and capped."""
+        db_session.add(
+            Holding(portfolio_id=10, symbol="AAA", current_price=Decimal("15"))
+        )
+        await db_session.commit()
+
+        assert (await api_client.post(URL, json=BUY)).status_code == 201
+        holding = await db_session.scalar(select(Holding))
+        await db_session.refresh(holding)
+        assert holding.unrealized_gain_loss_percent == Decimal("50")
+
+        await db_session.execute(update(Holding).values(current_price=100000))
+        await db_session.commit()
+        assert (await api_client.post(URL, json=BUY)).status_code == 201
+        await db_session.refresh(holding)
+        assert holding.unrealized_gain_loss_percent == Decimal("999.99")
+
+    async def test_retry_with_key_replays_response(self, api_client, store, db_session):
+        """Test that a retried request is recorded once and replayed."""
+        headers = {"Idempotency-Key": "retry-1"}
+        first = await api_client.post(URL, json=BUY, headers=headers)
+        second = await api_client.post(URL, json=BUY, headers=headers)
+
+        assert first.status_code == second.status_code == 201
+        assert second.json() == first.json()
+        assert second.headers["Idempotent-Replayed"] == "true"
+        assert await transaction_count(db_session) == 1
+
+        await api_client.post(URL, json=BUY)
+        assert await transaction_count(db_session) == 2
+
+    async def test_key_reused_for_other_request(self, api_client, store):
+        """Test that a key cannot be reused with a different body."""
+        headers = {"Idempotency-Key": "retry-1"}
+        await api_client.post(URL, json=BUY, headers=headers)
+        response = await api_client.post(
+            URL, json={**BUY, "quantity": "3"}, headers=headers
+        )
+        assert response.status_code == 422
+        assert response.json()["errors"][0]["code"] == "IDEMPOTENCY_KEY_REUSED"
+
+    async def test_batch_with_key_runs_once(self, api_client, store, db_session):
+        """Test that a retried batch does not apply its writes twice."""
+        batch = {"requests": [{"method": "POST", "path": URL, "body": BUY}]}
+        headers = {"Idempotency-Key": "batch-1"}
+        first = await api_client.post("/api/v1/batch", json=batch, headers=headers)
+        second = await api_client.post("/api/v1/batch", json=batch, headers=headers)
+
+        assert first.json()["data"][0]["status"] == 201
+        assert second.json() == first.json()
+        assert await transaction_count(db_session) == 1
@@ -0,0 +1,55 @@
+"""
+Unit tests for instrument ID translation.
+"""
+
+import sys
+
+from portfolio_tracker.models.db import Instrument
+from portfolio_tracker.repositories.instrument import InstrumentRepository
+from portfolio_tracker.services.instruments import InstrumentService, get_symbol_map
+
+
+class TestInstrumentService:
+    """Tests for resolving symbols and IDs through the symbol map."""
+
+    async def test_get_ids_reads_once_and_creates_on_request(
+        self, db_session, monkeypatch
+    ):
+        """Test one query for unknown symbols, none once mapped."""
+        db_session.add(Instrument(id=7, symbol="AAA"))
+        await db_session.commit()
+
+        queries = []
+        load = InstrumentRepository.get_ids
+
+        async def counting_load(self, symbols):
+            queries.append(list(symbols))
+            return await load(self, symbols)
+
+        monkeypatch.setattr(InstrumentRepository, "get_ids", counting_load)
+        service = InstrumentService(db_session)
+        assert await service.get_ids(["AAA", "BBB", "AAA"]) == {"AAA": 7}
+        assert await service.get_ids(["AAA"]) == {"AAA": 7}
+        assert queries == [["AAA", "BBB"]]
+
+        ids = await service.get_ids(["AAA", "BBB"], create=True)
+        await db_session.commit()
+        assert ids["AAA"] == 7 and ids["BBB"] not in (None, 7)
+        # Inserted IDs are only remembered once read back
+        assert get_symbol_map().id_of("BBB") is None
+        assert await service.get_ids(["BBB"]) == {"BBB": ids["BBB"]}
+        assert get_symbol_map().id_of("BBB") == ids["BBB"]
+
+    async def test_get_symbols_shares_interned_strings(self, db_session):
+        """Test ID to symbol lookups and that mapped symbols are interned."""
+        db_session.add_all(
+            [Instrument(id=1, symbol="AAA"), Instrument(id=2, symbol="BBB")]
+        )
+        await db_session.commit()
+
+        service = InstrumentService(db_session)
+        symbols = await service.get_symbols([2, 1, 99])
+        assert symbols == {1: "AAA", 2: "BBB"}
+        assert symbols[1] is sys.intern("".join(["AA", "A"]))
+        assert get_symbol_map().symbol_of(2) is symbols[2]
+        assert len(get_symbol_map()) == 2
@@ -0,0 +1,161 @@
+"""
+Unit tests for the cache invalidation bus and local cache.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from portfolio_tracker.models.db import Holding, MarketPrice, Portfolio, User
+from portfolio_tracker.services.invalidation import (
+    Invalidation,
+    InvalidationBus,
+    get_invalidation_bus,
+    install_invalidation_hooks,
+    parse_payload,
+    publish_invalidations,
+)
+from portfolio_tracker.utils.cache import LocalCache, bind_invalidations
+
+
+@pytest.fixture
+def received():
+    """Invalidations dispatched on the process-wide bus during the test."""
+    events = []
+    bus = get_invalidation_bus()
+    install_invalidation_hooks()
+    for entity in ("holding", "market_price"):
+        bus.subscribe(entity, events.append)
+    yield events
+    for entity in ("holding", "market_price"):
+        bus.unsubscribe(entity, events.append)
+
+
+@pytest.fixture
+async def portfolio(db_session):
+    """Empty portfolio 10 owned by user 1."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    await db_session.commit()
+    return 10
+
+
+class TestPayloads:
+    """Tests for NOTIFY payload parsing."""
+
+    def test_portfolio_keyed_entities_get_integer_ids(self):
+        """Test that holding IDs are parsed back to integers."""
+        assert parse_payload('{"entity":"holding","id":"42","version":7}') == (
+            Invalidation("holding", 42, 7)
+        )
+        assert parse_payload('{"entity":"market_price","id":"AAPL"}').id == "AAPL"
+
+
+class TestInvalidationBus:
+    """Tests for local dispatch."""
+
+    def test_failing_handler_does_not_stop_others(self):
+        """Test that one handler's error is isolated."""
+        bus = InvalidationBus()
+        seen = []
+        bus.subscribe("holding", lambda inv: 1 / 0)
+        bus.subscribe("holding", seen.append)
+        bus.dispatch(Invalidation("holding", 1))
+        assert seen == [Invalidation("holding", 1)]
+
+    async def test_orm_writes_dispatch_after_commit(
+        self, db_session, portfolio, received
+    ):
+        """Test that committed ORM writes are published once per key."""
+        for symbol in ("AAA", "BBB"):
+            db_session.add(
+                Holding(
+                    portfolio_id=10,
+                    symbol=symbol,
+                    quantity=Decimal("1"),
+                    average_cost=Decimal("1"),
+                    total_cost=Decimal("1"),
+                )
+            )
+        await db_session.flush()
+        assert received == []
+
+        await db_session.commit()
+        assert received == [Invalidation("holding", 10)]
+
+    async def test_rolled_back_writes_are_dropped(
+        self, db_session, portfolio, received
+    ):
+        """Test that nothing is published for a rolled back transaction."""
+        db_session.add(
+            Holding(
+                portfolio_id=10,
+                symbol="AAA",
+                quantity=Decimal("1"),
+                average_cost=Decimal("1"),
+                total_cost=Decimal("1"),
+            )
+        )
+        await db_session.flush()
+        await db_session.rollback()
+        assert received == []
+
+    async def test_orm_price_writes_publish_symbols(
+        self, db_session, received, instrument
+    ):
+        """Test that price rows written by instrument ID are published by symbol."""
+        db_session.add(instrument("AAA"))
+        await db_session.commit()
+        received.clear()
+
+        db_session.add(
+            MarketPrice(
+                instrument_id=instrument("AAA").id, date=date(2024, 1, 2), close=1
+            )
+        )
+        await db_session.commit()
+        assert received == [Invalidation("market_price", "AAA")]
+
+    async def test_core_writes_publish_explicitly(self, db_session, received):
+        """Test publish_invalidations for Core bulk statements."""
+        await publish_invalidations(db_session, "market_price", ["AAA", "BBB"])
+        await db_session.commit()
+        assert sorted(inv.id for inv in received) == ["AAA", "BBB"]
+
+
+class TestLocalCache:
+    """Tests for the grouped TTL cache."""
+
+    def test_ttl_and_lru_eviction(self):
+        """Test expiry and the entry limit."""
+        now = [0.0]
+        cache = LocalCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+        cache.set(1, "a", "A")
+        cache.set(1, "b", "B")
+        assert cache.get(1, "a") == "A"
+        cache.set(2, "c", "C")
+        assert cache.get(1, "b") is None
+        now[0] = 11
+        assert cache.get(1, "a") is None
+
+    def test_bus_invalidation_evicts_group(self):
+        """Test that an invalidation evicts every entry of its key."""
+        bus = InvalidationBus()
+        cache = LocalCache(ttl_seconds=3600)
+        unbind = bind_invalidations(cache, bus, "holding")
+        cache.set(10, "summary", 1)
+        cache.set(10, "history", 2)
+        cache.set(11, "summary", 3)
+
+        bus.dispatch(Invalidation("holding", 10))
+        assert cache.get(10, "summary") is None
+        assert cache.get(11, "summary") == 3
+
+        bus.reset()
+        assert len(cache) == 0
+
+        unbind()
+        cache.set(11, "summary", 3)
+        bus.dispatch(Invalidation("holding", 11))
+        assert cache.get(11, "summary") == 3
@@ -0,0 +1,237 @@
+"""
+Unit tests for live valuation streaming.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import update
+
+from portfolio_tracker.models.db import Holding, MarketPrice, Portfolio, User
+from portfolio_tracker.services.invalidation import Invalidation
+from portfolio_tracker.services.live_valuation import (
+    ValuationHub,
+    diff_values,
+    merge_deltas,
+)
+
+
+@pytest.fixture
+async def portfolios(db_session):
+    """Two portfolios of user 1 that both hold AAA."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    for portfolio_id, quantity in ((10, "2"), (11, "3")):
+        db_session.add(Portfolio(id=portfolio_id, user_id=1, name=f"P{portfolio_id}"))
+        db_session.add(
+            Holding(
+                portfolio_id=portfolio_id,
+                symbol="AAA",
+                quantity=Decimal(quantity),
+                average_cost=Decimal("5"),
+                total_cost=Decimal(quantity) * 5,
+                current_price=Decimal("5"),
+            )
+        )
+    db_session.add(
+        Holding(
+            portfolio_id=10,
+            symbol="BBB",
+            quantity=Decimal("1"),
+            average_cost=Decimal("1"),
+            total_cost=Decimal("1"),
+            current_price=Decimal("1"),
+        )
+    )
+    await db_session.commit()
+    return [10, 11]
+
+
+@pytest.fixture
+async def hub():
+    """Hub whose feed never polls during the test."""
+    instance = ValuationHub(poll_interval=3600)
+    yield instance
+    await instance.stop()
+
+
+class TestDiff:
+    """Tests for delta helpers."""
+
+    def test_only_changed_fields_are_reported(self):
+        """Test nested diffing and removed keys."""
+        old = {"total": 1, "holdings": {"A": {"price": 1, "qty": 2}, "B": {"price": 3}}}
+        new = {"total": 2, "holdings": {"A": {"price": 1, "qty": 3}}}
+        assert diff_values(old, new) == {
+            "total": 2,
+            "holdings": {"A": {"qty": 3}, "B": None},
+        }
+
+    def test_merge_keeps_latest_values(self):
+        """Test that coalesced deltas keep every changed field once."""
+        merged = merge_deltas(
+            {"total": 1, "holdings": {"A": {"price": 1}}},
+            {"total": 2, "holdings": {"B": {"price": 5}}},
+        )
+        assert merged == {
+            "total": 2,
+            "holdings": {"A": {"price": 1}, "B": {"price": 5}},
+        }
+
+
+class TestValuationHub:
+    """Tests for fan-out and throttling."""
+
+    async def test_price_change_fans_out_deltas(self, db_session, portfolios, hub):
+        """Test that one price update reaches every subscriber as a delta."""
+        first = await hub.subscribe(db_session, [10, 11])
+        second = await hub.subscribe(db_session, [10])
+        assert hub.snapshot(10)["total_value"] == 11.0
+
+        assert hub.apply_prices({"AAA": 6.0, "ZZZ": 1.0}) == 2
+
+        updates = await first.next_update(throttle=0, timeout=1)
+        assert updates[10] == {
+            "total_value": 13.0,
+            "total_gain_loss": 2.0,
+            "holdings": {"AAA": {"price": 6.0, "market_value": 12.0}},
+        }
+        assert updates[11]["total_value"] == 18.0
+        assert (await second.next_update(throttle=0, timeout=1)) == {10: updates[10]}
+
+    async def test_unchanged_price_sends_nothing(self, db_session, portfolios, hub):
+        """Test that a repeated price produces no delta."""
+        subscription = await hub.subscribe(db_session, [10])
+        assert hub.apply_prices({"AAA": 5.0}) == 0
+        assert await subscription.next_update(throttle=0, timeout=0.01) is None
+
+    async def test_throttle_coalesces_updates(self, db_session, portfolios, hub):
+        """Test that updates inside the throttle window are merged."""
+        subscription = await hub.subscribe(db_session, [10])
+        subscription.last_sent = asyncio.get_running_loop().time()
+        hub.apply_prices({"AAA": 6.0})
+
+        waiter = asyncio.create_task(subscription.next_update(throttle=0.05, timeout=1))
+        await asyncio.sleep(0)
+        hub.apply_prices({"BBB": 2.0})
+        updates = await waiter
+
+        assert set(updates[10]["holdings"]) == {"AAA", "BBB"}
+        assert updates[10]["total_value"] == 14.0
+
+    async def test_portfolio_of_unpriced_symbols(self, db_session, portfolios, hub):
+        """Test that holdings never priced anywhere value at zero."""
+        db_session.add(Portfolio(id=12, user_id=1, name="Unpriced"))
+        db_session.add(
+            Holding(
+                portfolio_id=12,
+                symbol="NEW",
+                quantity=Decimal("4"),
+                average_cost=Decimal("2"),
+                total_cost=Decimal("8"),
+            )
+        )
+        await db_session.commit()
+
+        await hub.subscribe(db_session, [12])
+        snapshot = hub.snapshot(12)
+        assert snapshot["total_value"] == 0.0
+        assert snapshot["holdings"]["NEW"]["price"] is None
+
+    async def test_unsubscribe_untracks_portfolios(self, db_session, portfolios, hub):
+        """Test that portfolios nobody follows are dropped."""
+        subscription = await hub.subscribe(db_session, [11])
+        hub.unsubscribe(subscription)
+        assert hub.apply_prices({"AAA": 9.0}) == 0
+
+    async def test_holding_invalidation_reloads_positions(
+        self, db_session, portfolios, hub
+    ):
+        """Test that a holding invalidation reloads the portfolio on next poll."""
+        subscription = await hub.subscribe(db_session, [11])
+        await db_session.execute(
+            update(Holding).where(Holding.portfolio_id == 11).values(quantity=4)
+        )
+        await db_session.commit()
+        hub.watermark = datetime.utcnow()
+
+        hub._on_portfolio_change(Invalidation("holding", 11))
+        assert await hub.poll_once(db_session) == 1
+        updates = await subscription.next_update(throttle=0, timeout=1)
+        assert updates[11]["total_value"] == 20.0
+
+    async def test_poll_applies_new_market_prices(
+        self, db_session, portfolios, hub, instrument
+    ):
+        """Test that polling picks up prices written after the watermark."""
+        subscription = await hub.subscribe(db_session, [11])
+        hub.watermark = datetime.utcnow() - timedelta(minutes=1)
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"), date=date.today(), close=Decimal("7")
+            )
+        )
+        await db_session.commit()
+
+        assert await hub.poll_once(db_session) == 1
+        updates = await subscription.next_update(throttle=0, timeout=1)
+        assert updates[11]["total_value"] == 21.0
+
+    async def test_backfilled_prices_keep_latest_close(
+        self, db_session, portfolios, hub, instrument
+    ):
+        """Test that an older row written late does not replace the price."""
+        subscription = await hub.subscribe(db_session, [11])
+        hub.watermark = datetime.utcnow() - timedelta(minutes=1)
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"), date=date.today(), close=Decimal("7")
+            )
+        )
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=date.today() - timedelta(days=30),
+                close=Decimal("2"),
+            )
+        )
+        await db_session.commit()
+
+        assert await hub.poll_once(db_session) == 1
+        updates = await subscription.next_update(throttle=0, timeout=1)
+        assert updates[11]["total_value"] == 21.0
+
+    async def test_late_commit_inside_overlap_is_applied(
+        self, db_session, portfolios, hub, instrument
+    ):
+        """Test that a row stamped before the watermark but committed later is read."""
+        subscription = await hub.subscribe(db_session, [11])
+        hub.watermark = datetime.utcnow()
+        assert await hub.poll_once(db_session) == 0
+
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=date.today(),
+                close=Decimal("7"),
+                updated_at=hub.watermark - timedelta(seconds=1),
+            )
+        )
+        await db_session.commit()
+
+        assert await hub.poll_once(db_session) == 1
+        updates = await subscription.next_update(throttle=0, timeout=1)
+        assert updates[11]["total_value"] == 21.0
+        assert await hub.poll_once(db_session) == 0
+
+
+class TestStreamEndpoint:
+    """Tests for the SSE endpoint's request validation."""
+
+    async def test_foreign_portfolio_is_not_found(self, api_client, portfolios):
+        """Test that subscribing to another user's portfolio fails."""
+        response = await api_client.get(
+            "/api/v1/live/portfolios", params={"portfolio_id": 99}
+        )
+        assert response.status_code == 404
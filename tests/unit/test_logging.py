@@ -0,0 +1,105 @@
+"""
+Unit tests for structured, context-aware logging.
+"""
+
+import asyncio
+import io
+import json
+import logging
+
+import pytest
+
+from portfolio_tracker.config.logging import (
+    LogContext,
+    LogContextMiddleware,
+    get_log_context,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def log_stream():
+    """Capture root logging output, restoring the previous handlers."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def _records(stream):
+    """Parse the JSON lines written so far."""
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestLogContext:
+    """Tests for contextvar-based context fields."""
+
+    async def test_concurrent_tasks_do_not_share_context(self):
+        """Test that each task only sees its own fields."""
+
+        async def handle(request_id):
+            with LogContext(request_id=request_id):
+                await asyncio.sleep(0.01)
+                return get_log_context()["request_id"]
+
+        assert await asyncio.gather(*(handle(i) for i in range(5))) == list(range(5))
+        assert get_log_context() == {}
+
+    def test_nested_contexts_merge_and_restore(self):
+        """Test that inner fields are dropped on exit."""
+        with LogContext(request_id="a"):
+            with LogContext(user_id=1):
+                assert get_log_context() == {"request_id": "a", "user_id": 1}
+            assert get_log_context() == {"request_id": "a"}
+
+
+class TestStructuredOutput:
+    """Tests for the JSON formatter and queue handler."""
+
+    @pytest.mark.parametrize("use_queue", [False, True])
+    def test_records_carry_context_and_extra(self, log_stream, use_queue):
+        """Test JSON lines with context fields, extras and tracebacks."""
+        setup_logging(stream=log_stream, log_format="json", use_queue=use_queue)
+        logger = logging.getLogger("tests.logging")
+        with LogContext(request_id="abc"):
+            logger.info("loaded %d rows", 3, extra={"portfolio_id": 10})
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logger.exception("failed")
+
+        first, second = _records(log_stream)
+        assert first["message"] == "loaded 3 rows"
+        assert first["request_id"] == "abc"
+        assert first["portfolio_id"] == 10
+        assert first["level"] == "INFO"
+        assert "ZeroDivisionError" in second["exc_info"]
+        assert second["message"] == "failed"
+
+    async def test_middleware_binds_request_fields(self, log_stream):
+        """Test that records logged by a request carry its ID and path."""
+        setup_logging(stream=log_stream, log_format="json", use_queue=True)
+
+        async def app(scope, receive, send):
+            logging.getLogger("tests.logging").info("handled")
+
+        middleware = LogContextMiddleware(app, id_factory=lambda: "generated")
+        scope = {"type": "http", "method": "GET", "path": "/api/v1/portfolios"}
+        await middleware(
+            {**scope, "headers": [(b"x-request-id", b"req-1")]}, None, None
+        )
+        await middleware({**scope, "headers": []}, None, None)
+
+        first, second = _records(log_stream)
+        assert (first["request_id"], first["method"], first["path"]) == (
+            "req-1",
+            "GET",
+            "/api/v1/portfolios",
+        )
+        assert second["request_id"] == "generated"
+        assert get_log_context() == {}
@@ -2,6 +2,11 @@
 Unit tests for main module.
 """
 
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 
 from src.portfolio_tracker.main import app
@@ -24,3 +29,30 @@ class TestApp:
         routes = [route.path for route in app.routes]
         assert "/docs" in routes
         assert "/openapi.json" in routes
+
+
+class TestLazyRouters:
+    """Tests for deferred router mounting."""
+
+    def test_import_skips_routers(self):
+        """Test that importing the app does not import SQLAlchemy or NumPy."""
+        code = (
+            "import sys, portfolio_tracker.main; "
+            "print(sorted({'sqlalchemy', 'numpy'} & set(sys.modules)))"
+        )
+        env = {**os.environ, "PYTHONPATH": str(Path(__file__).parents[2] / "src")}
+        completed = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        )
+        assert completed.stdout.strip() == "[]"
+
+    def test_routers_mounted_on_first_call(self):
+        """Test that the API routes exist once the app is mounted."""
+        app.mount_routers()
+        app.mount_routers()
+        paths = [route.path for route in app.routes]
+        assert paths.count("/api/v1/portfolios/{portfolio_id}/transactions") == 2
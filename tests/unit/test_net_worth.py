@@ -0,0 +1,149 @@
+"""
+Unit tests for the net worth roll-up.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from portfolio_tracker.models.db import FxRate, Holding, Portfolio, User
+from portfolio_tracker.services import net_worth
+
+URL = "/api/v1/analytics/net-worth"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty roll-up cache."""
+    net_worth.get_net_worth_cache().clear()
+
+
+@pytest.fixture
+async def portfolios(db_session):
+    """
+    User 1 with a USD and a EUR portfolio, and user 2 with one of their own.
+
+    1 EUR buys 1.10 USD.
+    """
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(User(id=2, email="b@example.com", password_hash="x", name="B"))
+    db_session.add(Portfolio(id=10, user_id=1, name="US", currency="USD"))
+    db_session.add(Portfolio(id=11, user_id=1, name="EU", currency="EUR"))
+    db_session.add(Portfolio(id=12, user_id=2, name="Other", currency="USD"))
+    for portfolio_id, symbol, asset_type, value, cost in (
+        (10, "AAA", "stock", "1000", "800"),
+        (10, "BBB", "etf", "500", "500"),
+        (11, "CCC", "stock", "1000", "1200"),
+        (12, "DDD", "stock", "9999", "1"),
+    ):
+        db_session.add(
+            Holding(
+                portfolio_id=portfolio_id,
+                symbol=symbol,
+                asset_type=asset_type,
+                quantity=Decimal("10"),
+                average_cost=Decimal(cost) / 10,
+                total_cost=Decimal(cost),
+                market_value=Decimal(value),
+            )
+        )
+    db_session.add(
+        FxRate(
+            base_currency="EUR",
+            quote_currency="USD",
+            date=date(2024, 1, 2),
+            rate=Decimal("1.10"),
+        )
+    )
+    await db_session.commit()
+
+
+class TestNetWorth:
+    """Tests for the net worth endpoint."""
+
+    async def test_rolls_up_portfolios_in_one_currency(self, api_client, portfolios):
+        """Test totals, allocation and currency exposure across portfolios."""
+        response = await api_client.get(URL)
+        assert response.status_code == 200
+        data = response.json()["data"]
+
+        assert data["currency"] == "USD"
+        assert data["portfolios_count"] == 2
+        assert data["holdings_count"] == 3
+        assert Decimal(data["total_value"]) == Decimal("2600.00")
+        assert Decimal(data["total_cost"]) == Decimal("2620.00")
+        assert Decimal(data["total_gain_loss"]) == Decimal("-20.00")
+        assert [
+            (item["asset_type"], Decimal(item["market_value"]))
+            for item in data["allocation"]
+        ] == [("etf", Decimal("500.00")), ("stock", Decimal("2100.00"))]
+        eur = data["currencies"][0]
+        assert eur["currency"] == "EUR"
+        assert Decimal(eur["market_value"]) == Decimal("1000.00")
+        assert Decimal(eur["converted_value"]) == Decimal("1100.00")
+
+        response = await api_client.get(URL, params={"currency": "EUR"})
+        assert Decimal(response.json()["data"]["total_value"]) == Decimal("2363.64")
+
+    async def test_cached_until_a_portfolio_changes(
+        self, api_client, db_session, portfolios
+    ):
+        """Test cache hits, 304s and misses after holding writes."""
+        first = await api_client.get(URL)
+        etag = first.headers["ETag"]
+        response = await api_client.get(URL, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        # Another user's writes keep user 1's roll-up
+        other = await db_session.get(Holding, 4)
+        other.market_value = Decimal("1")
+        await db_session.commit()
+        response = await api_client.get(URL, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+        holding = Holding(
+            portfolio_id=11,
+            symbol="EEE",
+            asset_type="bond",
+            quantity=Decimal("1"),
+            average_cost=Decimal("100"),
+            total_cost=Decimal("100"),
+            market_value=Decimal("100"),
+        )
+        db_session.add(holding)
+        await db_session.commit()
+
+        response = await api_client.get(URL, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert Decimal(response.json()["data"]["total_value"]) == Decimal("2710.00")
+
+    async def test_write_during_roll_up_is_not_cached_over(
+        self, api_client, db_session, portfolios, monkeypatch
+    ):
+        """Test that a write committed mid-computation misses the cache next time."""
+        latest_rates = net_worth.NetWorthService._latest_rates
+
+        async def write_then_read_rates(service, currencies, target):
+            monkeypatch.setattr(
+                net_worth.NetWorthService, "_latest_rates", latest_rates
+            )
+            holding = await db_session.get(Holding, 1)
+            holding.market_value = Decimal("2000")
+            await db_session.commit()
+            return await latest_rates(service, currencies, target)
+
+        monkeypatch.setattr(
+            net_worth.NetWorthService, "_latest_rates", write_then_read_rates
+        )
+        await api_client.get(URL)
+
+        response = await api_client.get(URL)
+        assert Decimal(response.json()["data"]["total_value"]) == Decimal("3600.00")
+
+    async def test_missing_exchange_rate(self, api_client, portfolios):
+        """Test the error when a portfolio currency cannot be converted."""
+        response = await api_client.get(URL, params={"currency": "JPY"})
+        assert response.status_code == 503
+        assert response.json()["errors"][0]["code"] == "EXCHANGE_RATE_UNAVAILABLE"
@@ -0,0 +1,149 @@
+"""
+Unit tests for mean-variance optimization.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from portfolio_tracker.models.db import Holding, MarketPrice, Portfolio, User
+from portfolio_tracker.services import optimization
+from portfolio_tracker.services.optimization import (
+    efficient_frontier,
+    portfolio_stats,
+    project_simplex,
+    solve_frontier,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty covariance cache."""
+    optimization.get_covariance_cache().clear()
+
+
+@pytest.fixture
+async def three_asset_portfolio(db_session, instrument):
+    """Portfolio 10 holding AAA, BBB and CCC with 300 days of closes."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Growth"))
+    rng = np.random.default_rng(3)
+    start = date.today() - timedelta(days=299)
+    for symbol, drift, volatility in (
+        ("AAA", 0.0008, 0.02),
+        ("BBB", 0.0003, 0.008),
+        ("CCC", 0.0005, 0.012),
+    ):
+        db_session.add(
+            Holding(
+                portfolio_id=10,
+                symbol=symbol,
+                asset_type="stock",
+                quantity=Decimal("10"),
+                average_cost=Decimal("100"),
+                total_cost=Decimal("1000"),
+            )
+        )
+        closes = 100 * np.exp(np.cumsum(rng.normal(drift, volatility, 300)))
+        for offset, close in enumerate(closes):
+            db_session.add(
+                MarketPrice(
+                    instrument=instrument(symbol),
+                    date=start + timedelta(days=offset),
+                    close=Decimal(str(round(close, 2))),
+                )
+            )
+    await db_session.commit()
+
+
+class TestSolver:
+    """Tests for the batched frontier solver."""
+
+    def test_simplex_projection(self):
+        """Test that rows land on the simplex at the closest point."""
+        projected = project_simplex(np.array([[0.5, 0.5, 0.5], [2.0, 0.0, -1.0]]))
+        np.testing.assert_allclose(projected, [[1 / 3, 1 / 3, 1 / 3], [1.0, 0, 0]])
+
+    def test_min_variance_matches_closed_form(self):
+        """Test the two-asset minimum-variance weights."""
+        cov = np.array([[0.04, 0.006], [0.006, 0.01]])
+        (weights,) = solve_frontier(np.array([0.1, 0.05]), cov, np.array([0.0]))
+        first = (0.01 - 0.006) / (0.04 + 0.01 - 2 * 0.006)
+        np.testing.assert_allclose(weights, [first, 1 - first], atol=1e-6)
+
+    def test_batched_points_satisfy_optimality(self):
+        """Test KKT conditions of every frontier point of a large problem."""
+        rng = np.random.default_rng(0)
+        returns = rng.normal(0.0004, 0.015, (500, 120)) + rng.normal(0, 0.01, (500, 1))
+        mu = returns.mean(axis=0) * 252
+        cov = np.cov(returns, rowvar=False) * 252
+        risk_aversion = np.array([0.0, 0.1, 1.0, 10.0])
+        weights = solve_frontier(mu, cov, risk_aversion)
+
+        np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+        assert (weights >= 0).all()
+        for row, penalty in zip(weights, risk_aversion):
+            gradient = 2 * cov @ row - penalty * mu
+            active = row > 1e-6
+            floor = gradient[active].min()
+            assert gradient[active].max() - floor < 1e-6
+            assert (gradient[~active] >= floor - 1e-6).all()
+
+    def test_frontier_is_ordered_and_max_sharpe_dominates(self):
+        """Test frontier ordering and the max-Sharpe portfolio."""
+        mu = np.array([0.12, 0.06, 0.09])
+        cov = np.array([[0.09, 0.01, 0.02], [0.01, 0.02, 0.01], [0.02, 0.01, 0.04]])
+        frontier, min_variance, max_sharpe = efficient_frontier(mu, cov, 30, 0.02)
+
+        returns, volatility, sharpe = portfolio_stats(frontier, mu, cov, 0.02)
+        assert (np.diff(volatility) > 0).all()
+        assert (np.diff(returns) > 0).all()
+        assert volatility[0] == pytest.approx(
+            portfolio_stats(min_variance[None], mu, cov, 0.02)[1][0]
+        )
+        assert portfolio_stats(max_sharpe[None], mu, cov, 0.02)[2][0] >= sharpe.max()
+
+
+class TestFrontierEndpoint:
+    """Tests for the frontier endpoint."""
+
+    async def test_frontier_reuses_cached_covariance(
+        self, api_client, three_asset_portfolio, monkeypatch
+    ):
+        """Test the response and that estimates are computed once."""
+        calls = []
+        estimate = optimization.estimate
+
+        def counting_estimate(*args):
+            calls.append(args)
+            return estimate(*args)
+
+        monkeypatch.setattr(optimization, "estimate", counting_estimate)
+
+        url = "/api/v1/analytics/portfolios/10/frontier"
+        response = await api_client.get(url, params={"points": 20})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["symbols"] == ["AAA", "BBB", "CCC"]
+        assert data["history_days"] == 299
+        assert sum(data["min_variance"]["weights"].values()) == pytest.approx(
+            1, abs=1e-3
+        )
+        assert data["max_sharpe"]["sharpe_ratio"] >= data["current"]["sharpe_ratio"]
+        volatilities = [point["volatility"] for point in data["frontier"]]
+        assert volatilities == sorted(volatilities)
+
+        await api_client.get(url, params={"points": 40, "risk_free_rate": 0})
+        assert len(calls) == 1
+
+    async def test_portfolio_without_prices_is_rejected(self, api_client, db_session):
+        """Test that optimization needs at least two priced symbols."""
+        db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+        db_session.add(Portfolio(id=10, user_id=1, name="Empty"))
+        await db_session.commit()
+
+        response = await api_client.get("/api/v1/analytics/portfolios/10/frontier")
+        assert response.status_code == 400
+        assert response.json()["errors"][0]["code"] == "INSUFFICIENT_PRICE_HISTORY"
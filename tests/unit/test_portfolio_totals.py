@@ -0,0 +1,84 @@
+"""
+Unit tests for the set-based portfolio totals recompute.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from portfolio_tracker.models.db import Holding, Portfolio, User
+from portfolio_tracker.repositories.portfolio import PortfolioRepository
+
+
+@pytest.fixture
+async def portfolios(db_session):
+    """Portfolio 10 with a priced and an unpriced holding, empty portfolio 11."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    db_session.add(
+        Portfolio(id=11, user_id=1, name="Sold", total_value=50, total_cost=40)
+    )
+    db_session.add(
+        Holding(
+            portfolio_id=10,
+            symbol="AAA",
+            quantity=Decimal("2"),
+            average_cost=Decimal("5"),
+            total_cost=Decimal("10"),
+            market_value=Decimal("14.50"),
+        )
+    )
+    db_session.add(
+        Holding(
+            portfolio_id=10,
+            symbol="BBB",
+            quantity=Decimal("1"),
+            average_cost=Decimal("3"),
+            total_cost=Decimal("3"),
+        )
+    )
+    await db_session.commit()
+    return [10, 11]
+
+
+async def _totals(db_session):
+    """Totals per portfolio ID."""
+    result = await db_session.execute(
+        select(
+            Portfolio.id,
+            Portfolio.total_value,
+            Portfolio.total_cost,
+            Portfolio.total_gain_loss,
+        ).order_by(Portfolio.id)
+    )
+    return {row.id: tuple(row[1:]) for row in result}
+
+
+class TestRecomputeTotals:
+    """Tests for PortfolioRepository.recompute_totals."""
+
+    async def test_recomputes_all_portfolios(self, db_session, portfolios):
+        """Test sums, unpriced holdings and portfolios without holdings."""
+        repository = PortfolioRepository(db_session)
+        assert await repository.recompute_totals() == 2
+        await db_session.commit()
+
+        assert await _totals(db_session) == {
+            10: (Decimal("14.50"), Decimal("13.00"), Decimal("1.50")),
+            11: (Decimal("0"), Decimal("0"), Decimal("0")),
+        }
+        assert await repository.recompute_totals() == 0
+
+    async def test_filter_limits_updated_portfolios(self, db_session, portfolios):
+        """Test that only the requested portfolios are touched."""
+        repository = PortfolioRepository(db_session)
+        assert await repository.recompute_totals([10]) == 1
+        assert await repository.recompute_totals([]) == 0
+        await db_session.commit()
+        assert (await _totals(db_session))[11][0] == Decimal("50")
+
+    async def test_admin_endpoint_requires_admin(self, api_client, portfolios):
+        """Test that regular users cannot trigger a recompute."""
+        response = await api_client.post("/api/v1/admin/portfolios/recompute-totals")
+        assert response.status_code == 403
@@ -0,0 +1,128 @@
+"""
+Unit tests for the historical price backfill.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from portfolio_tracker.models.db import MarketPrice
+from portfolio_tracker.services.price_backfill import (
+    Checkpoint,
+    PriceWriter,
+    backfill,
+    normalize_header,
+    normalize_record,
+    parse_chunk,
+    plan_chunks,
+)
+
+CSV_HEADER = "Ticker,Date,Open,High,Low,Close,Adj Close,Volume\n"
+
+
+@pytest.fixture
+def price_file(tmp_path):
+    """CSV dump with 50 valid rows, one invalid row and one duplicate."""
+    lines = [
+        f"aaa,2024-01-{day:02d},1.005,2,1,{day}.5,{day}.4,100.6\n"
+        for day in range(1, 26)
+    ]
+    lines += [f"BBB,2024/02/{day:02d},,,,{day},,\n" for day in range(1, 26)]
+    lines.append("CCC,2024-01-01,1,1,1,-5,,\n")
+    lines.append("aaa,2024-01-01,1,2,1,9.99,,\n")
+    path = tmp_path / "prices.csv"
+    path.write_text(CSV_HEADER + "".join(lines))
+    return path
+
+
+class TestNormalization:
+    """Tests for column mapping and validation."""
+
+    def test_vendor_headers_map_to_model_columns(self):
+        """Test header aliases."""
+        assert [normalize_header(name) for name in ("Ticker", "Adj Close", "VOL")] == [
+            "symbol",
+            "adjusted_close",
+            "volume",
+        ]
+
+    def test_record_is_normalized(self):
+        """Test symbol, date, price and volume conversion."""
+        assert normalize_record(
+            {"date": "20240105", "close": "10.125", "volume": "7.6"}, "aapl"
+        ) == ("AAPL", date(2024, 1, 5), None, None, None, Decimal("10.13"), 8, None)
+
+    @pytest.mark.parametrize(
+        "record",
+        [
+            {"symbol": "A", "date": "2024-01-01", "close": "0"},
+            {"symbol": "A", "date": "yesterday", "close": "1"},
+            {"symbol": "A", "date": "2024-01-01", "close": "1", "high": 1, "low": 2},
+            {"symbol": "", "date": "2024-01-01", "close": "1"},
+        ],
+    )
+    def test_invalid_records_are_rejected(self, record):
+        """Test validation errors."""
+        with pytest.raises(ValueError):
+            normalize_record(record)
+
+
+class TestChunking:
+    """Tests for CSV chunk planning."""
+
+    def test_chunks_cover_every_row_once(self, price_file):
+        """Test that line-aligned chunks neither drop nor repeat rows."""
+        chunks = plan_chunks(price_file, chunk_bytes=100)
+        assert len(chunks) > 5
+        results = [parse_chunk(chunk) for chunk in chunks]
+        assert sum(len(result.rows) for result in results) == 51
+        assert sum(result.rejected for result in results) == 1
+        assert all(result.rows or result.rejected for result in results)
+
+
+class TestBackfill:
+    """Tests for writing and resuming."""
+
+    async def test_backfill_writes_and_resumes(self, db_session, price_file, tmp_path):
+        """Test that a second run skips committed chunks."""
+        factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+        checkpoint_path = tmp_path / "checkpoint.json"
+
+        summary = await backfill(
+            [price_file],
+            factory,
+            PriceWriter("vendor", batch_rows=7),
+            Checkpoint(checkpoint_path),
+            chunk_bytes=512,
+            workers=0,
+        )
+        assert summary.rejected == 1
+        assert summary.skipped_chunks == 0
+        count = await db_session.scalar(select(func.count()).select_from(MarketPrice))
+        assert count == 50
+
+        again = await backfill(
+            [price_file],
+            factory,
+            PriceWriter("vendor"),
+            Checkpoint(checkpoint_path),
+            chunk_bytes=512,
+            workers=0,
+        )
+        assert again.chunks == 0
+        assert again.skipped_chunks == summary.chunks
+
+    async def test_duplicate_rows_keep_the_last_value(self, db_session):
+        """Test that repeated (symbol, date) pairs are upserted."""
+        writer = PriceWriter("vendor")
+        row = ("AAA", date(2024, 1, 1), None, None, None, Decimal("1"), None, None)
+        assert (
+            await writer.write(db_session, [row, (*row[:5], Decimal("2"), None, None)])
+            == 1
+        )
+        await writer.write(db_session, [(*row[:5], Decimal("3"), None, None)])
+        await db_session.commit()
+        assert await db_session.scalar(select(MarketPrice.close)) == Decimal("3")
@@ -0,0 +1,135 @@
+"""
+Unit tests for the as-of price index.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from portfolio_tracker.models.db import MarketPrice
+from portfolio_tracker.repositories.market_price import MarketPriceRepository
+from portfolio_tracker.services.invalidation import Invalidation, get_invalidation_bus
+from portfolio_tracker.services.price_index import (
+    AsOfPriceIndex,
+    PriceIndexService,
+    get_price_index,
+)
+
+
+def _history(*pairs):
+    """(dates, closes) arrays from ``("2024-01-05", 10.0)`` pairs."""
+    dates, closes = zip(*pairs)
+    return np.array(dates, dtype="datetime64[D]"), np.array(closes)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAsOfPriceIndex:
+    """Tests for in-memory as-of lookups."""
+
+    def test_weekend_and_stale_lookups(self):
+        """Test last close on or before dates across symbols."""
+        index = AsOfPriceIndex(max_symbols=10, ttl_seconds=60)
+        index.put("AAA", _history(("2024-01-04", 10.0), ("2024-01-05", 11.0)))
+        index.put("BBB", _history(("2023-06-30", 3.0)))
+
+        # Saturday, Sunday and before AAA's first close
+        dates = np.array(["2024-01-06", "2024-01-07", "2024-01-03"], "datetime64[D]")
+        np.testing.assert_array_equal(
+            index.closes_as_of(["AAA", "BBB", "ZZZ"], dates),
+            [[11.0, 3.0, np.nan], [11.0, 3.0, np.nan], [np.nan, 3.0, np.nan]],
+        )
+        assert index.latest(["AAA", "ZZZ"], on=date(2024, 1, 4)) == {"AAA": 10.0}
+
+    def test_only_unpriced_symbols(self):
+        """Test that lookups over symbols without any close return NaN."""
+        index = AsOfPriceIndex(max_symbols=10, ttl_seconds=60)
+        dates = np.array(["2024-01-05", "2024-01-06"], "datetime64[D]")
+        np.testing.assert_array_equal(
+            index.closes_as_of(["ZZZ", "YYY"], dates),
+            [[np.nan, np.nan], [np.nan, np.nan]],
+        )
+        assert index.latest(["ZZZ"]) == {}
+
+    def test_expiry_and_lru_eviction(self):
+        """Test that old and least recently used symbols are reloaded."""
+        clock = FakeClock()
+        index = AsOfPriceIndex(max_symbols=2, ttl_seconds=60, clock=clock)
+        index.put("AAA", _history(("2024-01-04", 10.0)))
+        index.put("BBB", _history(("2024-01-04", 20.0)))
+        index.history("AAA")
+        index.put("CCC", _history(("2024-01-04", 30.0)))
+        assert index.missing(["AAA", "BBB", "CCC"]) == ["BBB"]
+
+        clock.now = 61
+        assert index.missing(["AAA", "CCC"]) == ["AAA", "CCC"]
+
+
+class TestPriceIndexService:
+    """Tests for loading and maintaining the index from market_prices."""
+
+    async def test_loads_missing_symbols_once(
+        self, db_session, monkeypatch, instrument
+    ):
+        """Test one query for all missing symbols and none once indexed."""
+        for symbol, close in (("AAA", "10"), ("BBB", "20")):
+            db_session.add(
+                MarketPrice(
+                    instrument=instrument(symbol),
+                    date=date(2024, 1, 5),
+                    close=Decimal(close),
+                )
+            )
+        await db_session.commit()
+
+        calls = []
+        load = MarketPriceRepository.get_close_histories
+
+        async def counting_load(self, symbols, *args, **kwargs):
+            calls.append(list(symbols))
+            return await load(self, symbols, *args, **kwargs)
+
+        monkeypatch.setattr(MarketPriceRepository, "get_close_histories", counting_load)
+        service = PriceIndexService(db_session)
+        on = date(2024, 1, 7)
+        assert await service.latest(["AAA", "BBB", "ZZZ"], on) == {
+            "AAA": 10.0,
+            "BBB": 20.0,
+        }
+        assert await service.latest(["BBB", "ZZZ"], on) == {"BBB": 20.0}
+        assert calls == [["AAA", "BBB", "ZZZ"]]
+
+    async def test_price_invalidation_reloads_symbol(self, db_session, instrument):
+        """Test that new prices reach lookups after an invalidation."""
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=date(2024, 1, 5),
+                close=Decimal("10"),
+            )
+        )
+        await db_session.commit()
+        service = PriceIndexService(db_session)
+        assert await service.latest(["AAA"], date(2024, 1, 9)) == {"AAA": 10.0}
+
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=date(2024, 1, 8),
+                close=Decimal("12"),
+            )
+        )
+        await db_session.commit()
+        get_invalidation_bus().dispatch(Invalidation("market_price", "AAA"))
+
+        assert "AAA" in get_price_index().missing(["AAA"])
+        assert await service.latest(["AAA"], date(2024, 1, 9)) == {"AAA": 12.0}
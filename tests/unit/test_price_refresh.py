@@ -0,0 +1,236 @@
+"""
+Unit tests for the price refresh scheduler.
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from portfolio_tracker.models.db import (
+    Holding,
+    MarketPrice,
+    Portfolio,
+    PriceRefreshState,
+    User,
+)
+from portfolio_tracker.services.market_data import PriceQuote
+from portfolio_tracker.services.price_refresh import PriceRefreshScheduler
+from portfolio_tracker.utils.exceptions import MarketDataUnavailableException
+
+
+class FakeProvider:
+    """Provider returning fixed quotes and tracking concurrency."""
+
+    source = "fake"
+
+    def __init__(self, failing=(), close="10.00"):
+        self.failing = set(failing)
+        self.close = Decimal(close)
+        self.active = 0
+        self.max_active = 0
+
+    async def fetch_quote(self, symbol):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if symbol in self.failing:
+            raise MarketDataUnavailableException(symbol)
+        return PriceQuote(symbol=symbol, date=date(2024, 1, 5), close=self.close)
+
+    async def aclose(self):
+        pass
+
+
+def make_scheduler(provider, **options):
+    """Build a scheduler that never touches the database."""
+    defaults = {
+        "session_factory": lambda: None,
+        "concurrency": 2,
+        "jitter": 0.0,
+        "backoff_base": 60,
+        "backoff_max": 600,
+    }
+    defaults.update(options)
+    return PriceRefreshScheduler(provider, **defaults)
+
+
+class TestPriceRefreshScheduler:
+    """Tests for quote fetching and backoff."""
+
+    async def test_fetch_respects_concurrency_and_collects_errors(self):
+        """Test bounded concurrency and per-symbol error capture."""
+        provider = FakeProvider(failing={"BAD"})
+        scheduler = make_scheduler(provider)
+
+        quotes, errors = await scheduler.fetch_quotes(["AAA", "BBB", "BAD", "CCC"])
+
+        assert sorted(quotes) == ["AAA", "BBB", "CCC"]
+        assert list(errors) == ["BAD"]
+        assert provider.max_active <= 2
+
+    def test_backoff_is_exponential_and_capped(self):
+        """Test that retry delays double and stop at the maximum."""
+        scheduler = make_scheduler(FakeProvider())
+
+        assert scheduler.backoff_delay(1) == timedelta(seconds=60)
+        assert scheduler.backoff_delay(2) == timedelta(seconds=120)
+        assert scheduler.backoff_delay(3) == timedelta(seconds=240)
+        assert scheduler.backoff_delay(10) == timedelta(seconds=600)
+
+
+@pytest.fixture
+async def holdings(db_session):
+    """BIG holds the most value; WIDE and SMALL tie, WIDE in more portfolios."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    for portfolio_id in (10, 11, 12):
+        db_session.add(Portfolio(id=portfolio_id, user_id=1, name=f"P{portfolio_id}"))
+    for portfolio_id, symbol, quantity, value in (
+        (10, "BIG", "1", "1000"),
+        (10, "WIDE", "1", "50"),
+        (11, "WIDE", "1", "50"),
+        (12, "SMALL", "1", "100"),
+        (12, "SOLD", "0", "0"),
+    ):
+        db_session.add(
+            Holding(
+                portfolio_id=portfolio_id,
+                symbol=symbol,
+                quantity=Decimal(quantity),
+                average_cost=Decimal("1"),
+                total_cost=Decimal(quantity),
+                market_value=Decimal(value),
+            )
+        )
+    await db_session.commit()
+    return async_sessionmaker(db_session.bind, expire_on_commit=False)
+
+
+class TestRefreshCycle:
+    """Tests for due-symbol selection and run_once persistence."""
+
+    async def test_due_symbols_in_priority_order(self, holdings):
+        """Test held value, then portfolio count, ordering and exclusions."""
+        scheduler = make_scheduler(
+            FakeProvider(), session_factory=holdings, refresh_interval=300
+        )
+        now = datetime(2024, 1, 5, 16, 0)
+        async with holdings() as session:
+            session.add(
+                PriceRefreshState(symbol="BIG", last_refreshed_at=now, failure_count=0)
+            )
+            session.add(
+                PriceRefreshState(
+                    symbol="SMALL",
+                    failure_count=2,
+                    next_attempt_at=now + timedelta(minutes=1),
+                )
+            )
+            await session.commit()
+
+            assert await scheduler.select_due_symbols(session, now) == [("WIDE", 0)]
+
+            later = now + timedelta(minutes=10)
+            assert await scheduler.select_due_symbols(session, later) == [
+                ("BIG", 0),
+                ("WIDE", 0),
+                ("SMALL", 2),
+            ]
+
+        scheduler.batch_size = 2
+        async with holdings() as session:
+            due = await scheduler.select_due_symbols(session, later)
+        assert [symbol for symbol, _ in due] == ["BIG", "WIDE"]
+
+    async def test_run_once_stores_prices_and_watermarks(self, holdings):
+        """Test that quotes are upserted and holdings revalued in one cycle."""
+        provider = FakeProvider()
+        scheduler = make_scheduler(provider, session_factory=holdings)
+
+        summary = await scheduler.run_once()
+        assert summary.selected == 3
+        assert summary.refreshed == ["BIG", "SMALL", "WIDE"]
+        assert summary.failed == {}
+        # Everything is fresh now
+        assert (await scheduler.run_once()).selected == 0
+
+        provider.close = Decimal("12.00")
+        async with holdings() as session:
+            await session.execute(
+                PriceRefreshState.__table__.update().values(
+                    last_refreshed_at=datetime(2000, 1, 1)
+                )
+            )
+            await session.commit()
+        await scheduler.run_once()
+
+        async with holdings() as session:
+            closes = (await session.execute(select(MarketPrice.close))).scalars().all()
+            holding = await session.scalar(
+                select(Holding).where(Holding.symbol == "BIG")
+            )
+            state = await session.scalar(
+                select(PriceRefreshState).where(PriceRefreshState.symbol == "BIG")
+            )
+        assert closes == [Decimal("12.00")] * 3
+        assert holding.current_price == Decimal("12.00")
+        assert holding.market_value == Decimal("12.00")
+        assert state.last_price_date == date(2024, 1, 5)
+        assert state.failure_count == 0
+
+    async def test_failures_back_off_then_reset(self, holdings):
+        """Test failure counting, backoff scheduling and reset on success."""
+        provider = FakeProvider(failing={"WIDE"})
+        scheduler = make_scheduler(provider, session_factory=holdings)
+
+        summary = await scheduler.run_once()
+        assert list(summary.failed) == ["WIDE"]
+
+        async with holdings() as session:
+            state = await session.scalar(
+                select(PriceRefreshState).where(PriceRefreshState.symbol == "WIDE")
+            )
+            assert state.failure_count == 1
+            assert state.last_refreshed_at is None
+            assert "WIDE" in state.last_error
+            backoff = state.next_attempt_at - datetime.utcnow()
+            assert timedelta(seconds=50) < backoff <= timedelta(seconds=60)
+
+            # Backing off: not due again until next_attempt_at
+            assert await scheduler.select_due_symbols(session, datetime.utcnow()) == []
+            due = await scheduler.select_due_symbols(session, state.next_attempt_at)
+            assert due == [("WIDE", 1)]
+
+            await session.execute(
+                PriceRefreshState.__table__.update().values(next_attempt_at=None)
+            )
+            await session.commit()
+
+        await scheduler.run_once()
+        async with holdings() as session:
+            state = await session.scalar(
+                select(PriceRefreshState).where(PriceRefreshState.symbol == "WIDE")
+            )
+        assert state.failure_count == 2
+        assert state.next_attempt_at - datetime.utcnow() > timedelta(seconds=100)
+
+        provider.failing.clear()
+        async with holdings() as session:
+            await session.execute(
+                PriceRefreshState.__table__.update().values(next_attempt_at=None)
+            )
+            await session.commit()
+        assert (await scheduler.run_once()).refreshed == ["WIDE"]
+        async with holdings() as session:
+            state = await session.scalar(
+                select(PriceRefreshState).where(PriceRefreshState.symbol == "WIDE")
+            )
+        assert (state.failure_count, state.next_attempt_at, state.last_error) == (
+            0,
+            None,
+            None,
+        )
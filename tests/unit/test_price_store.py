@@ -0,0 +1,124 @@
+"""
+Unit tests for the columnar price store.
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+from sqlalchemy import insert, update
+
+from portfolio_tracker.models.db import MarketPrice
+from portfolio_tracker.services.instruments import InstrumentService
+from portfolio_tracker.services.price_store import ColumnarPriceStore
+
+
+async def add_prices(session, symbol, closes, start=date(2024, 1, 1), updated_at=None):
+    """Insert consecutive daily closes for a symbol."""
+    ids = await InstrumentService(session).get_ids([symbol], create=True)
+    await session.execute(
+        insert(MarketPrice),
+        [
+            {
+                "instrument_id": ids[symbol],
+                "date": start + timedelta(days=offset),
+                "close": Decimal(str(close)),
+                "updated_at": updated_at or datetime(2024, 1, 1),
+            }
+            for offset, close in enumerate(closes)
+        ],
+    )
+    await session.commit()
+
+
+class TestColumnarPriceStore:
+    """Tests for snapshot, incremental refresh and slicing."""
+
+    async def test_snapshot_and_slices(self, db_session, tmp_path):
+        """Test that a full snapshot exposes memory-mapped, sliceable series."""
+        await add_prices(db_session, "AAA", [1.0, 2.0, 3.0, 4.0])
+        await add_prices(db_session, "BBB", [10.0, 11.0])
+        store = ColumnarPriceStore(tmp_path)
+
+        assert await store.refresh(db_session) == 6
+        assert store.symbols == ["AAA", "BBB"]
+
+        series = store.get_series("AAA", start=date(2024, 1, 2), end=date(2024, 1, 3))
+        np.testing.assert_allclose(series.closes, [2.0, 3.0])
+        assert isinstance(series.closes.base, np.memmap)
+        assert store.get_series("ZZZ") is None
+
+    async def test_incremental_refresh_applies_new_and_corrected_rows(
+        self, db_session, tmp_path
+    ):
+        """Test that only rows past the watermark are applied."""
+        await add_prices(db_session, "AAA", [1.0, 2.0])
+        store = ColumnarPriceStore(tmp_path)
+        await store.refresh(db_session)
+
+        later = datetime(2024, 2, 1)
+        await add_prices(
+            db_session, "AAA", [3.0], start=date(2024, 1, 3), updated_at=later
+        )
+        await db_session.execute(
+            update(MarketPrice)
+            .where(MarketPrice.date == date(2024, 1, 1))
+            .values(close=Decimal("1.5"), updated_at=later)
+        )
+        await db_session.commit()
+
+        assert await store.refresh(db_session) == 2
+        assert await store.refresh(db_session) == 0
+
+        reader = ColumnarPriceStore(tmp_path)
+        np.testing.assert_allclose(reader.get_series("AAA").closes, [1.5, 2.0, 3.0])
+
+    async def test_late_commit_inside_overlap_is_applied(self, db_session, tmp_path):
+        """Test that a row stamped before the watermark but committed later is read."""
+        await add_prices(db_session, "AAA", [1.0, 2.0], updated_at=datetime(2024, 2, 1))
+        store = ColumnarPriceStore(tmp_path, overlap_seconds=60)
+        await store.refresh(db_session)
+
+        late = datetime(2024, 2, 1) - timedelta(seconds=30)
+        await add_prices(
+            db_session, "AAA", [3.0], start=date(2024, 1, 3), updated_at=late
+        )
+
+        assert await store.refresh(db_session) == 1
+        assert await store.refresh(db_session) == 0
+        assert store.watermark == datetime(2024, 2, 1)
+        np.testing.assert_allclose(store.get_series("AAA").closes, [1.0, 2.0, 3.0])
+
+    async def test_rewrite_goes_to_new_generation_files(self, db_session, tmp_path):
+        """Test that a rewrite never replaces the files a manifest points at."""
+        await add_prices(db_session, "AAA", [1.0, 2.0])
+        store = ColumnarPriceStore(tmp_path)
+        await store.refresh(db_session)
+
+        reader = ColumnarPriceStore(tmp_path)
+        mapped = reader.get_series("AAA")
+        stale = json.loads((tmp_path / "manifest.json").read_text())
+
+        await add_prices(
+            db_session,
+            "AAA",
+            [3.0],
+            start=date(2024, 1, 3),
+            updated_at=datetime(2024, 2, 1),
+        )
+        await store.refresh(db_session)
+
+        assert sorted(path.name for path in tmp_path.glob("*.npy")) == [
+            "s0.g2.close.npy",
+            "s0.g2.dates.npy",
+        ]
+        np.testing.assert_allclose(mapped.closes, [1.0, 2.0])
+
+        # A reader holding the manifest from before the swap retries on the new one
+        reader._manifest = stale
+        reader._manifest_mtime = (tmp_path / "manifest.json").stat().st_mtime_ns
+        reader._mapped.clear()
+        series = reader.get_series("AAA")
+        assert len(series.dates) == len(series.closes) == 3
+        np.testing.assert_allclose(series.closes, [1.0, 2.0, 3.0])
@@ -0,0 +1,109 @@
+"""
+Unit tests for the request profiler.
+"""
+
+import sys
+import threading
+
+import pytest
+
+from portfolio_tracker.api.v1.dependencies import get_current_user
+from portfolio_tracker.main import app
+from portfolio_tracker.services.profiling import (
+    RequestProfile,
+    StackSampler,
+    _ActiveRequest,
+    format_collapsed,
+    requested_mode,
+)
+
+
+@pytest.fixture
+def as_admin(api_client):
+    """Make the test user an admin."""
+    app.dependency_overrides[get_current_user] = lambda: {"id": 1, "is_admin": True}
+    return api_client
+
+
+def _handler(sampler):
+    """Stand-in for endpoint code running when the sample is taken."""
+    return sampler.sample()
+
+
+class TestRequestedMode:
+    """Tests for the header and query flags."""
+
+    @pytest.mark.parametrize(
+        "headers, query, expected",
+        [
+            ([(b"x-profile", b"collapsed")], b"", "collapsed"),
+            ([(b"x-profile", b"1")], b"", "store"),
+            ([], b"page=2&profile=store", "store"),
+            ([], b"page=2", None),
+            ([(b"x-profile", b"bogus")], b"", None),
+        ],
+    )
+    def test_flags(self, headers, query, expected):
+        """Test header and query values."""
+        assert requested_mode({"headers": headers, "query_string": query}) == expected
+
+
+class TestStackSampler:
+    """Tests for sample attribution."""
+
+    def test_samples_are_trimmed_and_attributed(self):
+        """Test that only frames below the request's frame are recorded."""
+        sampler = StackSampler(
+            thread_id=threading.get_ident(), interval=1, continuous_interval=0
+        )
+        profile = RequestProfile(id="p", method="GET", path="/x", mode="store")
+        scope = {"method": "GET", "path": "/x"}
+        sampler.active[sys._getframe()] = _ActiveRequest(scope, profile)
+
+        assert _handler(sampler)
+        (stack,) = profile.samples
+        assert [code.co_name for code in stack] == ["_handler", "sample"]
+        assert format_collapsed(profile.samples).startswith("_handler (test_profiling")
+        assert sum(sampler.take_routes(reset=True)["GET /x"].values()) == 1
+        assert sampler.routes == {}
+
+    def test_unregistered_stacks_are_ignored(self):
+        """Test that samples outside any request are dropped."""
+        sampler = StackSampler(thread_id=threading.get_ident(), interval=1)
+        assert not _handler(sampler)
+
+
+class TestProfilingEndpoints:
+    """Tests for on-demand profiling through the API."""
+
+    async def test_admin_profile_is_stored(self, as_admin):
+        """Test that a flagged admin request returns a retrievable profile ID."""
+        response = await as_admin.get(
+            "/api/v1/portfolios", headers={"X-Profile": "store"}
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        stored = await as_admin.get(f"/api/v1/admin/profiles/{profile_id}")
+        assert stored.status_code == 200
+        assert stored.headers["content-type"].startswith("text/plain")
+        listed = (await as_admin.get("/api/v1/admin/profiles")).json()["data"]
+        assert listed[0]["route"] == "GET /api/v1/portfolios"
+
+    async def test_collapsed_mode_replaces_body(self, as_admin):
+        """Test that the profile is returned instead of the response."""
+        response = await as_admin.get(
+            "/api/v1/portfolios", params={"profile": "collapsed"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "x-profile-id" in response.headers
+
+    async def test_non_admin_cannot_profile(self, api_client):
+        """Test that the flag is rejected for regular users."""
+        response = await api_client.get(
+            "/api/v1/portfolios", headers={"X-Profile": "store"}
+        )
+        assert response.status_code == 403
+        assert "x-profile-id" not in response.headers
+        assert (await api_client.get("/api/v1/admin/profiles")).status_code == 403
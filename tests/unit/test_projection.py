@@ -0,0 +1,190 @@
+"""
+Unit tests for Monte Carlo projections.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from multiprocessing import get_context
+
+import numpy as np
+import pytest
+
+from portfolio_tracker.models.db import Holding, MarketPrice, Portfolio, User
+from portfolio_tracker.services import projection
+from portfolio_tracker.services.projection import (
+    PATHS_PER_SHARD,
+    ProjectionParams,
+    run_simulation,
+    weighted_log_returns,
+)
+
+
+def _history(*pairs):
+    """(dates, closes) arrays from ``("2024-01-01", 10.0)`` pairs."""
+    dates, closes = zip(*pairs)
+    return np.array(dates, dtype="datetime64[D]"), np.array(closes)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty projection cache."""
+    projection.get_projection_cache().clear()
+
+
+@pytest.fixture
+async def priced_portfolio(db_session, instrument):
+    """Portfolio 10 holding 10 AAA with a year of growing closes."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Growth"))
+    db_session.add(Portfolio(id=11, user_id=1, name="Empty"))
+    db_session.add(
+        Holding(
+            portfolio_id=10,
+            symbol="AAA",
+            asset_type="stock",
+            quantity=Decimal("10"),
+            average_cost=Decimal("100"),
+            total_cost=Decimal("1000"),
+        )
+    )
+    rng = np.random.default_rng(1)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.01, 250)))
+    start = date.today() - timedelta(days=249)
+    for offset, close in enumerate(closes):
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=start + timedelta(days=offset),
+                close=Decimal(str(round(close, 2))),
+            )
+        )
+    await db_session.commit()
+
+
+class TestReturns:
+    """Tests for building the historical return series."""
+
+    def test_forward_fills_and_weights_by_current_value(self):
+        """Test forward-filled closes weighted at today's values."""
+        histories = {
+            "AAA": _history(("2024-01-01", 10.0), ("2024-01-02", 11.0)),
+            "BBB": _history(
+                ("2023-12-01", 50.0), ("2024-01-01", 50.0), ("2024-01-03", 60.0)
+            ),
+        }
+        value, returns = weighted_log_returns(histories, {"AAA": 10, "BBB": 1})
+
+        # AAA: 11 x 10 = 110, BBB: 60 x 1 = 60; starts when both have a price
+        assert value == 170.0
+        weights = np.array([110, 60]) / 170
+        expected = np.log([np.dot([1.1, 1.0], weights), np.dot([1.0, 1.2], weights)])
+        np.testing.assert_allclose(returns, expected)
+
+    def test_symbols_without_prices_are_skipped(self):
+        """Test that unpriced holdings do not break the series."""
+        histories = {"AAA": _history(("2024-01-01", 10.0), ("2024-01-02", 12.0))}
+        value, returns = weighted_log_returns(histories, {"AAA": 1, "ZZZ": 5})
+        assert value == 12.0
+        np.testing.assert_allclose(returns, [np.log(1.2)])
+
+
+class TestSimulation:
+    """Tests for path simulation."""
+
+    async def test_seeded_paths_are_reproducible(self):
+        """Test that a seed fixes the paths and shards the same way."""
+        returns = np.random.default_rng(0).normal(0.0003, 0.01, 500)
+        params = ProjectionParams(horizon_years=3, paths=PATHS_PER_SHARD + 10)
+
+        first = await run_simulation(returns, params)
+        second = await run_simulation(returns, params)
+        other = await run_simulation(returns, ProjectionParams(3, params.paths, seed=1))
+
+        assert first.shape == (PATHS_PER_SHARD + 10, 3)
+        np.testing.assert_array_equal(first, second)
+        assert not np.array_equal(first, other)
+
+    async def test_process_pool_matches_inline(self, monkeypatch):
+        """Test that fanning out over processes gives the inline result."""
+        returns = np.random.default_rng(0).normal(0.0003, 0.01, 500)
+        params = ProjectionParams(horizon_years=2, paths=2 * PATHS_PER_SHARD)
+        inline = await run_simulation(returns, params)
+
+        pool = ProcessPoolExecutor(max_workers=2, mp_context=get_context("spawn"))
+        monkeypatch.setattr(projection, "get_projection_pool", lambda: pool)
+        monkeypatch.setattr(projection.settings, "PROJECTION_POOL_MIN_PATHS", 0)
+        try:
+            pooled = await run_simulation(returns, params)
+        finally:
+            pool.shutdown()
+        np.testing.assert_array_equal(inline, pooled)
+
+    async def test_normal_method_matches_fitted_drift(self):
+        """Test that normal yearly draws follow the daily fit."""
+        returns = np.random.default_rng(0).normal(0.0004, 0.01, 1000)
+        params = ProjectionParams(horizon_years=10, paths=20_000, method="normal")
+        growth = await run_simulation(returns, params)
+
+        assert growth[:, -1].mean() == pytest.approx(returns.mean() * 2520, abs=0.01)
+        assert growth[:, 0].std() == pytest.approx(
+            returns.std(ddof=1) * np.sqrt(252), rel=0.03
+        )
+
+
+class TestProjectionEndpoint:
+    """Tests for the projection endpoint."""
+
+    async def test_projection_is_computed_and_cached(
+        self, api_client, priced_portfolio
+    ):
+        """Test yearly percentiles and reuse of cached results."""
+        url = "/api/v1/analytics/portfolios/10/projection?horizon_years=5&paths=1000"
+        response = await api_client.get(url)
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["history_days"] == 249
+        assert [point["year"] for point in data["points"]] == [1, 2, 3, 4, 5]
+        point = data["points"][-1]
+        assert point["percentiles"]["p5"] < point["percentiles"]["p50"]
+        assert point["percentiles"]["p50"] < point["percentiles"]["p95"]
+        assert len(projection.get_projection_cache()) == 1
+
+        again = await api_client.get(url)
+        assert again.json()["data"] == data
+        assert len(projection.get_projection_cache()) == 1
+
+        cached = await api_client.get(
+            url, headers={"If-None-Match": response.headers["etag"]}
+        )
+        assert cached.status_code == 304
+
+    async def test_new_close_changes_etag(
+        self, api_client, db_session, priced_portfolio, instrument
+    ):
+        """Test that a price write for a held symbol is not answered with 304."""
+        url = "/api/v1/analytics/portfolios/10/projection?horizon_years=5&paths=1000"
+        first = await api_client.get(url)
+        etag = first.headers["etag"]
+
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=date.today() - timedelta(days=250),
+                close=Decimal("99"),
+            )
+        )
+        await db_session.commit()
+
+        response = await api_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["data"]["history_days"] == 250
+
+    async def test_portfolio_without_history_is_rejected(
+        self, api_client, priced_portfolio
+    ):
+        """Test the error for holdings without prices."""
+        response = await api_client.get("/api/v1/analytics/portfolios/11/projection")
+        assert response.status_code == 400
+        assert response.json()["errors"][0]["code"] == "INSUFFICIENT_PRICE_HISTORY"
@@ -0,0 +1,144 @@
+"""
+Unit tests for the rebalancing engine.
+"""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from portfolio_tracker.models.db import Holding, Portfolio, User
+from portfolio_tracker.models.db.portfolio import RiskProfile
+from portfolio_tracker.services.rebalancing import (
+    HoldingRow,
+    compute_proposals,
+    propose_all,
+)
+
+
+def _trades(proposal):
+    """Trades as comparable tuples."""
+    return [
+        (trade.action, trade.asset_type, trade.symbol, trade.value)
+        for trade in proposal.trades
+    ]
+
+
+@pytest.fixture
+async def portfolios(db_session):
+    """Five all-stock moderate portfolios and one balanced conservative one."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    for portfolio_id in range(10, 15):
+        db_session.add(Portfolio(id=portfolio_id, user_id=1, name=f"P{portfolio_id}"))
+        db_session.add(
+            Holding(
+                portfolio_id=portfolio_id,
+                symbol="AAA",
+                asset_type="stock",
+                quantity=Decimal("100"),
+                average_cost=Decimal("10"),
+                total_cost=Decimal("1000"),
+                current_price=Decimal("10"),
+            )
+        )
+    db_session.add(
+        Portfolio(id=20, user_id=1, name="Balanced", risk_profile="CONSERVATIVE")
+    )
+    for symbol, asset_type, quantity in (
+        ("B", "bond", 60),
+        ("E", "etf", 25),
+        ("S", "stock", 15),
+    ):
+        db_session.add(
+            Holding(
+                portfolio_id=20,
+                symbol=symbol,
+                asset_type=asset_type,
+                quantity=Decimal(quantity),
+                average_cost=Decimal("1"),
+                total_cost=Decimal(quantity),
+                current_price=Decimal("1"),
+            )
+        )
+    await db_session.commit()
+
+
+class TestComputeProposals:
+    """Tests for the vectorized trade computation."""
+
+    def test_sells_largest_holdings_first_and_buys_missing_types(self):
+        """Test minimal sells and symbol-less buys for absent asset types."""
+        holdings = [
+            HoldingRow(1, "BIG", "stock", 60, 100.0),
+            HoldingRow(1, "SMALL", "stock", 40, 100.0),
+        ]
+        (proposal,) = compute_proposals(
+            [(1, RiskProfile.MODERATE)], holdings, tolerance=0.05, min_trade_value=0
+        )
+        assert proposal.total_value == 10000.0
+        assert _trades(proposal) == [
+            ("sell", "stock", "BIG", 6000.0),
+            ("sell", "stock", "SMALL", 1000.0),
+            ("buy", "bond", None, 3500.0),
+            ("buy", "etf", None, 3000.0),
+            ("buy", "crypto", None, 500.0),
+        ]
+        assert proposal.trades[1].quantity == 10.0
+
+    def test_buys_go_into_the_largest_holding(self):
+        """Test that an underweight type is topped up through one holding."""
+        holdings = [
+            HoldingRow(1, "B", "bond", 50, 1.0),
+            HoldingRow(1, "E1", "etf", 10, 1.0),
+            HoldingRow(1, "E2", "etf", 5, 1.0),
+            HoldingRow(1, "S", "stock", 35, 1.0),
+        ]
+        (proposal,) = compute_proposals(
+            [(1, RiskProfile.CONSERVATIVE)], holdings, tolerance=0.05, min_trade_value=1
+        )
+        assert ("buy", "etf", "E1", 10.0) in _trades(proposal)
+        assert all(trade.symbol != "E2" for trade in proposal.trades)
+
+    def test_within_tolerance_and_unknown_types_are_left_alone(self):
+        """Test that balanced portfolios and untargeted types get no trades."""
+        holdings = [
+            HoldingRow(1, "B", "bond", 58, 1.0),
+            HoldingRow(1, "E", "etf", 27, 1.0),
+            HoldingRow(1, "S", "stock", 15, 1.0),
+            HoldingRow(1, "R", "reit", 1000, 1.0),
+        ]
+        assert (
+            compute_proposals(
+                [(1, RiskProfile.CONSERVATIVE), (2, RiskProfile.AGGRESSIVE)],
+                holdings,
+                tolerance=0.05,
+                min_trade_value=0,
+            )
+            == []
+        )
+
+
+class TestBatchRebalancing:
+    """Tests for the chunked batch job and the endpoint."""
+
+    async def test_all_portfolios_are_processed_in_chunks(self, db_session, portfolios):
+        """Test that every out-of-balance portfolio gets a proposal."""
+        factory = async_sessionmaker(db_session.bind, expire_on_commit=False)
+        chunks = [
+            chunk
+            async for chunk in propose_all(
+                factory, chunk_size=2, concurrency=2, tolerance=0.05, min_trade_value=0
+            )
+        ]
+        assert len(chunks) == 3
+        proposals = [proposal for chunk in chunks for proposal in chunk]
+        assert sorted(p.portfolio_id for p in proposals) == [10, 11, 12, 13, 14]
+
+    async def test_endpoint_returns_proposal(self, api_client, portfolios):
+        """Test the single-portfolio endpoint."""
+        response = await api_client.get("/api/v1/analytics/portfolios/10/rebalance")
+        assert response.status_code == 200
+        assert response.json()["data"]["trades"][0]["action"] == "sell"
+
+        balanced = await api_client.get("/api/v1/analytics/portfolios/20/rebalance")
+        assert balanced.json()["data"] is None
@@ -0,0 +1,163 @@
+"""
+Unit tests for search and symbol autocomplete.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from portfolio_tracker.models.db import (
+    Holding,
+    Portfolio,
+    PriceRefreshState,
+    Transaction,
+    User,
+)
+from portfolio_tracker.models.db.transaction import TransactionType
+from portfolio_tracker.repositories.holding import HoldingRepository
+from portfolio_tracker.services.invalidation import Invalidation, get_invalidation_bus
+from portfolio_tracker.services.symbol_search import SymbolIndex, get_symbol_index_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_index():
+    """Start every test without a symbol index."""
+    get_symbol_index_cache().clear()
+
+
+@pytest.fixture
+async def searchable(db_session):
+    """Two users' portfolios with named holdings and annotated transactions."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(User(id=2, email="b@example.com", password_hash="x", name="B"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Mine"))
+    db_session.add(Portfolio(id=20, user_id=2, name="Theirs"))
+    for holding_id, portfolio_id, symbol, name, notes in (
+        (1, 10, "AAPL", "Apple Inc.", "Rebalance after earnings"),
+        (2, 10, "MSFT", "Microsoft Corporation", "Bought 100% on margin"),
+        (3, 20, "AMZN", "Amazon.com Inc.", "Rebalance quarterly"),
+    ):
+        db_session.add(
+            Holding(
+                id=holding_id,
+                portfolio_id=portfolio_id,
+                symbol=symbol,
+                name=name,
+                quantity=Decimal("1"),
+                average_cost=Decimal("100"),
+                total_cost=Decimal("100"),
+            )
+        )
+        db_session.add(
+            Transaction(
+                portfolio_id=portfolio_id,
+                holding_id=holding_id,
+                transaction_type=TransactionType.BUY,
+                transaction_date=date(2024, 1, holding_id),
+                symbol=symbol,
+                quantity=Decimal("1"),
+                price=Decimal("100"),
+                total_amount=Decimal("100"),
+                notes=notes,
+            )
+        )
+    db_session.add(PriceRefreshState(symbol="SPY"))
+    await db_session.commit()
+
+
+class TestSymbolIndex:
+    """Tests for the in-memory prefix index."""
+
+    def test_symbols_before_name_words(self):
+        """Test ordering, case-insensitivity and the limit."""
+        index = SymbolIndex(
+            [
+                ("AMD", "Advanced Micro Devices"),
+                ("AMZN", "Amazon.com Inc."),
+                ("aapl", "Apple Inc."),
+                ("MSFT", "Microsoft Corporation"),
+                ("AMZN", None),
+            ]
+        )
+        assert len(index) == 4
+        assert index.complete("am", 10) == [
+            ("AMD", "Advanced Micro Devices"),
+            ("AMZN", "Amazon.com Inc."),
+        ]
+        assert index.complete("Micro", 10) == [
+            ("AMD", "Advanced Micro Devices"),
+            ("MSFT", "Microsoft Corporation"),
+        ]
+        assert index.complete("inc", 10) == [
+            ("AAPL", "Apple Inc."),
+            ("AMZN", "Amazon.com Inc."),
+        ]
+        assert index.complete("a", 1) == [("AAPL", "Apple Inc.")]
+        assert index.complete("  ", 10) == []
+
+
+class TestSearchEndpoints:
+    """Tests for the search endpoints."""
+
+    async def test_transaction_notes(self, api_client, searchable):
+        """Test case-insensitive, user-scoped and escaped note search."""
+        response = await api_client.get(
+            "/api/v1/search/transactions", params={"q": "REBALANCE"}
+        )
+        assert response.status_code == 200
+        assert [row["symbol"] for row in response.json()["data"]] == ["AAPL"]
+
+        response = await api_client.get(
+            "/api/v1/search/transactions", params={"q": "00%", "fields": "id,notes"}
+        )
+        assert response.json()["data"] == [{"id": 2, "notes": "Bought 100% on margin"}]
+
+        response = await api_client.get(
+            "/api/v1/search/transactions", params={"q": "re"}
+        )
+        assert response.status_code == 422
+
+    async def test_holding_names(self, api_client, searchable):
+        """Test matching holding names and symbols of the user's portfolios."""
+        response = await api_client.get("/api/v1/search/holdings", params={"q": "inc"})
+        assert [row["symbol"] for row in response.json()["data"]] == ["AAPL"]
+
+        response = await api_client.get("/api/v1/search/holdings", params={"q": "msf"})
+        assert [row["symbol"] for row in response.json()["data"]] == ["MSFT"]
+
+    async def test_autocomplete_is_served_from_memory(
+        self, api_client, db_session, searchable, monkeypatch
+    ):
+        """Test one index build for many lookups and rebuilds for new symbols."""
+        builds = []
+        load = HoldingRepository.get_symbol_names
+
+        async def counting_load(self):
+            builds.append(1)
+            return await load(self)
+
+        monkeypatch.setattr(HoldingRepository, "get_symbol_names", counting_load)
+
+        url = "/api/v1/search/symbols"
+        response = await api_client.get(url, params={"q": "a"})
+        assert response.json()["data"] == [
+            {"symbol": "AAPL", "name": "Apple Inc."},
+            {"symbol": "AMZN", "name": "Amazon.com Inc."},
+        ]
+        for prefix in ("s", "sp", "spy"):
+            response = await api_client.get(url, params={"q": prefix})
+            assert response.json()["data"] == [{"symbol": "SPY", "name": None}]
+        assert len(builds) == 1
+
+        # Prices for a known symbol keep the index, an unknown one expires it
+        get_invalidation_bus().dispatch(Invalidation("market_price", "SPY"))
+        await api_client.get(url, params={"q": "q"})
+        assert len(builds) == 1
+
+        db_session.add(PriceRefreshState(symbol="QQQ"))
+        await db_session.commit()
+        get_invalidation_bus().dispatch(Invalidation("market_price", "QQQ"))
+        response = await api_client.get(url, params={"q": "q"})
+        assert response.json()["data"] == [{"symbol": "QQQ", "name": None}]
+        assert len(builds) == 2
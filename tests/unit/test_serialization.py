@@ -0,0 +1,145 @@
+"""
+Unit tests for sparse fieldsets and compiled row serializers.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from portfolio_tracker.models.db import Holding, Portfolio, Transaction, User
+from portfolio_tracker.models.db.portfolio import RiskProfile
+from portfolio_tracker.models.db.transaction import TransactionType
+from portfolio_tracker.models.schemas.portfolio import PortfolioResponse
+from portfolio_tracker.utils.exceptions import ValidationException
+from portfolio_tracker.utils.helpers import to_dict
+from portfolio_tracker.utils.serialization import get_row_serializer, parse_fields
+
+
+@pytest.fixture
+async def portfolio(db_session):
+    """Portfolio with one holding and two transactions owned by user 1."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    db_session.add(
+        Holding(
+            id=100,
+            portfolio_id=10,
+            symbol="AAA",
+            quantity=Decimal("2"),
+            average_cost=Decimal("5"),
+            total_cost=Decimal("10"),
+        )
+    )
+    for tx_id, day in ((1, 2), (2, 3)):
+        db_session.add(
+            Transaction(
+                id=tx_id,
+                portfolio_id=10,
+                holding_id=100,
+                transaction_type=TransactionType.BUY,
+                transaction_date=date(2024, 1, day),
+                symbol="AAA",
+                quantity=Decimal("1"),
+                price=Decimal("5"),
+                total_amount=Decimal("5"),
+            )
+        )
+    await db_session.commit()
+    return 10
+
+
+class TestParseFields:
+    """Tests for fields= parsing."""
+
+    def test_default_is_all_allowed_fields(self):
+        """Test that a missing parameter selects every field."""
+        assert parse_fields(None, ("id", "name")) == ("id", "name")
+
+    def test_fieldset_follows_allowed_order(self):
+        """Test that request order and duplicates do not change the fieldset."""
+        allowed = ("id", "name", "currency")
+        assert parse_fields(" currency,id,id ", allowed) == ("id", "currency")
+
+    def test_unknown_field_is_rejected(self):
+        """Test that unknown fields raise a validation error."""
+        with pytest.raises(ValidationException) as exc_info:
+            parse_fields("id,password_hash", ("id", "name"))
+        assert exc_info.value.details["unknown"] == ["password_hash"]
+
+
+class TestRowSerializer:
+    """Tests for compiled serializers."""
+
+    def test_serializer_is_cached_per_fieldset(self):
+        """Test that a (model, fieldset) pair compiles once."""
+        fieldset = ("id", "name")
+        assert get_row_serializer(Portfolio, fieldset) is get_row_serializer(
+            Portfolio, fieldset
+        )
+
+    def test_matches_pydantic_json_output(self):
+        """Test that compiled output equals the response schema dump."""
+        portfolio = Portfolio(
+            id=1,
+            user_id=2,
+            name="Main",
+            description=None,
+            currency="USD",
+            risk_profile=RiskProfile.AGGRESSIVE,
+            total_value=Decimal("10.50"),
+            total_cost=Decimal("8.00"),
+            total_gain_loss=Decimal("2.50"),
+        )
+        portfolio.created_at = portfolio.updated_at = datetime(2024, 1, 1, 12, 30)
+        fieldset = tuple(PortfolioResponse.model_fields)
+
+        row = tuple(getattr(portfolio, name) for name in fieldset)
+        expected = PortfolioResponse.model_validate(portfolio).model_dump(mode="json")
+        assert get_row_serializer(Portfolio, fieldset)(row) == expected
+        assert to_dict(portfolio) == expected
+
+    def test_to_dict_exclude(self):
+        """Test that to_dict still honours exclude."""
+        portfolio = Portfolio(id=1, user_id=2, name="Main")
+        assert "name" not in to_dict(portfolio, exclude=["name"])
+
+
+class TestSparseListEndpoints:
+    """Tests for fields= on list endpoints."""
+
+    async def test_holdings_only_return_requested_fields(self, api_client, portfolio):
+        """Test that only requested holding fields are returned."""
+        response = await api_client.get(
+            "/api/v1/portfolios/10/holdings", params={"fields": "symbol,quantity"}
+        )
+        assert response.status_code == 200
+        assert response.json()["data"] == [{"symbol": "AAA", "quantity": "2.00000000"}]
+
+    async def test_fieldset_changes_etag(self, api_client, portfolio):
+        """Test that different fieldsets get different ETags."""
+        full = await api_client.get("/api/v1/portfolios")
+        sparse = await api_client.get("/api/v1/portfolios", params={"fields": "id"})
+        assert sparse.json()["data"] == [{"id": 10}]
+        assert full.headers["ETag"] != sparse.headers["ETag"]
+
+    async def test_transactions_are_paginated(self, api_client, portfolio):
+        """Test transaction listing with fields and pagination."""
+        response = await api_client.get(
+            "/api/v1/portfolios/10/transactions",
+            params={"fields": "id,transaction_type,transaction_date", "page_size": 1},
+        )
+        body = response.json()
+        assert body["data"] == [
+            {"id": 2, "transaction_type": "buy", "transaction_date": "2024-01-03"}
+        ]
+        assert body["meta"]["pagination"]["total_items"] == 2
+        assert body["meta"]["pagination"]["has_next"] is True
+
+    async def test_unknown_field_returns_422(self, api_client, portfolio):
+        """Test that an unknown field is a validation error."""
+        response = await api_client.get(
+            "/api/v1/portfolios/10/holdings", params={"fields": "secret"}
+        )
+        assert response.status_code == 422
+        assert response.json()["errors"][0]["code"] == "VALIDATION_ERROR"
@@ -0,0 +1,117 @@
+"""
+Unit tests for time-series content negotiation and encoding.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from portfolio_tracker.models.db import (
+    Holding,
+    MarketPrice,
+    Portfolio,
+    Transaction,
+    User,
+)
+from portfolio_tracker.models.db.transaction import TransactionType
+from portfolio_tracker.utils.timeseries import (
+    ARROW_MEDIA_TYPE,
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    negotiate_media_type,
+)
+
+msgpack = pytest.importorskip("msgpack")
+pa = pytest.importorskip("pyarrow")
+
+
+class TestNegotiation:
+    """Tests for Accept header negotiation."""
+
+    def test_defaults_to_json(self):
+        """Test missing, wildcard and unsupported Accept headers."""
+        assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+        assert negotiate_media_type("*/*") == JSON_MEDIA_TYPE
+        assert negotiate_media_type("text/csv") == JSON_MEDIA_TYPE
+
+    def test_quality_values(self):
+        """Test that the highest q-value supported type wins."""
+        accept = f"{MSGPACK_MEDIA_TYPE};q=0.5, {ARROW_MEDIA_TYPE};q=0.9"
+        assert negotiate_media_type(accept) == ARROW_MEDIA_TYPE
+        assert negotiate_media_type(f"{ARROW_MEDIA_TYPE};q=0") == JSON_MEDIA_TYPE
+
+
+@pytest.fixture
+async def priced_portfolio(db_session, instrument):
+    """Portfolio buying 10 AAA on Jan 2 and selling 4 on Jan 4."""
+    db_session.add(User(id=1, email="a@example.com", password_hash="x", name="A"))
+    db_session.add(Portfolio(id=10, user_id=1, name="Main"))
+    db_session.add(
+        Holding(id=100, portfolio_id=10, symbol="AAA", quantity=Decimal("6"))
+    )
+    for day, quantity, kind in (
+        (2, "10", TransactionType.BUY),
+        (4, "4", TransactionType.SELL),
+    ):
+        db_session.add(
+            Transaction(
+                portfolio_id=10,
+                holding_id=100,
+                transaction_type=kind,
+                transaction_date=date(2024, 1, day),
+                symbol="AAA",
+                quantity=Decimal(quantity),
+                price=Decimal("1"),
+                total_amount=Decimal(quantity),
+            )
+        )
+    for day, close in ((1, "1.00"), (2, "2.00"), (3, "3.00"), (5, "5.00")):
+        db_session.add(
+            MarketPrice(
+                instrument=instrument("AAA"),
+                date=date(2024, 1, day),
+                close=Decimal(close),
+            )
+        )
+    await db_session.commit()
+
+
+class TestTimeSeriesEndpoints:
+    """Tests for negotiated time-series endpoints."""
+
+    HISTORY = "/api/v1/analytics/portfolios/10/history?start=2024-01-01&end=2024-01-05"
+
+    async def test_json_history(self, api_client, priced_portfolio):
+        """Test positions and forward-filled prices in the JSON default."""
+        response = await api_client.get(self.HISTORY)
+        assert response.status_code == 200
+        assert response.json()["data"] == [
+            {"date": "2024-01-01", "value": 0.0},
+            {"date": "2024-01-02", "value": 20.0},
+            {"date": "2024-01-03", "value": 30.0},
+            {"date": "2024-01-05", "value": 30.0},
+        ]
+
+    async def test_arrow_history(self, api_client, priced_portfolio):
+        """Test Arrow IPC encoding of the same series."""
+        response = await api_client.get(
+            self.HISTORY, headers={"Accept": ARROW_MEDIA_TYPE}
+        )
+        assert response.headers["content-type"] == ARROW_MEDIA_TYPE
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.column("date").type == pa.date32()
+        assert table.column("value").to_pylist() == [0.0, 20.0, 30.0, 30.0]
+
+    async def test_msgpack_price_history(self, api_client, priced_portfolio):
+        """Test MessagePack column blocks for price history."""
+        response = await api_client.get(
+            "/api/v1/market/prices/AAA/history?start=2024-01-02",
+            headers={"Accept": MSGPACK_MEDIA_TYPE},
+        )
+        block = msgpack.unpackb(response.content)
+        assert block["columns"] == ["date", "close"]
+        assert block["close"] == [2.0, 3.0, 5.0]
+        first = np.datetime64("1970-01-01") + np.timedelta64(block["date"][0], "D")
+        assert first == np.datetime64("2024-01-02")
@@ -0,0 +1,3 @@
+"""
+Data backfill tools.
+"""
@@ -0,0 +1,91 @@
+"""
+Exchange rate ingestion.
+
+Loads daily exchange rates from CSV files into ``fx_rates``. Rows for a
+pair and date that is already stored overwrite it, so the same file can
+be loaded again after a correction. Invalid rows are counted, not loaded.
+
+Usage:
+    python -m tools.backfill.fx_rates ecb.csv
+    python -m tools.backfill.fx_rates rates/*.csv --source vendor \\
+        --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "src"))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from portfolio_tracker.config.logging import get_logger, setup_logging  # noqa: E402
+from portfolio_tracker.config.settings import get_settings  # noqa: E402
+from portfolio_tracker.services.currency import (  # noqa: E402
+    CurrencyConversionService,
+    read_rates_csv,
+)
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+async def run_ingest(paths: List[Path], database_url: str, source: str) -> int:
+    """Load every file, one transaction per file, and print a JSON summary."""
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    started = time.perf_counter()
+    written = rejected = 0
+
+    try:
+        for path in paths:
+            rates, invalid = read_rates_csv(path, source)
+            async with session_factory() as session:
+                count = await CurrencyConversionService(session).ingest_rates(rates)
+                await session.commit()
+            logger.info("Loaded %s: %d rates, %d rejected", path, count, invalid)
+            written += count
+            rejected += invalid
+    finally:
+        await engine.dispose()
+
+    print(
+        json.dumps(
+            {
+                "files": len(paths),
+                "rows": written,
+                "rejected": rejected,
+                "seconds": round(time.perf_counter() - started, 2),
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+def main() -> int:
+    """Main function for the exchange rate ingestion tool."""
+    parser = argparse.ArgumentParser(description="Exchange rate ingestion")
+    parser.add_argument("files", type=Path, nargs="+", help="CSV files")
+    parser.add_argument(
+        "--database-url", default=settings.DATABASE_URL, help="Async database URL"
+    )
+    parser.add_argument("--source", default="ecb", help="fx_rates.source")
+
+    args = parser.parse_args()
+
+    missing = [str(path) for path in args.files if not path.is_file()]
+    if missing:
+        parser.error(f"not found: {', '.join(missing)}")
+
+    setup_logging()
+    return asyncio.run(run_ingest(args.files, args.database_url, args.source))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
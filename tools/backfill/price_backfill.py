@@ -0,0 +1,143 @@
+"""
+Historical price backfill.
+
+Loads vendor CSV/Parquet price dumps into ``market_prices``, parsing in a
+process pool and writing through a single bulk writer. Re-running with the
+same checkpoint file skips chunks that were already committed.
+
+Usage:
+    python -m tools.backfill.price_backfill dumps/*.csv --source vendor
+    python -m tools.backfill.price_backfill AAPL.parquet --symbol-from-filename
+    python -m tools.backfill.price_backfill dumps/*.csv \\
+        --database-url postgresql+asyncpg://... --workers 8 --checkpoint run.json
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "src"))
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+from portfolio_tracker.config.logging import get_logger, setup_logging  # noqa: E402
+from portfolio_tracker.config.settings import get_settings  # noqa: E402
+from portfolio_tracker.services.price_backfill import (  # noqa: E402
+    Checkpoint,
+    ChunkResult,
+    PriceWriter,
+    backfill,
+)
+
+settings = get_settings()
+logger = get_logger(__name__)
+
+
+async def run_backfill(
+    paths: List[Path],
+    database_url: str,
+    source: str,
+    checkpoint_path: Optional[Path],
+    chunk_mb: float,
+    workers: Optional[int],
+    batch_rows: int,
+    symbol_from_filename: bool,
+) -> int:
+    """Run the backfill and print a JSON summary."""
+    engine = create_async_engine(database_url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    started = time.perf_counter()
+
+    def report(result: ChunkResult) -> None:
+        logger.info(
+            "Committed %s [%s]: %d rows, %d rejected",
+            result.chunk.path,
+            result.chunk.key,
+            len(result.rows),
+            result.rejected,
+        )
+
+    try:
+        summary = await backfill(
+            paths,
+            session_factory,
+            PriceWriter(source, batch_rows=batch_rows),
+            Checkpoint(checkpoint_path),
+            chunk_bytes=int(chunk_mb * 1024 * 1024),
+            workers=workers,
+            symbol_from_filename=symbol_from_filename,
+            on_progress=report,
+        )
+    finally:
+        await engine.dispose()
+
+    elapsed = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                **summary.as_dict(),
+                "seconds": round(elapsed, 2),
+                "rows_per_second": round(summary.rows / elapsed) if elapsed else None,
+            },
+            indent=2,
+        )
+    )
+    return 0
+
+
+def main() -> int:
+    """Main function for the price backfill tool."""
+    parser = argparse.ArgumentParser(description="Historical price backfill")
+    parser.add_argument("files", type=Path, nargs="+", help="CSV or Parquet files")
+    parser.add_argument(
+        "--database-url", default=settings.DATABASE_URL, help="Async database URL"
+    )
+    parser.add_argument("--source", default="backfill", help="market_prices.source")
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=Path("price_backfill.checkpoint.json"),
+        help="Checkpoint file for resuming",
+    )
+    parser.add_argument(
+        "--no-checkpoint", action="store_true", help="Do not read or write a checkpoint"
+    )
+    parser.add_argument("--chunk-mb", type=float, default=8.0, help="CSV chunk size")
+    parser.add_argument(
+        "--workers", type=int, help="Parser processes (default: CPU count, 0: inline)"
+    )
+    parser.add_argument("--batch-rows", type=int, default=2000, help="Rows per INSERT")
+    parser.add_argument(
+        "--symbol-from-filename",
+        action="store_true",
+        help="Use the file name as symbol for files without a symbol column",
+    )
+
+    args = parser.parse_args()
+
+    missing = [str(path) for path in args.files if not path.is_file()]
+    if missing:
+        parser.error(f"not found: {', '.join(missing)}")
+
+    setup_logging()
+    return asyncio.run(
+        run_backfill(
+            paths=args.files,
+            database_url=args.database_url,
+            source=args.source,
+            checkpoint_path=None if args.no_checkpoint else args.checkpoint,
+            chunk_mb=args.chunk_mb,
+            workers=args.workers,
+            batch_rows=args.batch_rows,
+            symbol_from_filename=args.symbol_from_filename,
+        )
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
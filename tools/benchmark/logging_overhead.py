@@ -0,0 +1,158 @@
+"""
+Logging overhead benchmark.
+
+Measures the time a request handler spends logging: each simulated
+request binds its context and emits a few records, and the caller-side
+time per request is reported for every handler configuration. The
+``legacy`` configuration reproduces the previous setup (global record
+factory swap, synchronous text handler) as a baseline.
+
+Use ``--sink-latency-ms`` to simulate a slow log sink (a blocking pipe,
+a network filesystem) and see how much of it reaches the event loop.
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, TextIO
+
+from portfolio_tracker.config.logging import LogContext, setup_logging, shutdown_logging
+
+CONFIGURATIONS = ("legacy", "text", "json", "json_queued")
+
+
+class SlowStream:
+    """File wrapper whose writes block for a fixed time."""
+
+    def __init__(self, stream: TextIO, latency: float) -> None:
+        """Wrap a stream."""
+        self.stream = stream
+        self.latency = latency
+
+    def write(self, data: str) -> int:
+        """Write after sleeping."""
+        time.sleep(self.latency)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        """Flush the wrapped stream."""
+        self.stream.flush()
+
+
+@contextmanager
+def _legacy_context(**context: Any) -> Iterator[None]:
+    """Previous LogContext: swap the process-wide record factory."""
+    old_factory = logging.getLogRecordFactory()
+
+    def record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = old_factory(*args, **kwargs)
+        for key, value in context.items():
+            setattr(record, key, value)
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+    try:
+        yield
+    finally:
+        logging.setLogRecordFactory(old_factory)
+
+
+def _configure(name: str, stream: Any) -> Callable[..., ContextManager[Any]]:
+    """Install a configuration and return its context manager."""
+    if name == "legacy":
+        setup_logging(stream=stream, log_format="text", use_queue=False)
+        return _legacy_context
+    setup_logging(
+        stream=stream,
+        log_format="text" if name == "text" else "json",
+        use_queue=name == "json_queued",
+    )
+    return LogContext
+
+
+def _measure(name: str, stream: Any, requests: int, records: int) -> Dict[str, float]:
+    """Time ``requests`` simulated requests under one configuration."""
+    context = _configure(name, stream)
+    logger = logging.getLogger("benchmark.request")
+    samples: List[float] = []
+    for request_number in range(requests):
+        start = time.perf_counter()
+        with context(request_id=f"req-{request_number}", path="/api/v1/portfolios"):
+            for record_number in range(records):
+                logger.info("step %d of %d", record_number, records)
+        samples.append(time.perf_counter() - start)
+
+    drain_start = time.perf_counter()
+    shutdown_logging()
+    drain = time.perf_counter() - drain_start
+
+    ordered = sorted(samples)
+    return {
+        "median_us": round(statistics.median(ordered) * 1e6, 2),
+        "p99_us": round(ordered[int(len(ordered) * 0.99) - 1] * 1e6, 2),
+        "drain_ms": round(drain * 1000, 2),
+    }
+
+
+def run_benchmark(
+    requests: int = 2000, records: int = 5, sink_latency_ms: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Run the logging benchmark.
+
+    Args:
+        requests: Simulated requests per configuration
+        records: Records logged per request
+        sink_latency_ms: Artificial delay per write to the sink
+
+    Returns:
+        Dictionary with caller-side timings per configuration
+    """
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    results: Dict[str, Any] = {
+        "requests": requests,
+        "records_per_request": records,
+        "sink_latency_ms": sink_latency_ms,
+    }
+    try:
+        with tempfile.TemporaryFile("w+") as sink:
+            stream = (
+                SlowStream(sink, sink_latency_ms / 1000) if sink_latency_ms else sink
+            )
+            for name in CONFIGURATIONS:
+                results[name] = _measure(name, stream, requests, records)
+    finally:
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+    return results
+
+
+def main() -> int:
+    """Main function for the logging benchmark."""
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument("--records", type=int, default=5, help="Records per request")
+    parser.add_argument(
+        "--sink-latency-ms", type=float, default=0.0, help="Simulated write latency"
+    )
+    parser.add_argument("--output", type=Path, help="Write JSON results to file")
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.requests, args.records, args.sink_latency_ms)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
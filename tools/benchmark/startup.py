@@ -0,0 +1,123 @@
+"""
+Startup-time benchmark.
+
+Measures, in fresh interpreter processes, how long it takes to import the
+application module and how long until the first HTTP response is served
+(import + lifespan startup + first request).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[2]
+
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import portfolio_tracker.main
+print(time.perf_counter() - start)
+"""
+
+FIRST_RESPONSE_PROBE = """
+import time
+start = time.perf_counter()
+import asyncio
+
+import httpx
+
+from portfolio_tracker.main import app
+
+
+async def first_response():
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            response = await client.get("/health")
+            response.raise_for_status()
+
+
+asyncio.run(first_response())
+print(time.perf_counter() - start)
+"""
+
+
+def _run_probe(code: str) -> float:
+    """
+    Run a probe in a fresh interpreter and return the reported seconds.
+
+    Args:
+        code: Python source printing elapsed seconds as its last line
+
+    Returns:
+        Elapsed seconds measured inside the child process
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(ROOT / "src"), env.get("PYTHONPATH")])
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def _summarize(samples: List[float]) -> Dict[str, float]:
+    """Summarize timing samples in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "min_ms": round(ordered[0] * 1000, 2),
+        "median_ms": round(statistics.median(ordered) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def run_benchmark(runs: int = 5) -> Dict[str, Any]:
+    """
+    Run the startup benchmark.
+
+    Args:
+        runs: Number of fresh processes per measurement
+
+    Returns:
+        Dictionary with import and first-response timings
+    """
+    import_samples = [_run_probe(IMPORT_PROBE) for _ in range(runs)]
+    response_samples = [_run_probe(FIRST_RESPONSE_PROBE) for _ in range(runs)]
+    return {
+        "runs": runs,
+        "import": _summarize(import_samples),
+        "time_to_first_response": _summarize(response_samples),
+    }
+
+
+def main() -> int:
+    """Main function for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Application startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Processes per metric")
+    parser.add_argument("--output", type=Path, help="Write JSON results to file")
+
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n")
+    print(payload)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,390 @@
+"""
+Load-test and micro-benchmark suite.
+
+Generates a synthetic dataset (see ``tests.fixtures.factories``), loads it
+into a database and times the key read and write paths: ingestion,
+valuation, price history, pagination and serialization. Results are
+written as JSON and compared against a stored baseline. Timings only
+compare on the machine that recorded them, so the baseline is not
+committed: the first run on a machine records it, and later runs are
+checked against it.
+
+Usage:
+    python -m tools.benchmark.suite --scale small
+    python -m tools.benchmark.suite --scale large \
+        --database-url postgresql+asyncpg://...
+    python -m tools.benchmark.suite --scale small --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.append(str(ROOT / "src"))
+
+from sqlalchemy import func, insert, select, text  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine  # noqa: E402
+
+from portfolio_tracker.config.database import Base  # noqa: E402
+from portfolio_tracker.models.db import (  # noqa: E402
+    Holding,
+    Instrument,
+    MarketPrice,
+    Portfolio,
+    Transaction,
+    User,
+)
+from portfolio_tracker.utils.helpers import to_dict  # noqa: E402
+from portfolio_tracker.utils.serialization import (  # noqa: E402
+    get_row_serializer,
+    select_columns,
+)
+from tests.fixtures.factories import (  # noqa: E402
+    SCALES,
+    SyntheticScale,
+    build_holdings,
+    build_instruments,
+    build_portfolios,
+    build_symbols,
+    build_users,
+    iter_market_prices,
+    iter_transactions,
+)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+INSERT_CHUNK_SIZE = 5_000
+PRICE_START = date(2015, 1, 2)
+
+
+def _chunks(
+    rows: Iterable[Dict[str, Any]], size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Split an iterable of rows into lists of ``size`` rows."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def _bulk_insert(
+    engine: AsyncEngine, table: Any, rows: Iterable[Dict[str, Any]]
+) -> int:
+    """
+    Insert rows in chunks with executemany.
+
+    Returns:
+        Number of rows inserted
+    """
+    inserted = 0
+    async with engine.begin() as conn:
+        for chunk in _chunks(rows, INSERT_CHUNK_SIZE):
+            await conn.execute(insert(table), chunk)
+            inserted += len(chunk)
+    return inserted
+
+
+async def _timed(func_: Callable[[], Awaitable[Any]], repeat: int) -> Dict[str, float]:
+    """Run an async callable ``repeat`` times and summarize timings."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func_()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min_ms": round(min(samples) * 1000, 3),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+    }
+
+
+async def load_dataset(
+    engine: AsyncEngine, scale: SyntheticScale, seed: int
+) -> Dict[str, Any]:
+    """
+    Create the schema and load a synthetic dataset.
+
+    Returns:
+        Ingestion metrics and identifiers used by the read benchmarks
+    """
+    rng = random.Random(seed)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    symbols = build_symbols(scale.symbols, rng)
+    users = build_users(scale.users)
+    portfolios = build_portfolios(users, scale.portfolios_per_user, rng)
+    holdings = build_holdings(portfolios, symbols, scale.holdings_per_portfolio, rng)
+
+    await _bulk_insert(engine, Instrument.__table__, build_instruments(symbols))
+    await _bulk_insert(engine, User.__table__, users)
+    await _bulk_insert(engine, Portfolio.__table__, portfolios)
+    await _bulk_insert(engine, Holding.__table__, holdings)
+
+    metrics: Dict[str, Any] = {}
+    for name, table, rows in (
+        (
+            "ingest_transactions",
+            Transaction.__table__,
+            iter_transactions(
+                holdings, scale.transactions, PRICE_START, scale.price_years * 365, rng
+            ),
+        ),
+        (
+            "ingest_market_prices",
+            MarketPrice.__table__,
+            iter_market_prices(symbols, PRICE_START, scale.price_years, rng),
+        ),
+    ):
+        start = time.perf_counter()
+        count = await _bulk_insert(engine, table, rows)
+        elapsed = time.perf_counter() - start
+        metrics[name] = {
+            "rows": count,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(count / elapsed, 1),
+        }
+
+    return {
+        "metrics": metrics,
+        "portfolio_ids": [
+            p["id"] for p in rng.sample(portfolios, min(20, len(portfolios)))
+        ],
+        "symbols": [s["symbol"] for s in rng.sample(symbols, min(20, len(symbols)))],
+    }
+
+
+async def run_read_benchmarks(
+    engine: AsyncEngine, dataset: Dict[str, Any], repeat: int
+) -> Dict[str, Any]:
+    """Time valuation, history, pagination and serialization paths."""
+    portfolio_ids = dataset["portfolio_ids"]
+    symbols = dataset["symbols"]
+
+    latest_close = (
+        select(MarketPrice.close)
+        .join(Instrument, Instrument.id == MarketPrice.instrument_id)
+        .where(Instrument.symbol == Holding.symbol)
+        .order_by(MarketPrice.date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    async def valuation() -> None:
+        async with engine.connect() as conn:
+            for portfolio_id in portfolio_ids:
+                await conn.execute(
+                    select(func.sum(Holding.quantity * latest_close)).where(
+                        Holding.portfolio_id == portfolio_id
+                    )
+                )
+
+    async def history() -> None:
+        async with engine.connect() as conn:
+            for symbol in symbols:
+                result = await conn.execute(
+                    select(MarketPrice.date, MarketPrice.close)
+                    .join(Instrument, Instrument.id == MarketPrice.instrument_id)
+                    .where(Instrument.symbol == symbol)
+                    .order_by(MarketPrice.date)
+                )
+                result.all()
+
+    async def pagination() -> None:
+        async with engine.connect() as conn:
+            for portfolio_id in portfolio_ids:
+                for page in range(5):
+                    result = await conn.execute(
+                        select(Transaction)
+                        .where(Transaction.portfolio_id == portfolio_id)
+                        .order_by(Transaction.transaction_date.desc(), Transaction.id)
+                        .offset(page * 50)
+                        .limit(50)
+                    )
+                    result.all()
+
+    async with engine.connect() as conn:
+        sample = (await conn.execute(select(Transaction).limit(10_000))).all()
+    rows = [Transaction(**row._mapping) for row in sample]
+
+    async def serialization() -> None:
+        json.dumps([to_dict(row) for row in rows], default=str)
+
+    sparse_fields = ("id", "symbol", "transaction_date", "total_amount")
+    async with engine.connect() as conn:
+        sparse_rows = (
+            await conn.execute(
+                select(*select_columns(Transaction, sparse_fields)).limit(10_000)
+            )
+        ).all()
+
+    async def sparse_serialization() -> None:
+        serialize = get_row_serializer(Transaction, sparse_fields)
+        json.dumps([serialize(row) for row in sparse_rows])
+
+    return {
+        "valuation": await _timed(valuation, repeat),
+        "history": await _timed(history, repeat),
+        "pagination": await _timed(pagination, repeat),
+        "serialization": await _timed(serialization, repeat),
+        "sparse_serialization": await _timed(sparse_serialization, repeat),
+    }
+
+
+def compare_with_baseline(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """
+    Compare timing results against a baseline.
+
+    Read paths are compared on their fastest run, which is far less
+    sensitive to scheduler noise than the median.
+
+    Args:
+        results: Current benchmark results
+        baseline: Stored baseline results
+        tolerance: Allowed relative slowdown (0.2 = 20%)
+
+    Returns:
+        Human-readable regression descriptions
+    """
+    regressions = []
+    for name, current in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        if current["min_ms"] > previous["min_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {current['min_ms']}ms vs baseline {previous['min_ms']}ms"
+            )
+    for name, current in results["ingestion"].items():
+        previous = baseline.get("ingestion", {}).get(name)
+        if not previous:
+            continue
+        if current["rows_per_second"] < previous["rows_per_second"] / (1 + tolerance):
+            regressions.append(
+                f"{name}: {current['rows_per_second']} rows/s "
+                f"vs baseline {previous['rows_per_second']} rows/s"
+            )
+    return regressions
+
+
+def check_against_baseline(
+    results: Dict[str, Any],
+    baseline_path: Path,
+    tolerance: float,
+    update: bool = False,
+) -> int:
+    """
+    Compare results with the stored baseline, recording it on first run.
+
+    The results become the baseline when ``update`` is set or when no
+    baseline exists yet.
+
+    Args:
+        results: Current benchmark results
+        baseline_path: Baseline JSON file
+        tolerance: Allowed relative slowdown (0.2 = 20%)
+        update: Replace the baseline with these results
+
+    Returns:
+        Exit code: 1 if regressions were detected, else 0
+    """
+    if update or not baseline_path.exists():
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n")
+        reason = "Baseline updated" if update else "No baseline found, recorded"
+        print(f"\n✅ {reason}: {baseline_path}")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    if baseline.get("meta", {}).get("scale") != results["meta"]["scale"]:
+        print("\n⚠️  Baseline was recorded at a different scale, skipping comparison")
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, tolerance)
+    if regressions:
+        print("\n❌ Regressions detected:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print("\n✨ No regressions against baseline")
+    return 0
+
+
+async def run_suite(
+    database_url: str, scale_name: str, seed: int, repeat: int
+) -> Dict[str, Any]:
+    """Load the dataset and run every benchmark."""
+    engine = create_async_engine(database_url)
+    try:
+        if engine.dialect.name == "sqlite":
+            async with engine.begin() as conn:
+                await conn.execute(text("PRAGMA journal_mode=WAL"))
+        dataset = await load_dataset(engine, SCALES[scale_name], seed)
+        benchmarks = await run_read_benchmarks(engine, dataset, repeat)
+    finally:
+        await engine.dispose()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "dialect": engine.dialect.name,
+            "scale": scale_name,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "ingestion": dataset["metrics"],
+        "benchmarks": benchmarks,
+    }
+
+
+def main() -> int:
+    """Main function for the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Portfolio Tracker benchmark suite")
+    parser.add_argument(
+        "--database-url",
+        help="Async database URL; its tables are dropped and recreated "
+        "(default: temporary SQLite file)",
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Write JSON results to file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as the new baseline "
+        "(done automatically when there is none)",
+    )
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{tmpdir}/bench.db"
+        results = asyncio.run(
+            run_suite(database_url, args.scale, args.seed, args.repeat)
+        )
+
+    payload = json.dumps(results, indent=2)
+    print(payload)
+    if args.output:
+        args.output.write_text(payload + "\n")
+
+    return check_against_baseline(
+        results, args.baseline, args.tolerance, update=args.update_baseline
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())